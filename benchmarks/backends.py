@@ -0,0 +1,60 @@
+"""
+Times batched vector and point math on every installed backend. Run from the
+repository root with::
+
+    python -m benchmarks.backends
+
+Numba compiles each loop on its first call, so every operation is run once
+before it is timed.
+"""
+import random
+import time
+
+from geom3d.backends import available_backends
+from geom3d.backends import use_backend
+from geom3d.nums import close_enough_mask
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+ROWS = 200_000
+CLOUD = 1_500
+
+
+def random_values(count, seed):
+    generator = random.Random(seed)
+    return [generator.uniform(-10, 10) for _ in range(3 * count)]
+
+
+def main():
+    a, b = VectorArray(random_values(ROWS, 1)), VectorArray(random_values(ROWS, 2))
+    points = PointCloud(random_values(ROWS, 3))
+    cloud = PointCloud(random_values(CLOUD, 4))
+    operations = {
+        'add': lambda: a + b,
+        'cross': lambda: a.cross(b),
+        'dot': lambda: a.dot(Vector(1, 2, 3)),
+        'norm': lambda: a.norm,
+        'unit': lambda: a.unit,
+        'make_length': lambda: a.make_length(2.0),
+        'distance_to': lambda: points.distance_to(Point(1, 2, 3)),
+        'close_enough_mask': lambda: close_enough_mask(a.data, b.data),
+        f'pairwise {CLOUD}x{CLOUD}': lambda: cloud.pairwise_distances(),
+    }
+    names = available_backends()
+    print(f"{ROWS} rows; milliseconds per call")
+    print(f"{'':24}" + "".join(f"{name:>10}" for name in names))
+    for operation, call in operations.items():
+        timings = []
+        for name in names:
+            with use_backend(name):
+                call()
+                start = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - start)
+        print(f"{operation:24}" + "".join(f"{timing * 1e3:10.1f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmarks for the tolerance comparisons in `geom3d.nums`, element by element
+and over whole buffers.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from geom3d.nums import all_close  # noqa: E402
+from geom3d.nums import are_close_enough  # noqa: E402
+from geom3d.nums import close_enough_mask  # noqa: E402
+from geom3d.nums import close_to_zero_mask  # noqa: E402
+from geom3d.nums import is_close_to_zero  # noqa: E402
+
+
+@pytest.fixture
+def values(vector_array):
+    return vector_array.data
+
+
+@pytest.fixture
+def noisy(values):
+    return [value + 1e-12 for value in values]
+
+
+@pytest.mark.benchmark(group="nums close_enough")
+class BenchCloseEnough:
+    def bench_scalar(self, benchmark, values, noisy):
+        benchmark(lambda: [are_close_enough(a, b) for a, b in zip(values, noisy)])
+
+    def bench_mask(self, benchmark, values, noisy):
+        benchmark(close_enough_mask, values, noisy)
+
+    def bench_all_close(self, benchmark, values, noisy):
+        benchmark(all_close, values, noisy)
+
+
+@pytest.mark.benchmark(group="nums close_to_zero")
+class BenchCloseToZero:
+    def bench_scalar(self, benchmark, values):
+        benchmark(lambda: [is_close_to_zero(a) for a in values])
+
+    def bench_mask(self, benchmark, values):
+        benchmark(close_to_zero_mask, values)
@@ -0,0 +1,50 @@
+"""
+Benchmarks for `Point` and `PointCloud` on the same data, grouped so the
+scalar and batched paths of every operation are reported side by side.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from geom3d.point_cloud import PointCloud  # noqa: E402
+from geom3d.points import Point  # noqa: E402
+
+
+@pytest.mark.benchmark(group="point construction")
+class BenchConstruction:
+    def bench_scalar(self, benchmark, point_cloud):
+        coordinates = list(zip(point_cloud.x, point_cloud.y, point_cloud.z))
+        benchmark(lambda: [Point(x, y, z) for x, y, z in coordinates])
+
+    def bench_batch(self, benchmark, point_cloud):
+        x, y, z = point_cloud.x, point_cloud.y, point_cloud.z
+        benchmark(PointCloud.from_coordinates, x, y, z)
+
+
+@pytest.mark.benchmark(group="point distance_to")
+class BenchDistance:
+    def bench_scalar(self, benchmark, points, other_points):
+        benchmark(lambda: [a.distance_to(b) for a, b in zip(points, other_points)])
+
+    def bench_batch(self, benchmark, point_cloud, other_point_cloud):
+        benchmark(point_cloud.distance_to, other_point_cloud)
+
+
+@pytest.mark.benchmark(group="point make_vector")
+class BenchMakeVector:
+    def bench_scalar(self, benchmark, points, other_points):
+        benchmark(lambda: [a.make_vector(b) for a, b in zip(points, other_points)])
+
+    def bench_batch(self, benchmark, point_cloud, other_point_cloud):
+        benchmark(point_cloud.make_vector, other_point_cloud)
+
+
+@pytest.mark.benchmark(group="point equality")
+class BenchEquality:
+    def bench_scalar(self, benchmark, points):
+        copies = [Point(p.x, p.y, p.z) for p in points]
+        benchmark(lambda: all(a == b for a, b in zip(points, copies)))
+
+    def bench_batch(self, benchmark, point_cloud):
+        copy = PointCloud(point_cloud.data[:])
+        benchmark(point_cloud.__eq__, copy)
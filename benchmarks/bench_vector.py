@@ -0,0 +1,87 @@
+"""
+Benchmarks for `Vector` (one object per vector) and `VectorArray` (one
+buffer per batch) on the same data, so the scalar and batched paths of every
+operation are reported side by side in one group.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from geom3d.vector import Vector  # noqa: E402
+from geom3d.vector_array import VectorArray  # noqa: E402
+
+
+@pytest.mark.benchmark(group="vector construction")
+class BenchConstruction:
+    def bench_scalar(self, benchmark, vector_array):
+        components = list(zip(vector_array.i, vector_array.j, vector_array.k))
+        benchmark(lambda: [Vector(i, j, k) for i, j, k in components])
+
+    def bench_batch(self, benchmark, vector_array):
+        i, j, k = vector_array.i, vector_array.j, vector_array.k
+        benchmark(VectorArray.from_components, i, j, k)
+
+
+@pytest.mark.benchmark(group="vector add")
+class BenchAdd:
+    def bench_scalar(self, benchmark, vectors, other_vectors):
+        benchmark(lambda: [a + b for a, b in zip(vectors, other_vectors)])
+
+    def bench_batch(self, benchmark, vector_array, other_vector_array):
+        benchmark(vector_array.__add__, other_vector_array)
+
+
+@pytest.mark.benchmark(group="vector scaled_by")
+class BenchScale:
+    def bench_scalar(self, benchmark, vectors):
+        benchmark(lambda: [a.scaled_by(2.5) for a in vectors])
+
+    def bench_batch(self, benchmark, vector_array):
+        benchmark(vector_array.scaled_by, 2.5)
+
+
+@pytest.mark.benchmark(group="vector cross")
+class BenchCross:
+    def bench_scalar(self, benchmark, vectors, other_vectors):
+        benchmark(lambda: [a.cross(b) for a, b in zip(vectors, other_vectors)])
+
+    def bench_batch(self, benchmark, vector_array, other_vector_array):
+        benchmark(vector_array.cross, other_vector_array)
+
+
+@pytest.mark.benchmark(group="vector dot")
+class BenchDot:
+    def bench_scalar(self, benchmark, vectors, other_vectors):
+        benchmark(lambda: [a.dot(b) for a, b in zip(vectors, other_vectors)])
+
+    def bench_batch(self, benchmark, vector_array, other_vector_array):
+        benchmark(vector_array.dot, other_vector_array)
+
+
+@pytest.mark.benchmark(group="vector norm")
+class BenchNorm:
+    def bench_scalar(self, benchmark, vectors):
+        benchmark(lambda: [a.norm for a in vectors])
+
+    def bench_batch(self, benchmark, vector_array):
+        benchmark(lambda: vector_array.norm)
+
+
+@pytest.mark.benchmark(group="vector unit")
+class BenchUnit:
+    def bench_scalar(self, benchmark, vectors):
+        benchmark(lambda: [a.unit for a in vectors])
+
+    def bench_batch(self, benchmark, vector_array):
+        benchmark(lambda: vector_array.unit)
+
+
+@pytest.mark.benchmark(group="vector equality")
+class BenchEquality:
+    def bench_scalar(self, benchmark, vectors):
+        copies = [Vector(a.i, a.j, a.k) for a in vectors]
+        benchmark(lambda: all(a == b for a, b in zip(vectors, copies)))
+
+    def bench_batch(self, benchmark, vector_array):
+        copy = VectorArray(vector_array.data[:])
+        benchmark(vector_array.__eq__, copy)
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+# Batch sizes every size-dependent benchmark runs at.
+SIZES = [10, 1000, 10000]
+
+
+def random_values(count, seed):
+    generator = random.Random(seed)
+    return [generator.uniform(-10, 10) for _ in range(count)]
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"n={size}")
+def size(request):
+    return request.param
+
+
+@pytest.fixture
+def vectors(size):
+    values = random_values(3 * size, 1)
+    return [Vector(*values[n:n + 3]) for n in range(0, len(values), 3)]
+
+
+@pytest.fixture
+def other_vectors(size):
+    values = random_values(3 * size, 2)
+    return [Vector(*values[n:n + 3]) for n in range(0, len(values), 3)]
+
+
+@pytest.fixture
+def vector_array(vectors):
+    return VectorArray.from_vectors(vectors)
+
+
+@pytest.fixture
+def other_vector_array(other_vectors):
+    return VectorArray.from_vectors(other_vectors)
+
+
+@pytest.fixture
+def points(size):
+    values = random_values(3 * size, 3)
+    return [Point(*values[n:n + 3]) for n in range(0, len(values), 3)]
+
+
+@pytest.fixture
+def other_points(size):
+    values = random_values(3 * size, 4)
+    return [Point(*values[n:n + 3]) for n in range(0, len(values), 3)]
+
+
+@pytest.fixture
+def point_cloud(points):
+    return PointCloud.from_points(points)
+
+
+@pytest.fixture
+def other_point_cloud(other_points):
+    return PointCloud.from_points(other_points)
@@ -0,0 +1,93 @@
+"""
+Times `norm`, `unit` and `make_length` on realistic call patterns.
+
+Three implementations are compared: the previous `Vector` methods (reproduced
+below as `PreviousVector`), the current `Vector`, and `FrozenVector`, which
+caches its derived properties. Run from the repository root with::
+
+    python -m benchmarks.derived_properties
+"""
+import math
+import random
+import timeit
+
+from geom3d.nums import are_close_enough
+from geom3d.vector import FrozenVector
+from geom3d.vector import Vector
+
+
+class PreviousVector(Vector):
+    __slots__ = ()
+
+    @property
+    def norm(self):
+        return math.sqrt(self.i ** 2 + self.j ** 2 + self.k ** 2)
+
+    @property
+    def unit(self):
+        if are_close_enough(self.norm, 0):
+            return self
+        return self.scaled_by(1 / self.norm)
+
+    def make_length(self, length):
+        if self == Vector(0, 0, 0):
+            return Vector(0, 0, 0)
+        return self.unit.scaled_by(length)
+
+
+def make_vectors(cls, count, seed=0):
+    generator = random.Random(seed)
+    return [cls(generator.uniform(-5, 5), generator.uniform(-5, 5), generator.uniform(-5, 5)) for _ in range(count)]
+
+
+def repeated_length_checks(members):
+    """
+    Checks every member length against several limits, as a design check
+    loop does, reading `norm` once per limit.
+    """
+    over = 0
+    for limit in (1.0, 2.0, 4.0, 6.0, 8.0):
+        for member in members:
+            if member.norm > limit:
+                over += 1
+    return over
+
+
+def projections_onto_axes(loads, axes):
+    """
+    Resolves every load along a few fixed member axes, normalizing the axis
+    each time as `load.dot(axis.unit)`.
+    """
+    total = 0.0
+    for axis in axes:
+        for load in loads:
+            total += load.dot(axis.unit)
+    return total
+
+
+def rescale(vectors):
+    """
+    Rescales every vector to unit load, as when building load directions.
+    """
+    return [vector.make_length(1.0) for vector in vectors]
+
+
+def best_time(function, repeat=5, number=20):
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def main():
+    rows = [("PreviousVector", PreviousVector), ("Vector", Vector), ("FrozenVector", FrozenVector)]
+    print(f"{'':<16} {'length checks':>14} {'projections':>12} {'make_length':>12}   (ms per call)")
+    for name, cls in rows:
+        members = make_vectors(cls, 2000, seed=1)
+        loads = make_vectors(cls, 2000, seed=2)
+        axes = make_vectors(cls, 3, seed=3)
+        checks = best_time(lambda: repeated_length_checks(members))
+        projections = best_time(lambda: projections_onto_axes(loads, axes))
+        rescaled = best_time(lambda: rescale(loads))
+        print(f"{name:<16} {1000 * checks:14.3f} {1000 * projections:12.3f} {1000 * rescaled:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
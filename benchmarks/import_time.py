@@ -0,0 +1,68 @@
+"""
+Measures the cold-start import time of geom3d in fresh interpreters with
+``python -X importtime`` and fails if it goes over a budget. Run from the
+repository root with::
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget 5
+
+Every statement is timed in several new processes and the fastest run is
+reported, which filters out noise from the rest of the machine. Only time
+spent importing geom3d and the modules it pulls in is counted, not the
+interpreter's own start-up.
+"""
+import argparse
+import subprocess
+import sys
+
+# The statements timed, with whether they count towards the budget.
+STATEMENTS = (
+    ("import geom3d", True),
+    ("from geom3d import Vector, Point, are_close_enough", True),
+    ("from geom3d import VectorArray, PointCloud", True),
+    ("from geom3d import Truss", False),
+    ("import geom3d; [getattr(geom3d, name) for name in geom3d.__all__]", False),
+)
+
+
+def import_time(statement, runs=5):
+    """
+    The fastest time in seconds geom3d took to import over `runs` fresh
+    interpreters running `statement`.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                                capture_output=True, text=True, check=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package", where
+            # top-level imports have exactly one space before their name.
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].startswith(' geom3d'):
+                total += int(fields[1])
+        if best is None or total < best:
+            best = total
+    return best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help="the cold-start budget in milliseconds (default: %(default)s)")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per statement")
+    arguments = parser.parse_args()
+
+    over = False
+    for statement, budgeted in STATEMENTS:
+        elapsed = import_time(statement, arguments.runs) * 1e3
+        flag = ""
+        if budgeted and elapsed > arguments.budget:
+            flag = f"  over the {arguments.budget:g} ms budget"
+            over = True
+        print(f"{elapsed:8.2f} ms  {statement}{flag}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
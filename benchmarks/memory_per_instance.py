@@ -0,0 +1,69 @@
+"""
+Reports the memory cost of one `Vector` and one `Point` instance.
+
+The "dict layout" rows reproduce the previous `__dict__` based classes so the
+saving from `__slots__` can be compared on the running interpreter. Run from
+the repository root with::
+
+    python -m benchmarks.memory_per_instance
+"""
+import tracemalloc
+
+from geom3d.points import FrozenPoint
+from geom3d.points import Point
+from geom3d.vector import FrozenVector
+from geom3d.vector import Vector
+
+
+class DictVector:
+    def __init__(self, i, j, k):
+        self.i = i
+        self.j = j
+        self.k = k
+
+
+class DictPoint:
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+def bytes_per_instance(cls, count=100_000):
+    """
+    Measures the average number of bytes allocated per instance of `cls`.
+
+    The components are shared float objects so only the instance layout is
+    measured, not the floats it refers to.
+
+    :param cls: The class to instantiate with three float arguments.
+    :param count: The number of instances to allocate.
+    :type count: int
+    :return: The average allocation per instance in bytes.
+    :rtype: float
+    """
+    a, b, c = 1.5, 2.5, 3.5
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(a, b, c) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the instances costs one pointer per entry.
+    return (after - before) / len(instances) - 8
+
+
+def main():
+    rows = [
+        ("Vector (dict layout)", DictVector),
+        ("Vector (__slots__)", Vector),
+        ("FrozenVector", FrozenVector),
+        ("Point (dict layout)", DictPoint),
+        ("Point (__slots__)", Point),
+        ("FrozenPoint", FrozenPoint),
+    ]
+    for name, cls in rows:
+        print(f"{name:<22} {bytes_per_instance(cls):8.1f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Times a moving-load sweep over a long Pratt truss two ways: solving the
+factorized truss once per train position, and evaluating stored influence
+lines. Run from the repository root with::
+
+    python -m benchmarks.moving_load
+"""
+import time
+
+from geom3d.influence import InfluenceLines
+from geom3d.influence import LoadTrain
+from geom3d.points import Point
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+
+DOWN = Vector(0, -1, 0)
+
+
+def make_pratt(panels, width=4.0, depth=3.0):
+    truss = Truss()
+    bottom = [truss.add_joint(Point(width * i, 0, 0)) for i in range(panels + 1)]
+    top = [truss.add_joint(Point(width * i, depth, 0)) for i in range(1, panels)]
+    for a, b in zip(bottom, bottom[1:]):
+        truss.add_member(a, b)
+    for a, b in zip(top, top[1:]):
+        truss.add_member(a, b)
+    truss.add_member(bottom[0], top[0])
+    truss.add_member(top[-1], bottom[-1])
+    for i, joint in enumerate(top, start=1):
+        truss.add_member(bottom[i], joint)
+    for i in range(1, panels - 1):
+        if i < panels / 2:
+            truss.add_member(top[i - 1], bottom[i + 1])
+        else:
+            truss.add_member(bottom[i], top[i])
+    truss.add_support(bottom[0], x=True, y=True, z=False)
+    truss.add_support(bottom[-1], x=False, y=True, z=False)
+    return truss, bottom
+
+
+def main():
+    truss, deck = make_pratt(100)
+    train = LoadTrain([35, 145, 145], [0, -4.3, -8.6])
+
+    start = time.perf_counter()
+    lines = InfluenceLines(truss, deck, DOWN)
+    setup = time.perf_counter() - start
+    positions = lines.positions(train, 0.1)
+
+    start = time.perf_counter()
+    lines.envelope(train, positions)
+    sweep = time.perf_counter() - start
+
+    factorized = truss.factorize()
+    sample = positions[::20]
+    cases = []
+    for position in sample:
+        loads = {}
+        for magnitude, offset in zip(train.magnitudes, train.offsets):
+            for station, share in lines._shares(position + offset):
+                joint = deck[station]
+                loads[joint] = loads.get(joint, Vector(0, 0, 0)) + DOWN.scaled_by(magnitude * share)
+        cases.append(loads)
+    start = time.perf_counter()
+    factorized.solve_many(cases)
+    per_solve = (time.perf_counter() - start) / len(sample)
+
+    print(f"{truss.member_count} members, {len(positions)} train positions")
+    print(f"solve per position:  {per_solve * len(positions):8.3f} s (estimated from {len(sample)} solves)")
+    print(f"influence lines:     {setup + sweep:8.3f} s ({setup:.3f} s unit load solves, {sweep:.3f} s envelope)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Times bursts of small concurrent resultant requests two ways: one executor
+call per request, and the micro-batching `StaticsService`. Reports throughput
+and the median and 99th percentile latency. Run from the repository root
+with::
+
+    python -m benchmarks.service_latency
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from geom3d.forces import ForceSystem
+from geom3d.point_cloud import PointCloud
+from geom3d.service import StaticsService
+from geom3d.vector_array import VectorArray
+
+BURSTS = 20
+BURST_SIZE = 500
+LOADS_PER_REQUEST = 8
+
+
+def resultant(forces, points):
+    system = ForceSystem(forces, points)
+    return system.resultant(), system.moment_about()
+
+
+def make_request(rng):
+    forces = VectorArray([rng.uniform(-1, 1) for _ in range(3 * LOADS_PER_REQUEST)])
+    points = PointCloud([rng.uniform(-10, 10) for _ in range(3 * LOADS_PER_REQUEST)])
+    return forces, points
+
+
+async def timed(awaitable, latencies):
+    start = time.perf_counter()
+    await awaitable
+    latencies.append(time.perf_counter() - start)
+
+
+async def run_bursts(requests, submit):
+    latencies = []
+    start = time.perf_counter()
+    for burst in range(BURSTS):
+        chunk = requests[burst * BURST_SIZE:(burst + 1) * BURST_SIZE]
+        await asyncio.gather(*(timed(submit(forces, points), latencies) for forces, points in chunk))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name, elapsed, latencies):
+    median = latencies[len(latencies) // 2]
+    tail = latencies[int(len(latencies) * 0.99)]
+    print(f"{name:22} {len(latencies) / elapsed:9.0f} req/s   p50 {median * 1e3:7.2f} ms   p99 {tail * 1e3:7.2f} ms")
+
+
+async def main():
+    rng = random.Random(0)
+    requests = [make_request(rng) for _ in range(BURSTS * BURST_SIZE)]
+    with ProcessPoolExecutor() as executor:
+        loop = asyncio.get_running_loop()
+        # Warm the pool up, so process start-up is not timed.
+        await asyncio.gather(*(loop.run_in_executor(executor, resultant, *requests[0]) for _ in range(64)))
+
+        def one_call_each(forces, points):
+            return loop.run_in_executor(executor, resultant, forces, points)
+        report("one call per request", *await run_bursts(requests, one_call_each))
+
+        async with StaticsService(executor=executor) as service:
+            report("StaticsService", *await run_bursts(requests, service.resultant))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Times solving a wide double-layer space frame, a mesh that is not slender in
+any direction, with every available method and backend. Run from the
+repository root with::
+
+    python -m benchmarks.space_frame
+    python -m benchmarks.space_frame --size 60
+
+The frame is a grid of `size` x `size` bays in two layers, braced in every
+face and through every bay, pinned at its four bottom corners and loaded on
+every top joint.
+"""
+import argparse
+import time
+
+from geom3d.backends import available_backends
+from geom3d.backends import use_backend
+from geom3d.points import Point
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+
+
+def make_space_frame(size, bay=2.0, depth=1.5):
+    """
+    A `size` x `size` bay double-layer grid with its load on the top layer.
+    """
+    truss = Truss()
+    joints = {}
+    for layer in range(2):
+        for i in range(size + 1):
+            for j in range(size + 1):
+                joints[i, j, layer] = truss.add_joint(Point(bay * i, bay * j, depth * layer))
+
+    def brace(a, b):
+        if a in joints and b in joints:
+            truss.add_member(joints[a], joints[b])
+
+    for (i, j, layer) in list(joints):
+        brace((i, j, layer), (i + 1, j, layer))
+        brace((i, j, layer), (i, j + 1, layer))
+        brace((i, j, layer), (i + 1, j + 1, layer))
+        if layer == 0:
+            brace((i, j, 0), (i, j, 1))
+            brace((i, j, 0), (i + 1, j, 1))
+            brace((i, j, 0), (i, j + 1, 1))
+            brace((i, j, 0), (i + 1, j + 1, 1))
+    for i, j in ((0, 0), (size, 0), (0, size), (size, size)):
+        truss.add_support(joints[i, j, 0])
+    for i in range(size + 1):
+        for j in range(size + 1):
+            truss.add_load(joints[i, j, 1], Vector(0, 0, -10))
+    return truss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=40, help="bays along each side (default: %(default)s)")
+    arguments = parser.parse_args()
+
+    truss = make_space_frame(arguments.size)
+    print(f"{arguments.size} x {arguments.size} x 2 space frame: {truss.joint_count} joints, "
+          f"{truss.member_count} members; seconds per solve")
+    for method in ("direct", "cg"):
+        for name in available_backends():
+            with use_backend(name):
+                start = time.perf_counter()
+                truss.solve(method)
+                print(f"{method:8}{name:8}{time.perf_counter() - start:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
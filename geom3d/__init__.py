@@ -0,0 +1,91 @@
+"""
+Vectors, points and statics for 3D geometry.
+
+The public classes and functions of every submodule are available from the
+package itself, for example ``geom3d.Vector`` or ``geom3d.are_close_enough``.
+Nothing is imported until a name is first used: ``import geom3d`` only runs
+this file, and each submodule, with its own dependencies, is loaded the
+first time one of its names is accessed. Submodules can still be imported
+directly, as in ``from geom3d.truss import Truss``.
+"""
+# The submodule each public name is loaded from.
+_EXPORTS = {
+    'Vector': 'vector',
+    'FrozenVector': 'vector',
+    'Point': 'points',
+    'FrozenPoint': 'points',
+    'are_close_enough': 'nums',
+    'is_close_to_zero': 'nums',
+    'is_close_to_one': 'nums',
+    'close_enough_mask': 'nums',
+    'close_to_zero_mask': 'nums',
+    'close_to_one_mask': 'nums',
+    'all_close': 'nums',
+    'available_backends': 'backends',
+    'get_backend': 'backends',
+    'set_backend': 'backends',
+    'use_backend': 'backends',
+    'VectorArray': 'vector_array',
+    'PointCloud': 'point_cloud',
+    'ForceSystem': 'forces',
+    'Wrench': 'forces',
+    'LineLoad': 'distributed',
+    'PressureLoad': 'distributed',
+    'MassProperties': 'mass_properties',
+    'Truss': 'truss',
+    'TrussSolution': 'truss',
+    'FactorizedTruss': 'truss',
+    'DeterminateTruss': 'truss',
+    'InfluenceLines': 'influence',
+    'LoadTrain': 'influence',
+    'Rotation': 'transforms',
+    'Quaternion': 'transforms',
+    'RigidTransform': 'transforms',
+    'FrameTree': 'transforms',
+    'GridIndex': 'spatial',
+    'remap_members': 'weld',
+    'LazyVector': 'lazy',
+    'LazyScalar': 'lazy',
+    'evaluate': 'lazy',
+    'fuse': 'lazy',
+    'read_csv': 'streaming',
+    'read_binary': 'streaming',
+    'CsvWriter': 'streaming',
+    'BinaryWriter': 'streaming',
+    'GeometryFile': 'geometry_file',
+    'write_geometry': 'geometry_file',
+    'run_batch': 'batch',
+    'ResultCache': 'sweep',
+    'geometry_hash': 'sweep',
+    'StaticsService': 'service',
+}
+
+_SUBMODULES = frozenset((
+    'backends', 'batch', 'distributed', 'forces', 'geometry_file', 'influence', 'instrument', 'lazy', 'mass_properties',
+    'nums', 'point_cloud', 'points', 'service', 'sparse', 'spatial', 'streaming', 'sweep', 'transforms', 'truss',
+    'vector', 'vector_array', 'weld',
+))
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    Imports the submodule a public name lives in on first access, and caches
+    the name so later lookups do not come back here.
+    """
+    # __import__ with a fromlist returns the submodule itself, and unlike
+    # importlib.import_module needs no import of its own at start-up.
+    module = _EXPORTS.get(name)
+    if module is not None:
+        value = getattr(__import__(f'{__name__}.{module}', fromlist=(name,)), name)
+    elif name in _SUBMODULES:
+        value = __import__(f'{__name__}.{name}', fromlist=('__name__',))
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -0,0 +1,836 @@
+import math
+import os
+from array import array
+from itertools import chain
+from itertools import cycle
+from itertools import repeat
+from operator import add
+from operator import mul
+from operator import sub
+
+# The environment variable naming the backend used when none was set.
+ENVIRONMENT_VARIABLE = 'GEOM3D_BACKEND'
+
+_active = None
+_instances = {}
+
+
+def _interleave(i, j, k):
+    """
+    Packs three equally long component sequences into one flat
+    ``i0, j0, k0, i1, j1, k1, ...`` float64 buffer.
+
+    :param i: The first components.
+    :param j: The second components.
+    :param k: The third components.
+    :return: A flat buffer holding the interleaved components.
+    :rtype: array
+    """
+    i = _as_array(i)
+    out = array('d', bytes(24 * len(i)))
+    out[0::3] = i
+    out[1::3] = _as_array(j)
+    out[2::3] = _as_array(k)
+    return out
+
+
+def _as_array(values):
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    return array('d', values)
+
+
+def _flat(values):
+    """
+    Iterates a flat buffer, or repeats a single ``(x, y, z)`` row so it lines
+    up with every row of an interleaved buffer.
+    """
+    if isinstance(values, tuple):
+        return cycle(values)
+    return values
+
+
+def _components(values):
+    if isinstance(values, tuple):
+        return repeat(values[0]), repeat(values[1]), repeat(values[2])
+    return values[0::3], values[1::3], values[2::3]
+
+
+def _broadcast(values):
+    if isinstance(values, (int, float)):
+        return repeat(values)
+    return values
+
+
+class PythonBackend:
+    """
+    The pure-Python reference backend, which needs nothing beyond the
+    standard library.
+
+    A backend implements the batched math behind `VectorArray`, `PointCloud`
+    and the buffer functions of `nums`. Every method works on flat float64
+    buffers of interleaved ``x, y, z`` rows; where a method takes two
+    buffers, either one may instead be a single ``(x, y, z)`` tuple, which is
+    applied to every row of the other. Lengths are checked by the callers.
+
+    It also exposes the kernels of the sparse solvers of `geom3d.sparse`: the
+    product of a compressed sparse row matrix with a vector, and the dense
+    steps of a multifrontal Cholesky factorization, which work on square
+    row-major blocks. Here they are the pure-Python ones of that module.
+    """
+    name = 'python'
+
+    def add(self, a, b):
+        """
+        :return: The row by row sums.
+        :rtype: array
+        """
+        return array('d', map(add, _flat(a), _flat(b)))
+
+    def subtract(self, a, b):
+        """
+        :return: The row by row differences ``a - b``.
+        :rtype: array
+        """
+        return array('d', map(sub, _flat(a), _flat(b)))
+
+    def scale(self, a, factor):
+        """
+        :param factor: A single factor, or one factor per row.
+        :type factor: float or sequence of float
+        :return: Every row scaled by its factor.
+        :rtype: array
+        """
+        if isinstance(factor, (int, float)):
+            return array('d', [c * factor for c in a])
+        return array('d', map(mul, a, chain.from_iterable(zip(factor, factor, factor))))
+
+    def dot(self, a, b):
+        """
+        :return: One dot product per row.
+        :rtype: array
+        """
+        bi, bj, bk = _components(b)
+        return array('d', [
+            x * u + y * v + z * w
+            for x, y, z, u, v, w in zip(a[0::3], a[1::3], a[2::3], bi, bj, bk)
+        ])
+
+    def cross(self, a, b):
+        """
+        :return: One cross product ``a x b`` per row.
+        :rtype: array
+        """
+        bi, bj, bk = _components(b)
+        i, j, k = [], [], []
+        for x, y, z, u, v, w in zip(a[0::3], a[1::3], a[2::3], bi, bj, bk):
+            i.append(y * w - z * v)
+            j.append(z * u - x * w)
+            k.append(x * v - y * u)
+        return _interleave(i, j, k)
+
+    def norm(self, a):
+        """
+        :return: The Euclidean norm of every row.
+        :rtype: array
+        """
+        sqrt = math.sqrt
+        return array('d', [sqrt(x * x + y * y + z * z) for x, y, z in zip(a[0::3], a[1::3], a[2::3])])
+
+    def unit(self, a, tolerance):
+        """
+        :return: Every row divided by its norm. Rows whose norm is below
+            `tolerance` are returned unchanged.
+        :rtype: array
+        """
+        sqrt = math.sqrt
+        fabs = math.fabs
+        i, j, k = [], [], []
+        for x, y, z in zip(a[0::3], a[1::3], a[2::3]):
+            n = sqrt(x * x + y * y + z * z)
+            if fabs(n) < tolerance:
+                i.append(x)
+                j.append(y)
+                k.append(z)
+            else:
+                inverse = 1 / n
+                i.append(x * inverse)
+                j.append(y * inverse)
+                k.append(z * inverse)
+        return _interleave(i, j, k)
+
+    def make_length(self, a, length, tolerance):
+        """
+        :param length: A single length, or one length per row.
+        :type length: float or sequence of float
+        :return: Every row rescaled to its length. Rows whose components are
+            all below `tolerance` become zero.
+        :rtype: array
+        """
+        sqrt = math.sqrt
+        fabs = math.fabs
+        i, j, k = [], [], []
+        for x, y, z, target in zip(a[0::3], a[1::3], a[2::3], _broadcast(length)):
+            if fabs(x) < tolerance and fabs(y) < tolerance and fabs(z) < tolerance:
+                i.append(0.0)
+                j.append(0.0)
+                k.append(0.0)
+            else:
+                inverse = 1 / sqrt(x * x + y * y + z * z)
+                i.append(x * inverse * target)
+                j.append(y * inverse * target)
+                k.append(z * inverse * target)
+        return _interleave(i, j, k)
+
+    def distance(self, a, b):
+        """
+        :return: The Euclidean distance between every pair of rows.
+        :rtype: array
+        """
+        bx, by, bz = _components(b)
+        sqrt = math.sqrt
+        distances = array('d')
+        for x, y, z, u, v, w in zip(a[0::3], a[1::3], a[2::3], bx, by, bz):
+            delta_x = u - x
+            delta_y = v - y
+            delta_z = w - z
+            distances.append(sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z))
+        return distances
+
+    def pairwise_distances(self, a, b):
+        """
+        :return: One row per row of `a`, of the distances to every row of `b`.
+        :rtype: list of array
+        """
+        bx, by, bz = array('d', b[0::3]), array('d', b[1::3]), array('d', b[2::3])
+        sqrt = math.sqrt
+        rows = []
+        for x, y, z in zip(a[0::3], a[1::3], a[2::3]):
+            row = array('d')
+            for u, v, w in zip(bx, by, bz):
+                delta_x = u - x
+                delta_y = v - y
+                delta_z = w - z
+                row.append(sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z))
+            rows.append(row)
+        return rows
+
+    def close_enough_mask(self, a, b, tolerance, rel_tolerance):
+        """
+        The element-wise `are_close_enough` of two flat sequences, either of
+        which may be a single number.
+
+        :rtype: list of bool
+        """
+        fabs = math.fabs
+        if not rel_tolerance:
+            return [fabs(x - y) < tolerance for x, y in zip(_broadcast(a), _broadcast(b))]
+        return [
+            fabs(x - y) < max(tolerance, rel_tolerance * max(fabs(x), fabs(y)))
+            for x, y in zip(_broadcast(a), _broadcast(b))
+        ]
+
+    def close_to_zero_mask(self, values, tolerance):
+        """
+        :rtype: list of bool
+        """
+        fabs = math.fabs
+        return [fabs(x) < tolerance for x in values]
+
+    def all_close(self, a, b, tolerance, rel_tolerance):
+        """
+        Whether `close_enough_mask` holds everywhere, stopping at the first
+        pair that is not close.
+
+        :rtype: bool
+        """
+        fabs = math.fabs
+        pairs = zip(_broadcast(a), _broadcast(b))
+        if not rel_tolerance:
+            return all(fabs(x - y) < tolerance for x, y in pairs)
+        return all(fabs(x - y) < max(tolerance, rel_tolerance * max(fabs(x), fabs(y))) for x, y in pairs)
+
+    def sparse_matvec(self, indptr, indices, values, x):
+        """
+        :param indptr: The row pointer of a compressed sparse row matrix.
+        :param indices: The column of every stored entry.
+        :param values: The value of every stored entry.
+        :param x: A dense vector with one entry per column.
+        :return: The product of the matrix with `x`, one entry per row.
+        :rtype: array
+        """
+        from geom3d import sparse
+        return sparse._sparse_matvec(indptr, indices, values, x)
+
+    def extend_add(self, front, size, update, positions):
+        """
+        Adds the lower triangle of a square update matrix into the lower
+        triangle of a `size` x `size` frontal matrix, in place.
+
+        :param front: The frontal matrix, row-major.
+        :type front: array
+        :param update: The update matrix, row-major.
+        :param positions: The row of `front` of every row of `update`, ascending.
+        :type positions: list of int
+        """
+        from geom3d import sparse
+        sparse._extend_add(front, size, update, positions)
+
+    def eliminate(self, front, size, pivots, diagonal, tolerance):
+        """
+        Eliminates the first `pivots` unknowns of a symmetric frontal matrix,
+        one step of a multifrontal Cholesky factorization.
+
+        :param front: The lower triangle of a `size` x `size` matrix,
+            row-major. The entries above the diagonal are ignored.
+        :type front: array
+        :param diagonal: The entry of the assembled matrix at every pivot. A
+            pivot that falls to `tolerance` times it is rejected.
+        :return: The first `pivots` columns of the factor, `size` x `pivots`
+            row-major with zeros above the diagonal, and the Schur complement
+            of the remaining unknowns, whose lower triangle is filled in.
+        :rtype: tuple of (array, array)
+        :raises ValueError: If the matrix is not positive definite.
+        """
+        from geom3d import sparse
+        return sparse._eliminate_front(front, size, pivots, diagonal, tolerance)
+
+
+def _size(a, b):
+    """
+    The number of values of whichever argument is a buffer.
+    """
+    return len(b) if isinstance(a, (int, float, tuple)) else len(a)
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Runs batched math as NumPy array operations over the existing buffers,
+    without copying them in. Batches of fewer than `min_size` values, where
+    NumPy's per-call overhead outweighs its speed, use the reference code.
+
+    :raises ImportError: If NumPy is not installed.
+    """
+    name = 'numpy'
+    min_size = 96
+
+    def __init__(self):
+        import importlib
+        self._np = importlib.import_module('numpy')
+
+    def _rows(self, values):
+        """
+        An (N, 3) view of a flat buffer, or a (3,) array for a single row.
+        """
+        if isinstance(values, tuple):
+            return self._np.array(values, dtype=float)
+        return self._np.asarray(values, dtype=float).reshape(-1, 3)
+
+    def _out(self, size, shape=None):
+        """
+        A new `array('d')` of `size` values and a writable NumPy view of it,
+        so results are computed straight into the buffer that is returned.
+        """
+        out = array('d', bytes(8 * size))
+        view = self._np.frombuffer(out)
+        return out, view if shape is None else view.reshape(shape)
+
+    def _row_sums(self, a_rows, b_rows, out):
+        """
+        Writes ``a_x * b_x + a_y * b_y + a_z * b_z`` of every row into `out`,
+        in the same order of operations as the reference backend, so both
+        round identically.
+        """
+        np = self._np
+        np.multiply(a_rows[:, 0], b_rows[..., 0], out=out)
+        term = a_rows[:, 1] * b_rows[..., 1]
+        out += term
+        np.multiply(a_rows[:, 2], b_rows[..., 2], out=term)
+        out += term
+
+    def _elementwise(self, function, a, b):
+        a_rows, b_rows = self._rows(a), self._rows(b)
+        rows = a_rows if a_rows.ndim == 2 else b_rows
+        out, view = self._out(rows.size, rows.shape)
+        function(a_rows, b_rows, out=view)
+        return out
+
+    def add(self, a, b):
+        if _size(a, b) < self.min_size:
+            return super().add(a, b)
+        return self._elementwise(self._np.add, a, b)
+
+    def subtract(self, a, b):
+        if _size(a, b) < self.min_size:
+            return super().subtract(a, b)
+        return self._elementwise(self._np.subtract, a, b)
+
+    def scale(self, a, factor):
+        if len(a) < self.min_size:
+            return super().scale(a, factor)
+        np = self._np
+        rows = self._rows(a)
+        if not isinstance(factor, (int, float)):
+            factor = np.asarray(factor, dtype=float)[:, None]
+        out, view = self._out(rows.size, rows.shape)
+        np.multiply(rows, factor, out=view)
+        return out
+
+    def dot(self, a, b):
+        if len(a) < self.min_size:
+            return super().dot(a, b)
+        a_rows = self._rows(a)
+        out, view = self._out(len(a_rows))
+        self._row_sums(a_rows, self._rows(b), view)
+        return out
+
+    def cross(self, a, b):
+        if len(a) < self.min_size:
+            return super().cross(a, b)
+        np = self._np
+        a_rows, b_rows = self._rows(a), self._rows(b)
+        out, view = self._out(a_rows.size, a_rows.shape)
+        view[...] = np.cross(a_rows, b_rows)
+        return out
+
+    def norm(self, a):
+        if len(a) < self.min_size:
+            return super().norm(a)
+        rows = self._rows(a)
+        out, view = self._out(len(rows))
+        self._row_sums(rows, rows, view)
+        self._np.sqrt(view, out=view)
+        return out
+
+    def _inverse_norms(self, rows):
+        """
+        The norm of every row and its reciprocal, computed as the reference
+        backend does. Zero norms give an infinite reciprocal without a warning.
+        """
+        np = self._np
+        norms = np.empty(len(rows))
+        self._row_sums(rows, rows, norms)
+        np.sqrt(norms, out=norms)
+        with np.errstate(divide='ignore'):
+            return norms, 1 / norms
+
+    def unit(self, a, tolerance):
+        if len(a) < self.min_size:
+            return super().unit(a, tolerance)
+        np = self._np
+        rows = self._rows(a)
+        norms, inverses = self._inverse_norms(rows)
+        out, view = self._out(rows.size, rows.shape)
+        with np.errstate(invalid='ignore'):
+            np.multiply(rows, inverses[:, None], out=view)
+        small = np.abs(norms) < tolerance
+        view[small] = rows[small]
+        return out
+
+    def make_length(self, a, length, tolerance):
+        if len(a) < self.min_size:
+            return super().make_length(a, length, tolerance)
+        np = self._np
+        rows = self._rows(a)
+        _, inverses = self._inverse_norms(rows)
+        if not isinstance(length, (int, float)):
+            length = np.asarray(length, dtype=float)[:, None]
+        out, view = self._out(rows.size, rows.shape)
+        with np.errstate(invalid='ignore'):
+            np.multiply(rows, inverses[:, None], out=view)
+            view *= length
+        view[(np.abs(rows) < tolerance).all(axis=1)] = 0.0
+        return out
+
+    def distance(self, a, b):
+        if len(a) < self.min_size:
+            return super().distance(a, b)
+        deltas = self._rows(b) - self._rows(a)
+        out, view = self._out(len(deltas))
+        self._row_sums(deltas, deltas, view)
+        self._np.sqrt(view, out=view)
+        return out
+
+    def pairwise_distances(self, a, b):
+        if len(a) * len(b) < 3 * self.min_size:
+            return super().pairwise_distances(a, b)
+        np = self._np
+        a_rows, b_rows = self._rows(a), self._rows(b)
+        squared = np.subtract.outer(a_rows[:, 0], b_rows[:, 0])
+        squared *= squared
+        for axis in (1, 2):
+            delta = np.subtract.outer(a_rows[:, axis], b_rows[:, axis])
+            delta *= delta
+            squared += delta
+        np.sqrt(squared, out=squared)
+        return [array('d', row.tobytes()) for row in squared]
+
+    def _deviations(self, a, b, tolerance, rel_tolerance):
+        np = self._np
+        a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        deviations = np.abs(a - b)
+        if rel_tolerance:
+            return deviations, np.maximum(tolerance, rel_tolerance * np.maximum(np.abs(a), np.abs(b)))
+        return deviations, tolerance
+
+    def close_enough_mask(self, a, b, tolerance, rel_tolerance):
+        if _size(a, b) < self.min_size:
+            return super().close_enough_mask(a, b, tolerance, rel_tolerance)
+        deviations, limits = self._deviations(a, b, tolerance, rel_tolerance)
+        return (deviations < limits).tolist()
+
+    def close_to_zero_mask(self, values, tolerance):
+        if len(values) < self.min_size:
+            return super().close_to_zero_mask(values, tolerance)
+        np = self._np
+        return (np.abs(np.asarray(values, dtype=float)) < tolerance).tolist()
+
+    def all_close(self, a, b, tolerance, rel_tolerance):
+        if _size(a, b) < self.min_size:
+            return super().all_close(a, b, tolerance, rel_tolerance)
+        deviations, limits = self._deviations(a, b, tolerance, rel_tolerance)
+        return bool((deviations < limits).all())
+
+    def sparse_matvec(self, indptr, indices, values, x):
+        if len(values) < self.min_size:
+            return super().sparse_matvec(indptr, indices, values, x)
+        np = self._np
+        indptr = np.asarray(indptr)
+        products = np.asarray(values, dtype=float) * np.asarray(x, dtype=float)[np.asarray(indices)]
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        out, view = self._out(len(indptr) - 1)
+        view[...] = np.bincount(rows, weights=products, minlength=len(view))
+        return out
+
+    def extend_add(self, front, size, update, positions):
+        if len(update) < self.min_size:
+            return super().extend_add(front, size, update, positions)
+        np = self._np
+        index = np.asarray(positions)
+        block = np.asarray(update, dtype=float).reshape(len(index), len(index))
+        np.frombuffer(front).reshape(size, size)[np.ix_(index, index)] += block
+
+    def eliminate(self, front, size, pivots, diagonal, tolerance):
+        if size * size < self.min_size:
+            return super().eliminate(front, size, pivots, diagonal, tolerance)
+        np = self._np
+        matrix = np.frombuffer(front).reshape(size, size)
+        lower = np.tril(matrix[:pivots, :pivots])
+        try:
+            head = np.linalg.cholesky(lower + np.tril(lower, -1).T)
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix is not positive definite") from None
+        if (np.diagonal(head) ** 2 <= tolerance * np.abs(np.asarray(diagonal, dtype=float))).any():
+            raise ValueError("Matrix is not positive definite")
+        factor, factor_view = self._out(size * pivots, (size, pivots))
+        factor_view[:pivots] = head
+        below = factor_view[pivots:]
+        below[...] = np.linalg.solve(head, matrix[pivots:, :pivots].T).T
+        count = size - pivots
+        update, update_view = self._out(count * count, (count, count))
+        np.subtract(matrix[pivots:, pivots:], below @ below.T, out=update_view)
+        return factor, update
+
+
+# The loops compiled by `NumbaBackend`. `step` is 3 when `b` holds one row per
+# row of `a`, and 0 when it holds a single row applied to every row.
+
+def _dot_loop(a, b, step, out):
+    for n in range(len(out)):
+        m = n * step
+        out[n] = a[3 * n] * b[m] + a[3 * n + 1] * b[m + 1] + a[3 * n + 2] * b[m + 2]
+
+
+def _cross_loop(a, b, step, out):
+    for n in range(len(out) // 3):
+        m = n * step
+        x, y, z = a[3 * n], a[3 * n + 1], a[3 * n + 2]
+        u, v, w = b[m], b[m + 1], b[m + 2]
+        out[3 * n] = y * w - z * v
+        out[3 * n + 1] = z * u - x * w
+        out[3 * n + 2] = x * v - y * u
+
+
+def _norm_loop(a, out):
+    for n in range(len(out)):
+        x, y, z = a[3 * n], a[3 * n + 1], a[3 * n + 2]
+        out[n] = math.sqrt(x * x + y * y + z * z)
+
+
+def _unit_loop(a, tolerance, out):
+    for n in range(len(out) // 3):
+        x, y, z = a[3 * n], a[3 * n + 1], a[3 * n + 2]
+        norm = math.sqrt(x * x + y * y + z * z)
+        if abs(norm) < tolerance:
+            out[3 * n], out[3 * n + 1], out[3 * n + 2] = x, y, z
+        else:
+            inverse = 1 / norm
+            out[3 * n], out[3 * n + 1], out[3 * n + 2] = x * inverse, y * inverse, z * inverse
+
+
+def _make_length_loop(a, lengths, step, tolerance, out):
+    for n in range(len(out) // 3):
+        x, y, z = a[3 * n], a[3 * n + 1], a[3 * n + 2]
+        if abs(x) < tolerance and abs(y) < tolerance and abs(z) < tolerance:
+            out[3 * n], out[3 * n + 1], out[3 * n + 2] = 0.0, 0.0, 0.0
+        else:
+            inverse = 1 / math.sqrt(x * x + y * y + z * z)
+            target = lengths[n * step]
+            out[3 * n] = x * inverse * target
+            out[3 * n + 1] = y * inverse * target
+            out[3 * n + 2] = z * inverse * target
+
+
+def _distance_loop(a, b, step, out):
+    for n in range(len(out)):
+        m = n * step
+        delta_x = b[m] - a[3 * n]
+        delta_y = b[m + 1] - a[3 * n + 1]
+        delta_z = b[m + 2] - a[3 * n + 2]
+        out[n] = math.sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z)
+
+
+def _pairwise_loop(a, b, out):
+    for n in range(out.shape[0]):
+        x, y, z = a[3 * n], a[3 * n + 1], a[3 * n + 2]
+        for m in range(out.shape[1]):
+            delta_x = b[3 * m] - x
+            delta_y = b[3 * m + 1] - y
+            delta_z = b[3 * m + 2] - z
+            out[n, m] = math.sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z)
+
+
+def _matvec_loop(indptr, indices, values, x, out):
+    for r in range(len(out)):
+        total = 0.0
+        for position in range(indptr[r], indptr[r + 1]):
+            total += values[position] * x[indices[position]]
+        out[r] = total
+
+
+def _close_loop(a, a_step, b, b_step, tolerance, rel_tolerance, out):
+    for n in range(len(out)):
+        x, y = a[n * a_step], b[n * b_step]
+        limit = tolerance
+        if rel_tolerance:
+            limit = max(tolerance, rel_tolerance * max(abs(x), abs(y)))
+        out[n] = abs(x - y) < limit
+
+
+def _all_close_loop(a, a_step, b, b_step, count, tolerance, rel_tolerance):
+    for n in range(count):
+        x, y = a[n * a_step], b[n * b_step]
+        limit = tolerance
+        if rel_tolerance:
+            limit = max(tolerance, rel_tolerance * max(abs(x), abs(y)))
+        if not abs(x - y) < limit:
+            return False
+    return True
+
+
+class NumbaBackend(NumpyBackend):
+    """
+    Runs the innermost loops as machine code compiled with Numba, fusing each
+    operation into one pass without NumPy's temporary arrays. Every loop is
+    compiled the first time it runs; elementwise sums and scaling, and the
+    dense steps of the multifrontal Cholesky factorization, use NumPy.
+
+    :raises ImportError: If Numba or NumPy is not installed.
+    """
+    name = 'numba'
+
+    def __init__(self):
+        super().__init__()
+        import importlib
+        self._njit = importlib.import_module('numba').njit
+        self._loops = {}
+
+    def _loop(self, function):
+        loop = self._loops.get(function)
+        if loop is None:
+            loop = self._loops[function] = self._njit(nogil=True)(function)
+        return loop
+
+    def _flat_and_step(self, values, rows):
+        """
+        A flat float64 array of `values` and the step between its rows, 0 for
+        a single row (or number) applied to all `rows`.
+        """
+        np = self._np
+        if isinstance(values, (tuple, int, float)):
+            return np.array(values, dtype=float).reshape(-1), 0
+        return np.asarray(values, dtype=float), rows
+
+    def dot(self, a, b):
+        if len(a) < self.min_size:
+            return PythonBackend.dot(self, a, b)
+        b, step = self._flat_and_step(b, 3)
+        out, view = self._out(len(a) // 3)
+        self._loop(_dot_loop)(self._np.asarray(a, dtype=float), b, step, view)
+        return out
+
+    def cross(self, a, b):
+        if len(a) < self.min_size:
+            return PythonBackend.cross(self, a, b)
+        b, step = self._flat_and_step(b, 3)
+        out, view = self._out(len(a))
+        self._loop(_cross_loop)(self._np.asarray(a, dtype=float), b, step, view)
+        return out
+
+    def norm(self, a):
+        if len(a) < self.min_size:
+            return PythonBackend.norm(self, a)
+        out, view = self._out(len(a) // 3)
+        self._loop(_norm_loop)(self._np.asarray(a, dtype=float), view)
+        return out
+
+    def unit(self, a, tolerance):
+        if len(a) < self.min_size:
+            return PythonBackend.unit(self, a, tolerance)
+        out, view = self._out(len(a))
+        self._loop(_unit_loop)(self._np.asarray(a, dtype=float), float(tolerance), view)
+        return out
+
+    def make_length(self, a, length, tolerance):
+        if len(a) < self.min_size:
+            return PythonBackend.make_length(self, a, length, tolerance)
+        lengths, step = self._flat_and_step(length, 1)
+        out, view = self._out(len(a))
+        self._loop(_make_length_loop)(self._np.asarray(a, dtype=float), lengths, step, float(tolerance), view)
+        return out
+
+    def distance(self, a, b):
+        if len(a) < self.min_size:
+            return PythonBackend.distance(self, a, b)
+        b, step = self._flat_and_step(b, 3)
+        out, view = self._out(len(a) // 3)
+        self._loop(_distance_loop)(self._np.asarray(a, dtype=float), b, step, view)
+        return out
+
+    def pairwise_distances(self, a, b):
+        if len(a) * len(b) < 3 * self.min_size:
+            return PythonBackend.pairwise_distances(self, a, b)
+        np = self._np
+        out = np.empty((len(a) // 3, len(b) // 3))
+        self._loop(_pairwise_loop)(np.asarray(a, dtype=float), np.asarray(b, dtype=float), out)
+        return [array('d', row.tobytes()) for row in out]
+
+    def sparse_matvec(self, indptr, indices, values, x):
+        if len(values) < self.min_size:
+            return PythonBackend.sparse_matvec(self, indptr, indices, values, x)
+        np = self._np
+        out, view = self._out(len(indptr) - 1)
+        self._loop(_matvec_loop)(np.asarray(indptr), np.asarray(indices), np.asarray(values, dtype=float),
+                                 np.asarray(x, dtype=float), view)
+        return out
+
+    def close_enough_mask(self, a, b, tolerance, rel_tolerance):
+        size = _size(a, b)
+        if size < self.min_size:
+            return PythonBackend.close_enough_mask(self, a, b, tolerance, rel_tolerance)
+        a, a_step = self._flat_and_step(a, 1)
+        b, b_step = self._flat_and_step(b, 1)
+        out = self._np.empty(size, dtype=bool)
+        self._loop(_close_loop)(a, a_step, b, b_step, float(tolerance), float(rel_tolerance), out)
+        return out.tolist()
+
+    def close_to_zero_mask(self, values, tolerance):
+        return self.close_enough_mask(values, 0.0, tolerance, 0.0)
+
+    def all_close(self, a, b, tolerance, rel_tolerance):
+        size = _size(a, b)
+        if size < self.min_size:
+            return PythonBackend.all_close(self, a, b, tolerance, rel_tolerance)
+        a, a_step = self._flat_and_step(a, 1)
+        b, b_step = self._flat_and_step(b, 1)
+        return bool(self._loop(_all_close_loop)(a, a_step, b, b_step, size, float(tolerance),
+                                                float(rel_tolerance)))
+
+
+# The backends by name.
+BACKENDS = {
+    'python': PythonBackend,
+    'numpy': NumpyBackend,
+    'numba': NumbaBackend,
+}
+
+
+def _instance(name):
+    backend = _instances.get(name)
+    if backend is None:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown backend {name!r}, expected one of {', '.join(BACKENDS)}")
+        backend = _instances[name] = BACKENDS[name]()
+    return backend
+
+
+def available_backends():
+    """
+    The backends whose dependencies are installed. Checking imports them.
+
+    :rtype: list of str
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            _instance(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend():
+    """
+    The backend batched math currently runs on. Until `set_backend` is called
+    this is the one named by the ``GEOM3D_BACKEND`` environment variable, or
+    the pure-Python reference backend if it is not set.
+
+    :rtype: PythonBackend
+    """
+    global _active
+    if _active is None:
+        _active = _instance(os.environ.get(ENVIRONMENT_VARIABLE) or 'python')
+    return _active
+
+
+def set_backend(name):
+    """
+    Selects the backend batched math runs on from now on, in every thread.
+
+    :param name: One of ``'python'``, ``'numpy'`` or ``'numba'``.
+    :type name: str
+    :return: The backend now in use.
+    :rtype: PythonBackend
+    :raises ValueError: If there is no backend of that name.
+    :raises ImportError: If the backend's dependencies are not installed.
+    """
+    global _active
+    _active = _instance(name)
+    return _active
+
+
+class _BackendBlock:
+    # A class rather than contextlib.contextmanager, which would add
+    # contextlib and functools to the cold start of every batch type.
+    def __init__(self, name):
+        self.name = name
+        self.previous = None
+
+    def __enter__(self):
+        self.previous = get_backend()
+        return set_backend(self.name)
+
+    def __exit__(self, *exc_info):
+        set_backend(self.previous.name)
+
+
+def use_backend(name):
+    """
+    Selects a backend for the duration of a ``with`` block, then restores the
+    previous one.
+
+    :return: The backend in use inside the block.
+    :rtype: PythonBackend
+    """
+    return _BackendBlock(name)
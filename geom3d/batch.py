@@ -0,0 +1,184 @@
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+
+def _attach(name):
+    """
+    Attaches to an existing shared memory block without tracking it, since the
+    block is owned and unlinked by the process that created it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block, but pool workers share the
+        # parent's resource tracker, where registration is idempotent.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _run_rows(function, inputs, outputs, count, input_width, output_width):
+    """
+    Applies `function` to `count` rows of `inputs` and writes each result row
+    into `outputs`.
+    """
+    for row in range(count):
+        result = function(inputs[row * input_width:(row + 1) * input_width])
+        if len(result) != output_width:
+            raise ValueError(f"Expected {output_width} outputs per job, got {len(result)}")
+        outputs[row * output_width:(row + 1) * output_width] = array('d', result)
+
+
+def _run_chunk(function, input_name, output_name, count, input_width, output_width):
+    """
+    Worker entry point: runs one chunk whose inputs and outputs live in shared
+    memory, so only the block names cross the process boundary.
+    """
+    input_block = _attach(input_name)
+    output_block = _attach(output_name)
+    try:
+        inputs = input_block.buf.cast('d')
+        outputs = output_block.buf.cast('d')
+        try:
+            _run_rows(function, inputs, outputs, count, input_width, output_width)
+        finally:
+            inputs.release()
+            outputs.release()
+    finally:
+        input_block.close()
+        output_block.close()
+
+
+class _Chunk:
+    __slots__ = ('count', 'input_block', 'output_block', 'future')
+
+    def __init__(self, count, input_block, output_block, future):
+        self.count = count
+        self.input_block = input_block
+        self.output_block = output_block
+        self.future = future
+
+    def release(self):
+        for block in (self.input_block, self.output_block):
+            block.close()
+            block.unlink()
+
+
+def _pack(rows, input_width):
+    data = array('d')
+    count = 0
+    for row in rows:
+        if len(row) != input_width:
+            raise ValueError(f"Expected {input_width} inputs per job, got {len(row)}")
+        data.extend(row)
+        count += 1
+    return data, count
+
+
+def run_batch(function, jobs, input_width, output_width, workers=None, chunk_size=1024, progress=None):
+    """
+    Runs `function` over a stream of independent jobs, sharded across a pool
+    of worker processes.
+
+    Every job is a fixed-width row of floats (for example the coordinates of a
+    point followed by the components of a force) and `function` maps one row
+    to a fixed-width row of results. Jobs are packed into chunks of
+    `chunk_size` rows; the input and output rows of a chunk live in shared
+    memory blocks, so only the block names are sent to the workers instead of
+    pickling every job and result. At most two chunks per worker are in flight
+    at a time, so memory stays bounded however long the job stream is.
+
+    :param function: A picklable (module level) function taking a sequence of
+        `input_width` floats and returning `output_width` floats.
+    :type function: callable
+    :param jobs: The job rows. May be a generator.
+    :type jobs: iterable of sequence of float
+    :param input_width: The number of floats in every job.
+    :type input_width: int
+    :param output_width: The number of floats in every result.
+    :type output_width: int
+    :param workers: The number of worker processes. Defaults to the number of
+        CPUs. Zero runs every chunk in the calling process.
+    :type workers: int or None
+    :param chunk_size: The number of jobs sent to a worker at a time.
+    :type chunk_size: int
+    :param progress: Called as ``progress(done, total)`` after every chunk,
+        where `total` is None when `jobs` has no length.
+    :type progress: callable or None
+    :return: The result rows, in the same order as the jobs.
+    :rtype: iterator of tuple of float
+    """
+    if input_width < 1 or output_width < 1:
+        raise ValueError("input_width and output_width must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    total = len(jobs) if hasattr(jobs, '__len__') else None
+    jobs = iter(jobs)
+    if workers == 0:
+        return _run_inline(function, jobs, input_width, output_width, chunk_size, progress, total)
+    return _run_pool(function, jobs, input_width, output_width, workers, chunk_size, progress, total)
+
+
+def _results(outputs, count, output_width):
+    for row in range(count):
+        yield tuple(outputs[row * output_width:(row + 1) * output_width])
+
+
+def _run_inline(function, jobs, input_width, output_width, chunk_size, progress, total):
+    done = 0
+    while True:
+        inputs, count = _pack(islice(jobs, chunk_size), input_width)
+        if not count:
+            return
+        outputs = array('d', bytes(8 * count * output_width))
+        _run_rows(function, inputs, outputs, count, input_width, output_width)
+        done += count
+        if progress is not None:
+            progress(done, total)
+        yield from _results(outputs, count, output_width)
+
+
+def _run_pool(function, jobs, input_width, output_width, workers, chunk_size, progress, total):
+    pending = deque()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < 2 * workers:
+                    inputs, count = _pack(islice(jobs, chunk_size), input_width)
+                    if not count:
+                        exhausted = True
+                        break
+                    input_block = shared_memory.SharedMemory(create=True, size=8 * len(inputs))
+                    input_block.buf[:8 * len(inputs)] = memoryview(inputs).cast('B')
+                    output_block = shared_memory.SharedMemory(create=True, size=8 * count * output_width)
+                    future = executor.submit(_run_chunk, function, input_block.name, output_block.name,
+                                             count, input_width, output_width)
+                    pending.append(_Chunk(count, input_block, output_block, future))
+                if not pending:
+                    return
+                chunk = pending.popleft()
+                try:
+                    chunk.future.result()
+                    outputs = array('d')
+                    outputs.frombytes(bytes(chunk.output_block.buf[:8 * chunk.count * output_width]))
+                finally:
+                    chunk.release()
+                done += chunk.count
+                if progress is not None:
+                    progress(done, total)
+                yield from _results(outputs, chunk.count, output_width)
+        finally:
+            for chunk in pending:
+                chunk.future.cancel()
+            for chunk in pending:
+                try:
+                    chunk.future.result()
+                except BaseException:
+                    pass
+                chunk.release()
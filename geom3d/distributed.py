@@ -0,0 +1,487 @@
+import math
+from array import array
+from functools import lru_cache
+
+from geom3d.forces import ORIGIN
+from geom3d.forces import ForceSystem
+from geom3d.nums import is_close_to_zero
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+# Polygon vertices may lie this far off their plane, relative to the size of
+# the polygon, before it is rejected as not planar.
+_PLANARITY_TOLERANCE = 1e-9
+
+
+@lru_cache(maxsize=None)
+def gauss_legendre(order):
+    """
+    The nodes and weights of the Gauss-Legendre rule with `order` points,
+    mapped onto the interval [0, 1]. The rule integrates polynomials of
+    degree up to ``2 * order - 1`` exactly.
+
+    :param order: The number of points.
+    :type order: int
+    :return: The nodes in ascending order and their weights, which sum to 1.
+    :rtype: tuple of (tuple of float, tuple of float)
+    """
+    if order < 1:
+        raise ValueError("order must be at least 1")
+    nodes = []
+    weights = []
+    for index in range(order):
+        x = math.cos(math.pi * (index + 0.75) / (order + 0.5))
+        for _ in range(100):
+            # Evaluate the Legendre polynomial and its derivative by recurrence.
+            previous, current = 1.0, x
+            for n in range(2, order + 1):
+                previous, current = current, ((2 * n - 1) * x * current - (n - 1) * previous) / n
+            derivative = order * (x * current - previous) / (x * x - 1) if order > 1 else 1.0
+            step = current / derivative
+            x -= step
+            if abs(step) < 1e-16:
+                break
+        previous, current = 1.0, x
+        for n in range(2, order + 1):
+            previous, current = current, ((2 * n - 1) * x * current - (n - 1) * previous) / n
+        derivative = order * (x * current - previous) / (x * x - 1) if order > 1 else 1.0
+        nodes.append((1 - x) / 2)
+        weights.append(1 / ((1 - x * x) * derivative * derivative))
+    return tuple(nodes), tuple(weights)
+
+
+class LoadIntegral:
+    __slots__ = ('system', 'point')
+
+    def __init__(self, system, point):
+        """
+        The result of integrating a distributed load.
+
+        :param system: The equivalent point forces, one per quadrature sample,
+            whose resultant and moments equal those of the distributed load.
+        :type system: ForceSystem
+        :param point: The point of application of the resultant on the loaded
+            line or plane, or None when the load reduces to a pure couple.
+        :type point: Point or None
+        """
+        self.system = system
+        self.point = point
+
+    @property
+    def force(self):
+        """
+        The resultant force.
+
+        :rtype: Vector
+        """
+        return self.system.resultant()
+
+    def moment_about(self, point: Point = ORIGIN):
+        """
+        The resultant moment about a point.
+
+        :param point: The point to take moments about. Defaults to the origin.
+        :type point: Point
+        :rtype: Vector
+        """
+        return self.system.moment_about(point)
+
+    @property
+    def couple(self):
+        """
+        The moment left over when the resultant acts at `point`. It is zero
+        when every load acts in the same direction, as for pressure on a
+        plane or gravity along a member. For a pure couple it is the moment
+        about the origin.
+
+        :rtype: Vector
+        """
+        return self.system.moment_about(self.point if self.point is not None else ORIGIN)
+
+    @property
+    def samples(self):
+        """
+        The number of quadrature samples kept in the result.
+
+        :rtype: int
+        """
+        return len(self.system)
+
+
+def _field(value, what):
+    """
+    Turns a constant into a batch field function, or passes a field function
+    through.
+    """
+    if callable(value):
+        return value
+    if isinstance(value, Vector):
+        return lambda points: VectorArray(array('d', (value.i, value.j, value.k)) * len(points))
+    if isinstance(value, (int, float)):
+        return lambda points: array('d', [value]) * len(points)
+    raise TypeError(f"Expected a {what} or a function of a PointCloud, got {type(value).__name__}")
+
+
+def _integrate(cells, rule, split, traction, reference, length_scale, tolerance, max_samples, min_depth, gain):
+    """
+    Integrates a force field over cells with adaptive Gauss quadrature.
+
+    The initial cells are first split `min_depth` times. Every cell is then
+    compared with the sum over its children. Its children are accepted once
+    the comparison has passed at two successive levels, for the cell and for
+    its parent, so a feature missed by the samples of one level alone is not
+    taken for zero. The parent only has to pass within `gain` times the
+    tolerance, since a smooth field converges that much faster per level.
+    The rest are replaced by their children and refined again. All cells of
+    one refinement level are sampled with a single call to the field, so the
+    field runs on batches.
+
+    :param cells: The initial cells.
+    :param rule: Maps a cell to its quadrature samples ``[(x, y, z, weight), ...]``
+        and its share of the whole domain.
+    :param split: Maps a cell to its children.
+    :param traction: The field, mapping a PointCloud to one force per unit
+        length or area per point.
+    :param reference: The point moments are accumulated about while
+        refining, so the error test does not depend on the coordinate origin.
+    :param length_scale: Converts moment errors into force units.
+    :param min_depth: The number of times every initial cell is split before
+        any is accepted.
+    :param gain: How much the error of the rule shrinks per split.
+    :return: The equivalent point forces at the accepted samples.
+    :rtype: ForceSystem
+    """
+    rx, ry, rz = reference.x, reference.y, reference.z
+    evaluations = 0
+
+    def estimate(batch):
+        nonlocal evaluations
+        samples = [rule(cell) for cell in batch]
+        coordinates = array('d')
+        for cell_samples, _ in samples:
+            for x, y, z, _ in cell_samples:
+                coordinates.extend((x, y, z))
+        count = len(coordinates) // 3
+        evaluations += count
+        if evaluations > max_samples:
+            raise ValueError(f"Distributed load did not converge within {max_samples} samples")
+        values = traction(PointCloud(coordinates))
+        values = values.data if isinstance(values, VectorArray) else values
+        if len(values) != 3 * count:
+            raise ValueError(f"Expected {count} loads from the field, got {len(values) // 3}")
+        results = []
+        position = 0
+        for cell_samples, share in samples:
+            fx = fy = fz = mx = my = mz = 0.0
+            points = array('d')
+            forces = array('d')
+            for x, y, z, weight in cell_samples:
+                vx = values[position] * weight
+                vy = values[position + 1] * weight
+                vz = values[position + 2] * weight
+                position += 3
+                dx, dy, dz = x - rx, y - ry, z - rz
+                fx += vx
+                fy += vy
+                fz += vz
+                mx += dy * vz - dz * vy
+                my += dz * vx - dx * vz
+                mz += dx * vy - dy * vx
+                points.extend((x, y, z))
+                forces.extend((vx, vy, vz))
+            results.append(((fx, fy, fz, mx, my, mz), share, points, forces))
+        return results
+
+    def size(sums):
+        return math.hypot(*sums[:3]) + math.hypot(*sums[3:]) / length_scale
+
+    for _ in range(min_depth):
+        cells = [child for cell in cells for child in split(cell)]
+    system = ForceSystem()
+    accepted = [0.0] * 6
+    coarse = estimate(cells)
+    # Whether each cell's parent agreed with its children within `gain` times
+    # the tolerance, the first of the two levels that have to agree.
+    confirmed = [False] * len(cells)
+    scale = size([sum(values) for values in zip(*(result[0] for result in coarse))])
+    while cells:
+        children = [split(cell) for cell in cells]
+        fine = estimate([child for group in children for child in group])
+        # Measure errors against the best estimate of the whole load so far.
+        estimated = size([sum(values) for values in zip(accepted, *(result[0] for result in fine))])
+        if estimated > 0.0:
+            scale = estimated
+        next_cells, next_coarse, next_confirmed = [], [], []
+        position = 0
+        for group, (sums, share, _, _), agreed in zip(children, coarse, confirmed):
+            parts = fine[position:position + len(group)]
+            position += len(group)
+            refined = [sum(values) for values in zip(*(part[0] for part in parts))]
+            error = size([a - b for a, b in zip(refined, sums)])
+            limit = tolerance * scale * share
+            if agreed and error <= limit:
+                for _, _, points, forces in parts:
+                    system.add_loads(VectorArray(forces), PointCloud(points))
+                accepted = [a + b for a, b in zip(accepted, refined)]
+            else:
+                next_cells.extend(group)
+                next_coarse.extend(parts)
+                next_confirmed.extend([error <= gain * limit] * len(group))
+        cells, coarse, confirmed = next_cells, next_coarse, next_confirmed
+    return system
+
+
+class LineLoad:
+    def __init__(self, start: Point, end: Point, intensity):
+        """
+        A distributed load along the straight segment from `start` to `end`,
+        such as the self weight of a member or wind on a cable.
+
+        :param start: The start of the loaded segment.
+        :type start: Point
+        :param end: The end of the loaded segment.
+        :type end: Point
+        :param intensity: The force per unit length: a constant `Vector`, or
+            a function mapping a `PointCloud` of positions on the segment to a
+            `VectorArray` with one force per unit length per position.
+        :type intensity: Vector or callable
+        :raises ValueError: If the segment has zero length.
+        """
+        self.start = start
+        self.end = end
+        self.direction = start.make_vector(end)
+        self.length = self.direction.norm
+        if is_close_to_zero(self.length):
+            raise ValueError("A line load needs a segment of non-zero length")
+        self.intensity = _field(intensity, "Vector")
+
+    @classmethod
+    def linear(cls, start: Point, end: Point, at_start: Vector, at_end: Vector):
+        """
+        A load whose intensity varies linearly from `at_start` to `at_end`,
+        such as a triangular or trapezoidal load.
+
+        :param start: The start of the loaded segment.
+        :type start: Point
+        :param end: The end of the loaded segment.
+        :type end: Point
+        :param at_start: The force per unit length at `start`.
+        :type at_start: Vector
+        :param at_end: The force per unit length at `end`.
+        :type at_end: Vector
+        :rtype: LineLoad
+        """
+        direction = start.make_vector(end)
+        squared_length = direction.norm_squared
+        change = at_end - at_start
+
+        def intensity(points):
+            fractions = [f / squared_length for f in points.make_vector(start).scaled_by(-1).dot(direction)]
+            return VectorArray.from_components(
+                [at_start.i + change.i * f for f in fractions],
+                [at_start.j + change.j * f for f in fractions],
+                [at_start.k + change.k * f for f in fractions]
+            )
+
+        return cls(start, end, intensity)
+
+    def integrate(self, tolerance=1e-9, order=3, max_samples=1_000_000, min_depth=0):
+        """
+        Integrates the load into its resultant and equivalent point forces.
+
+        The segment is sampled with an `order`-point Gauss-Legendre rule and
+        bisected wherever halving changes the result, until the change in
+        force and moment of every piece has stayed below its share of
+        `tolerance`, relative to the size of the load, for two halvings in a
+        row.
+
+        A peak much narrower than the segment can fall between the samples of
+        every coarse piece. Starting from ``2 ** min_depth`` pieces, each no
+        wider than a few times the peak, makes sure it is seen.
+
+        :param tolerance: The relative accuracy. Defaults to 1e-9.
+        :type tolerance: float
+        :param order: The number of Gauss points per piece. Defaults to 3,
+            which is exact for loads varying up to quintically.
+        :type order: int
+        :param max_samples: The limit on evaluations of the intensity.
+        :type max_samples: int
+        :param min_depth: The number of times the segment is halved before
+            any piece is accepted. Defaults to 0.
+        :type min_depth: int
+        :rtype: LoadIntegral
+        :raises ValueError: If the limit is reached before converging.
+        """
+        nodes, weights = gauss_legendre(order)
+        sx, sy, sz = self.start.x, self.start.y, self.start.z
+        d = self.direction
+        length = self.length
+
+        def rule(cell):
+            a, b = cell
+            width = b - a
+            samples = []
+            for node, weight in zip(nodes, weights):
+                t = a + width * node
+                samples.append((sx + t * d.i, sy + t * d.j, sz + t * d.k, width * weight * length))
+            return samples, width
+
+        def split(cell):
+            a, b = cell
+            middle = (a + b) / 2
+            return (a, middle), (middle, b)
+
+        system = _integrate([(0.0, 1.0)], rule, split, self.intensity, self.start, length, tolerance, max_samples,
+                            min_depth, 4 ** order)
+        return LoadIntegral(system, _point_on_line(system, self.start, d))
+
+
+class PressureLoad:
+    def __init__(self, vertices, pressure):
+        """
+        A pressure acting over a flat polygon, such as wind on a cladding
+        panel or water on a gate.
+
+        The polygon's normal follows the right-hand rule on the vertex order.
+        A positive pressure pushes against the normal, that is onto the face
+        from the side the normal points to. The polygon may be non-convex.
+
+        :param vertices: The corners of the polygon, in order.
+        :type vertices: sequence of Point
+        :param pressure: The force per unit area: a number, or a function
+            mapping a `PointCloud` of positions on the polygon to one pressure
+            per position.
+        :type pressure: float or callable
+        :raises ValueError: If there are fewer than three vertices, the
+            polygon has zero area or is not flat.
+        """
+        if len(vertices) < 3:
+            raise ValueError("A polygon needs at least three vertices")
+        self.vertices = list(vertices)
+        area_vector = Vector(0, 0, 0)
+        for a, b in zip(self.vertices, self.vertices[1:] + self.vertices[:1]):
+            area_vector = area_vector + ORIGIN.make_vector(a).cross(ORIGIN.make_vector(b))
+        self.area = area_vector.norm / 2
+        if is_close_to_zero(self.area):
+            raise ValueError("A pressure load needs a polygon of non-zero area")
+        self.normal = area_vector.unit
+        size = math.sqrt(self.area)
+        first = self.vertices[0]
+        for vertex in self.vertices[1:]:
+            if abs(first.make_vector(vertex).dot(self.normal)) > _PLANARITY_TOLERANCE * size:
+                raise ValueError("The polygon is not flat")
+        self.pressure = _field(pressure, "number")
+
+    def _traction(self, points):
+        n = self.normal
+        pressures = self.pressure(points)
+        if len(pressures) != len(points):
+            raise ValueError(f"Expected {len(points)} pressures from the field, got {len(pressures)}")
+        return VectorArray.from_components(
+            [-p * n.i for p in pressures],
+            [-p * n.j for p in pressures],
+            [-p * n.k for p in pressures]
+        )
+
+    def integrate(self, tolerance=1e-9, order=3, max_samples=1_000_000, min_depth=0):
+        """
+        Integrates the pressure into its resultant, its centre of pressure and
+        equivalent point forces.
+
+        The polygon is split into triangles, each sampled with a collapsed
+        `order` x `order` Gauss rule and subdivided into four wherever that
+        changes the result, until the change in force and moment of every
+        triangle has stayed below its share of `tolerance`, relative to the
+        size of the load, for two subdivisions in a row. Raise `min_depth` for
+        pressures concentrated on a small part of the polygon.
+
+        :param tolerance: The relative accuracy. Defaults to 1e-9.
+        :type tolerance: float
+        :param order: The number of Gauss points along each side of the
+            collapsed rule. Defaults to 3.
+        :type order: int
+        :param max_samples: The limit on evaluations of the pressure.
+        :type max_samples: int
+        :param min_depth: The number of times every triangle is subdivided
+            before any is accepted. Defaults to 0.
+        :type min_depth: int
+        :rtype: LoadIntegral
+        :raises ValueError: If the limit is reached before converging.
+        """
+        nodes, weights = gauss_legendre(order)
+        normal = self.normal
+        total_area = sum(
+            abs(_signed_area(self.vertices[0], b, c, normal)) for b, c in zip(self.vertices[1:], self.vertices[2:])
+        )
+
+        def rule(cell):
+            a, b, c = cell
+            ab, ac = a.make_vector(b), a.make_vector(c)
+            signed_area = _signed_area(a, b, c, normal)
+            samples = []
+            for u, wu in zip(nodes, weights):
+                for v, wv in zip(nodes, weights):
+                    s = v * (1 - u)
+                    samples.append((
+                        a.x + u * ab.i + s * ac.i,
+                        a.y + u * ab.j + s * ac.j,
+                        a.z + u * ab.k + s * ac.k,
+                        wu * wv * (1 - u) * 2 * signed_area
+                    ))
+            return samples, abs(signed_area) / total_area
+
+        def split(cell):
+            a, b, c = cell
+            ab, bc, ca = _midpoint(a, b), _midpoint(b, c), _midpoint(c, a)
+            return (a, ab, ca), (ab, b, bc), (ca, bc, c), (ab, bc, ca)
+
+        first = self.vertices[0]
+        triangles = [(first, b, c) for b, c in zip(self.vertices[1:], self.vertices[2:])]
+        system = _integrate(triangles, rule, split, self._traction, first, math.sqrt(self.area), tolerance,
+                            max_samples, min_depth, 4 ** order)
+        return LoadIntegral(system, _point_on_plane(system, first, normal))
+
+
+def _signed_area(a, b, c, normal):
+    return a.make_vector(b).cross(a.make_vector(c)).dot(normal) / 2
+
+
+def _midpoint(a, b):
+    return Point((a.x + b.x) / 2, (a.y + b.y) / 2, (a.z + b.z) / 2)
+
+
+def _point_on_line(system, start, direction):
+    """
+    The point of the loaded line closest to the central axis of the
+    resultant, where the resultant acts. None for a pure couple.
+    """
+    try:
+        axis_point, axis = system.central_axis()
+    except ValueError:
+        return None
+    unit = direction.unit
+    w = start.make_vector(axis_point)
+    b = unit.dot(axis)
+    denominator = 1 - b * b
+    if is_close_to_zero(denominator):
+        # The resultant acts along the line itself.
+        return start.displaced(unit, w.dot(unit))
+    t = (w.dot(unit) - b * w.dot(axis)) / denominator
+    return start.displaced(unit, t)
+
+
+def _point_on_plane(system, origin, normal):
+    """
+    The point where the central axis of the resultant pierces the loaded
+    plane, the centre of pressure. None for a pure couple.
+    """
+    try:
+        axis_point, axis = system.central_axis()
+    except ValueError:
+        return None
+    along = axis.dot(normal)
+    if is_close_to_zero(along):
+        return axis_point
+    return axis_point.displaced(axis, axis_point.make_vector(origin).dot(normal) / along)
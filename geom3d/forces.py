@@ -0,0 +1,172 @@
+import math
+from array import array
+
+from geom3d.nums import is_close_to_zero
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+ORIGIN = Point(0, 0, 0)
+
+
+class Wrench:
+    __slots__ = ('force', 'couple', 'point', 'pitch')
+
+    def __init__(self, force, couple, point, pitch):
+        """
+        The simplest equivalent of a force system: a single force acting along
+        the central axis together with a couple parallel to that force.
+
+        :param force: The resultant force.
+        :type force: Vector
+        :param couple: The couple parallel to the resultant force.
+        :type couple: Vector
+        :param point: The point on the central axis closest to the origin.
+        :type point: Point
+        :param pitch: The ratio of the couple to the force, so that
+            ``couple == force * pitch``.
+        :type pitch: float
+        """
+        self.force = force
+        self.couple = couple
+        self.point = point
+        self.pitch = pitch
+
+    def __str__(self):
+        return f"force {self.force} at {self.point} with couple {self.couple}"
+
+
+class ForceSystem:
+    def __init__(self, forces=None, points=None):
+        """
+        Holds a set of forces and their points of application in array form and
+        reduces them to a resultant force, moment or wrench.
+
+        The resultant force and the moment about the origin are kept as running
+        sums, so adding loads only costs the work for the new loads and every
+        query afterwards is constant time regardless of how many loads the
+        system holds.
+
+        :param forces: Optional initial forces.
+        :type forces: VectorArray or None
+        :param points: The points of application of `forces`, one per force.
+        :type points: PointCloud or None
+        """
+        self._forces = array('d')
+        self._points = array('d')
+        self._force_sum = [0.0, 0.0, 0.0]
+        self._moment_sum = [0.0, 0.0, 0.0]
+        if forces is not None or points is not None:
+            self.add_loads(forces, points)
+
+    def __len__(self):
+        return len(self._forces) // 3
+
+    @property
+    def forces(self):
+        """
+        Every force in the system.
+
+        :rtype: VectorArray
+        """
+        return VectorArray(self._forces)
+
+    @property
+    def points(self):
+        """
+        The point of application of every force.
+
+        :rtype: PointCloud
+        """
+        return PointCloud(self._points)
+
+    def add_load(self, force: Vector, point: Point):
+        """
+        Adds a single force acting at a point.
+
+        :param force: The force to add.
+        :type force: Vector
+        :param point: The point the force acts at.
+        :type point: Point
+        """
+        self._forces.extend((force.i, force.j, force.k))
+        self._points.extend((point.x, point.y, point.z))
+        moment = ORIGIN.make_vector(point).cross(force)
+        self._accumulate((force.i, force.j, force.k), (moment.i, moment.j, moment.k))
+
+    def add_loads(self, forces: VectorArray, points: PointCloud):
+        """
+        Adds a batch of forces in one call, one point of application per force.
+
+        :param forces: The forces to add.
+        :type forces: VectorArray
+        :param points: The point each force acts at.
+        :type points: PointCloud
+        """
+        if len(forces) != len(points):
+            raise ValueError(f"Expected {len(forces)} points, got {len(points)}")
+        moments = VectorArray(points.data).cross(forces)
+        self._forces.extend(forces.data)
+        self._points.extend(points.data)
+        self._accumulate(
+            (math.fsum(forces.i), math.fsum(forces.j), math.fsum(forces.k)),
+            (math.fsum(moments.i), math.fsum(moments.j), math.fsum(moments.k))
+        )
+
+    def _accumulate(self, force, moment):
+        for axis in range(3):
+            self._force_sum[axis] += force[axis]
+            self._moment_sum[axis] += moment[axis]
+
+    def resultant(self):
+        """
+        The sum of every force in the system.
+
+        :rtype: Vector
+        """
+        return Vector(*self._force_sum)
+
+    def moment_about(self, point: Point = ORIGIN):
+        """
+        The resultant moment of the system about a point, the sum of r x F over
+        every load where r runs from `point` to the load's point of application.
+
+        :param point: The point to take moments about. Defaults to the origin.
+        :type point: Point
+        :return: The resultant moment.
+        :rtype: Vector
+        """
+        moment = Vector(*self._moment_sum)
+        return moment - ORIGIN.make_vector(point).cross(self.resultant())
+
+    def wrench(self):
+        """
+        Reduces the system to its wrench: the resultant force acting along the
+        central axis plus a couple parallel to it.
+
+        :return: The equivalent wrench.
+        :rtype: Wrench
+        :raises ValueError: If the resultant force is zero, in which case the
+            system reduces to a pure couple and has no central axis.
+        """
+        force = self.resultant()
+        if is_close_to_zero(force.norm):
+            raise ValueError("The system reduces to a pure couple and has no central axis")
+        moment = self.moment_about(ORIGIN)
+        squared_norm = force.dot(force)
+        pitch = force.dot(moment) / squared_norm
+        offset = force.cross(moment).scaled_by(1 / squared_norm)
+        return Wrench(force, force.scaled_by(pitch), ORIGIN.displaced(offset), pitch)
+
+    def central_axis(self):
+        """
+        The line along which the resultant force acts in the equivalent wrench.
+
+        :return: The point on the axis closest to the origin and the unit
+            direction of the axis.
+        :rtype: tuple of (Point, Vector)
+        :raises ValueError: If the resultant force is zero.
+        """
+        wrench = self.wrench()
+        return wrench.point, wrench.force.unit
@@ -0,0 +1,181 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from geom3d.point_cloud import PointCloud
+from geom3d.vector_array import VectorArray
+
+MAGIC = b'G3DM'
+VERSION = 1
+
+# magic, version, point count, vector count, member count, padded to 64 bytes
+_HEADER = struct.Struct('<4sIQQQ')
+HEADER_SIZE = 64
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _little_endian(values, typecode):
+    data = array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        data.byteswap()
+    return data
+
+
+def write_geometry(path, points=None, vectors=None, members=None):
+    """
+    Writes points, vectors and member connectivity to a compact binary file
+    that `GeometryFile` can memory-map.
+
+    The layout is a 64 byte header (magic ``G3DM``, format version, and the
+    number of points, vectors and members) followed by the point coordinates
+    and vector components as little-endian float64 triples and the member
+    joint indices as little-endian int32 pairs.
+
+    :param path: The file to write.
+    :type path: str or os.PathLike
+    :param points: The points to store.
+    :type points: PointCloud or None
+    :param vectors: The vectors to store.
+    :type vectors: VectorArray or None
+    :param members: The ``(start, end)`` point indices of every member.
+    :type members: iterable of tuple of (int, int) or None
+    """
+    point_data = _little_endian(points.data if points is not None else (), 'd')
+    vector_data = _little_endian(vectors.data if vectors is not None else (), 'd')
+    member_data = _little_endian((index for pair in (members or ()) for index in pair), 'i')
+    if len(member_data) % 2:
+        raise ValueError("Members must be pairs of point indices")
+    header = _HEADER.pack(MAGIC, VERSION, len(point_data) // 3, len(vector_data) // 3, len(member_data) // 2)
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        file.write(point_data)
+        file.write(vector_data)
+        file.write(member_data)
+
+
+class GeometryFile:
+    def __init__(self, path):
+        """
+        Opens a file written by `write_geometry` by memory-mapping it.
+
+        `points`, `vectors` and `members` are zero-copy views into the mapping,
+        so opening a model costs no parsing and no copying, and the batch
+        operations of `PointCloud` and `VectorArray` read the mapped pages
+        directly. The mapping is read-only and backed by the operating
+        system's page cache, so several worker processes that open the same
+        file share one copy of the model in memory.
+
+        Use as a context manager, or call `close`. The mapping is released once
+        every view handed out from it has been dropped.
+
+        :param path: The file to open.
+        :type path: str or os.PathLike
+        :raises ValueError: If the file is not a geometry file of a supported
+            version or is truncated.
+        """
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < HEADER_SIZE:
+                raise ValueError(f"{path} is too short to be a geometry file")
+            magic, version, point_count, vector_count, member_count = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a geometry file")
+            if version != VERSION:
+                raise ValueError(f"{path} has unsupported format version {version}")
+            vectors_at = HEADER_SIZE + 24 * point_count
+            members_at = vectors_at + 24 * vector_count
+            end = members_at + 8 * member_count
+            if len(self._mmap) < end:
+                raise ValueError(f"{path} is truncated")
+            self._view = memoryview(self._mmap)
+            self.point_count = point_count
+            self.vector_count = vector_count
+            self.member_count = member_count
+            self._ranges = (HEADER_SIZE, vectors_at, members_at, end)
+            self._members = self._section(members_at, end, 'i')
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _section(self, start, stop, typecode):
+        """
+        Returns a typed view of a byte range of the mapping. On big-endian
+        hosts the little-endian payload cannot be viewed in place and is
+        copied into a byte-swapped array instead.
+        """
+        section = self._view[start:stop]
+        if _LITTLE_ENDIAN:
+            return section.cast(typecode)
+        data = array(typecode)
+        data.frombytes(section)
+        data.byteswap()
+        return data
+
+    @property
+    def points(self):
+        """
+        The stored points, viewing the mapped file without a copy.
+
+        :rtype: PointCloud
+        """
+        start, stop = self._ranges[0:2]
+        return PointCloud(self._section(start, stop, 'd'))
+
+    @property
+    def vectors(self):
+        """
+        The stored vectors, viewing the mapped file without a copy.
+
+        :rtype: VectorArray
+        """
+        start, stop = self._ranges[1:3]
+        return VectorArray(self._section(start, stop, 'd'))
+
+    @property
+    def members(self):
+        """
+        The member connectivity as a flat ``start0, end0, start1, end1, ...``
+        sequence of int32 point indices, viewing the mapped file without a copy.
+
+        :rtype: memoryview or array
+        """
+        start, stop = self._ranges[2:4]
+        return self._section(start, stop, 'i')
+
+    def member(self, index):
+        """
+        The ``(start, end)`` point indices of one member.
+
+        :param index: The member index.
+        :type index: int
+        :rtype: tuple of (int, int)
+        """
+        if not 0 <= index < self.member_count:
+            raise IndexError("Member index out of range")
+        return self._members[2 * index], self._members[2 * index + 1]
+
+    def close(self):
+        """
+        Releases this object's own views and closes the mapping. Views handed
+        out by `points`, `vectors` or `members` stay readable, and if any is
+        still alive the mapping stays open until they are dropped.
+        """
+        for view in (self._members, self._view):
+            if isinstance(view, memoryview):
+                try:
+                    view.release()
+                except BufferError:
+                    pass
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,209 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+
+
+class LoadTrain:
+    __slots__ = ('magnitudes', 'offsets')
+
+    def __init__(self, magnitudes, offsets):
+        """
+        A group of concentrated loads that move together, such as the axles of
+        a vehicle.
+
+        :param magnitudes: The load of every axle, in the direction of the
+            unit load of the influence lines it is applied to.
+        :type magnitudes: sequence of float
+        :param offsets: The distance of every axle from the reference point of
+            the train, measured along the load path; an axle sits at the train
+            position plus its offset.
+        :type offsets: sequence of float
+        :raises ValueError: If there are no axles or the lengths differ.
+        """
+        if len(magnitudes) != len(offsets):
+            raise ValueError(f"Expected {len(magnitudes)} offsets, got {len(offsets)}")
+        if not magnitudes:
+            raise ValueError("A load train needs at least one load")
+        self.magnitudes = array('d', magnitudes)
+        self.offsets = array('d', offsets)
+
+
+class Envelope:
+    __slots__ = ('maxima', 'minima', 'max_positions', 'min_positions')
+
+    def __init__(self, maxima, minima, max_positions, min_positions):
+        """
+        The extreme force in every member over a moving-load sweep.
+
+        :param maxima: The largest force in every member.
+        :type maxima: array
+        :param minima: The smallest force in every member.
+        :type minima: array
+        :param max_positions: The train position giving each maximum.
+        :type max_positions: array
+        :param min_positions: The train position giving each minimum.
+        :type min_positions: array
+        """
+        self.maxima = maxima
+        self.minima = minima
+        self.max_positions = max_positions
+        self.min_positions = min_positions
+
+
+class InfluenceLines:
+    def __init__(self, truss: Truss, path, direction: Vector = None):
+        """
+        Influence lines of every member force of a truss for a load moving
+        along a path of joints, such as the deck joints of a bridge.
+
+        The truss is factorized once and solved for a unit load at every path
+        joint in a single `solve_many` call. A load between two path joints is
+        shared between them in proportion to its distance from each, as a
+        deck carried by simply supported stringers does, so the influence
+        lines are piecewise linear between the joints. After that, any load
+        train at any number of positions costs a weighted sum of a few stored
+        columns per position instead of a solve.
+
+        :param truss: The truss, with its supports.
+        :type truss: Truss
+        :param path: The joints the load travels over, in order.
+        :type path: sequence of int
+        :param direction: The direction of a unit load. Defaults to ``-z``.
+        :type direction: Vector or None
+        :raises ValueError: If the path has fewer than two joints or the truss
+            is unstable.
+        """
+        if len(path) < 2:
+            raise ValueError("A load path needs at least two joints")
+        if direction is None:
+            direction = Vector(0, 0, -1)
+        self.path = list(path)
+        joints = [truss.joint(joint) for joint in self.path]
+        self.stations = array('d', accumulate(
+            (a.distance_to(b) for a, b in zip(joints, joints[1:])), initial=0.0
+        ))
+        self.length = self.stations[-1]
+        self.member_count = truss.member_count
+        solutions = truss.factorize().solve_many({joint: direction} for joint in self.path)
+        self._columns = [array('d', solution.member_forces) for solution in solutions]
+
+    def line(self, member):
+        """
+        The influence coefficients of one member, the force in it for a unit
+        load at each path joint.
+
+        :param member: The member index.
+        :type member: int
+        :return: One coefficient per entry of `stations`.
+        :rtype: array
+        """
+        return array('d', (column[member] for column in self._columns))
+
+    def _shares(self, position):
+        """
+        The path joints that carry a unit load at `position` and their
+        shares of it. Empty when the load is off the path.
+        """
+        stations = self.stations
+        if position < 0.0 or position > self.length:
+            return ()
+        index = min(bisect_right(stations, position), len(stations) - 1)
+        start, end = stations[index - 1], stations[index]
+        fraction = (position - start) / (end - start) if end > start else 0.0
+        return (index - 1, 1.0 - fraction), (index, fraction)
+
+    def at(self, member, position):
+        """
+        The force in a member for a unit load at a distance along the path.
+
+        :param member: The member index.
+        :type member: int
+        :param position: The distance along the path from its first joint.
+        :type position: float
+        :rtype: float
+        """
+        return sum(share * self._columns[station][member] for station, share in self._shares(position))
+
+    def _weights(self, train, position):
+        """
+        The load carried by every path joint for the train at `position`, as
+        ``{station: load}``: one row of the sparse load-distribution matrix.
+        """
+        weights = {}
+        for magnitude, offset in zip(train.magnitudes, train.offsets):
+            for station, share in self._shares(position + offset):
+                if share:
+                    weights[station] = weights.get(station, 0.0) + magnitude * share
+        return weights
+
+    def _forces(self, weights):
+        forces = [0.0] * self.member_count
+        for station, weight in weights.items():
+            forces = [force + weight * c for force, c in zip(forces, self._columns[station])]
+        return forces
+
+    def positions(self, train, step):
+        """
+        Evenly spaced train positions from the first axle entering the path to
+        the last one leaving it.
+
+        :param train: The load train.
+        :type train: LoadTrain
+        :param step: The spacing between positions.
+        :type step: float
+        :rtype: array
+        """
+        if step <= 0:
+            raise ValueError("step must be positive")
+        first = -max(train.offsets)
+        last = self.length - min(train.offsets)
+        count = int((last - first) / step + 1e-9) + 1
+        return array('d', (first + step * index for index in range(count)))
+
+    def forces(self, train, positions):
+        """
+        The force in every member with the train at each position.
+
+        :param train: The load train.
+        :type train: LoadTrain
+        :param positions: The train positions along the path.
+        :type positions: iterable of float
+        :return: One row of member forces per position.
+        :rtype: list of array
+        """
+        return [array('d', self._forces(self._weights(train, position))) for position in positions]
+
+    def envelope(self, train, positions):
+        """
+        The largest and smallest force in every member as the train moves
+        over the given positions. Rows are reduced as they are computed, so
+        long sweeps need no more memory than a single row.
+
+        :param train: The load train.
+        :type train: LoadTrain
+        :param positions: The train positions along the path.
+        :type positions: iterable of float
+        :rtype: Envelope
+        :raises ValueError: If there are no positions.
+        """
+        maxima = minima = max_positions = min_positions = None
+        for position in positions:
+            forces = self._forces(self._weights(train, position))
+            if maxima is None:
+                maxima, minima = array('d', forces), array('d', forces)
+                max_positions = array('d', [position]) * len(forces)
+                min_positions = array('d', [position]) * len(forces)
+                continue
+            for member, force in enumerate(forces):
+                if force > maxima[member]:
+                    maxima[member] = force
+                    max_positions[member] = position
+                elif force < minima[member]:
+                    minima[member] = force
+                    min_positions[member] = position
+        if maxima is None:
+            raise ValueError("An envelope needs at least one position")
+        return Envelope(maxima, minima, max_positions, min_positions)
@@ -0,0 +1,268 @@
+import json
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+from geom3d import nums
+from geom3d.point_cloud import PointCloud
+from geom3d.points import FrozenPoint
+from geom3d.points import Point
+from geom3d.vector import FrozenVector
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+# The methods and properties counted by default, by class.
+OPERATIONS = {
+    Vector: (
+        '__init__', '__eq__', '__add__', '__sub__', 'scaled_by', 'dot', 'cross', 'norm', 'norm_squared',
+        'unit', 'comp', 'is_parallel', 'make_length',
+    ),
+    FrozenVector: ('__init__', '__eq__', '__hash__', 'norm', 'norm_squared', 'unit'),
+    Point: ('__init__', '__eq__', '__sub__', 'distance_to', 'displaced', 'make_vector'),
+    FrozenPoint: ('__init__', '__eq__', '__hash__'),
+    VectorArray: (
+        '__add__', '__sub__', 'scaled_by', 'dot', 'cross', 'norm', 'unit', 'comp', 'is_parallel',
+        'make_length', 'close_enough',
+    ),
+    PointCloud: ('close_enough', 'distance_to', 'pairwise_distances', 'displaced', 'make_vector'),
+}
+
+# The tolerance checks counted by default.
+FUNCTIONS = (
+    nums.are_close_enough, nums.is_close_to_zero, nums.is_close_to_one,
+    nums.close_enough_mask, nums.close_to_zero_mask, nums.close_to_one_mask, nums.all_close,
+)
+
+_active = None
+_patches = []
+
+
+class Recorder:
+    def __init__(self):
+        """
+        Collects call counts and timings while instrumentation is enabled.
+
+        Every call is recorded under its call stack of instrumented
+        operations, so the time spent in `Vector.unit` is split between the
+        `Vector.norm` it calls and its own work. Time is measured with
+        `time.perf_counter` and includes the small overhead of the wrappers.
+        Recording is not thread safe; enable it around single-threaded code.
+        """
+        self._stats = {}
+        self._stack = ()
+        self._child_time = [0.0]
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        self._stats.clear()
+
+    def _record(self, function, label, args, kwargs):
+        parent = self._stack
+        stack = parent + (label,)
+        self._stack = stack
+        self._child_time.append(0.0)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            self._stack = parent
+            child_time = self._child_time.pop()
+            self._child_time[-1] += elapsed
+            entry = self._stats.get(stack)
+            if entry is None:
+                self._stats[stack] = [1, elapsed, elapsed - child_time]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - child_time
+
+    def summary(self):
+        """
+        Totals per operation, slowest first.
+
+        `total_seconds` includes time spent in other instrumented operations
+        called from this one (counted once for recursive calls);
+        `self_seconds` excludes it.
+
+        :return: Per operation, its ``calls``, ``total_seconds`` and ``self_seconds``.
+        :rtype: dict
+        """
+        totals = {}
+        for stack, (calls, total, own) in self._stats.items():
+            label = stack[-1]
+            entry = totals.setdefault(label, {'calls': 0, 'total_seconds': 0.0, 'self_seconds': 0.0})
+            entry['calls'] += calls
+            entry['self_seconds'] += own
+            if label not in stack[:-1]:
+                entry['total_seconds'] += total
+        return dict(sorted(totals.items(), key=lambda item: item[1]['total_seconds'], reverse=True))
+
+    def to_json(self, file=None):
+        """
+        Exports the per-operation summary and the per-stack breakdown as JSON.
+
+        :param file: A path or writable text file to write to, or None to only
+            return the text.
+        :type file: str or os.PathLike or file object or None
+        :return: The JSON document.
+        :rtype: str
+        """
+        document = {
+            'operations': self.summary(),
+            'stacks': [
+                {'stack': list(stack), 'calls': calls, 'total_seconds': total, 'self_seconds': own}
+                for stack, (calls, total, own) in self._stats.items()
+            ],
+        }
+        return _write(json.dumps(document, indent=2), file)
+
+    def to_folded(self, file=None):
+        """
+        Exports the self time of every call stack in the folded format read by
+        flame graph tools such as ``flamegraph.pl`` and speedscope: one line
+        per stack, ``outer;inner <microseconds>``.
+
+        :param file: A path or writable text file to write to, or None to only
+            return the text.
+        :type file: str or os.PathLike or file object or None
+        :return: The folded stacks.
+        :rtype: str
+        """
+        lines = [
+            f"{';'.join(stack)} {round(own * 1e6)}"
+            for stack, (_, _, own) in sorted(self._stats.items())
+        ]
+        return _write(''.join(line + '\n' for line in lines), file)
+
+
+def _write(text, file):
+    if file is None:
+        return text
+    if hasattr(file, 'write'):
+        file.write(text)
+    else:
+        with open(file, 'w') as handle:
+            handle.write(text)
+    return text
+
+
+def _wrap(function, label):
+    @wraps(function)
+    def instrumented(*args, **kwargs):
+        recorder = _active
+        if recorder is None:
+            return function(*args, **kwargs)
+        return recorder._record(function, label, args, kwargs)
+
+    return instrumented
+
+
+def _patch(owner, name, label):
+    original = owner.__dict__[name]
+    if isinstance(original, property):
+        replacement = property(_wrap(original.fget, label), original.fset, original.fdel, original.__doc__)
+    elif isinstance(original, (classmethod, staticmethod)):
+        replacement = type(original)(_wrap(original.__func__, label))
+    else:
+        replacement = _wrap(original, label)
+    setattr(owner, name, replacement)
+    _patches.append((owner, name, original))
+
+
+def _patch_function(function, label):
+    """
+    Replaces a module-level function everywhere it has been imported by name
+    within geom3d, since ``from geom3d.nums import ...`` copies the reference.
+    """
+    replacement = _wrap(function, label)
+    for module_name, module in list(sys.modules.items()):
+        if module_name.split('.')[0] != 'geom3d' or module is None:
+            continue
+        for name, value in list(vars(module).items()):
+            if value is function:
+                setattr(module, name, replacement)
+                _patches.append((module, name, function))
+
+
+def enable(recorder=None, operations=None, functions=None):
+    """
+    Starts counting calls and timing geom3d operations.
+
+    Instrumentation replaces the operations with timing wrappers only while
+    it is enabled, and `disable` puts the originals back, so it costs nothing
+    at all when it is off.
+
+    :param recorder: Where to record. Defaults to a new `Recorder`.
+    :type recorder: Recorder or None
+    :param operations: The methods and properties to instrument, as a dict of
+        class to attribute names. Defaults to `OPERATIONS`.
+    :type operations: dict or None
+    :param functions: Module-level geom3d functions to instrument. Defaults
+        to `FUNCTIONS`.
+    :type functions: iterable of callable or None
+    :return: The recorder in use.
+    :rtype: Recorder
+    :raises RuntimeError: If instrumentation is already enabled.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Instrumentation is already enabled")
+    recorder = recorder if recorder is not None else Recorder()
+    try:
+        for owner, names in (OPERATIONS if operations is None else operations).items():
+            for name in names:
+                _patch(owner, name, f'{owner.__name__}.{name}')
+        for function in (FUNCTIONS if functions is None else functions):
+            _patch_function(function, f'{function.__module__.split(".")[-1]}.{function.__name__}')
+    except BaseException:
+        _restore()
+        raise
+    _active = recorder
+    return recorder
+
+
+def disable():
+    """
+    Stops instrumentation and restores the original operations.
+
+    :return: The recorder that was in use, or None if instrumentation was off.
+    :rtype: Recorder or None
+    """
+    global _active
+    recorder = _active
+    _active = None
+    _restore()
+    return recorder
+
+
+def _restore():
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+
+def is_enabled():
+    """
+    :return: Whether instrumentation is currently enabled.
+    :rtype: bool
+    """
+    return _active is not None
+
+
+@contextmanager
+def recording(recorder=None, operations=None, functions=None):
+    """
+    Enables instrumentation for the duration of a ``with`` block.
+
+    :return: The recorder, which keeps its results after the block ends.
+    :rtype: Recorder
+    """
+    recorder = enable(recorder, operations, functions)
+    try:
+        yield recorder
+    finally:
+        disable()
@@ -0,0 +1,477 @@
+import math
+from array import array
+from functools import lru_cache
+from functools import wraps
+
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+from geom3d.vector_array import _interleave
+
+# The tolerance `Vector.unit` and `Vector.make_length` use to detect zero vectors.
+_ZERO_TOLERANCE = 1e-10
+
+
+class _Expression:
+    __slots__ = ('op', 'args', 'value')
+
+    def __init__(self, op, args=(), value=None):
+        self.op = op
+        self.args = args
+        self.value = value
+
+    def evaluate(self):
+        """
+        Runs the expression graph as one fused kernel and returns the result.
+
+        :return: A `Vector` or float for expressions over single vectors, a
+            `VectorArray` or float64 array for expressions over batches.
+        """
+        return evaluate(self)[0]
+
+    @property
+    def source(self):
+        """
+        The Python source of the fused kernel that evaluates this expression,
+        for inspection.
+
+        :rtype: str
+        """
+        signature, _ = _plan((self,))
+        return _kernel(signature).source
+
+
+class LazyVector(_Expression):
+    __slots__ = ()
+
+    def __add__(self, other):
+        return LazyVector('vadd', (self, _vector_node(other)))
+
+    def __radd__(self, other):
+        return LazyVector('vadd', (_vector_node(other), self))
+
+    def __sub__(self, other):
+        return LazyVector('vsub', (self, _vector_node(other)))
+
+    def __rsub__(self, other):
+        return LazyVector('vsub', (_vector_node(other), self))
+
+    def scaled_by(self, factor):
+        """
+        Records scaling by a number, a `LazyScalar`, or one factor per row.
+
+        :rtype: LazyVector
+        """
+        return LazyVector('scale', (self, _scalar_node(factor)))
+
+    def __mul__(self, other):
+        return self.scaled_by(other)
+
+    def dot(self, other):
+        """
+        Records a dot product.
+
+        :rtype: LazyScalar
+        """
+        return LazyScalar('dot', (self, _vector_node(other)))
+
+    def cross(self, other):
+        """
+        Records a cross product.
+
+        :rtype: LazyVector
+        """
+        return LazyVector('cross', (self, _vector_node(other)))
+
+    @property
+    def norm(self):
+        """
+        Records the Euclidean norm.
+
+        :rtype: LazyScalar
+        """
+        return LazyScalar('norm', (self,))
+
+    @property
+    def unit(self):
+        """
+        Records the unit vector. Zero vectors stay unchanged, as with `Vector.unit`.
+
+        :rtype: LazyVector
+        """
+        return LazyVector('unit', (self, self.norm))
+
+    def comp(self, other):
+        """
+        Records the scalar projection onto `other`.
+
+        :rtype: LazyScalar
+        """
+        other = _vector_node(other)
+        return LazyScalar('div', (self.dot(other), other.norm))
+
+    def make_length(self, length):
+        """
+        Records rescaling to `length`. Zero vectors stay zero, as with
+        `Vector.make_length`.
+
+        :rtype: LazyVector
+        """
+        return LazyVector('make_length', (self, self.norm, _scalar_node(length)))
+
+
+class LazyScalar(_Expression):
+    __slots__ = ()
+
+    def __add__(self, other):
+        return LazyScalar('add', (self, _scalar_node(other)))
+
+    def __radd__(self, other):
+        return LazyScalar('add', (_scalar_node(other), self))
+
+    def __sub__(self, other):
+        return LazyScalar('sub', (self, _scalar_node(other)))
+
+    def __rsub__(self, other):
+        return LazyScalar('sub', (_scalar_node(other), self))
+
+    def __mul__(self, other):
+        if isinstance(other, (LazyVector, Vector, VectorArray)):
+            return _vector_node(other).scaled_by(self)
+        return LazyScalar('mul', (self, _scalar_node(other)))
+
+    def __rmul__(self, other):
+        if isinstance(other, (Vector, VectorArray)):
+            return _vector_node(other).scaled_by(self)
+        return LazyScalar('mul', (_scalar_node(other), self))
+
+    def __truediv__(self, other):
+        return LazyScalar('div', (self, _scalar_node(other)))
+
+    def __rtruediv__(self, other):
+        return LazyScalar('div', (_scalar_node(other), self))
+
+
+def lazy(value):
+    """
+    Wraps a value so that operations on it build an expression graph instead
+    of computing intermediate results.
+
+    The graph runs only when `evaluate` is called. It is then compiled into a
+    single fused loop with no intermediate vectors or arrays, subexpressions
+    that appear more than once (including a norm shared by `unit` and an
+    explicit `norm`) are computed once, and terms that do not depend on the
+    batch rows are hoisted out of the loop. Compiled kernels are cached by the
+    shape of the graph, so re-evaluating the same expression with new values
+    does not recompile. Results are identical to eager evaluation.
+
+    Single vectors broadcast against batches, as in `VectorArray`.
+
+    :param value: The value to wrap.
+    :type value: Vector or VectorArray or float or sequence of float
+    :return: A lazy vector, or a lazy scalar for numbers and per-row sequences.
+    :rtype: LazyVector or LazyScalar
+    """
+    if isinstance(value, (LazyVector, Vector, VectorArray)):
+        return _vector_node(value)
+    return _scalar_node(value)
+
+
+def _vector_node(value):
+    if isinstance(value, LazyVector):
+        return value
+    if isinstance(value, (Vector, VectorArray)):
+        return LazyVector('leaf', value=value)
+    raise TypeError(f"Expected a Vector, VectorArray or LazyVector, got {type(value).__name__}")
+
+
+def _scalar_node(value):
+    if isinstance(value, LazyScalar):
+        return value
+    if isinstance(value, (LazyVector, Vector, VectorArray)):
+        raise TypeError(f"Expected a number or a sequence of numbers, got {type(value).__name__}")
+    return LazyScalar('leaf', value=value)
+
+
+class _Argument:
+    __slots__ = ('position', 'kind')
+
+    def __init__(self, position, kind):
+        """
+        Stands in for an argument of a `fuse`-decorated function while it is
+        traced.
+        """
+        self.position = position
+        self.kind = kind
+
+
+def _kind_of(value):
+    if isinstance(value, Vector):
+        return 'vector'
+    if isinstance(value, VectorArray):
+        return 'vectors'
+    return 'scalar' if isinstance(value, (int, float)) else 'scalars'
+
+
+def _leaf_kind(node):
+    value = node.value
+    if isinstance(value, _Argument):
+        return value.kind
+    return _kind_of(value)
+
+
+def _plan(roots):
+    """
+    Flattens the graphs under `roots` into a list of unique nodes in
+    dependency order. Nodes with the same operation on the same operands are
+    merged, and leaves wrapping the same object are merged.
+
+    :return: The graph signature, which is what the kernel cache is keyed on,
+        and the leaf values in argument order.
+    """
+    canonical = {}
+    by_key = {}
+    signature = []
+    leaves = []
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in canonical:
+            continue
+        if node.op != 'leaf' and not expanded:
+            stack.append((node, True))
+            stack.extend((arg, False) for arg in reversed(node.args) if id(arg) not in canonical)
+            continue
+        if node.op == 'leaf':
+            value = node.value
+            kind = _leaf_kind(node)
+            # Equal numbers share a leaf; repr keeps 0.0 and -0.0 apart.
+            key = ('leaf', kind, (type(value), repr(value)) if kind == 'scalar' else id(value))
+            entry = ('leaf', kind)
+        else:
+            args = tuple(canonical[id(arg)] for arg in node.args)
+            key = (node.op, args)
+            entry = (node.op, args)
+        index = by_key.get(key)
+        if index is None:
+            index = len(signature)
+            by_key[key] = index
+            signature.append(entry)
+            if node.op == 'leaf':
+                leaves.append(node.value)
+        canonical[id(node)] = index
+    root_indices = tuple(canonical[id(root)] for root in roots)
+    root_kinds = tuple(isinstance(root, LazyVector) for root in roots)
+    return (tuple(signature), root_indices, root_kinds), leaves
+
+
+def _statements(index, op, args):
+    """
+    The lines of Python computing node `index`. Vector nodes are held in three
+    locals ``n<index>_0``, ``n<index>_1`` and ``n<index>_2``, scalar nodes in
+    ``n<index>``. The arithmetic mirrors `Vector` and `VectorArray` exactly so
+    fused results are identical to eager ones.
+    """
+    name = f'n{index}'
+    a = f'n{args[0]}'
+    b = f'n{args[1]}' if len(args) > 1 else None
+    if op == 'vadd':
+        return [f'{name}_{c} = {a}_{c} + {b}_{c}' for c in range(3)]
+    if op == 'vsub':
+        return [f'{name}_{c} = {a}_{c} - {b}_{c}' for c in range(3)]
+    if op == 'scale':
+        return [f'{name}_{c} = {a}_{c} * {b}' for c in range(3)]
+    if op == 'cross':
+        return [
+            f'{name}_0 = {a}_1 * {b}_2 - {a}_2 * {b}_1',
+            f'{name}_1 = {a}_2 * {b}_0 - {a}_0 * {b}_2',
+            f'{name}_2 = {a}_0 * {b}_1 - {a}_1 * {b}_0',
+        ]
+    if op == 'dot':
+        return [f'{name} = {a}_0 * {b}_0 + {a}_1 * {b}_1 + {a}_2 * {b}_2']
+    if op == 'norm':
+        return [f'{name} = sqrt({a}_0 * {a}_0 + {a}_1 * {a}_1 + {a}_2 * {a}_2)']
+    if op == 'unit':
+        return [
+            f'if fabs({b}) < {_ZERO_TOLERANCE!r}:',
+            *(f'    {name}_{c} = {a}_{c}' for c in range(3)),
+            'else:',
+            f'    {name}_inverse = 1 / {b}',
+            *(f'    {name}_{c} = {a}_{c} * {name}_inverse' for c in range(3)),
+        ]
+    if op == 'make_length':
+        length = f'n{args[2]}'
+        return [
+            f'if fabs({a}_0) < {_ZERO_TOLERANCE!r} and fabs({a}_1) < {_ZERO_TOLERANCE!r} '
+            f'and fabs({a}_2) < {_ZERO_TOLERANCE!r}:',
+            *(f'    {name}_{c} = 0.0' for c in range(3)),
+            'else:',
+            f'    {name}_inverse = 1 / {b}',
+            *(f'    {name}_{c} = {a}_{c} * {name}_inverse * {length}' for c in range(3)),
+        ]
+    symbol = {'add': '+', 'sub': '-', 'mul': '*', 'div': '/'}[op]
+    return [f'{name} = {a} {symbol} {b}']
+
+
+@lru_cache(maxsize=256)
+def _kernel(signature):
+    """
+    Generates and compiles the fused kernel for a graph signature.
+
+    Leaves become parameters. Nodes that depend only on single vectors and
+    numbers are computed once before the loop; the rest are computed per row
+    inside one loop over the batch leaves. Without batch leaves there is no
+    loop at all.
+    """
+    nodes, roots, root_kinds = signature
+    params, batch_params, before, body, loop_names, loop_sources = [], [], [], [], [], []
+    varies = []
+    for index, (op, args) in enumerate(nodes):
+        name = f'n{index}'
+        if op == 'leaf':
+            param = f'leaf{len(params)}'
+            params.append(param)
+            if args == 'vector':
+                before.append(f'{name}_0, {name}_1, {name}_2 = {param}.i, {param}.j, {param}.k')
+            elif args == 'vectors':
+                loop_names.extend(f'{name}_{c}' for c in range(3))
+                loop_sources.extend(f'{param}.{axis}' for axis in 'ijk')
+            elif args == 'scalar':
+                before.append(f'{name} = {param}')
+            else:
+                loop_names.append(name)
+                loop_sources.append(param)
+            varies.append(args in ('vectors', 'scalars'))
+            if varies[-1]:
+                batch_params.append(param)
+        else:
+            varies.append(any(varies[arg] for arg in args))
+            (body if varies[-1] else before).extend(_statements(index, op, args))
+
+    outputs = [
+        [f'n{root}_{c}' for c in range(3)] if is_vector else [f'n{root}']
+        for root, is_vector in zip(roots, root_kinds)
+    ]
+    lines = [f'def kernel({", ".join(params)}):']
+    if loop_names:
+        lines.append(f'    check_rows({", ".join(batch_params)})')
+    lines.extend(f'    {line}' for line in before)
+    if loop_names:
+        results = []
+        count = 0
+        for names, is_vector in zip(outputs, root_kinds):
+            columns = []
+            for _ in names:
+                lines.append(f'    out{count} = []')
+                lines.append(f'    append{count} = out{count}.append')
+                columns.append(f'out{count}')
+                count += 1
+            if is_vector:
+                results.append(f'VectorArray(interleave({", ".join(columns)}))')
+            else:
+                results.append(f"array('d', {columns[0]})")
+        lines.append(f'    for {", ".join(loop_names)} in zip({", ".join(loop_sources)}):')
+        lines.extend(f'        {line}' for line in body)
+        count = 0
+        for names in outputs:
+            for name in names:
+                lines.append(f'        append{count}({name})')
+                count += 1
+    else:
+        results = [
+            f'Vector({", ".join(names)})' if is_vector else names[0]
+            for names, is_vector in zip(outputs, root_kinds)
+        ]
+    lines.append(f'    return {", ".join(results)},')
+    source = '\n'.join(lines) + '\n'
+    namespace = {
+        'sqrt': math.sqrt, 'fabs': math.fabs, 'array': array, 'check_rows': _check_rows,
+        'Vector': Vector, 'VectorArray': VectorArray, 'interleave': _interleave,
+    }
+    exec(compile(source, '<geom3d.lazy kernel>', 'exec'), namespace)
+    kernel = namespace['kernel']
+    kernel.source = source
+    return kernel
+
+
+def _check_rows(*batches):
+    rows = len(batches[0])
+    for batch in batches[1:]:
+        if len(batch) != rows:
+            raise ValueError(f"Expected {rows} rows, got {len(batch)}")
+
+
+def evaluate(*expressions):
+    """
+    Evaluates several lazy expressions in one fused pass. Subexpressions they
+    have in common are computed once.
+
+    :param expressions: The expressions to evaluate.
+    :type expressions: LazyVector or LazyScalar
+    :return: One result per expression: a `Vector` or float when every leaf
+        is a single value, otherwise a `VectorArray` or float64 array.
+    :rtype: tuple
+    :raises ValueError: If the batch leaves have different lengths.
+    """
+    signature, leaves = _plan(expressions)
+    return _kernel(signature)(*leaves)
+
+
+def fuse(function):
+    """
+    Decorator that compiles a function of vectors and numbers into a fused
+    kernel, for hot loops where even building the expression graph on every
+    call would cost more than it saves.
+
+    On the first call with a given combination of argument types (single
+    vector, batch, number or per-row sequence) the function is traced once
+    with lazy arguments. Later calls bind the new arguments straight to the
+    cached kernel. The function must build its result only from its
+    arguments, constants and the operations of `LazyVector` and `LazyScalar`,
+    and return one expression or a tuple of expressions.
+
+    :param function: The function to compile.
+    :type function: callable
+    :return: A function with the same arguments that returns eager results.
+    :rtype: callable
+    """
+    traces = {}
+
+    @wraps(function)
+    def fused(*args):
+        key = tuple(map(type, args))
+        call = traces.get(key)
+        if call is None:
+            call = traces[key] = _trace(function, tuple(map(_kind_of, args)))
+        return call(*args)
+
+    return fused
+
+
+def _trace(function, kinds):
+    """
+    Traces `function` with lazy placeholder arguments and returns a function
+    that passes its arguments, plus any constants captured while tracing,
+    straight to the compiled kernel.
+    """
+    placeholders = [
+        (LazyVector if kind in ('vector', 'vectors') else LazyScalar)('leaf', value=_Argument(position, kind))
+        for position, kind in enumerate(kinds)
+    ]
+    result = function(*placeholders)
+    single = not isinstance(result, tuple)
+    expressions = (result,) if single else result
+    if not all(isinstance(expression, _Expression) for expression in expressions):
+        raise TypeError("A fused function must return lazy expressions")
+    signature, bindings = _plan(expressions)
+    namespace = {'kernel': _kernel(signature)}
+    leaves = []
+    for binding in bindings:
+        if isinstance(binding, _Argument):
+            leaves.append(f'arg{binding.position}')
+        else:
+            leaves.append(f'constant{len(namespace)}')
+            namespace[leaves[-1]] = binding
+    params = ', '.join(f'arg{position}' for position in range(len(kinds)))
+    source = f'def call({params}):\n    return kernel({", ".join(leaves)}){"[0]" if single else ""}\n'
+    exec(compile(source, '<geom3d.lazy call>', 'exec'), namespace)
+    return namespace['call']
@@ -0,0 +1,315 @@
+import math
+from array import array
+
+from geom3d.nums import is_close_to_zero
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector_array import VectorArray
+from geom3d.vector_array import _scalars
+
+# Each part is stored as its contribution to the running sums: mass, first
+# moment of mass about the origin and second moments about the origin
+# (xx, yy, zz, xy, xz, yz).
+_FIELDS = 10
+
+
+def _contribution(mass, gx, gy, gz, cxx, cyy, czz, cxy, cxz, cyz):
+    """
+    Moves the second moments of a part from its own centroid to the origin
+    with the parallel-axis theorem.
+    """
+    return (
+        mass, mass * gx, mass * gy, mass * gz,
+        cxx + mass * gx * gx, cyy + mass * gy * gy, czz + mass * gz * gz,
+        cxy + mass * gx * gy, cxz + mass * gx * gz, cyz + mass * gy * gz,
+    )
+
+
+def _check_length(values, count, what):
+    if len(values) != count:
+        raise ValueError(f"Expected {count} {what}, got {len(values)}")
+
+
+class MassProperties:
+    def __init__(self):
+        """
+        Mass, centroid and inertia tensor of an assembly of primitive parts.
+
+        Parts are added in batches and every part contributes its mass, first
+        moment and second moments about the origin to running sums, so queries
+        are constant time however many parts there are. Removing a part
+        subtracts its stored contribution, so editing an assembly costs only
+        the work for the parts that change.
+
+        Every batch method returns the ids of the new parts, for `remove`.
+        """
+        self._parts = array('d')
+        self._removed = bytearray()
+        self._sums = [0.0] * _FIELDS
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _add(self, contributions):
+        first = len(self._removed)
+        count = len(contributions) // _FIELDS
+        self._parts.extend(contributions)
+        self._removed.extend(bytes(count))
+        self._count += count
+        for field in range(_FIELDS):
+            self._sums[field] += math.fsum(contributions[field::_FIELDS])
+        return range(first, first + count)
+
+    def add_point_masses(self, masses, points: PointCloud):
+        """
+        Adds concentrated masses.
+
+        :param masses: One mass per point, or a single mass for every point.
+        :type masses: float or sequence of float
+        :param points: The position of every mass.
+        :type points: PointCloud
+        :return: The ids of the new parts.
+        :rtype: range
+        """
+        contributions = array('d')
+        for mass, x, y, z in zip(_scalars(masses, len(points)), points.x, points.y, points.z):
+            contributions.extend(_contribution(mass, x, y, z, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+        return self._add(contributions)
+
+    def add_rods(self, masses, starts: PointCloud, ends: PointCloud):
+        """
+        Adds slender uniform rods, such as truss members.
+
+        :param masses: One mass per rod, or a single mass for every rod.
+        :type masses: float or sequence of float
+        :param starts: The start of every rod.
+        :type starts: PointCloud
+        :param ends: The end of every rod.
+        :type ends: PointCloud
+        :return: The ids of the new parts.
+        :rtype: range
+        """
+        _check_length(ends, len(starts), "ends")
+        contributions = array('d')
+        for mass, sx, sy, sz, ex, ey, ez in zip(
+                _scalars(masses, len(starts)), starts.x, starts.y, starts.z, ends.x, ends.y, ends.z):
+            dx, dy, dz = ex - sx, ey - sy, ez - sz
+            f = mass / 12
+            contributions.extend(_contribution(
+                mass, (sx + ex) / 2, (sy + ey) / 2, (sz + ez) / 2,
+                f * dx * dx, f * dy * dy, f * dz * dz, f * dx * dy, f * dx * dz, f * dy * dz
+            ))
+        return self._add(contributions)
+
+    def add_plates(self, masses, a: PointCloud, b: PointCloud, c: PointCloud):
+        """
+        Adds thin uniform triangular plates, such as panels or the faces of a
+        shell. Quadrilateral plates are added as two triangles with their mass
+        split by area.
+
+        :param masses: One mass per plate, or a single mass for every plate.
+        :type masses: float or sequence of float
+        :param a: The first corner of every plate.
+        :type a: PointCloud
+        :param b: The second corner of every plate.
+        :type b: PointCloud
+        :param c: The third corner of every plate.
+        :type c: PointCloud
+        :return: The ids of the new parts.
+        :rtype: range
+        """
+        _check_length(b, len(a), "second corners")
+        _check_length(c, len(a), "third corners")
+        contributions = array('d')
+        for mass, ax, ay, az, bx, by, bz, cx, cy, cz in zip(
+                _scalars(masses, len(a)), a.x, a.y, a.z, b.x, b.y, b.z, c.x, c.y, c.z):
+            gx, gy, gz = (ax + bx + cx) / 3, (ay + by + cy) / 3, (az + bz + cz) / 3
+            # About its centroid a triangle has second moments m / 12 times
+            # the sum of e e^T over its corners e, taken from the centroid.
+            corners = ((ax - gx, ay - gy, az - gz), (bx - gx, by - gy, bz - gz), (cx - gx, cy - gy, cz - gz))
+            f = mass / 12
+            contributions.extend(_contribution(
+                mass, gx, gy, gz,
+                f * sum(x * x for x, _, _ in corners),
+                f * sum(y * y for _, y, _ in corners),
+                f * sum(z * z for _, _, z in corners),
+                f * sum(x * y for x, y, _ in corners),
+                f * sum(x * z for x, _, z in corners),
+                f * sum(y * z for _, y, z in corners),
+            ))
+        return self._add(contributions)
+
+    def add_boxes(self, masses, centers: PointCloud, sizes: VectorArray, rotations=None):
+        """
+        Adds solid uniform boxes.
+
+        :param masses: One mass per box, or a single mass for every box.
+        :type masses: float or sequence of float
+        :param centers: The centre of every box.
+        :type centers: PointCloud
+        :param sizes: The edge lengths of every box along its own axes.
+        :type sizes: VectorArray
+        :param rotations: Optional orientation of every box, rotating its own
+            axes onto the global axes. Defaults to boxes aligned with the
+            global axes.
+        :type rotations: sequence of Rotation or None
+        :return: The ids of the new parts.
+        :rtype: range
+        """
+        _check_length(sizes, len(centers), "sizes")
+        if rotations is not None:
+            _check_length(rotations, len(centers), "rotations")
+        contributions = array('d')
+        for index, (mass, x, y, z, a, b, c) in enumerate(zip(
+                _scalars(masses, len(centers)), centers.x, centers.y, centers.z, sizes.i, sizes.j, sizes.k)):
+            f = mass / 12
+            local = (f * a * a, f * b * b, f * c * c)
+            if rotations is None:
+                second = (local[0], local[1], local[2], 0.0, 0.0, 0.0)
+            else:
+                rows = rotations[index].matrix
+                # R diag(local) R^T
+                (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = rows
+                second = (
+                    r00 * r00 * local[0] + r01 * r01 * local[1] + r02 * r02 * local[2],
+                    r10 * r10 * local[0] + r11 * r11 * local[1] + r12 * r12 * local[2],
+                    r20 * r20 * local[0] + r21 * r21 * local[1] + r22 * r22 * local[2],
+                    r00 * r10 * local[0] + r01 * r11 * local[1] + r02 * r12 * local[2],
+                    r00 * r20 * local[0] + r01 * r21 * local[1] + r02 * r22 * local[2],
+                    r10 * r20 * local[0] + r11 * r21 * local[1] + r12 * r22 * local[2],
+                )
+            contributions.extend(_contribution(mass, x, y, z, *second))
+        return self._add(contributions)
+
+    def add_mesh(self, vertices: PointCloud, triangles, density):
+        """
+        Adds a solid of uniform density bounded by a closed triangle mesh, as
+        a single part.
+
+        The solid is split into tetrahedra from the first vertex to every
+        face, so the mesh may be non-convex but must be closed, with faces
+        ordered counter-clockwise seen from outside.
+
+        :param vertices: The vertices of the mesh.
+        :type vertices: PointCloud
+        :param triangles: The three vertex indices of every face.
+        :type triangles: iterable of tuple of (int, int, int)
+        :param density: The mass per unit volume.
+        :type density: float
+        :return: The id of the new part.
+        :rtype: int
+        :raises ValueError: If the mesh encloses no volume or is inside out.
+        """
+        xs, ys, zs = vertices.x, vertices.y, vertices.z
+        ox, oy, oz = xs[0], ys[0], zs[0]
+        volumes = []
+        first = ([], [], [])
+        second = ([], [], [], [], [], [])
+        for a, b, c in triangles:
+            p = ((xs[a] - ox, ys[a] - oy, zs[a] - oz),
+                 (xs[b] - ox, ys[b] - oy, zs[b] - oz),
+                 (xs[c] - ox, ys[c] - oy, zs[c] - oz))
+            (ax, ay, az), (bx, by, bz), (cx, cy, cz) = p
+            volume = (ax * (by * cz - bz * cy) + ay * (bz * cx - bx * cz) + az * (bx * cy - by * cx)) / 6
+            sx, sy, sz = ax + bx + cx, ay + by + cy, az + bz + cz
+            volumes.append(volume)
+            first[0].append(volume * sx / 4)
+            first[1].append(volume * sy / 4)
+            first[2].append(volume * sz / 4)
+            # A tetrahedron with one corner at the reference point has second
+            # moments V / 20 (sum of p p^T over its corners + s s^T).
+            f = volume / 20
+            second[0].append(f * (ax * ax + bx * bx + cx * cx + sx * sx))
+            second[1].append(f * (ay * ay + by * by + cy * cy + sy * sy))
+            second[2].append(f * (az * az + bz * bz + cz * cz + sz * sz))
+            second[3].append(f * (ax * ay + bx * by + cx * cy + sx * sy))
+            second[4].append(f * (ax * az + bx * bz + cx * cz + sx * sz))
+            second[5].append(f * (ay * az + by * bz + cy * cz + sy * sz))
+        volume = math.fsum(volumes)
+        if volume <= 0 or is_close_to_zero(volume):
+            raise ValueError("The mesh must be closed with outward facing triangles")
+        mass = density * volume
+        gx, gy, gz = (math.fsum(values) / volume for values in first)
+        cxx, cyy, czz, cxy, cxz, cyz = (density * math.fsum(values) for values in second)
+        # Move the second moments from the reference vertex to the centroid.
+        contribution = _contribution(
+            mass, ox + gx, oy + gy, oz + gz,
+            cxx - mass * gx * gx, cyy - mass * gy * gy, czz - mass * gz * gz,
+            cxy - mass * gx * gy, cxz - mass * gx * gz, cyz - mass * gy * gz,
+        )
+        return self._add(array('d', contribution))[0]
+
+    def remove(self, parts):
+        """
+        Removes parts by id.
+
+        :param parts: A part id or an iterable of part ids.
+        :type parts: int or iterable of int
+        :raises KeyError: If a part does not exist or was already removed.
+        """
+        parts = [parts] if isinstance(parts, int) else list(parts)
+        for part in parts:
+            if not 0 <= part < len(self._removed) or self._removed[part]:
+                raise KeyError(part)
+        if len(set(parts)) != len(parts):
+            raise KeyError("Every part can only be removed once")
+        for part in parts:
+            self._removed[part] = 1
+        self._count -= len(parts)
+        if self._count == 0:
+            # Start again from exact zeros rather than leftover rounding.
+            self._sums = [0.0] * _FIELDS
+            return
+        for field in range(_FIELDS):
+            self._sums[field] -= math.fsum(self._parts[part * _FIELDS + field] for part in parts)
+
+    @property
+    def mass(self):
+        """
+        The total mass.
+
+        :rtype: float
+        """
+        return self._sums[0]
+
+    @property
+    def centroid(self):
+        """
+        The centre of mass.
+
+        :rtype: Point
+        :raises ValueError: If the assembly has no mass.
+        """
+        mass = self._sums[0]
+        if is_close_to_zero(mass):
+            raise ValueError("The assembly has no mass")
+        return Point(self._sums[1] / mass, self._sums[2] / mass, self._sums[3] / mass)
+
+    def inertia_tensor(self, point: Point = None):
+        """
+        The inertia tensor about a point, by the parallel-axis theorem.
+
+        :param point: The point to take the tensor about. Defaults to the
+            centroid.
+        :type point: Point or None
+        :return: The symmetric 3x3 tensor, row by row, with the moments of
+            inertia on the diagonal and the negated products of inertia off it.
+        :rtype: tuple of tuple of float
+        """
+        if point is None:
+            point = self.centroid
+        mass, mx, my, mz, sxx, syy, szz, sxy, sxz, syz = self._sums
+        px, py, pz = point.x, point.y, point.z
+        # Second moments about the point: S - m p^T - p m^T + M p p^T.
+        sxx += -2 * px * mx + mass * px * px
+        syy += -2 * py * my + mass * py * py
+        szz += -2 * pz * mz + mass * pz * pz
+        sxy += -px * my - py * mx + mass * px * py
+        sxz += -px * mz - pz * mx + mass * px * pz
+        syz += -py * mz - pz * my + mass * py * pz
+        return (
+            (syy + szz, -sxy, -sxz),
+            (-sxy, sxx + szz, -syz),
+            (-sxz, -syz, sxx + syy),
+        )
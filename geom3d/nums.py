@@ -1,6 +1,7 @@
 import math
 
-def are_close_enough(a, b, tolerance=1e-10):
+
+def are_close_enough(a, b, tolerance=1e-10, rel_tolerance=0.0):
     """
     Determines if two floating-point numbers are close enough to each other
     based on a specified tolerance.
@@ -16,10 +17,16 @@ def are_close_enough(a, b, tolerance=1e-10):
     :param tolerance: The acceptable difference between a and b for them to be
         considered close enough. Defaults to 1e-10.
     :type tolerance: float
+    :param rel_tolerance: An optional tolerance relative to the larger
+        magnitude of a and b. When given, the numbers are close if the
+        difference is below either tolerance. Defaults to 0.0 (absolute only).
+    :type rel_tolerance: float
     :return: A boolean indicating whether the absolute difference of the
         numbers is less than the specified tolerance.
     :rtype: bool
     """
+    if rel_tolerance:
+        tolerance = max(tolerance, rel_tolerance * max(math.fabs(a), math.fabs(b)))
     return math.fabs(a-b) < tolerance
 
 def is_close_to_zero(a, tolerance=1e-10):
@@ -53,4 +60,106 @@ def is_close_to_one(a, tolerance=1e-10):
     :return: True if the number `a` is close to 1.0 within the allowed tolerance, False otherwise.
     :rtype: bool
     """
-    return are_close_enough(a, 1.0, tolerance)
\ No newline at end of file
+    return are_close_enough(a, 1.0, tolerance)
+
+
+def close_enough_mask(a, b, tolerance=1e-10, rel_tolerance=0.0):
+    """
+    Element-wise version of `are_close_enough` over whole buffers.
+
+    Either argument may be a single number, which is compared against every
+    element of the other. Any flat sequence of numbers is accepted, including
+    `array('d')` buffers and the components of `VectorArray` and `PointCloud`.
+    The comparison runs on the selected backend, see `geom3d.backends`.
+
+    :param a: The first numbers to compare.
+    :type a: sequence of float or float
+    :param b: The second numbers to compare.
+    :type b: sequence of float or float
+    :param tolerance: The absolute tolerance. Defaults to 1e-10.
+    :type tolerance: float
+    :param rel_tolerance: The tolerance relative to the larger magnitude of
+        each pair. Defaults to 0.0 (absolute only).
+    :type rel_tolerance: float
+    :return: One boolean per pair, True where the pair is close enough.
+    :rtype: list of bool
+    """
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return [are_close_enough(a, b, tolerance, rel_tolerance)]
+    if not isinstance(a, (int, float)) and not isinstance(b, (int, float)) and len(a) != len(b):
+        raise ValueError(f"Cannot compare sequences of length {len(a)} and {len(b)}")
+    from geom3d.backends import get_backend
+    return get_backend().close_enough_mask(a, b, tolerance, rel_tolerance)
+
+
+def close_to_zero_mask(values, tolerance=1e-10):
+    """
+    Element-wise version of `is_close_to_zero` over a whole buffer.
+
+    :param values: The numbers to check.
+    :type values: sequence of float
+    :param tolerance: The maximum acceptable difference from zero. Defaults to 1e-10.
+    :type tolerance: float, optional
+    :return: One boolean per number, True where it is close to zero.
+    :rtype: list of bool
+    """
+    from geom3d.backends import get_backend
+    return get_backend().close_to_zero_mask(values, tolerance)
+
+
+def close_to_one_mask(values, tolerance=1e-10):
+    """
+    Element-wise version of `is_close_to_one` over a whole buffer.
+
+    :param values: The numbers to check.
+    :type values: sequence of float
+    :param tolerance: The acceptable deviation from 1.0. Defaults to 1e-10.
+    :type tolerance: float, optional
+    :return: One boolean per number, True where it is close to 1.0.
+    :rtype: list of bool
+    """
+    from geom3d.backends import get_backend
+    return get_backend().close_enough_mask(values, 1.0, tolerance, 0.0)
+
+
+def all_close(a, b, tolerance=1e-10, rel_tolerance=0.0):
+    """
+    Checks that every pair of numbers is close enough, stopping at the first
+    pair that is not. This validates a whole result buffer against a reference
+    in a single call.
+
+    :param a: The first numbers to compare.
+    :type a: sequence of float or float
+    :param b: The second numbers to compare.
+    :type b: sequence of float or float
+    :param tolerance: The absolute tolerance. Defaults to 1e-10.
+    :type tolerance: float
+    :param rel_tolerance: The tolerance relative to the larger magnitude of
+        each pair. Defaults to 0.0 (absolute only).
+    :type rel_tolerance: float
+    :return: True if every pair is close enough, False otherwise. Sequences of
+        different lengths are never close.
+    :rtype: bool
+    """
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return are_close_enough(a, b, tolerance, rel_tolerance)
+    if not isinstance(a, (int, float)) and not isinstance(b, (int, float)) and len(a) != len(b):
+        return False
+    from geom3d.backends import get_backend
+    return get_backend().all_close(a, b, tolerance, rel_tolerance)
+
+
+def _snap(values, tolerance):
+    """
+    The key frozen vectors and points compare and hash by: every coordinate
+    as the nearest whole number of tolerances. A coordinate too large to
+    count in tolerances is kept as is, wrapped in a tuple so it never equals
+    a count. The key is None if any coordinate is NaN or infinite.
+    """
+    key = []
+    for value in values:
+        if not math.isfinite(value):
+            return None
+        count = value / tolerance
+        key.append((value,) if math.isinf(count) else round(count))
+    return tuple(key)
@@ -0,0 +1,285 @@
+from array import array
+
+from geom3d.backends import _interleave
+from geom3d.backends import get_backend
+from geom3d.nums import all_close
+from geom3d.nums import close_enough_mask
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+from geom3d.vector_array import _as_buffer
+
+
+class PointCloud:
+    def __init__(self, data=()):
+        """
+        Stores N points as one contiguous float64 buffer laid out as
+        ``x0, y0, z0, x1, y1, z1, ...``, which costs 24 bytes per point.
+
+        Provides batched versions of the `Point` operations so that large sets
+        of joint and node coordinates can be processed without a Python object
+        per point.
+
+        :param data: A flat sequence of floats whose length is a multiple of 3.
+            An `array('d')` or a float64 memoryview is used without copying.
+        :type data: array or memoryview or iterable of float
+        """
+        data = _as_buffer(data)
+        if len(data) % 3 != 0:
+            raise ValueError("PointCloud data length must be a multiple of 3")
+        self._data = data
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Builds a PointCloud from an iterable of `Point` instances.
+
+        :param points: The points to pack.
+        :type points: iterable of Point
+        :return: A new PointCloud holding the same coordinates.
+        :rtype: PointCloud
+        """
+        data = array('d')
+        for point in points:
+            data.append(point.x)
+            data.append(point.y)
+            data.append(point.z)
+        return cls(data)
+
+    @classmethod
+    def from_coordinates(cls, x, y, z):
+        """
+        Builds a PointCloud from three equally long coordinate sequences.
+
+        :param x: The `x` coordinates.
+        :param y: The `y` coordinates.
+        :param z: The `z` coordinates.
+        :return: A new PointCloud.
+        :rtype: PointCloud
+        """
+        if not len(x) == len(y) == len(z):
+            raise ValueError("Coordinate sequences must have the same length")
+        return cls(_interleave(x, y, z))
+
+    def to_points(self):
+        """
+        Unpacks the cloud into a list of `Point` instances.
+
+        :return: One `Point` per row.
+        :rtype: list of Point
+        """
+        return [Point(x, y, z) for x, y, z in zip(self.x, self.y, self.z)]
+
+    @property
+    def data(self):
+        """
+        The underlying flat float64 buffer.
+
+        :rtype: array or memoryview
+        """
+        return self._data
+
+    @property
+    def x(self):
+        """
+        The `x` coordinates of every point.
+
+        :rtype: array or memoryview
+        """
+        return self._data[0::3]
+
+    @property
+    def y(self):
+        """
+        The `y` coordinates of every point.
+
+        :rtype: array or memoryview
+        """
+        return self._data[1::3]
+
+    @property
+    def z(self):
+        """
+        The `z` coordinates of every point.
+
+        :rtype: array or memoryview
+        """
+        return self._data[2::3]
+
+    def __len__(self):
+        return len(self._data) // 3
+
+    def __getitem__(self, index):
+        """
+        Returns a single row as a `Point`, or a contiguous range of rows as a
+        new PointCloud when given a slice with step 1.
+
+        :param index: The row index or slice.
+        :type index: int or slice
+        :rtype: Point or PointCloud
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("PointCloud slices must have a step of 1")
+            return PointCloud(self._data[3 * start:3 * max(start, stop)])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PointCloud index out of range")
+        offset = 3 * index
+        return Point(self._data[offset], self._data[offset + 1], self._data[offset + 2])
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    def __eq__(self, other):
+        """
+        Two PointClouds are equal when they hold the same number of points and
+        every coordinate is within `are_close_enough` of its counterpart, which
+        matches `Point.__eq__` applied row by row.
+
+        :param other: The object to compare with.
+        :return: True if both clouds hold the same points, False otherwise.
+        :rtype: bool
+        """
+        if self is other:
+            return True
+        if not isinstance(other, PointCloud):
+            return False
+        if len(self) != len(other):
+            return False
+        return all_close(self._data, other._data)
+
+    def close_enough(self, other, tolerance=1e-10, rel_tolerance=0.0):
+        """
+        Compares every row with the matching row of `other`, or with a single
+        `Point`, and reports which rows are close enough on all three components.
+
+        :param other: The points to compare with.
+        :type other: PointCloud or Point
+        :param tolerance: The absolute tolerance. Defaults to 1e-10.
+        :type tolerance: float
+        :param rel_tolerance: The tolerance relative to the larger magnitude of
+            each component pair. Defaults to 0.0 (absolute only).
+        :type rel_tolerance: float
+        :return: One boolean per row.
+        :rtype: list of bool
+        """
+        self._other_data(other)
+        x_mask = close_enough_mask(self.x, other.x, tolerance, rel_tolerance)
+        y_mask = close_enough_mask(self.y, other.y, tolerance, rel_tolerance)
+        z_mask = close_enough_mask(self.z, other.z, tolerance, rel_tolerance)
+        return [a and b and c for a, b, c in zip(x_mask, y_mask, z_mask)]
+
+    def __str__(self):
+        return "[" + ", ".join(f"({x}, {y}, {z})" for x, y, z in zip(self.x, self.y, self.z)) + "]"
+
+    def _other_data(self, other):
+        """
+        Returns the buffer of `other` as the backends take it, a single
+        `Point` becoming one ``(x, y, z)`` row applied to every row.
+        """
+        if isinstance(other, PointCloud):
+            if len(other) != len(self):
+                raise ValueError(f"Expected {len(self)} points, got {len(other)}")
+            return other._data
+        if isinstance(other, Point):
+            return other.x, other.y, other.z
+        raise TypeError(f"Expected a Point or PointCloud, got {type(other).__name__}")
+
+    def distance_to(self, other):
+        """
+        Calculates the Euclidean distance from every point to a single `Point`,
+        or to the matching row of another PointCloud.
+
+        :param other: The point or points to measure to.
+        :type other: Point or PointCloud
+        :return: One distance per point.
+        :rtype: array
+        """
+        return get_backend().distance(self._data, self._other_data(other))
+
+    def iter_distance_blocks(self, other=None, block_size=1024):
+        """
+        Yields the pairwise distance matrix between this cloud and `other` one
+        block of rows at a time, so that peak memory is bounded by
+        ``block_size * len(other)`` distances regardless of the cloud size.
+
+        :param other: The cloud to measure to. Defaults to this cloud.
+        :type other: PointCloud or None
+        :param block_size: The number of rows in each block.
+        :type block_size: int
+        :return: Tuples of ``(first_row_index, rows)`` where each row is an
+            `array('d')` of distances to every point of `other`.
+        :rtype: iterator of tuple
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if other is None:
+            other = self
+        backend = get_backend()
+        for start in range(0, len(self), block_size):
+            yield start, backend.pairwise_distances(self[start:start + block_size]._data, other._data)
+
+    def pairwise_distances(self, other=None, block_size=1024):
+        """
+        Computes the full pairwise distance matrix between this cloud and
+        `other`, filled in blocks of rows (see `iter_distance_blocks`).
+
+        :param other: The cloud to measure to. Defaults to this cloud.
+        :type other: PointCloud or None
+        :param block_size: The number of rows computed per block.
+        :type block_size: int
+        :return: One row of distances per point of this cloud.
+        :rtype: list of array
+        """
+        matrix = []
+        for _, rows in self.iter_distance_blocks(other, block_size):
+            matrix.extend(rows)
+        return matrix
+
+    def displaced(self, vector, times=1):
+        """
+        Displaces every point by a scaled vector.
+
+        :param vector: A single vector applied to every point, or one vector
+            per point.
+        :type vector: Vector or VectorArray
+        :param times: A single scale factor, or one factor per point.
+        :type times: int or float or sequence of float
+        :return: A new PointCloud holding the displaced points.
+        :rtype: PointCloud
+        """
+        if isinstance(vector, Vector):
+            vector = VectorArray(array('d', [vector.i, vector.j, vector.k]) * len(self))
+        elif len(vector) != len(self):
+            raise ValueError(f"Expected {len(self)} vectors, got {len(vector)}")
+        scaled = vector.scaled_by(times)
+        return PointCloud(get_backend().add(self._data, scaled.data))
+
+    def make_vector(self, other):
+        """
+        Computes the vectors from every point to a single `Point`, or to the
+        matching row of another PointCloud.
+
+        :param other: The point or points the vectors point to.
+        :type other: Point or PointCloud
+        :return: One vector per point, from self and to other.
+        :rtype: VectorArray
+        """
+        return VectorArray(get_backend().subtract(self._other_data(other), self._data))
+
+    def __sub__(self, other):
+        """
+        Subtracts a PointCloud row by row, or a single `Point` from every row,
+        returning the difference vectors.
+
+        :param other: The point or points to subtract.
+        :type other: Point or PointCloud
+        :return: One difference vector per point.
+        :rtype: VectorArray
+        """
+        if not isinstance(other, (Point, PointCloud)):
+            return NotImplemented
+        return VectorArray(get_backend().subtract(self._data, self._other_data(other)))
@@ -1,10 +1,13 @@
 import math
 
+from geom3d.nums import _snap
 from geom3d.nums import are_close_enough
 from geom3d.vector import Vector
 
 
 class Point:
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x, y, z):
         """
         Represents a class that encapsulates three attributes `x`, `y`, and `z`.
@@ -142,3 +145,80 @@ class Point:
             other.y - self.y,
             other.z - self.z
         )
+
+
+class FrozenPoint(Point):
+    __slots__ = ('_key',)
+
+    tolerance = 1e-10
+
+    def __init__(self, x, y, z):
+        """
+        An immutable, hashable Point that can be used as a dict key or set member.
+
+        Coordinates cannot be reassigned after construction. Every coordinate
+        is snapped once to the nearest multiple of the `tolerance` class
+        attribute (the default tolerance of `are_close_enough`), and two frozen
+        points of the same tolerance are equal when their snapped coordinates
+        are, so equality is transitive, equal points always hash equally and
+        their coordinates agree to within the tolerance. Two points closer
+        than the tolerance can still snap apart; `GridIndex.find_equal` looks
+        points up by distance instead. Comparisons with a plain `Point` use
+        `Point.__eq__`.
+
+        A point with a NaN or infinite coordinate is equal only to itself, as
+        `are_close_enough` never finds such coordinates close.
+
+        :param x: The `x` coordinate.
+        :type x: float or int
+        :param y: The `y` coordinate.
+        :type y: float or int
+        :param z: The `z` coordinate.
+        :type z: float or int
+        """
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'z', z)
+        object.__setattr__(self, '_key', _snap((x, y, z), self.tolerance))
+
+    @classmethod
+    def from_point(cls, point):
+        """
+        Creates a frozen copy of an existing point.
+
+        :param point: The point to copy.
+        :type point: Point
+        :return: A FrozenPoint with the same coordinates.
+        :rtype: FrozenPoint
+        """
+        return cls(point.x, point.y, point.z)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.x, self.y, self.z)
+
+    def __eq__(self, other):
+        """
+        Compares two frozen points by their snapped coordinates, or falls back
+        to `Point.__eq__` for any other object.
+
+        :param other: The object to compare with.
+        :type other: Any
+        :return: True if the points are equal, False otherwise.
+        :rtype: bool
+        """
+        if self is other:
+            return True
+        if isinstance(other, FrozenPoint):
+            return self._key is not None and self._key == other._key and self.tolerance == other.tolerance
+        return Point.__eq__(self, other)
+
+    def __hash__(self):
+        if self._key is None:
+            return object.__hash__(self)
+        return hash(self._key)
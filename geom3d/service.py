@@ -0,0 +1,369 @@
+import asyncio
+import math
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from geom3d.forces import ORIGIN
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.sweep import geometry_hash
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+# The number of truss factorizations each worker keeps.
+_CACHED_FACTORIZATIONS = 8
+
+_factorizations = OrderedDict()
+_factorizations_lock = threading.Lock()
+
+
+def _repeat_rows(rows, sizes):
+    """
+    Repeats the i-th ``(x, y, z)`` row `sizes[i]` times, flat.
+    """
+    repeated = array('d')
+    for (x, y, z), size in zip(rows, sizes):
+        repeated.extend(array('d', (x, y, z)) * size)
+    return repeated
+
+
+def _segment_sums(values, sizes):
+    sums = []
+    start = 0
+    for size in sizes:
+        sums.append(math.fsum(values[start:start + size]))
+        start += size
+    return sums
+
+
+def _resultant_batch(forces, points, references, sizes):
+    """
+    Resultant force and moment of several load sets at once: the moment arms
+    and moments of every request are computed in one pass over the
+    concatenated rows, then summed per request.
+    """
+    forces = VectorArray(forces)
+    moments = PointCloud(_repeat_rows(references, sizes)).make_vector(PointCloud(points)).cross(forces)
+    components = (forces.i, forces.j, forces.k, moments.i, moments.j, moments.k)
+    columns = [_segment_sums(values, sizes) for values in components]
+    return list(zip(*columns))
+
+
+def _distance_batch(points, targets, sizes):
+    """
+    Distances from several point sets to one target each, in one pass over
+    the concatenated rows.
+    """
+    distances = PointCloud(points).distance_to(PointCloud(_repeat_rows(targets, sizes)))
+    split = []
+    start = 0
+    for size in sizes:
+        split.append(distances[start:start + size])
+        start += size
+    return split
+
+
+def _factorization(truss):
+    """
+    The factorization of a truss, reused while this worker keeps solving
+    trusses of the same geometry, members, stiffnesses and supports.
+    """
+    key = geometry_hash(truss.joints, truss.members, truss.stiffnesses, truss.supports)
+    with _factorizations_lock:
+        entry = _factorizations.get(key)
+        if entry is not None:
+            _factorizations.move_to_end(key)
+            return entry
+    entry = (truss.factorize(), threading.Lock())
+    with _factorizations_lock:
+        entry = _factorizations.setdefault(key, entry)
+        while len(_factorizations) > _CACHED_FACTORIZATIONS:
+            _factorizations.popitem(last=False)
+    return entry
+
+
+def _equilibrium_batch(truss, load_cases):
+    """
+    Solves several load cases on one truss against a single factorization,
+    kept by the worker for later batches on the same truss.
+    """
+    factorized, lock = _factorization(truss)
+    with lock:
+        return factorized.solve_many(load_cases)
+
+
+class _Request:
+    __slots__ = ('payload', 'size', 'future')
+
+    def __init__(self, payload, size, future):
+        self.payload = payload
+        self.size = size
+        self.future = future
+
+
+class _Batcher:
+    def __init__(self, service, dispatch):
+        """
+        Collects the requests of one kind that arrive within the batching
+        window and hands them to `dispatch` together.
+        """
+        self.service = service
+        self.dispatch = dispatch
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        service = self.service
+        while True:
+            batch = [await self.queue.get()]
+            rows = batch[0].size
+            rows = self._drain(batch, rows)
+            if rows < service.max_batch and service.max_delay > 0:
+                await asyncio.sleep(service.max_delay)
+                self._drain(batch, rows)
+            batch = [request for request in batch if not request.future.done()]
+            if batch:
+                service._track(self.dispatch(batch))
+
+    def _drain(self, batch, rows):
+        while rows < self.service.max_batch and not self.queue.empty():
+            request = self.queue.get_nowait()
+            batch.append(request)
+            rows += request.size
+        return rows
+
+
+def _settle(requests, results):
+    for request, result in zip(requests, results):
+        if not request.future.done():
+            request.future.set_result(result)
+
+
+def _fail(requests, error):
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(error)
+
+
+class StaticsService:
+    def __init__(self, executor=None, workers=None, max_batch=4096, max_delay=0.001, max_pending=1024):
+        """
+        An asyncio front end for statics computations that keeps the event
+        loop free.
+
+        Concurrent small requests of the same kind are micro-batched: the
+        requests that arrive within `max_delay` of each other, up to
+        `max_batch` rows, are concatenated into one vectorized call, and
+        equilibrium requests on the same `Truss` share one factorization. The
+        calls run on a worker pool, never on the event loop.
+
+        Every worker also keeps the factorizations of the last few trusses it
+        solved, keyed by their content, so a steady stream of requests on one
+        truss is factorized once per worker rather than once per batch. The
+        truss itself is still sent to the worker with every batch, which costs
+        time proportional to its size but far less than factorizing it.
+
+        At most `max_pending` requests are accepted at a time; further callers
+        wait for a free slot, which bounds memory and queueing delay under
+        bursty load. Cancelling a caller withdraws its request if its batch
+        has not been sent yet, and discards the result otherwise.
+
+        Use it as an async context manager, or call `start` and `close`::
+
+            async with StaticsService() as service:
+                force, moment = await service.resultant(forces, points)
+
+        :param executor: The pool computations run on. Defaults to a process
+            pool owned by the service.
+        :type executor: concurrent.futures.Executor or None
+        :param workers: The number of processes of the default pool. Defaults
+            to the number of CPUs.
+        :type workers: int or None
+        :param max_batch: The number of rows above which a batch is sent
+            without waiting for more requests.
+        :type max_batch: int
+        :param max_delay: How long in seconds a batch waits for more requests.
+        :type max_delay: float
+        :param max_pending: The number of requests accepted at once.
+        :type max_pending: int
+        """
+        if max_batch < 1 or max_pending < 1:
+            raise ValueError("max_batch and max_pending must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._slots = None
+        self._batchers = None
+        self._dispatches = set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """
+        Starts the batching tasks on the running event loop.
+        """
+        if self._batchers is not None:
+            raise RuntimeError("The service is already running")
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers or os.cpu_count() or 1)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._batchers = {
+            'resultant': _Batcher(self, self._dispatch_resultants),
+            'distance': _Batcher(self, self._dispatch_distances),
+            'equilibrium': _Batcher(self, self._dispatch_equilibrium),
+        }
+
+    async def close(self):
+        """
+        Stops accepting requests, cancels the requests still waiting and
+        shuts down the pool if the service created it.
+        """
+        if self._batchers is None:
+            return
+        batchers, self._batchers = self._batchers, None
+        for batcher in batchers.values():
+            batcher.task.cancel()
+            while not batcher.queue.empty():
+                batcher.queue.get_nowait().future.cancel()
+        await asyncio.gather(*(batcher.task for batcher in batchers.values()), return_exceptions=True)
+        for task in list(self._dispatches):
+            task.cancel()
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+        if self._owns_executor:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    def _track(self, coroutine):
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _submit(self, kind, payload, size):
+        if self._batchers is None:
+            raise RuntimeError("The service is not running")
+        async with self._slots:
+            if self._batchers is None:
+                raise RuntimeError("The service is not running")
+            future = asyncio.get_running_loop().create_future()
+            self._batchers[kind].queue.put_nowait(_Request(payload, size, future))
+            return await future
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _dispatch_resultants(self, requests):
+        forces, points = array('d'), array('d')
+        references, sizes = [], []
+        for request in requests:
+            request_forces, request_points, reference = request.payload
+            forces.extend(request_forces)
+            points.extend(request_points)
+            references.append(reference)
+            sizes.append(request.size)
+        try:
+            rows = await self._run(_resultant_batch, forces, points, references, sizes)
+        except Exception as error:
+            _fail(requests, error)
+            return
+        _settle(requests, [(Vector(*row[:3]), Vector(*row[3:])) for row in rows])
+
+    async def _dispatch_distances(self, requests):
+        points = array('d')
+        targets, sizes = [], []
+        for request in requests:
+            request_points, target, _ = request.payload
+            points.extend(request_points)
+            targets.append(target)
+            sizes.append(request.size)
+        try:
+            split = await self._run(_distance_batch, points, targets, sizes)
+        except Exception as error:
+            _fail(requests, error)
+            return
+        _settle(requests, [distances[0] if request.payload[2] else distances
+                           for request, distances in zip(requests, split)])
+
+    async def _dispatch_equilibrium(self, requests):
+        groups = {}
+        for request in requests:
+            groups.setdefault(id(request.payload[0]), []).append(request)
+        await asyncio.gather(*(self._solve_group(group) for group in groups.values()))
+
+    async def _solve_group(self, requests):
+        truss = requests[0].payload[0]
+        try:
+            solutions = await self._run(_equilibrium_batch, truss, [request.payload[1] for request in requests])
+        except Exception as error:
+            if len(requests) == 1:
+                _fail(requests, error)
+                return
+            # Solve one by one, so a bad load case only fails its own request.
+            await asyncio.gather(*(self._solve_group([request]) for request in requests))
+            return
+        _settle(requests, solutions)
+
+    async def resultant(self, forces: VectorArray, points: PointCloud, about: Point = ORIGIN):
+        """
+        The resultant force of a set of loads and its moment about a point.
+
+        :param forces: The forces.
+        :type forces: VectorArray
+        :param points: The point each force acts at.
+        :type points: PointCloud
+        :param about: The point to take moments about. Defaults to the origin.
+        :type about: Point
+        :return: The resultant force and moment.
+        :rtype: tuple of (Vector, Vector)
+        """
+        if len(forces) != len(points):
+            raise ValueError(f"Expected {len(forces)} points, got {len(points)}")
+        payload = (array('d', forces.data), array('d', points.data), (about.x, about.y, about.z))
+        return await self._submit('resultant', payload, len(forces))
+
+    async def distances(self, points, target: Point):
+        """
+        The distance from every point to a target point.
+
+        :param points: A single point or a cloud of points.
+        :type points: Point or PointCloud
+        :param target: The point to measure to.
+        :type target: Point
+        :return: The distance for a single point, else one distance per point.
+        :rtype: float or array
+        """
+        single = isinstance(points, Point)
+        data = array('d', (points.x, points.y, points.z)) if single else array('d', points.data)
+        payload = (data, (target.x, target.y, target.z), single)
+        return await self._submit('distance', payload, len(data) // 3)
+
+    async def equilibrium(self, truss: Truss, loads=None):
+        """
+        Solves a truss for one load case. Concurrent requests on the same
+        truss object are solved against one shared factorization.
+
+        :param truss: The truss. It must not be modified until the result
+            arrives.
+        :type truss: Truss
+        :param loads: One load per joint, or a mapping from joint index to load.
+            Defaults to the loads of the truss.
+        :type loads: VectorArray or dict of int to Vector or None
+        :rtype: TrussSolution
+        :raises ValueError: If the truss is unstable.
+        """
+        if loads is None:
+            loads = truss.loads
+        return await self._submit('equilibrium', (truss, loads), truss.member_count or 1)
@@ -0,0 +1,873 @@
+import math
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import mul
+
+from geom3d.backends import get_backend
+
+# A pivot that loses all but this fraction of its diagonal entry to
+# cancellation means the matrix is singular to working precision.
+_PIVOT_TOLERANCE = 1e-12
+
+# Nested dissection stops splitting parts of at most this many unknowns.
+_LEAF_SIZE = 16
+
+# Supernodes of up to this many columns absorb their parent whatever the
+# zeros, and larger ones while at most this fraction of their entries is zero.
+_SMALL_SUPERNODE = 4
+_SUPERNODE_ZEROS = 0.2
+
+
+class SparseMatrix:
+    def __init__(self, shape, indptr, indices, values):
+        """
+        A sparse matrix in compressed sparse row (CSR) form.
+
+        Row `r` holds the column indices ``indices[indptr[r]:indptr[r + 1]]``
+        (sorted ascending) and the matching entries of `values`. Use
+        `from_triplets` to build one from unordered ``(row, column, value)``
+        entries.
+
+        :param shape: The number of rows and columns.
+        :type shape: tuple of (int, int)
+        :param indptr: The row pointer, one entry per row plus one.
+        :type indptr: array
+        :param indices: The column index of every stored entry.
+        :type indices: array
+        :param values: The value of every stored entry.
+        :type values: array
+        """
+        self.shape = shape
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+
+    @classmethod
+    def from_triplets(cls, rows, columns, values, shape):
+        """
+        Builds a CSR matrix from coordinate entries. Entries that share a
+        position are summed, which is how element contributions are assembled
+        into a global matrix.
+
+        :param rows: The row index of every entry.
+        :param columns: The column index of every entry.
+        :param values: The value of every entry.
+        :param shape: The number of rows and columns.
+        :type shape: tuple of (int, int)
+        :return: The assembled matrix.
+        :rtype: SparseMatrix
+        """
+        row_maps = [{} for _ in range(shape[0])]
+        for row, column, value in zip(rows, columns, values):
+            entries = row_maps[row]
+            entries[column] = entries.get(column, 0.0) + value
+        indptr = array('q', [0])
+        indices = array('q')
+        data = array('d')
+        for entries in row_maps:
+            for column in sorted(entries):
+                indices.append(column)
+                data.append(entries[column])
+            indptr.append(len(indices))
+        return cls(shape, indptr, indices, data)
+
+    @property
+    def nnz(self):
+        """
+        The number of stored entries.
+
+        :rtype: int
+        """
+        return len(self.values)
+
+    def row(self, index):
+        """
+        The stored entries of one row.
+
+        :param index: The row index.
+        :type index: int
+        :return: Pairs of ``(column, value)``.
+        :rtype: list of tuple
+        """
+        start, stop = self.indptr[index], self.indptr[index + 1]
+        return list(zip(self.indices[start:stop], self.values[start:stop]))
+
+    def matvec(self, x):
+        """
+        Computes the product of this matrix with a dense vector.
+
+        :param x: A dense vector with one entry per column.
+        :type x: sequence of float
+        :return: The product, one entry per row.
+        :rtype: array
+        """
+        return get_backend().sparse_matvec(self.indptr, self.indices, self.values, x)
+
+    def rmatvec(self, y):
+        """
+        Computes the product of the transpose of this matrix with a dense vector.
+
+        :param y: A dense vector with one entry per row.
+        :type y: sequence of float
+        :return: The product, one entry per column.
+        :rtype: array
+        """
+        indptr, indices, values = self.indptr, self.indices, self.values
+        result = array('d', bytes(8 * self.shape[1]))
+        for r in range(self.shape[0]):
+            scale = y[r]
+            if scale:
+                for position in range(indptr[r], indptr[r + 1]):
+                    result[indices[position]] += values[position] * scale
+        return result
+
+    def diagonal(self):
+        """
+        The main diagonal, with zeros where no entry is stored.
+
+        :rtype: array
+        """
+        result = array('d', bytes(8 * min(self.shape)))
+        for r in range(len(result)):
+            for position in range(self.indptr[r], self.indptr[r + 1]):
+                if self.indices[position] == r:
+                    result[r] = self.values[position]
+        return result
+
+    def to_dense(self):
+        """
+        Expands the matrix into a list of dense rows. Intended for small
+        matrices and debugging.
+
+        :rtype: list of list of float
+        """
+        dense = [[0.0] * self.shape[1] for _ in range(self.shape[0])]
+        for r in range(self.shape[0]):
+            for column, value in self.row(r):
+                dense[r][column] = value
+        return dense
+
+
+def _sparse_matvec(indptr, indices, values, x):
+    """
+    The product of a compressed sparse row matrix with a dense vector.
+    """
+    lookup = x.__getitem__
+    return array('d', [
+        sum(map(mul, values[start:stop], map(lookup, indices[start:stop])))
+        for start, stop in zip(indptr[:-1], indptr[1:])
+    ])
+
+
+def reverse_cuthill_mckee(matrix):
+    """
+    Computes a reverse Cuthill-McKee ordering of a structurally symmetric
+    matrix. Renumbering the unknowns in this order keeps the nonzeros close to
+    the diagonal, which keeps the profile of a skyline factorization small.
+
+    :param matrix: A square matrix with a symmetric sparsity pattern.
+    :type matrix: SparseMatrix
+    :return: The new position of each old index is its position in this list,
+        i.e. ``ordering[new] == old``.
+    :rtype: list of int
+    """
+    size = matrix.shape[0]
+    neighbours = _neighbours(matrix)
+    degree = [len(n) for n in neighbours]
+    visited = [False] * size
+    ordering = []
+    for seed in sorted(range(size), key=degree.__getitem__):
+        if visited[seed]:
+            continue
+        visited[seed] = True
+        queue = deque([seed])
+        while queue:
+            node = queue.popleft()
+            ordering.append(node)
+            for neighbour in sorted(neighbours[node], key=degree.__getitem__):
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    queue.append(neighbour)
+    ordering.reverse()
+    return ordering
+
+
+def _neighbours(matrix):
+    """
+    The off-diagonal column indices of every row.
+    """
+    indptr, indices = matrix.indptr, matrix.indices
+    return [[c for c in indices[indptr[r]:indptr[r + 1]] if c != r] for r in range(matrix.shape[0])]
+
+
+def _supervariables(neighbours):
+    """
+    Groups the unknowns whose rows share one pattern, diagonal included, such
+    as the three directions of a joint that is braced in all of them.
+
+    :return: The unknowns of every group, ascending, and the groups adjacent
+        to every group.
+    :rtype: tuple of (list of list of int, list of list of int)
+    """
+    groups = {}
+    for node, adjacent in enumerate(neighbours):
+        groups.setdefault(tuple(sorted(adjacent + [node])), []).append(node)
+    members = list(groups.values())
+    group_of = [0] * len(neighbours)
+    for group, nodes in enumerate(members):
+        for node in nodes:
+            group_of[node] = group
+    adjacency = [
+        sorted({group_of[c] for c in neighbours[nodes[0]]} - {group})
+        for group, nodes in enumerate(members)
+    ]
+    return members, adjacency
+
+
+def _level_structure(adjacency, part, stamp, root):
+    """
+    The breadth-first levels of the nodes of one part reachable from `root`.
+    """
+    levels = [[root]]
+    seen = {root}
+    while True:
+        level = []
+        for node in levels[-1]:
+            for neighbour in adjacency[node]:
+                if part[neighbour] == stamp and neighbour not in seen:
+                    seen.add(neighbour)
+                    level.append(neighbour)
+        if not level:
+            return levels
+        levels.append(level)
+
+
+def _level_halves(adjacency, weights, part, stamp, nodes):
+    """
+    Splits a part between the levels of a breadth-first search from a
+    pseudo-peripheral node, after the thinnest level that leaves between a
+    third and two thirds of the weight on either side. A part that is not
+    connected is split into the nodes reachable from its first node and the
+    rest instead.
+    """
+    levels = _level_structure(adjacency, part, stamp, nodes[0])
+    if sum(len(level) for level in levels) < len(nodes):
+        reachable = {node for level in levels for node in level}
+        return list(reachable), [node for node in nodes if node not in reachable]
+    # Walk to a pseudo-peripheral node, whose levels are long and thin.
+    while True:
+        last = min(levels[-1], key=lambda node: sum(part[n] == stamp for n in adjacency[node]))
+        candidate = _level_structure(adjacency, part, stamp, last)
+        if len(candidate) <= len(levels):
+            break
+        levels = candidate
+    level_weights = [sum(weights[node] for node in level) for level in levels]
+    whole = sum(level_weights)
+    total = 0
+    middle = None
+    for index, weight in enumerate(level_weights[:-1]):
+        total += weight
+        if whole / 3 <= total <= 2 * whole / 3 and (middle is None or weight < level_weights[middle]):
+            middle = index
+    if middle is None:
+        return None
+    return ([node for level in levels[:middle + 1] for node in level],
+            [node for level in levels[middle + 1:] for node in level])
+
+
+def _coordinate_halves(positions, nodes):
+    """
+    Splits a part by the plane across its longest side through the median
+    position on that side.
+    """
+    axis = max(range(3), key=lambda a: max(positions[n][a] for n in nodes) - min(positions[n][a] for n in nodes))
+    values = sorted(positions[node][axis] for node in nodes)
+    median = values[len(values) // 2]
+    if median == values[0]:
+        near = [node for node in nodes if positions[node][axis] <= median]
+    else:
+        near = [node for node in nodes if positions[node][axis] < median]
+    if len(near) == len(nodes):
+        return None
+    near_set = set(near)
+    return near, [node for node in nodes if node not in near_set]
+
+
+def _dissect(adjacency, weights, leaf_size, positions=None):
+    """
+    Orders the nodes of a weighted graph by nested dissection: every part
+    heavier than `leaf_size` is split in two, by position if `positions` are
+    given and by breadth-first levels otherwise, and the nodes of the first
+    half next to the second, which separate them, are numbered after both.
+    """
+    part = [0] * len(adjacency)
+    order = []
+    stamp = 0
+    # Parts still to split, and separators to number once everything pushed
+    # after them is numbered.
+    tasks = [(False, list(range(len(adjacency))))]
+    while tasks:
+        separator, nodes = tasks.pop()
+        if separator or sum(weights[node] for node in nodes) <= leaf_size:
+            order.extend(nodes)
+            continue
+        stamp += 1
+        for node in nodes:
+            part[node] = stamp
+        if positions is None:
+            halves = _level_halves(adjacency, weights, part, stamp, nodes)
+        else:
+            halves = _coordinate_halves(positions, nodes)
+        if halves is None:
+            order.extend(nodes)
+            continue
+        near, far = halves
+        stamp += 1
+        for node in far:
+            part[node] = stamp
+        cut = [node for node in near if any(part[n] == stamp for n in adjacency[node])]
+        cut_set = set(cut)
+        tasks.append((True, cut))
+        tasks.append((False, far))
+        tasks.append((False, [node for node in near if node not in cut_set]))
+    return order
+
+
+def nested_dissection(matrix, positions=None, leaf_size=_LEAF_SIZE):
+    """
+    Computes a nested dissection ordering of a structurally symmetric matrix,
+    a fill-reducing ordering for `SparseCholesky`.
+
+    The graph of the matrix is cut in two by a small set of unknowns, which
+    are numbered last, and each half is ordered the same way. The factor of a
+    mesh-like matrix then fills in far less than with a banded ordering such
+    as `reverse_cuthill_mckee`, unless the mesh is long and slender. Unknowns
+    with the same pattern, such as the directions of one truss joint, are
+    kept together.
+
+    The cuts follow the graph alone unless the position of every unknown is
+    given, as for the joints of a truss; the mesh is then cut by planes,
+    which for regular meshes gives smaller separators.
+
+    :param matrix: A square matrix with a symmetric sparsity pattern.
+    :type matrix: SparseMatrix
+    :param positions: The ``(x, y, z)`` position of every unknown, or None.
+    :type positions: sequence of tuple of float or None
+    :param leaf_size: The number of unknowns below which a part is not split.
+    :type leaf_size: int
+    :return: The new position of each old index is its position in this list,
+        i.e. ``ordering[new] == old``.
+    :rtype: list of int
+    """
+    members, adjacency = _supervariables(_neighbours(matrix))
+    if positions is not None:
+        if len(positions) != matrix.shape[0]:
+            raise ValueError(f"Expected {matrix.shape[0]} positions, got {len(positions)}")
+        positions = [positions[nodes[0]] for nodes in members]
+    order = _dissect(adjacency, [len(nodes) for nodes in members], leaf_size, positions)
+    return [node for group in order for node in members[group]]
+
+
+class SkylineCholesky:
+    def __init__(self, matrix, ordering=None):
+        """
+        Factorizes a sparse symmetric positive definite matrix as ``L L^T``
+        using skyline (profile) storage, the classic direct solver for
+        structural stiffness matrices.
+
+        Each row of `L` is stored from its first nonzero column up to the
+        diagonal, so fill-in is confined to the profile. The unknowns are
+        renumbered with `reverse_cuthill_mckee` by default to keep that profile
+        narrow.
+
+        :param matrix: The symmetric positive definite matrix to factorize.
+        :type matrix: SparseMatrix
+        :param ordering: An explicit renumbering, ``ordering[new] == old``.
+            Defaults to a reverse Cuthill-McKee ordering.
+        :type ordering: list of int or None
+        :raises ValueError: If the matrix is not positive definite, or is
+            singular to working precision.
+        """
+        size = matrix.shape[0]
+        if ordering is None:
+            ordering = reverse_cuthill_mckee(matrix)
+        self.size = size
+        self.ordering = ordering
+        position = [0] * size
+        for new, old in enumerate(ordering):
+            position[old] = new
+
+        lower = [{} for _ in range(size)]
+        for old_row in range(size):
+            row = position[old_row]
+            for old_column, value in matrix.row(old_row):
+                column = position[old_column]
+                if column <= row:
+                    lower[row][column] = value
+
+        self.first = first = [min(entries, default=r) for r, entries in enumerate(lower)]
+        self.rows = rows = []
+        for i in range(size):
+            fi = first[i]
+            row = array('d', bytes(8 * (i - fi + 1)))
+            for column, value in lower[i].items():
+                row[column - fi] = value
+            for j in range(fi, i):
+                fj = first[j]
+                start = fi if fi > fj else fj
+                row_j = rows[j]
+                total = row[j - fi] - sum(map(mul, row[start - fi:j - fi], row_j[start - fj:j - fj]))
+                row[j - fi] = total / row_j[j - fj]
+            diagonal = row[i - fi]
+            pivot = diagonal - sum(map(mul, row[:i - fi], row[:i - fi]))
+            if pivot <= _PIVOT_TOLERANCE * abs(diagonal):
+                raise ValueError("Matrix is not positive definite")
+            row[i - fi] = math.sqrt(pivot)
+            rows.append(row)
+
+    @property
+    def profile(self):
+        """
+        The number of stored entries of the factor.
+
+        :rtype: int
+        """
+        return sum(len(row) for row in self.rows)
+
+    def solve(self, b):
+        """
+        Solves ``A x = b`` with the stored factorization.
+
+        :param b: The right-hand side, one entry per row of `A`.
+        :type b: sequence of float
+        :return: The solution.
+        :rtype: array
+        """
+        size, first, rows, ordering = self.size, self.first, self.rows, self.ordering
+        y = array('d', [b[old] for old in ordering])
+        for i in range(size):
+            fi = first[i]
+            row = rows[i]
+            y[i] = (y[i] - sum(map(mul, row[:i - fi], y[fi:i]))) / row[i - fi]
+        for i in range(size - 1, -1, -1):
+            fi = first[i]
+            row = rows[i]
+            value = y[i] / row[i - fi]
+            y[i] = value
+            if value:
+                for offset in range(i - fi):
+                    y[fi + offset] -= row[offset] * value
+        x = array('d', bytes(8 * size))
+        for new, old in enumerate(ordering):
+            x[old] = y[new]
+        return x
+
+    def solve_many(self, right_hand_sides):
+        """
+        Solves ``A x = b`` for several right-hand sides with one factorization.
+
+        :param right_hand_sides: The right-hand sides.
+        :type right_hand_sides: iterable of sequence of float
+        :return: One solution per right-hand side.
+        :rtype: list of array
+        """
+        return [self.solve(b) for b in right_hand_sides]
+
+
+class _Supernodes:
+    def __init__(self, matrix, ordering):
+        """
+        The symbolic phase of `SparseCholesky`: the elimination tree of a
+        matrix in a given ordering, renumbered in postorder, and the columns
+        of `L` grouped into supernodes with the rows below each of them.
+        """
+        size = matrix.shape[0]
+        position = [0] * size
+        for new, old in enumerate(ordering):
+            position[old] = new
+        indptr, indices = matrix.indptr, matrix.indices
+
+        # Consecutive unknowns whose permuted rows have one pattern form a node
+        # of the elimination tree.
+        patterns = [
+            sorted({position[c] for c in indices[indptr[old]:indptr[old + 1]]} | {new})
+            for new, old in enumerate(ordering)
+        ]
+        starts = [new for new in range(size) if new == 0 or patterns[new] != patterns[new - 1]]
+        node_of = array('q', bytes(8 * size))
+        for node, start in enumerate(starts):
+            for new in range(start, starts[node + 1] if node + 1 < len(starts) else size):
+                node_of[new] = node
+        adjacency = [sorted({node_of[new] for new in patterns[start]} - {node}) for node, start in enumerate(starts)]
+        parent = _elimination_tree(adjacency)
+
+        # Renumber the nodes in postorder, which keeps every supernode's
+        # columns together without changing the fill-in.
+        count = len(starts)
+        stops = starts[1:] + [size]
+        post = _postorder(parent)
+        label = [0] * count
+        for new, node in enumerate(post):
+            label[node] = new
+        ordering = [ordering[new] for node in post for new in range(starts[node], stops[node])]
+        widths = [stops[node] - starts[node] for node in post]
+        adjacency = [sorted(label[u] for u in adjacency[node]) for node in post]
+        parent = [label[parent[node]] if parent[node] >= 0 else -1 for node in post]
+        starts = [0] * count
+        for node in range(1, count):
+            starts[node] = starts[node - 1] + widths[node - 1]
+        for new, old in enumerate(ordering):
+            position[old] = new
+
+        # The rows below the diagonal of every node's columns of L, as nodes,
+        # and the supernodes: chains of nodes whose columns share a pattern.
+        children = [[] for _ in range(count)]
+        for node in range(count):
+            if parent[node] >= 0:
+                children[parent[node]].append(node)
+        structure = []
+        tops = []
+        # The columns, rows below them and explicit zeros of the last supernode.
+        pivots = below = zeros = 0
+        for node in range(count):
+            rows = {u for u in adjacency[node] if u > node}
+            for child in children[node]:
+                rows |= structure[child]
+            rows.discard(node)
+            structure.append(rows)
+            width = widths[node]
+            rows_below = sum(widths[u] for u in rows)
+            if node and parent[node - 1] == node:
+                # Merging the last supernode into its parent stores the rows of
+                # the parent's front in its columns too, zeros included.
+                merged = pivots + width
+                merged_zeros = zeros + pivots * (width + rows_below - below)
+                entries = merged * (merged + 1) // 2 + merged * rows_below
+                if merged <= _SMALL_SUPERNODE or merged_zeros <= _SUPERNODE_ZEROS * entries:
+                    tops[-1] = node
+                    pivots, below, zeros = merged, rows_below, merged_zeros
+                    continue
+            tops.append(node)
+            pivots, below, zeros = width, rows_below, 0
+
+        self.ordering = ordering
+        self.position = position
+        self.spans = []
+        self.below = []
+        supernode_of = [0] * count
+        first = 0
+        for index, top in enumerate(tops):
+            for node in range(first, top + 1):
+                supernode_of[node] = index
+            self.spans.append((starts[first], starts[top] + widths[top] - starts[first]))
+            self.below.append(array('q', [new for u in sorted(structure[top])
+                                          for new in range(starts[u], starts[u] + widths[u])]))
+            first = top + 1
+        self.parents = [supernode_of[parent[top]] if parent[top] >= 0 else -1 for top in tops]
+
+    @property
+    def work(self):
+        """
+        The number of multiply-adds of the numeric factorization.
+
+        :rtype: int
+        """
+        return sum(pivots * (pivots * pivots + 3 * pivots * len(below) + 3 * len(below) ** 2) // 6
+                   for (_, pivots), below in zip(self.spans, self.below))
+
+
+def _envelope_work(matrix, ordering):
+    """
+    The number of multiply-adds of `SkylineCholesky` in a given ordering, at
+    most: every row of the factor fills its envelope.
+    """
+    position = [0] * len(ordering)
+    for new, old in enumerate(ordering):
+        position[old] = new
+    indptr, indices = matrix.indptr, matrix.indices
+    work = 0
+    for new, old in enumerate(ordering):
+        width = new - min((position[c] for c in indices[indptr[old]:indptr[old + 1]]), default=new)
+        if width > 0:
+            work += width * (width + 1) // 2
+    return work
+
+
+def _extend_add(front, size, update, positions):
+    """
+    Adds the lower triangle of a square update matrix into the lower triangle
+    of a `size` x `size` frontal matrix, both row-major, in place. Row ``a``
+    of `update` is row ``positions[a]`` of `front`.
+    """
+    count = len(positions)
+    for a, target in enumerate(positions):
+        base = target * size
+        start = a * count
+        for b in range(a + 1):
+            front[base + positions[b]] += update[start + b]
+
+
+def _eliminate_front(front, size, pivots, diagonal, tolerance):
+    """
+    Eliminates the first `pivots` unknowns of the lower triangle of a
+    `size` x `size` row-major frontal matrix. Returns the first `pivots`
+    columns of the factor, `size` x `pivots` row-major with zeros above the
+    diagonal, and the lower triangle of the Schur complement of the remaining
+    unknowns. A pivot that falls to `tolerance` times its entry of `diagonal`
+    is rejected with a ValueError.
+    """
+    sqrt = math.sqrt
+    rows = [front[r * size:r * size + min(r + 1, pivots)] for r in range(size)]
+    for j in range(pivots):
+        row_j = rows[j]
+        head = row_j[:j]
+        pivot = row_j[j] - sum(map(mul, head, head))
+        if pivot <= tolerance * abs(diagonal[j]):
+            raise ValueError("Matrix is not positive definite")
+        root = sqrt(pivot)
+        row_j[j] = root
+        for row in rows[j + 1:]:
+            row[j] = (row[j] - sum(map(mul, row[:j], head))) / root
+    factor = array('d')
+    for row in rows:
+        factor.extend(row)
+        factor.extend(repeat(0.0, pivots - len(row)))
+    below = rows[pivots:]
+    count = len(below)
+    update = array('d', bytes(8 * count * count))
+    for a, row_a in enumerate(below):
+        base = (pivots + a) * size + pivots
+        start = a * count
+        for b in range(a + 1):
+            update[start + b] = front[base + b] - sum(map(mul, row_a, below[b]))
+    return factor, update
+
+
+class SparseCholesky:
+    def __init__(self, matrix, ordering=None):
+        """
+        Factorizes a sparse symmetric positive definite matrix as ``L L^T``
+        with the multifrontal method.
+
+        The unknowns are renumbered with `nested_dissection` by default, which
+        keeps the fill-in of `L` small for meshes that extend in two or three
+        directions, where a banded `SkylineCholesky` fills in its whole
+        profile. Columns of `L` with the same or nearly the same pattern are
+        grouped into supernodes, and each supernode is eliminated as one dense
+        frontal matrix with the dense kernels of the current backend (see
+        `geom3d.backends.get_backend`), so the factorization runs on NumPy
+        when that backend is selected.
+
+        :param matrix: The symmetric positive definite matrix to factorize.
+        :type matrix: SparseMatrix
+        :param ordering: An explicit renumbering, ``ordering[new] == old``.
+            Defaults to a nested dissection ordering.
+        :type ordering: list of int or None
+        :raises ValueError: If the matrix is not positive definite, or is
+            singular to working precision.
+        """
+        if ordering is None:
+            ordering = nested_dissection(matrix)
+        self._eliminate(matrix, _Supernodes(matrix, ordering))
+
+    @classmethod
+    def _from_supernodes(cls, matrix, symbolic):
+        factor = cls.__new__(cls)
+        factor._eliminate(matrix, symbolic)
+        return factor
+
+    def _eliminate(self, matrix, symbolic):
+        self.size = matrix.shape[0]
+        self.ordering = ordering = symbolic.ordering
+        position = symbolic.position
+        indptr, indices, values = matrix.indptr, matrix.indices, matrix.values
+        diagonal = matrix.diagonal()
+        backend = get_backend()
+        # The update matrices waiting for the supernode they are added into.
+        pending = {}
+        self._supernodes = supernodes = []
+        for index, ((start, pivots), below, parent) in enumerate(zip(symbolic.spans, symbolic.below, symbolic.parents)):
+            front_size = pivots + len(below)
+            local = {new: pivots + offset for offset, new in enumerate(below)}
+            local.update((start + offset, offset) for offset in range(pivots))
+            front = array('d', bytes(8 * front_size * front_size))
+            for offset in range(pivots):
+                column = start + offset
+                old = ordering[column]
+                for entry in range(indptr[old], indptr[old + 1]):
+                    row = position[indices[entry]]
+                    if row >= column:
+                        front[local[row] * front_size + offset] += values[entry]
+            for update, rows in pending.pop(index, ()):
+                backend.extend_add(front, front_size, update, [local[row] for row in rows])
+            factor, update = backend.eliminate(front, front_size, pivots,
+                                               [diagonal[ordering[start + offset]] for offset in range(pivots)],
+                                               _PIVOT_TOLERANCE)
+            supernodes.append((start, pivots, below, factor))
+            if below:
+                pending.setdefault(parent, []).append((update, below))
+
+    @property
+    def nnz(self):
+        """
+        The number of entries of the factor on and below the diagonal.
+
+        :rtype: int
+        """
+        return sum(pivots * (pivots + 1) // 2 + pivots * len(below) for _, pivots, below, _ in self._supernodes)
+
+    def solve(self, b):
+        """
+        Solves ``A x = b`` with the stored factorization.
+
+        :param b: The right-hand side, one entry per row of `A`.
+        :type b: sequence of float
+        :return: The solution.
+        :rtype: array
+        """
+        ordering = self.ordering
+        y = array('d', [b[old] for old in ordering])
+        for start, pivots, below, factor in self._supernodes:
+            for r in range(pivots):
+                row = factor[r * pivots:r * pivots + r + 1]
+                y[start + r] = (y[start + r] - sum(map(mul, row, y[start:start + r]))) / row[r]
+            head = y[start:start + pivots]
+            offset = pivots * pivots
+            for row in below:
+                y[row] -= sum(map(mul, factor[offset:offset + pivots], head))
+                offset += pivots
+        for start, pivots, below, factor in reversed(self._supernodes):
+            tail = array('d', [y[row] for row in below])
+            end = start + pivots
+            for r in range(pivots - 1, -1, -1):
+                total = sum(map(mul, factor[pivots * pivots + r::pivots], tail))
+                total += sum(map(mul, factor[(r + 1) * pivots + r:pivots * pivots:pivots], y[start + r + 1:end]))
+                y[start + r] = (y[start + r] - total) / factor[r * pivots + r]
+        x = array('d', bytes(8 * self.size))
+        for new, old in enumerate(ordering):
+            x[old] = y[new]
+        return x
+
+    def solve_many(self, right_hand_sides):
+        """
+        Solves ``A x = b`` for several right-hand sides with one factorization.
+
+        :param right_hand_sides: The right-hand sides.
+        :type right_hand_sides: iterable of sequence of float
+        :return: One solution per right-hand side.
+        :rtype: list of array
+        """
+        return [self.solve(b) for b in right_hand_sides]
+
+
+def cholesky(matrix, positions=None):
+    """
+    Factorizes a sparse symmetric positive definite matrix with whichever of
+    `SkylineCholesky` in a `reverse_cuthill_mckee` ordering and
+    `SparseCholesky` in a `nested_dissection` ordering needs fewer operations.
+    The skyline wins on long, slender meshes, whose band stays narrow, and
+    the multifrontal factorization on everything wider.
+
+    :param matrix: The symmetric positive definite matrix to factorize.
+    :type matrix: SparseMatrix
+    :param positions: The ``(x, y, z)`` position of every unknown for the
+        nested dissection, or None.
+    :type positions: sequence of tuple of float or None
+    :rtype: SkylineCholesky or SparseCholesky
+    :raises ValueError: If the matrix is not positive definite, or is
+        singular to working precision.
+    """
+    banded = reverse_cuthill_mckee(matrix)
+    symbolic = _Supernodes(matrix, nested_dissection(matrix, positions))
+    if _envelope_work(matrix, banded) <= symbolic.work:
+        return SkylineCholesky(matrix, banded)
+    return SparseCholesky._from_supernodes(matrix, symbolic)
+
+
+def _elimination_tree(adjacency):
+    """
+    The parent of every node in the elimination tree of a symmetric graph,
+    or -1 for a root, by Liu's algorithm with path compression.
+    """
+    parent = [-1] * len(adjacency)
+    ancestor = [-1] * len(adjacency)
+    for node, adjacent in enumerate(adjacency):
+        for u in adjacent:
+            if u >= node:
+                break
+            while u != -1 and u != node:
+                following = ancestor[u]
+                ancestor[u] = node
+                if following == -1:
+                    parent[u] = node
+                u = following
+    return parent
+
+
+def _postorder(parent):
+    """
+    The nodes of a forest with every node after its descendants, and the
+    descendants of every node numbered together.
+    """
+    children = [[] for _ in parent]
+    roots = []
+    for node, above in enumerate(parent):
+        (children[above] if above >= 0 else roots).append(node)
+    order = []
+    for root in roots:
+        stack = [root]
+        visit = []
+        while stack:
+            node = stack.pop()
+            visit.append(node)
+            stack.extend(children[node])
+        visit.reverse()
+        order.extend(visit)
+    return order
+
+
+def conjugate_gradient(matrix, b, tolerance=1e-10, max_iterations=None):
+    """
+    Solves ``A x = b`` for a sparse symmetric positive definite matrix with the
+    Jacobi-preconditioned conjugate gradient method.
+
+    :param matrix: The symmetric positive definite matrix.
+    :type matrix: SparseMatrix
+    :param b: The right-hand side.
+    :type b: sequence of float
+    :param tolerance: The required residual norm relative to the norm of `b`.
+        Defaults to 1e-10.
+    :type tolerance: float
+    :param max_iterations: The iteration limit. Defaults to ten times the
+        number of unknowns.
+    :type max_iterations: int or None
+    :return: The solution.
+    :rtype: array
+    :raises ValueError: If the method does not converge within the limit.
+    """
+    size = matrix.shape[0]
+    if max_iterations is None:
+        max_iterations = 10 * size
+    inverse_diagonal = array('d', [1 / d if d else 1.0 for d in matrix.diagonal()])
+    x = array('d', bytes(8 * size))
+    r = array('d', b)
+    b_norm = math.sqrt(sum(map(mul, r, r)))
+    if b_norm == 0:
+        return x
+    z = array('d', map(mul, inverse_diagonal, r))
+    p = array('d', z)
+    rz = sum(map(mul, r, z))
+    for _ in range(max_iterations):
+        q = matrix.matvec(p)
+        alpha = rz / sum(map(mul, p, q))
+        x = array('d', [xi + alpha * pi for xi, pi in zip(x, p)])
+        r = array('d', [ri - alpha * qi for ri, qi in zip(r, q)])
+        if math.sqrt(sum(map(mul, r, r))) <= tolerance * b_norm:
+            return x
+        z = array('d', map(mul, inverse_diagonal, r))
+        rz_next = sum(map(mul, r, z))
+        beta = rz_next / rz
+        rz = rz_next
+        p = array('d', [zi + beta * pi for zi, pi in zip(z, p)])
+    raise ValueError(f"Conjugate gradient did not converge in {max_iterations} iterations")
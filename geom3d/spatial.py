@@ -0,0 +1,348 @@
+import heapq
+import math
+from itertools import product
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+
+
+class GridIndex:
+    def __init__(self, cell_size):
+        """
+        A spatial index that buckets points into a uniform grid of cubic cells.
+
+        Nearest-neighbour, k-nearest and radius queries only visit the cells
+        around the query point instead of measuring the distance to every
+        point, and points can be inserted and removed at any time. Points are
+        identified by the integer id returned when they are inserted.
+
+        :param cell_size: The edge length of a grid cell. A good choice is
+            about the typical spacing between points or the typical query radius.
+        :type cell_size: float
+        """
+        if not cell_size > 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._points = {}
+        self._cells = {}
+        self._next_id = 0
+        # Bounds of every cell ever occupied. They are not shrunk on removal,
+        # which only makes them conservative.
+        self._low = None
+        self._high = None
+
+    @classmethod
+    def from_points(cls, points: PointCloud, cell_size=None):
+        """
+        Builds an index over a cloud of points. Point `n` of the cloud gets id `n`.
+
+        :param points: The points to index.
+        :type points: PointCloud
+        :param cell_size: The grid cell size. Defaults to the edge of the cube
+            that would hold one point if the points filled their bounding box
+            evenly.
+        :type cell_size: float or None
+        :return: The populated index.
+        :rtype: GridIndex
+        """
+        if cell_size is None:
+            cell_size = _default_cell_size(points)
+        index = cls(cell_size)
+        index.insert_many(points)
+        return index
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, point_id):
+        return point_id in self._points
+
+    def _cell(self, x, y, z):
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size), math.floor(z / size)
+
+    def point(self, point_id):
+        """
+        The position of an indexed point.
+
+        :param point_id: The id returned by `insert`.
+        :type point_id: int
+        :rtype: Point
+        """
+        return Point(*self._points[point_id])
+
+    def insert(self, point: Point):
+        """
+        Adds a point to the index.
+
+        :param point: The point to add.
+        :type point: Point
+        :return: The id of the new point.
+        :rtype: int
+        """
+        point_id = self._next_id
+        self._next_id += 1
+        coordinates = (point.x, point.y, point.z)
+        self._points[point_id] = coordinates
+        self._add_to_cell(point_id, coordinates)
+        return point_id
+
+    def insert_many(self, points: PointCloud):
+        """
+        Adds every point of a cloud to the index.
+
+        :param points: The points to add.
+        :type points: PointCloud
+        :return: The ids of the new points, in cloud order.
+        :rtype: range
+        """
+        first = self._next_id
+        for point_id, coordinates in enumerate(zip(points.x, points.y, points.z), first):
+            self._points[point_id] = coordinates
+            self._add_to_cell(point_id, coordinates)
+        self._next_id = first + len(points)
+        return range(first, self._next_id)
+
+    def _add_to_cell(self, point_id, coordinates):
+        key = self._cell(*coordinates)
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = {point_id}
+            if self._low is None:
+                self._low, self._high = key, key
+            else:
+                self._low = tuple(map(min, self._low, key))
+                self._high = tuple(map(max, self._high, key))
+        else:
+            bucket.add(point_id)
+
+    def remove(self, point_id):
+        """
+        Removes a point from the index.
+
+        :param point_id: The id returned by `insert`.
+        :type point_id: int
+        :raises KeyError: If no point has that id.
+        """
+        coordinates = self._points.pop(point_id)
+        key = self._cell(*coordinates)
+        bucket = self._cells[key]
+        bucket.discard(point_id)
+        if not bucket:
+            del self._cells[key]
+
+    def _ring(self, center, radius):
+        """
+        Yields the occupied cells whose Chebyshev distance from `center` is
+        exactly `radius` cells.
+        """
+        cx, cy, cz = center
+        span = range(-radius, radius + 1)
+        for dx, dy, dz in product(span, span, span):
+            if max(abs(dx), abs(dy), abs(dz)) == radius:
+                bucket = self._cells.get((cx + dx, cy + dy, cz + dz))
+                if bucket:
+                    yield bucket
+
+    def _rings_from(self, center, first):
+        """
+        Yields ``(radius, bucket)`` for every occupied cell whose Chebyshev
+        distance from `center` is at least `first` cells, nearest first.
+        """
+        cx, cy, cz = center
+        rings = []
+        for key, bucket in self._cells.items():
+            radius = max(abs(key[0] - cx), abs(key[1] - cy), abs(key[2] - cz))
+            if radius >= first:
+                rings.append((radius, key))
+        rings.sort()
+        for radius, key in rings:
+            yield radius, self._cells[key]
+
+    def _max_ring(self, center):
+        """
+        The largest ring around `center` that can still hold a point.
+        """
+        if not self._cells:
+            return -1
+        return max(max(abs(low - c), abs(high - c)) for low, high, c in zip(self._low, self._high, center))
+
+    def _distance(self, point_id, x, y, z):
+        px, py, pz = self._points[point_id]
+        delta_x = px - x
+        delta_y = py - y
+        delta_z = pz - z
+        return math.sqrt(delta_x * delta_x + delta_y * delta_y + delta_z * delta_z)
+
+    def _collect(self, best, k, bucket, x, y, z):
+        """
+        Adds the points of a cell to a max-heap of the `k` best candidates.
+        """
+        for point_id in bucket:
+            entry = (-self._distance(point_id, x, y, z), -point_id)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+    def k_nearest(self, point: Point, k):
+        """
+        Finds the `k` indexed points closest to a point.
+
+        :param point: The query point.
+        :type point: Point
+        :param k: The number of neighbours to find.
+        :type k: int
+        :return: Up to `k` pairs of ``(id, distance)``, closest first.
+        :rtype: list of tuple of (int, float)
+        """
+        if k < 1:
+            return []
+        x, y, z = point.x, point.y, point.z
+        center = self._cell(x, y, z)
+        last_ring = self._max_ring(center)
+        # Max-heap of the best candidates so far, as (-distance, -id).
+        best = []
+        ring = 0
+        while ring <= last_ring:
+            if (2 * ring + 1) ** 3 > 4 * len(self._cells):
+                # The rings left hold more empty cells than there are occupied
+                # ones: visit the occupied cells in ring order instead, which
+                # also skips the empty rings between the query and the points.
+                for cell_ring, bucket in self._rings_from(center, ring):
+                    if cell_ring > ring:
+                        if len(best) == k and -best[0][0] <= (cell_ring - 1) * self.cell_size:
+                            break
+                        ring = cell_ring
+                    self._collect(best, k, bucket, x, y, z)
+                break
+            for bucket in self._ring(center, ring):
+                self._collect(best, k, bucket, x, y, z)
+            # Every point outside the rings searched so far is at least this far away.
+            if len(best) == k and -best[0][0] <= ring * self.cell_size:
+                break
+            ring += 1
+        return [(-negative_id, -negative_distance) for negative_distance, negative_id in sorted(best, reverse=True)]
+
+    def nearest(self, point: Point):
+        """
+        Finds the indexed point closest to a point.
+
+        :param point: The query point.
+        :type point: Point
+        :return: The ``(id, distance)`` of the nearest point, or None if the
+            index is empty.
+        :rtype: tuple of (int, float) or None
+        """
+        found = self.k_nearest(point, 1)
+        return found[0] if found else None
+
+    def within_radius(self, point: Point, radius):
+        """
+        Finds every indexed point within a distance of a point.
+
+        :param point: The query point.
+        :type point: Point
+        :param radius: The search radius. Points exactly at this distance are
+            included.
+        :type radius: float
+        :return: The ids of the points found, in ascending order.
+        :rtype: list of int
+        """
+        x, y, z = point.x, point.y, point.z
+        low = self._cell(x - radius, y - radius, z - radius)
+        high = self._cell(x + radius, y + radius, z + radius)
+        found = []
+        for key in self._cells_between(low, high):
+            for point_id in self._cells[key]:
+                if self._distance(point_id, x, y, z) <= radius:
+                    found.append(point_id)
+        found.sort()
+        return found
+
+    def find_equal(self, point: Point, tolerance=1e-10):
+        """
+        Finds every indexed point that matches a point coordinate by coordinate,
+        using the same test as `Point.__eq__` (each coordinate differs by less
+        than `tolerance`).
+
+        :param point: The query point.
+        :type point: Point
+        :param tolerance: The per-coordinate tolerance. Defaults to 1e-10.
+        :type tolerance: float
+        :return: The ids of the matching points, in ascending order.
+        :rtype: list of int
+        """
+        x, y, z = point.x, point.y, point.z
+        low = self._cell(x - tolerance, y - tolerance, z - tolerance)
+        high = self._cell(x + tolerance, y + tolerance, z + tolerance)
+        found = []
+        for key in self._cells_between(low, high):
+            for point_id in self._cells[key]:
+                px, py, pz = self._points[point_id]
+                if abs(px - x) < tolerance and abs(py - y) < tolerance and abs(pz - z) < tolerance:
+                    found.append(point_id)
+        found.sort()
+        return found
+
+    def _cells_between(self, low, high):
+        """
+        Yields the keys of the occupied cells inside an inclusive box of cells.
+        """
+        volume = (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        if volume > len(self._cells):
+            for key in self._cells:
+                if low[0] <= key[0] <= high[0] and low[1] <= key[1] <= high[1] and low[2] <= key[2] <= high[2]:
+                    yield key
+            return
+        for key in product(range(low[0], high[0] + 1), range(low[1], high[1] + 1), range(low[2], high[2] + 1)):
+            if key in self._cells:
+                yield key
+
+    def nearest_many(self, points: PointCloud):
+        """
+        Finds the nearest indexed point to every point of a cloud.
+
+        :param points: The query points.
+        :type points: PointCloud
+        :return: One ``(id, distance)`` pair, or None, per query point.
+        :rtype: list
+        """
+        return [self.nearest(point) for point in points]
+
+    def k_nearest_many(self, points: PointCloud, k):
+        """
+        Finds the `k` nearest indexed points to every point of a cloud.
+
+        :param points: The query points.
+        :type points: PointCloud
+        :param k: The number of neighbours to find per query point.
+        :type k: int
+        :return: One list of ``(id, distance)`` pairs per query point.
+        :rtype: list of list
+        """
+        return [self.k_nearest(point, k) for point in points]
+
+    def within_radius_many(self, points: PointCloud, radius):
+        """
+        Finds the indexed points within a distance of every point of a cloud.
+
+        :param points: The query points.
+        :type points: PointCloud
+        :param radius: The search radius.
+        :type radius: float
+        :return: One sorted list of ids per query point.
+        :rtype: list of list of int
+        """
+        return [self.within_radius(point, radius) for point in points]
+
+
+def _default_cell_size(points):
+    if len(points) == 0:
+        return 1.0
+    extents = [max(values) - min(values) for values in (points.x, points.y, points.z)]
+    occupied = [extent for extent in extents if extent > 0]
+    if not occupied:
+        return 1.0
+    volume = math.prod(occupied)
+    return (volume / len(points)) ** (1 / len(occupied))
@@ -0,0 +1,177 @@
+import csv
+import sys
+from array import array
+from itertools import islice
+
+from geom3d.point_cloud import PointCloud
+from geom3d.vector_array import VectorArray
+
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def read_csv(path, batch_type=PointCloud, chunk_size=65536, columns=(0, 1, 2), skip_rows=0, delimiter=','):
+    """
+    Reads x, y, z triples from a CSV file in fixed-size chunks.
+
+    Only one chunk is held in memory at a time, so peak memory depends on
+    `chunk_size` and not on the size of the file. Blank lines are skipped.
+
+    :param path: The file to read.
+    :type path: str or os.PathLike
+    :param batch_type: The batch type to yield, `PointCloud` or `VectorArray`.
+    :type batch_type: type
+    :param chunk_size: The number of rows in each batch.
+    :type chunk_size: int
+    :param columns: The indices of the three columns holding the coordinates.
+    :type columns: tuple of (int, int, int)
+    :param skip_rows: The number of leading rows to skip, such as a header.
+    :type skip_rows: int
+    :param delimiter: The column delimiter.
+    :type delimiter: str
+    :return: Batches of at most `chunk_size` rows.
+    :rtype: iterator of PointCloud or VectorArray
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    a, b, c = columns
+    with open(path, newline='') as file:
+        rows = (row for row in islice(csv.reader(file, delimiter=delimiter), skip_rows, None) if row)
+        while True:
+            data = array('d')
+            for row in islice(rows, chunk_size):
+                data.append(float(row[a]))
+                data.append(float(row[b]))
+                data.append(float(row[c]))
+            if not data:
+                return
+            yield batch_type(data)
+
+
+def read_binary(path, batch_type=PointCloud, chunk_size=65536):
+    """
+    Reads x, y, z triples from a raw little-endian float64 file in fixed-size
+    chunks. The file holds nothing but consecutive triples.
+
+    :param path: The file to read.
+    :type path: str or os.PathLike
+    :param batch_type: The batch type to yield, `PointCloud` or `VectorArray`.
+    :type batch_type: type
+    :param chunk_size: The number of triples in each batch.
+    :type chunk_size: int
+    :return: Batches of at most `chunk_size` triples.
+    :rtype: iterator of PointCloud or VectorArray
+    :raises ValueError: If the file does not hold a whole number of triples.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    with open(path, 'rb') as file:
+        while True:
+            raw = file.read(24 * chunk_size)
+            if not raw:
+                return
+            if len(raw) % 24:
+                raise ValueError(f"{path} does not hold a whole number of float64 triples")
+            data = array('d')
+            data.frombytes(raw)
+            if _BIG_ENDIAN:
+                data.byteswap()
+            yield batch_type(data)
+
+
+def _flat(batch, width):
+    """
+    Returns the flat float buffer of a batch type, or the batch itself when it
+    is already a flat sequence of floats.
+    """
+    if isinstance(batch, (PointCloud, VectorArray)):
+        if width != 3:
+            raise ValueError(f"Writer expects rows of {width} values, batches have 3")
+        return batch.data
+    if len(batch) % width:
+        raise ValueError(f"Expected a multiple of {width} values, got {len(batch)}")
+    return batch
+
+
+class CsvWriter:
+    def __init__(self, path, width=3, header=None, delimiter=','):
+        """
+        Writes batches of rows to a CSV file as they are produced, so results
+        never have to be collected in memory first. Use as a context manager.
+
+        :param path: The file to write.
+        :type path: str or os.PathLike
+        :param width: The number of values per row. Defaults to 3.
+        :type width: int
+        :param header: Optional column names written as the first row.
+        :type header: sequence of str or None
+        :param delimiter: The column delimiter.
+        :type delimiter: str
+        """
+        self.width = width
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file, delimiter=delimiter)
+        if header is not None:
+            self._writer.writerow(header)
+
+    def write(self, batch):
+        """
+        Appends a batch of rows.
+
+        :param batch: A `PointCloud` or `VectorArray`, or a flat sequence of
+            floats holding whole rows of `width` values.
+        :type batch: PointCloud or VectorArray or sequence of float
+        """
+        data = _flat(batch, self.width)
+        width = self.width
+        self._writer.writerows(
+            [repr(float(v)) for v in data[start:start + width]]
+            for start in range(0, len(data), width)
+        )
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BinaryWriter:
+    def __init__(self, path, width=3):
+        """
+        Writes batches of rows to a raw little-endian float64 file as they are
+        produced. Use as a context manager.
+
+        :param path: The file to write.
+        :type path: str or os.PathLike
+        :param width: The number of values per row. Defaults to 3.
+        :type width: int
+        """
+        self.width = width
+        self._file = open(path, 'wb')
+
+    def write(self, batch):
+        """
+        Appends a batch of rows.
+
+        :param batch: A `PointCloud` or `VectorArray`, or a flat sequence of
+            floats holding whole rows of `width` values.
+        :type batch: PointCloud or VectorArray or sequence of float
+        """
+        data = _flat(batch, self.width)
+        if _BIG_ENDIAN or not isinstance(data, (array, memoryview)):
+            data = array('d', data)
+            if _BIG_ENDIAN:
+                data.byteswap()
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,303 @@
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import types
+from array import array
+from collections import OrderedDict
+
+from geom3d.batch import run_batch
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def _doubles(digest, tag, values):
+    data = array('d', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    digest.update(tag + struct.pack('<q', len(data)))
+    digest.update(data.tobytes())
+
+
+def _feed(digest, value):
+    """
+    Feeds a canonical, type-tagged encoding of `value` into `digest`.
+    """
+    if value is None:
+        digest.update(b'N')
+    elif isinstance(value, bool):
+        digest.update(b'B1' if value else b'B0')
+    elif isinstance(value, int):
+        digest.update(b'I' + str(value).encode() + b';')
+    elif isinstance(value, float):
+        digest.update(b'F' + struct.pack('<d', value))
+    elif isinstance(value, str):
+        encoded = value.encode()
+        digest.update(b'S' + struct.pack('<q', len(encoded)) + encoded)
+    elif isinstance(value, bytes):
+        digest.update(b'Y' + struct.pack('<q', len(value)) + value)
+    elif isinstance(value, Vector):
+        digest.update(b'V' + struct.pack('<3d', value.i, value.j, value.k))
+    elif isinstance(value, Point):
+        digest.update(b'P' + struct.pack('<3d', value.x, value.y, value.z))
+    elif isinstance(value, VectorArray):
+        _doubles(digest, b'A', value.data)
+    elif isinstance(value, PointCloud):
+        _doubles(digest, b'C', value.data)
+    elif isinstance(value, (array, memoryview)):
+        _doubles(digest, b'D', value)
+    elif isinstance(value, Truss):
+        digest.update(b'T')
+        _doubles(digest, b'C', value.joints.data)
+        _feed(digest, value.members)
+        _doubles(digest, b'D', value.stiffnesses)
+        _feed(digest, value.supports)
+        _doubles(digest, b'A', value.loads.data)
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'L' + struct.pack('<q', len(value)))
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        # Order entries by the hash of their key, so equal mappings built in a
+        # different order hash the same.
+        entries = []
+        for key, item in value.items():
+            key_digest = hashlib.blake2b(digest_size=16)
+            _feed(key_digest, key)
+            entries.append((key_digest.digest(), item))
+        digest.update(b'M' + struct.pack('<q', len(entries)))
+        for key, item in sorted(entries, key=lambda entry: entry[0]):
+            digest.update(key)
+            _feed(digest, item)
+    else:
+        raise TypeError(f"Cannot hash values of type {type(value).__name__}")
+
+
+def _feed_code(digest, code):
+    """
+    Feeds the bytecode, referenced names and constants of a code object, and
+    of the code objects nested in it, into `digest`.
+    """
+    _feed(digest, code.co_code)
+    _feed(digest, code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _feed_code(digest, constant)
+        else:
+            _feed(digest, repr(constant))
+
+
+def geometry_hash(*values):
+    """
+    A stable content hash of geometry, loads and parameters.
+
+    Equal inputs give the same hash in every process and on every platform:
+    numbers are hashed by their exact binary value and type, containers by
+    their contents, and mappings independently of insertion order. Supported
+    values are None, bool, int, float, str, bytes, `Vector`, `Point`,
+    `VectorArray`, `PointCloud`, float arrays, `Truss` and lists, tuples and
+    dicts of these.
+
+    :return: A 32 character hexadecimal digest.
+    :rtype: str
+    :raises TypeError: If a value of another type is given.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _feed(digest, values)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=100_000, directory=None):
+        """
+        A content-addressed store of result rows with least recently used
+        eviction and an optional on-disk tier.
+
+        Entries evicted from memory stay on disk when a directory is given, and
+        are read back on the next lookup, so a cache directory can be shared
+        between runs and processes. Rows are stored as raw little-endian
+        float64 values, one file per key.
+
+        :param max_entries: The number of rows kept in memory.
+        :type max_entries: int
+        :param directory: Where to store every row on disk, or None to keep
+            rows in memory only.
+        :type directory: str or os.PathLike or None
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.directory = None if directory is None else os.fspath(directory)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.f64')
+
+    def get(self, key):
+        """
+        Looks up a row, counting a hit or a miss.
+
+        :param key: The hash the row was stored under.
+        :type key: str
+        :return: The row, or None if it is not cached.
+        :rtype: tuple of float or None
+        """
+        row = self._entries.get(key)
+        if row is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            row = self._read(key)
+            if row is not None:
+                self._remember(key, row)
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), 'rb') as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return None
+        if len(data) % 8:
+            return None
+        values = array('d')
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return tuple(values)
+
+    def _remember(self, key, row):
+        self._entries[key] = row
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, key, row):
+        """
+        Stores a row, in memory and on disk when a directory was given.
+
+        :param key: The hash to store the row under.
+        :type key: str
+        :param row: The result row.
+        :type row: sequence of float
+        """
+        row = tuple(float(value) for value in row)
+        self._remember(key, row)
+        if self.directory is not None:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            values = array('d', row)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            # Write to a temporary file and rename it, so concurrent readers
+            # never see a partial row.
+            handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    file.write(values.tobytes())
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+
+    def clear(self):
+        """
+        Empties the in-memory tier. Rows on disk are kept.
+        """
+        self._entries.clear()
+
+
+def sweep(function, grid, output_width, context=(), cache=None, workers=0, chunk_size=1024, progress=None,
+          version=None):
+    """
+    Runs a statics function over a grid of parameter values, computing only
+    the points that are not cached yet.
+
+    Every grid point is looked up under the hash of the function's name and
+    code, `version`, the `context` and the point's own values, so repeating or
+    extending a sweep over the same model only runs the new points, and the
+    same point appearing twice is computed once. The points left over are run
+    with `run_batch`, in this process or across a pool of workers.
+
+    Editing the function's own body invalidates its cached rows, but editing
+    the helpers it calls does not: change `version` whenever the results
+    would change for any other reason, so a shared cache directory never
+    serves stale rows.
+
+    :param function: A picklable (module level) function taking one grid
+        point and returning `output_width` floats, as for `run_batch`.
+    :type function: callable
+    :param grid: The parameter values of every point, all of the same length,
+        for example ``itertools.product(spans, loads)``.
+    :type grid: iterable of sequence of float
+    :param output_width: The number of floats returned for every point.
+    :type output_width: int
+    :param context: Everything else the results depend on, such as the base
+        geometry and loads, accepted by `geometry_hash`.
+    :param cache: Where results are cached. Defaults to a new in-memory
+        `ResultCache`, which only removes duplicate points.
+    :type cache: ResultCache or None
+    :param workers: The number of worker processes for the points that are
+        not cached, as for `run_batch`. Defaults to zero, running them here.
+    :type workers: int or None
+    :param chunk_size: The number of points sent to a worker at a time.
+    :type chunk_size: int
+    :param progress: Called as ``progress(done, total)`` while the points that
+        are not cached are computed.
+    :type progress: callable or None
+    :param version: Anything accepted by `geometry_hash` that identifies the
+        current revision of the computation, such as ``"2024-06-01"`` or ``3``.
+    :return: One result row per grid point, in grid order.
+    :rtype: list of tuple of float
+    """
+    if cache is None:
+        cache = ResultCache()
+    rows = [tuple(float(value) for value in row) for row in grid]
+    if not rows:
+        return []
+    width = len(rows[0])
+    base = hashlib.blake2b(digest_size=16)
+    _feed(base, (getattr(function, '__module__', None), getattr(function, '__qualname__', None), output_width))
+    code = getattr(function, '__code__', None)
+    if code is not None:
+        _feed_code(base, code)
+    _feed(base, version)
+    _feed(base, context)
+    results = [None] * len(rows)
+    missing = {}
+    for index, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(f"Expected {width} parameters per point, got {len(row)}")
+        digest = base.copy()
+        _doubles(digest, b'D', row)
+        key = digest.hexdigest()
+        if key in missing:
+            missing[key].append(index)
+            continue
+        cached = cache.get(key)
+        if cached is not None and len(cached) == output_width:
+            results[index] = cached
+        else:
+            missing[key] = [index]
+    if not missing:
+        return results
+    jobs = [rows[indices[0]] for indices in missing.values()]
+    computed = run_batch(function, jobs, width, output_width, workers=workers, chunk_size=chunk_size,
+                         progress=progress)
+    for (key, indices), row in zip(missing.items(), computed):
+        cache.put(key, row)
+        for index in indices:
+            results[index] = row
+    return results
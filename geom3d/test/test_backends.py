@@ -0,0 +1,204 @@
+import os
+import random
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+from geom3d import backends
+from geom3d.backends import BACKENDS
+from geom3d.backends import PythonBackend
+from geom3d.backends import available_backends
+from geom3d.backends import get_backend
+from geom3d.backends import set_backend
+from geom3d.backends import use_backend
+from geom3d.nums import all_close
+from geom3d.nums import close_enough_mask
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.sparse import SparseMatrix
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+REFERENCE = PythonBackend()
+
+# Row counts below and well above NumpyBackend.min_size.
+SIZES = [0, 5, 400]
+
+
+def random_values(count, seed):
+    generator = random.Random(seed)
+    return VectorArray([generator.uniform(-10, 10) for _ in range(3 * count)]).data
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    try:
+        with use_backend(request.param) as selected:
+            yield selected
+    except ImportError as error:
+        pytest.skip(f"{request.param} backend not available: {error}")
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"n={size}")
+def size(request):
+    return request.param
+
+
+def run_fresh(statement, **variables):
+    """
+    Prints what `statement` prints in a new interpreter that imports geom3d
+    from this tree, without the backend environment variable unless given.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(backends.__file__))))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get('PYTHONPATH')))))
+    environment.pop(backends.ENVIRONMENT_VARIABLE, None)
+    environment.update(variables)
+    return subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True,
+                          env=environment).stdout.strip()
+
+
+def assert_agrees(result, expected):
+    assert type(result) is type(expected)
+    assert all_close(result, expected)
+
+
+class TestConformance:
+    def test_elementwise(self, backend, size):
+        a, b = random_values(size, 1), random_values(size, 2)
+        row = (1.5, -2.0, 0.25)
+        for name in ('add', 'subtract'):
+            assert_agrees(getattr(backend, name)(a, b), getattr(REFERENCE, name)(a, b))
+            assert_agrees(getattr(backend, name)(a, row), getattr(REFERENCE, name)(a, row))
+            assert_agrees(getattr(backend, name)(row, a), getattr(REFERENCE, name)(row, a))
+
+    def test_scale(self, backend, size):
+        a = random_values(size, 1)
+        factors = list(random_values(size, 2)[:size])
+        assert_agrees(backend.scale(a, 2.5), REFERENCE.scale(a, 2.5))
+        assert_agrees(backend.scale(a, 3), REFERENCE.scale(a, 3))
+        assert_agrees(backend.scale(a, factors), REFERENCE.scale(a, factors))
+
+    def test_products(self, backend, size):
+        a, b = random_values(size, 1), random_values(size, 2)
+        row = (0.5, 4.0, -1.0)
+        for name in ('dot', 'cross', 'distance'):
+            assert_agrees(getattr(backend, name)(a, b), getattr(REFERENCE, name)(a, b))
+            assert_agrees(getattr(backend, name)(a, row), getattr(REFERENCE, name)(a, row))
+        assert_agrees(backend.norm(a), REFERENCE.norm(a))
+
+    def test_unit_and_make_length(self, backend, size):
+        # A zero row, a row below the tolerance and one just above it.
+        a = array('d', (0.0, 0.0, 0.0, 5e-11, -5e-11, 2e-11, 2e-10, 0.0, 0.0)) + random_values(size, 1)
+        lengths = list(random_values(size + 3, 2)[:size + 3])
+        assert backend.unit(a, 1e-10) == REFERENCE.unit(a, 1e-10)
+        for length in (2.5, 3, lengths):
+            assert backend.make_length(a, length, 1e-10) == REFERENCE.make_length(a, length, 1e-10)
+
+    def test_pairwise_distances(self, backend, size):
+        a, b = random_values(size, 1), random_values(60, 2)
+        rows = backend.pairwise_distances(a, b)
+        expected = REFERENCE.pairwise_distances(a, b)
+        assert len(rows) == len(expected)
+        for row, expected_row in zip(rows, expected):
+            assert_agrees(row, expected_row)
+
+    def test_masks(self, backend, size):
+        a = random_values(size, 1)
+        b = REFERENCE.add(a, (1e-11, -1e-9, 0.0))
+        for tolerance, rel_tolerance in ((1e-10, 0.0), (1e-12, 1e-10), (0.5, 0.0)):
+            assert backend.close_enough_mask(a, b, tolerance, rel_tolerance) == \
+                REFERENCE.close_enough_mask(a, b, tolerance, rel_tolerance)
+            assert backend.close_enough_mask(a, 1.0, tolerance, rel_tolerance) == \
+                REFERENCE.close_enough_mask(a, 1.0, tolerance, rel_tolerance)
+            assert backend.all_close(a, b, tolerance, rel_tolerance) == \
+                REFERENCE.all_close(a, b, tolerance, rel_tolerance)
+        assert backend.close_to_zero_mask(b, 1e-9) == REFERENCE.close_to_zero_mask(b, 1e-9)
+
+    def test_nan_is_never_close(self, backend):
+        values = [float('nan')] * 300
+        assert backend.close_enough_mask(values, values, 1e-10, 0.0) == [False] * 300
+        assert not backend.all_close(values, values, 1e-10, 0.0)
+
+    def test_batch_types(self, backend, size):
+        vectors = VectorArray(random_values(size, 1))
+        points = PointCloud(random_values(size, 2))
+        with use_backend('python'):
+            expected = (vectors.cross(Vector(1, 2, 3)).unit, vectors.dot(vectors), points.distance_to(Point(1, 0, 0)),
+                        points.make_vector(Point(1, 0, 0)), close_enough_mask(vectors.data, 0.0, 5.0))
+        result = (vectors.cross(Vector(1, 2, 3)).unit, vectors.dot(vectors), points.distance_to(Point(1, 0, 0)),
+                  points.make_vector(Point(1, 0, 0)), close_enough_mask(vectors.data, 0.0, 5.0))
+        assert result[0] == expected[0]
+        assert all_close(result[1], expected[1])
+        assert all_close(result[2], expected[2])
+        assert result[3] == expected[3]
+        assert result[4] == expected[4]
+
+    def test_sparse_matvec(self, backend, size):
+        generator = random.Random(size)
+        matrix = SparseMatrix.from_triplets([generator.randrange(size) for _ in range(4 * size)],
+                                            [generator.randrange(size) for _ in range(4 * size)],
+                                            random_values(2 * size, 1)[:4 * size], (size, size))
+        x = random_values(size, 2)[:size]
+        assert_agrees(backend.sparse_matvec(matrix.indptr, matrix.indices, matrix.values, x),
+                      REFERENCE.sparse_matvec(matrix.indptr, matrix.indices, matrix.values, x))
+
+    @pytest.mark.parametrize('front_size, pivots', [(3, 2), (20, 8), (20, 20)])
+    def test_multifrontal_kernels(self, backend, front_size, pivots):
+        generator = random.Random(front_size + pivots)
+        columns = [[generator.uniform(-1, 1) for _ in range(front_size)] for _ in range(front_size)]
+        front = array('d', [
+            sum(a * b for a, b in zip(columns[r], columns[c])) + (front_size if r == c else 0.0)
+            for r in range(front_size) for c in range(front_size)
+        ])
+        diagonal = [front[r * front_size + r] for r in range(pivots)]
+        factor, update = backend.eliminate(array('d', front), front_size, pivots, diagonal, 1e-12)
+        expected_factor, expected_update = REFERENCE.eliminate(array('d', front), front_size, pivots, diagonal, 1e-12)
+        assert_agrees(factor, expected_factor)
+        count = front_size - pivots
+        assert all_close([update[a * count + b] for a in range(count) for b in range(a + 1)],
+                         [expected_update[a * count + b] for a in range(count) for b in range(a + 1)])
+
+        positions = sorted(generator.sample(range(front_size), count))
+        result, expected = array('d', front), array('d', front)
+        backend.extend_add(result, front_size, expected_update, positions)
+        REFERENCE.extend_add(expected, front_size, expected_update, positions)
+        assert all_close([result[r * front_size + c] for r in range(front_size) for c in range(r + 1)],
+                         [expected[r * front_size + c] for r in range(front_size) for c in range(r + 1)])
+
+    @pytest.mark.parametrize('front_size', [2, 12])
+    def test_eliminate_rejects_singular_fronts(self, backend, front_size):
+        front = array('d', [1.0] * (front_size * front_size))
+        with pytest.raises(ValueError):
+            backend.eliminate(front, front_size, front_size, [1.0] * front_size, 1e-12)
+
+    def test_memoryview_buffers(self, backend):
+        data = memoryview(random_values(200, 1))
+        assert_agrees(backend.norm(data), REFERENCE.norm(data))
+        assert_agrees(backend.distance(data, data[::-1]), REFERENCE.distance(data, data[::-1]))
+
+
+class TestSelection:
+    def test_python_always_available(self):
+        assert 'python' in available_backends()
+
+    def test_use_backend_restores(self):
+        before = get_backend()
+        with use_backend('python') as backend:
+            assert get_backend() is backend
+        assert get_backend() is before
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            set_backend('fortran')
+
+    def test_environment_variable(self):
+        statement = 'from geom3d.backends import get_backend; print(get_backend().name)'
+        assert run_fresh(statement) == 'python'
+        assert run_fresh(statement, **{backends.ENVIRONMENT_VARIABLE: 'python'}) == 'python'
+
+    def test_optional_dependencies_not_imported(self):
+        statement = 'import sys; from geom3d.vector_array import VectorArray; VectorArray([1, 2, 3]).norm; ' \
+                    'print("numpy" in sys.modules or "numba" in sys.modules)'
+        assert run_fresh(statement) == 'False'
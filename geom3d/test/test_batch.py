@@ -0,0 +1,67 @@
+import pytest
+
+from geom3d.batch import run_batch
+from geom3d.points import Point
+from geom3d.vector import Vector
+
+
+def distance_and_moment(row):
+    point = Point(row[0], row[1], row[2])
+    force = Vector(row[3], row[4], row[5])
+    moment = Point(0, 0, 0).make_vector(point).cross(force)
+    return point.distance_to(Point(0, 0, 0)), moment.i, moment.j, moment.k
+
+
+def wrong_width(row):
+    return (1.0,)
+
+
+def make_jobs(count):
+    return [(float(n), 1.0, 0.0, 0.0, 0.0, float(n % 7)) for n in range(count)]
+
+
+def expected(jobs):
+    return [distance_and_moment(job) for job in jobs]
+
+
+class TestRunBatch:
+    def test_pool_preserves_order(self):
+        jobs = make_jobs(250)
+        results = list(run_batch(distance_and_moment, jobs, 6, 4, workers=2, chunk_size=16))
+        assert results == expected(jobs)
+
+    def test_inline(self):
+        jobs = make_jobs(10)
+        assert list(run_batch(distance_and_moment, jobs, 6, 4, workers=0, chunk_size=3)) == expected(jobs)
+
+    def test_generator_input(self):
+        jobs = make_jobs(40)
+        results = run_batch(distance_and_moment, (job for job in jobs), 6, 4, workers=2, chunk_size=7)
+        assert list(results) == expected(jobs)
+
+    def test_progress(self):
+        calls = []
+        list(run_batch(distance_and_moment, make_jobs(25), 6, 4, workers=2, chunk_size=10,
+                       progress=lambda done, total: calls.append((done, total))))
+        assert calls == [(10, 25), (20, 25), (25, 25)]
+
+    def test_progress_unknown_total(self):
+        calls = []
+        list(run_batch(distance_and_moment, iter(make_jobs(5)), 6, 4, workers=0, chunk_size=10,
+                       progress=lambda done, total: calls.append((done, total))))
+        assert calls == [(5, None)]
+
+    def test_empty(self):
+        assert list(run_batch(distance_and_moment, [], 6, 4, workers=2)) == []
+
+    def test_bad_input_width(self):
+        with pytest.raises(ValueError):
+            list(run_batch(distance_and_moment, [(1.0, 2.0)], 6, 4, workers=0))
+
+    def test_worker_error_propagates(self):
+        with pytest.raises(ValueError):
+            list(run_batch(wrong_width, make_jobs(3), 6, 4, workers=1))
+
+    def test_bad_chunk_size(self):
+        with pytest.raises(ValueError):
+            run_batch(distance_and_moment, [], 6, 4, chunk_size=0)
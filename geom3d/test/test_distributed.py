@@ -0,0 +1,177 @@
+import math
+
+import pytest
+
+from geom3d.distributed import LineLoad
+from geom3d.distributed import PressureLoad
+from geom3d.distributed import gauss_legendre
+from geom3d.forces import ForceSystem
+from geom3d.nums import are_close_enough
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def sine_load(points):
+    xs = points.data[0::3]
+    return VectorArray.from_components([0.0] * len(xs), [0.0] * len(xs), [-math.sin(x) for x in xs])
+
+
+def narrow_peak(center, width=0.01):
+    def intensity(points):
+        xs = points.data[0::3]
+        return VectorArray.from_components([0.0] * len(xs), [0.0] * len(xs),
+                                           [-math.exp(-((x - center) / width) ** 2) for x in xs])
+
+    return intensity
+
+
+class TestGaussLegendre:
+    @pytest.mark.parametrize('order', [1, 2, 3, 5, 8])
+    def test_exact_for_polynomials(self, order):
+        nodes, weights = gauss_legendre(order)
+        assert are_close_enough(sum(weights), 1.0)
+        for degree in range(2 * order):
+            integral = sum(w * x ** degree for x, w in zip(nodes, weights))
+            assert abs(integral - 1 / (degree + 1)) < 1e-13
+
+    def test_invalid_order(self):
+        with pytest.raises(ValueError):
+            gauss_legendre(0)
+
+
+class TestLineLoad:
+    def test_uniform(self):
+        result = LineLoad(Point(0, 0, 0), Point(10, 0, 0), Vector(0, 0, -2)).integrate()
+        assert result.force == Vector(0, 0, -20)
+        assert result.point == Point(5, 0, 0)
+        assert result.couple == Vector(0, 0, 0)
+
+    def test_triangular(self):
+        result = LineLoad.linear(Point(0, 0, 0), Point(6, 0, 0), Vector(0, 0, 0), Vector(0, 0, -3)).integrate()
+        assert result.force == Vector(0, 0, -9)
+        assert result.point == Point(4, 0, 0)
+
+    def test_small_load(self):
+        result = LineLoad(Point(0, 0, 0), Point(1, 0, 0), Vector(0, -1e-6, 0)).integrate()
+        assert result.force == Vector(0, -1e-6, 0)
+        assert result.point == Point(0.5, 0, 0)
+
+    def test_inclined_member_independent_of_origin(self):
+        start, end = Point(1, 2, 3), Point(4, 6, 3)
+        result = LineLoad(start, end, Vector(0, 0, -1)).integrate()
+        assert result.force == Vector(0, 0, -5)
+        assert result.point == Point(2.5, 4, 3)
+
+    def test_refines_until_tolerance(self):
+        loose = LineLoad(Point(0, 0, 0), Point(math.pi, 0, 0), sine_load).integrate(tolerance=1e-4)
+        tight = LineLoad(Point(0, 0, 0), Point(math.pi, 0, 0), sine_load).integrate(tolerance=1e-12)
+        assert tight.samples > loose.samples
+        assert abs(tight.force.k + 2) < 1e-11
+        assert tight.point == Point(math.pi / 2, 0, 0)
+
+    def test_field_called_once_per_level(self):
+        calls = []
+
+        def intensity(points):
+            calls.append(len(points))
+            return sine_load(points)
+
+        LineLoad(Point(0, 0, 0), Point(math.pi, 0, 0), intensity).integrate(tolerance=1e-10)
+        assert calls[0] == 3
+        assert all(count % 6 == 0 for count in calls[1:])
+        assert len(calls) < 10
+
+    @pytest.mark.parametrize('center', [1.1, 2.3, 5.5])
+    def test_narrow_peak(self, center):
+        # The samples of the first levels miss the peak.
+        result = LineLoad(Point(0, 0, 0), Point(6, 0, 0), narrow_peak(center)).integrate()
+        assert abs(result.force.k + 0.01 * math.sqrt(math.pi)) < 1e-12
+        assert result.point == Point(center, 0, 0)
+
+    def test_min_depth(self):
+        calls = []
+
+        def intensity(points):
+            calls.append(len(points))
+            return narrow_peak(4.05)(points)
+
+        # The peak falls between the samples of three successive levels.
+        assert LineLoad(Point(0, 0, 0), Point(6, 0, 0), narrow_peak(4.05)).integrate().force.k == 0
+        result = LineLoad(Point(0, 0, 0), Point(6, 0, 0), intensity).integrate(min_depth=8)
+        assert calls[0] == 3 * 2 ** 8
+        assert abs(result.force.k + 0.01 * math.sqrt(math.pi)) < 1e-12
+
+    def test_equivalent_forces(self):
+        result = LineLoad(Point(0, 0, 0), Point(math.pi, 0, 0), sine_load).integrate()
+        system = ForceSystem(result.system.forces, result.system.points)
+        assert system.moment_about(Point(0, 1, 0)) == result.moment_about(Point(0, 1, 0))
+
+    def test_antisymmetric_load_is_a_couple(self):
+        result = LineLoad.linear(Point(-1, 0, 0), Point(1, 0, 0), Vector(0, 0, 1), Vector(0, 0, -1)).integrate()
+        assert result.point is None
+        assert result.couple == Vector(0, 2 / 3, 0)
+
+    def test_sample_limit(self):
+        def spike(points):
+            xs = points.data[0::3]
+            return VectorArray.from_components([0.0] * len(xs), [0.0] * len(xs), [abs(x - 0.3) ** 0.5 for x in xs])
+
+        with pytest.raises(ValueError):
+            LineLoad(Point(0, 0, 0), Point(1, 0, 0), spike).integrate(tolerance=1e-15, max_samples=1000)
+
+    def test_wrong_field_length(self):
+        with pytest.raises(ValueError):
+            LineLoad(Point(0, 0, 0), Point(1, 0, 0), lambda points: VectorArray([0.0, 0.0, 1.0])).integrate()
+
+    def test_zero_length(self):
+        with pytest.raises(ValueError):
+            LineLoad(Point(1, 1, 1), Point(1, 1, 1), Vector(0, 0, -1))
+
+    def test_invalid_intensity(self):
+        with pytest.raises(TypeError):
+            LineLoad(Point(0, 0, 0), Point(1, 0, 0), "heavy")
+
+
+class TestPressureLoad:
+    def test_uniform_rectangle(self):
+        rectangle = [Point(0, 0, 0), Point(2, 0, 0), Point(2, 3, 0), Point(0, 3, 0)]
+        result = PressureLoad(rectangle, 5).integrate()
+        assert result.force == Vector(0, 0, -30)
+        assert result.point == Point(1, 1.5, 0)
+
+    def test_small_pressure(self):
+        rectangle = [Point(0, 0, 0), Point(2, 0, 0), Point(2, 3, 0), Point(0, 3, 0)]
+        result = PressureLoad(rectangle, 1e-7).integrate()
+        assert result.point == Point(1, 1.5, 0)
+
+    def test_vertex_order_sets_direction(self):
+        rectangle = [Point(0, 3, 0), Point(2, 3, 0), Point(2, 0, 0), Point(0, 0, 0)]
+        assert PressureLoad(rectangle, 5).integrate().force == Vector(0, 0, 30)
+
+    def test_hydrostatic_gate(self):
+        gate = [Point(0, 0, -4), Point(2, 0, -4), Point(2, 0, 0), Point(0, 0, 0)]
+        result = PressureLoad(gate, lambda points: [-9.81 * z for z in points.data[2::3]]).integrate()
+        assert result.force == Vector(0, 9.81 * 16, 0)
+        assert result.point == Point(1, 0, -8 / 3)
+
+    def test_non_convex_polygon(self):
+        # An L shape: the 2 x 2 square without its upper right 1 x 1 corner.
+        shape = [Point(0, 0, 0), Point(2, 0, 0), Point(2, 1, 0), Point(1, 1, 0), Point(1, 2, 0), Point(0, 2, 0)]
+        result = PressureLoad(shape, 1).integrate()
+        assert result.force == Vector(0, 0, -3)
+        assert result.point == Point(5 / 6, 5 / 6, 0)
+
+    def test_smooth_field_converges(self):
+        square = [Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0), Point(0, 1, 0)]
+        result = PressureLoad(square, lambda points: [math.exp(x) for x in points.data[0::3]]).integrate(1e-11)
+        assert abs(result.force.k + (math.e - 1)) < 1e-10
+        assert are_close_enough(result.point.x, 1 / (math.e - 1))
+
+    def test_invalid_polygons(self):
+        with pytest.raises(ValueError):
+            PressureLoad([Point(0, 0, 0), Point(1, 0, 0)], 1)
+        with pytest.raises(ValueError):
+            PressureLoad([Point(0, 0, 0), Point(1, 0, 0), Point(2, 0, 0)], 1)
+        with pytest.raises(ValueError):
+            PressureLoad([Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0), Point(0, 1, 1)], 1)
@@ -0,0 +1,95 @@
+import pytest
+
+from geom3d.forces import ForceSystem
+from geom3d.nums import are_close_enough
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def make_system():
+    system = ForceSystem()
+    system.add_load(Vector(0, 0, -10), Point(1, 0, 0))
+    system.add_load(Vector(0, 0, -10), Point(-1, 0, 0))
+    system.add_load(Vector(5, 0, 0), Point(0, 2, 0))
+    return system
+
+
+class TestResultant:
+    def test_empty(self):
+        system = ForceSystem()
+        assert len(system) == 0
+        assert system.resultant() == Vector(0, 0, 0)
+
+    def test_sum(self):
+        assert make_system().resultant() == Vector(5, 0, -20)
+
+    def test_batch_matches_single(self):
+        forces = VectorArray.from_vectors([Vector(1, 2, 3), Vector(-4, 0, 1)])
+        points = PointCloud.from_points([Point(1, 1, 1), Point(0, 2, -1)])
+        batch = ForceSystem(forces, points)
+        single = ForceSystem()
+        for force, point in zip(forces, points):
+            single.add_load(force, point)
+        assert batch.resultant() == single.resultant()
+        assert batch.moment_about(Point(3, 2, 1)) == single.moment_about(Point(3, 2, 1))
+
+    def test_mismatched_batch(self):
+        with pytest.raises(ValueError):
+            ForceSystem(VectorArray.from_vectors([Vector(1, 0, 0)]), PointCloud())
+
+    def test_incremental(self):
+        system = make_system()
+        system.add_loads(VectorArray.from_vectors([Vector(-5, 0, 20)]), PointCloud.from_points([Point(0, 0, 0)]))
+        assert len(system) == 4
+        assert system.resultant() == Vector(0, 0, 0)
+        assert len(system.forces) == len(system.points) == 4
+
+
+class TestMoment:
+    def test_about_origin(self):
+        # The two vertical loads cancel, the horizontal one gives r x F = (0, 2, 0) x (5, 0, 0)
+        assert make_system().moment_about() == Vector(0, 0, -10)
+
+    def test_about_point_matches_direct_sum(self):
+        system = make_system()
+        point = Point(1, 2, 3)
+        expected = Vector(0, 0, 0)
+        for force, at in zip(system.forces, system.points):
+            expected = expected + point.make_vector(at).cross(force)
+        assert system.moment_about(point) == expected
+
+
+class TestWrench:
+    def test_single_force_has_zero_pitch(self):
+        system = ForceSystem()
+        system.add_load(Vector(0, 0, 1), Point(2, 3, 5))
+        wrench = system.wrench()
+        assert are_close_enough(wrench.pitch, 0)
+        assert wrench.point == Point(2, 3, 0)
+
+    def test_moment_about_axis_point_is_parallel(self):
+        system = make_system()
+        wrench = system.wrench()
+        assert system.moment_about(wrench.point) == wrench.couple
+        assert wrench.couple.is_parallel(wrench.force)
+
+    def test_central_axis(self):
+        point, direction = make_system().central_axis()
+        assert are_close_enough(direction.norm, 1)
+        assert direction.is_parallel(Vector(5, 0, -20))
+
+    def test_small_resultant_has_central_axis(self):
+        system = ForceSystem()
+        system.add_load(Vector(0, 0, 1e-6), Point(2, 3, 5))
+        wrench = system.wrench()
+        assert wrench.point == Point(2, 3, 0)
+        assert wrench.force == Vector(0, 0, 1e-6)
+
+    def test_pure_couple(self):
+        system = ForceSystem()
+        system.add_load(Vector(1, 0, 0), Point(0, 1, 0))
+        system.add_load(Vector(-1, 0, 0), Point(0, -1, 0))
+        with pytest.raises(ValueError):
+            system.wrench()
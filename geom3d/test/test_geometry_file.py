@@ -0,0 +1,93 @@
+import struct
+
+import pytest
+
+from geom3d.geometry_file import GeometryFile
+from geom3d.geometry_file import write_geometry
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def write_model(path):
+    points = PointCloud.from_points([Point(0, 0, 0), Point(4, 0, 0), Point(2, 2, 0)])
+    vectors = VectorArray.from_vectors([Vector(0, -10, 0)])
+    write_geometry(path, points=points, vectors=vectors, members=[(0, 1), (0, 2), (1, 2)])
+    return points, vectors
+
+
+class TestGeometryFile:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        points, vectors = write_model(path)
+        with GeometryFile(path) as model:
+            assert (model.point_count, model.vector_count, model.member_count) == (3, 1, 3)
+            assert model.points == points
+            assert model.vectors == vectors
+            assert list(model.members) == [0, 1, 0, 2, 1, 2]
+            assert model.member(2) == (1, 2)
+
+    def test_views_are_zero_copy(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        write_model(path)
+        with GeometryFile(path) as model:
+            points = model.points
+            assert isinstance(points.data, memoryview)
+            assert list(points.distance_to(Point(0, 0, 0))) == [0, 4, 8 ** 0.5]
+            del points
+
+    def test_views_outlive_close(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        points, vectors = write_model(path)
+        model = GeometryFile(path)
+        cloud = model.points
+        model.close()
+        assert cloud[2] == Point(2, 2, 0)
+        with GeometryFile(path) as model:
+            loads, members = model.vectors, model.members
+        assert loads == vectors
+        assert list(members) == [0, 1, 0, 2, 1, 2]
+
+    def test_file_size(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        write_model(path)
+        assert path.stat().st_size == 64 + 3 * 24 + 24 + 3 * 8
+
+    def test_shared_by_several_readers(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        write_model(path)
+        with GeometryFile(path) as first, GeometryFile(path) as second:
+            assert first.points == second.points
+
+    def test_empty_sections(self, tmp_path):
+        path = tmp_path / "empty.g3d"
+        write_geometry(path)
+        with GeometryFile(path) as model:
+            assert len(model.points) == 0
+            assert len(model.vectors) == 0
+            with pytest.raises(IndexError):
+                model.member(0)
+
+    def test_not_a_geometry_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b'\0' * 64)
+        with pytest.raises(ValueError):
+            GeometryFile(path)
+
+    def test_truncated(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        write_model(path)
+        path.write_bytes(path.read_bytes()[:-4])
+        with pytest.raises(ValueError):
+            GeometryFile(path)
+
+    def test_unsupported_version(self, tmp_path):
+        path = tmp_path / "model.g3d"
+        path.write_bytes(struct.pack('<4sIQQQ', b'G3DM', 99, 0, 0, 0).ljust(64, b'\0'))
+        with pytest.raises(ValueError):
+            GeometryFile(path)
+
+    def test_odd_members(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_geometry(tmp_path / "bad.g3d", members=[(0, 1, 2)])
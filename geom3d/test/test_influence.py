@@ -0,0 +1,117 @@
+import pytest
+
+from geom3d.influence import InfluenceLines
+from geom3d.influence import LoadTrain
+from geom3d.nums import are_close_enough
+from geom3d.points import Point
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+
+DOWN = Vector(0, -1, 0)
+
+
+def make_pratt(panels, width=4.0, depth=3.0):
+    """
+    A planar Pratt truss in the xy plane, pinned at the left end and on a
+    roller at the right, returning the truss and its bottom chord joints.
+    """
+    truss = Truss()
+    bottom = [truss.add_joint(Point(width * i, 0, 0)) for i in range(panels + 1)]
+    top = [truss.add_joint(Point(width * i, depth, 0)) for i in range(1, panels)]
+    for a, b in zip(bottom, bottom[1:]):
+        truss.add_member(a, b)
+    for a, b in zip(top, top[1:]):
+        truss.add_member(a, b)
+    truss.add_member(bottom[0], top[0])
+    truss.add_member(top[-1], bottom[-1])
+    for i, joint in enumerate(top, start=1):
+        truss.add_member(bottom[i], joint)
+    for i in range(1, panels - 1):
+        if i < panels / 2:
+            truss.add_member(top[i - 1], bottom[i + 1])
+        else:
+            truss.add_member(bottom[i], top[i])
+    truss.add_support(bottom[0], x=True, y=True, z=False)
+    truss.add_support(bottom[-1], x=False, y=True, z=False)
+    return truss, bottom
+
+
+def direct_forces(truss, deck, lines, train, position):
+    truss.clear_loads()
+    for magnitude, offset in zip(train.magnitudes, train.offsets):
+        for station, share in lines._shares(position + offset):
+            truss.add_load(deck[station], DOWN.scaled_by(magnitude * share))
+    return truss.solve().member_forces
+
+
+class TestInfluenceLines:
+    def test_stations(self):
+        truss, deck = make_pratt(4)
+        lines = InfluenceLines(truss, deck, DOWN)
+        assert list(lines.stations) == [0, 4, 8, 12, 16]
+        assert lines.length == 16
+
+    def test_midspan_chord(self):
+        # The bottom chord from 4 to 8 is cut about the top joint at x = 4,
+        # where a unit load at midspan gives a moment of 0.5 * 4 over a depth 3.
+        truss, deck = make_pratt(4)
+        lines = InfluenceLines(truss, deck, DOWN)
+        chord = 1
+        assert are_close_enough(lines.at(chord, 8.0), 2 / 3)
+        assert are_close_enough(lines.line(chord)[0], 0.0)
+        assert are_close_enough(lines.at(chord, 2.0), lines.line(chord)[1] / 2)
+
+    def test_off_path_is_zero(self):
+        truss, deck = make_pratt(4)
+        lines = InfluenceLines(truss, deck, DOWN)
+        assert lines.at(0, -1.0) == 0.0
+        assert lines.at(0, 16.5) == 0.0
+
+    def test_short_path(self):
+        truss, deck = make_pratt(4)
+        with pytest.raises(ValueError):
+            InfluenceLines(truss, deck[:1], DOWN)
+
+
+class TestMovingLoads:
+    def test_forces_match_direct_solves(self):
+        truss, deck = make_pratt(6)
+        lines = InfluenceLines(truss, deck, DOWN)
+        train = LoadTrain([50, 100, 100], [0, -4.3, -8.6])
+        positions = [-1.0, 3.3, 10.0, 17.2, 24.0, 30.5]
+        for position, forces in zip(positions, lines.forces(train, positions)):
+            expected = direct_forces(truss, deck, lines, train, position)
+            assert all(abs(a - b) < 1e-9 for a, b in zip(forces, expected))
+
+    def test_positions_cover_entry_to_exit(self):
+        truss, deck = make_pratt(4)
+        lines = InfluenceLines(truss, deck, DOWN)
+        positions = lines.positions(LoadTrain([1, 1], [0, -2]), 0.5)
+        assert positions[0] == 0.0
+        assert positions[-1] == 18.0
+        with pytest.raises(ValueError):
+            lines.positions(LoadTrain([1], [0]), 0)
+
+    def test_envelope(self):
+        truss, deck = make_pratt(6)
+        lines = InfluenceLines(truss, deck, DOWN)
+        train = LoadTrain([50, 100], [0, -4])
+        positions = lines.positions(train, 0.25)
+        envelope = lines.envelope(train, positions)
+        rows = lines.forces(train, positions)
+        for member in range(truss.member_count):
+            column = [row[member] for row in rows]
+            assert envelope.maxima[member] == max(column)
+            assert envelope.minima[member] == min(column)
+            assert column[list(positions).index(envelope.max_positions[member])] == max(column)
+
+    def test_envelope_needs_positions(self):
+        truss, deck = make_pratt(4)
+        with pytest.raises(ValueError):
+            InfluenceLines(truss, deck, DOWN).envelope(LoadTrain([1], [0]), [])
+
+    def test_invalid_train(self):
+        with pytest.raises(ValueError):
+            LoadTrain([1, 2], [0])
+        with pytest.raises(ValueError):
+            LoadTrain([], [])
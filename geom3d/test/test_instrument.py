@@ -0,0 +1,115 @@
+import io
+import json
+
+import pytest
+
+from geom3d import instrument
+from geom3d import nums
+from geom3d import vector
+from geom3d.points import Point
+from geom3d.vector import Vector
+
+
+class TestEnableDisable:
+    def test_originals_restored(self):
+        cross = Vector.__dict__['cross']
+        norm = Vector.__dict__['norm']
+        are_close_enough = nums.are_close_enough
+        with instrument.recording():
+            assert Vector.__dict__['cross'] is not cross
+            assert vector.are_close_enough is not are_close_enough
+        assert Vector.__dict__['cross'] is cross
+        assert Vector.__dict__['norm'] is norm
+        assert nums.are_close_enough is are_close_enough
+        assert vector.are_close_enough is are_close_enough
+        assert not instrument.is_enabled()
+
+    def test_cannot_enable_twice(self):
+        with instrument.recording():
+            with pytest.raises(RuntimeError):
+                instrument.enable()
+        assert not instrument.is_enabled()
+
+    def test_disable_when_off(self):
+        assert instrument.disable() is None
+
+    def test_results_unchanged(self):
+        a, b = Vector(1, 2, 3), Vector(-1, 0, 2)
+        expected = a.cross(b).unit
+        with instrument.recording():
+            result = a.cross(b).unit
+        assert (result.i, result.j, result.k) == (expected.i, expected.j, expected.k)
+
+
+class TestRecorder:
+    def test_counts_calls(self):
+        with instrument.recording() as recorder:
+            a = Vector(1, 2, 3)
+            for _ in range(5):
+                a.cross(Vector(0, 0, 1))
+            Point(0, 0, 0).distance_to(Point(3, 4, 0))
+        summary = recorder.summary()
+        assert summary['Vector.cross']['calls'] == 5
+        assert summary['Point.distance_to']['calls'] == 1
+        assert summary['Vector.__init__']['calls'] == 11
+
+    def test_nested_calls_split_self_time(self):
+        with instrument.recording() as recorder:
+            Vector(3, 4, 0).unit
+        summary = recorder.summary()
+        unit = summary['Vector.unit']
+        assert unit['self_seconds'] <= unit['total_seconds']
+        assert summary['Vector.norm']['total_seconds'] <= unit['total_seconds']
+
+    def test_tolerance_checks_counted_through_imports(self):
+        with instrument.recording() as recorder:
+            Vector(1, 2, 3) == Vector(1, 2, 3.5)
+        assert recorder.summary()['nums.are_close_enough']['calls'] >= 1
+
+    def test_custom_operations(self):
+        with instrument.recording(operations={Vector: ('dot',)}, functions=()) as recorder:
+            Vector(1, 2, 3).dot(Vector(1, 1, 1))
+            Vector(1, 2, 3).cross(Vector(1, 1, 1))
+        assert list(recorder.summary()) == ['Vector.dot']
+
+    def test_exception_still_recorded(self):
+        with instrument.recording() as recorder:
+            with pytest.raises(ZeroDivisionError):
+                Vector(1, 0, 0).comp(Vector(0, 0, 0))
+            Vector(1, 0, 0).cross(Vector(0, 1, 0))
+        summary = recorder.summary()
+        assert summary['Vector.comp']['calls'] == 1
+        assert summary['Vector.cross']['calls'] == 1
+
+    def test_reset(self):
+        with instrument.recording() as recorder:
+            Vector(1, 2, 3)
+            recorder.reset()
+        assert recorder.summary() == {}
+
+
+class TestExport:
+    def record(self):
+        with instrument.recording() as recorder:
+            Vector(1, 2, 2).unit
+        return recorder
+
+    def test_json(self):
+        document = json.loads(self.record().to_json())
+        assert document['operations']['Vector.unit']['calls'] == 1
+        nested = [entry for entry in document['stacks'] if entry['stack'] == ['Vector.unit', 'Vector.norm']]
+        assert nested[0]['calls'] == 1
+
+    def test_folded(self):
+        text = self.record().to_folded()
+        stacks = dict(line.rsplit(' ', 1) for line in text.splitlines())
+        assert 'Vector.unit;Vector.norm' in stacks
+        assert all(value.isdigit() for value in stacks.values())
+
+    def test_write_to_file(self, tmp_path):
+        recorder = self.record()
+        recorder.to_json(tmp_path / 'profile.json')
+        buffer = io.StringIO()
+        recorder.to_folded(buffer)
+        assert json.loads((tmp_path / 'profile.json').read_text())['operations']
+        assert buffer.getvalue() == recorder.to_folded()
@@ -0,0 +1,146 @@
+import random
+from array import array
+
+import pytest
+
+from geom3d.lazy import LazyScalar
+from geom3d.lazy import LazyVector
+from geom3d.lazy import evaluate
+from geom3d.lazy import fuse
+from geom3d.lazy import lazy
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def random_vectors(count, seed):
+    generator = random.Random(seed)
+    return VectorArray([generator.uniform(-10, 10) for _ in range(3 * count)])
+
+
+def components(vector):
+    return vector.i, vector.j, vector.k
+
+
+class TestSingleVectors:
+    def test_builds_a_graph(self):
+        expression = lazy(Vector(1, 2, 3)).cross(Vector(0, 1, 0)) + Vector(1, 1, 1)
+        assert isinstance(expression, LazyVector)
+        assert isinstance(expression.norm, LazyScalar)
+
+    def test_identical_to_eager(self):
+        for a, b, c in zip(random_vectors(50, 1), random_vectors(50, 2), random_vectors(50, 3)):
+            eager = (a.cross(b) + c).scaled_by(2.5).unit
+            fused = (lazy(a).cross(b) + c).scaled_by(2.5).unit.evaluate()
+            assert components(fused) == components(eager)
+
+    def test_scalar_results(self):
+        a, b = Vector(1, 2, 3), Vector(-2, 0, 4)
+        assert lazy(a).dot(b).evaluate() == a.dot(b)
+        assert lazy(a).norm.evaluate() == a.norm
+        assert lazy(a).comp(b).evaluate() == a.comp(b)
+        assert (lazy(a).norm * 2 - 1).evaluate() == a.norm * 2 - 1
+
+    def test_zero_vector_matches_eager(self):
+        zero = Vector(0, 0, 0)
+        assert components(lazy(zero).unit.evaluate()) == components(zero.unit)
+        assert components(lazy(zero).make_length(3).evaluate()) == (0.0, 0.0, 0.0)
+
+    def test_make_length(self):
+        v = Vector(3, 4, 12)
+        assert components(lazy(v).make_length(2).evaluate()) == components(v.make_length(2))
+
+    def test_scalar_times_vector(self):
+        a, b = Vector(1, 2, 3), Vector(0, 0, 2)
+        assert components((lazy(a).dot(b) * b).evaluate()) == components(b.scaled_by(a.dot(b)))
+
+
+class TestBatches:
+    def test_identical_to_eager(self):
+        a, b = random_vectors(200, 4), random_vectors(200, 5)
+        c = Vector(1, -2, 0.5)
+        eager = (a.cross(b) + c).scaled_by(2.5).unit
+        fused = (lazy(a).cross(b) + c).scaled_by(2.5).unit.evaluate()
+        assert isinstance(fused, VectorArray)
+        assert list(fused.data) == list(eager.data)
+
+    def test_scalar_batch_results(self):
+        a, b = random_vectors(20, 6), random_vectors(20, 7)
+        assert lazy(a).dot(b).evaluate() == a.dot(b)
+        assert lazy(a).norm.evaluate() == a.norm
+
+    def test_per_row_factors(self):
+        a = random_vectors(10, 8)
+        factors = array('d', range(10))
+        assert list(lazy(a).scaled_by(factors).evaluate().data) == list(a.scaled_by(factors).data)
+
+    def test_mismatched_rows(self):
+        with pytest.raises(ValueError):
+            (lazy(random_vectors(3, 1)) + random_vectors(4, 2)).evaluate()
+
+
+class TestSharing:
+    def test_common_subexpressions_computed_once(self):
+        a, b = random_vectors(5, 1), random_vectors(5, 2)
+        cross = lazy(a).cross(b)
+        again = lazy(a).cross(b)
+        expression = cross.unit.scaled_by(again.norm)
+        assert expression.source.count('sqrt(') == 1
+        assert expression.source.count(' * n1_2 - ') == 1
+
+    def test_evaluate_shares_across_outputs(self):
+        a = random_vectors(5, 3)
+        direction = lazy(a).unit
+        unit, norm = evaluate(direction, lazy(a).norm)
+        assert list(unit.data) == list(a.unit.data)
+        assert norm == a.norm
+
+    def test_row_independent_terms_hoisted(self):
+        source = (lazy(random_vectors(5, 1)) + lazy(Vector(1, 2, 3)).cross(Vector(0, 0, 1))).source
+        loop = source[source.index('for '):]
+        assert ' * ' not in loop
+
+    def test_negative_zero_constant_kept_apart(self):
+        v = Vector(1, 1, 1)
+        result = (lazy(v).scaled_by(0.0) + lazy(v).scaled_by(-0.0)).evaluate()
+        assert components(result) == components(v.scaled_by(0.0) + v.scaled_by(-0.0))
+
+
+class TestFuse:
+    def test_matches_eager_for_single_and_batches(self):
+        @fuse
+        def direction(a, b, c, k):
+            return (a.cross(b) + c).scaled_by(k).unit
+
+        a, b = Vector(1, 2, 3), Vector(0, 1, 5)
+        c = Vector(2, 2, 2)
+        assert components(direction(a, b, c, 2.5)) == components((a.cross(b) + c).scaled_by(2.5).unit)
+        batch_a, batch_b = random_vectors(30, 1), random_vectors(30, 2)
+        fused = direction(batch_a, batch_b, c, 0.5)
+        assert list(fused.data) == list((batch_a.cross(batch_b) + c).scaled_by(0.5).unit.data)
+
+    def test_same_argument_twice_is_not_merged(self):
+        @fuse
+        def difference(a, b):
+            return a - b
+
+        v = Vector(1, 2, 3)
+        assert components(difference(v, v)) == (0, 0, 0)
+        assert components(difference(v, Vector(1, 1, 1))) == (0, 1, 2)
+
+    def test_multiple_outputs(self):
+        @fuse
+        def unit_and_norm(a):
+            return a.unit, a.norm
+
+        v = Vector(3, 4, 0)
+        unit, norm = unit_and_norm(v)
+        assert components(unit) == components(v.unit)
+        assert norm == 5.0
+
+    def test_must_return_expressions(self):
+        @fuse
+        def broken(a):
+            return 1.0
+
+        with pytest.raises(TypeError):
+            broken(Vector(1, 2, 3))
@@ -0,0 +1,132 @@
+import math
+import random
+
+import pytest
+
+from geom3d.mass_properties import MassProperties
+from geom3d.nums import are_close_enough
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.transforms import Rotation
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+CUBE_VERTICES = PointCloud.from_points([Point(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+# Vertex index is 4x + 2y + z; faces are counter-clockwise seen from outside.
+CUBE_FACES = [
+    (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+    (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+]
+
+
+def cloud(*points):
+    return PointCloud.from_points([Point(*point) for point in points])
+
+
+def assert_tensor(actual, expected, tolerance=1e-9):
+    for actual_row, expected_row in zip(actual, expected):
+        for a, e in zip(actual_row, expected_row):
+            assert abs(a - e) < tolerance
+
+
+class TestPrimitives:
+    def test_point_masses(self):
+        parts = MassProperties()
+        parts.add_point_masses([1, 3], cloud((0, 0, 0), (4, 0, 0)))
+        assert parts.mass == 4
+        assert parts.centroid == Point(3, 0, 0)
+        assert_tensor(parts.inertia_tensor(), ((0, 0, 0), (0, 12, 0), (0, 0, 12)))
+
+    def test_rod_about_its_end(self):
+        parts = MassProperties()
+        parts.add_rods(6.0, cloud((0, 0, 0)), cloud((0, 2, 0)))
+        tensor = parts.inertia_tensor(Point(0, 0, 0))
+        assert_tensor(tensor, ((8, 0, 0), (0, 0, 0), (0, 0, 8)))
+
+    def test_square_plate_from_two_triangles(self):
+        parts = MassProperties()
+        parts.add_plates(0.5, cloud((0, 0, 0), (0, 0, 0)), cloud((2, 0, 0), (2, 2, 0)), cloud((2, 2, 0), (0, 2, 0)))
+        assert parts.centroid == Point(1, 1, 0)
+        assert_tensor(parts.inertia_tensor(), ((1 / 3, 0, 0), (0, 1 / 3, 0), (0, 0, 2 / 3)))
+
+    def test_rotated_box(self):
+        parts = MassProperties()
+        quarter_turn = Rotation.from_axis_angle(Vector(0, 0, 1), math.pi / 2)
+        parts.add_boxes(12.0, cloud((1, 1, 1)), VectorArray.from_vectors([Vector(2, 1, 1)]), [quarter_turn])
+        assert_tensor(parts.inertia_tensor(), ((5, 0, 0), (0, 2, 0), (0, 0, 5)))
+
+    def test_mesh_matches_box(self):
+        mesh = MassProperties()
+        mesh.add_mesh(CUBE_VERTICES, CUBE_FACES, 2.0)
+        box = MassProperties()
+        box.add_boxes(2.0, cloud((0.5, 0.5, 0.5)), VectorArray.from_vectors([Vector(1, 1, 1)]))
+        assert are_close_enough(mesh.mass, 2.0)
+        assert mesh.centroid == Point(0.5, 0.5, 0.5)
+        assert_tensor(mesh.inertia_tensor(), box.inertia_tensor())
+
+    def test_inside_out_mesh(self):
+        with pytest.raises(ValueError):
+            MassProperties().add_mesh(CUBE_VERTICES, [(a, c, b) for a, b, c in CUBE_FACES], 1.0)
+
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            MassProperties().add_rods(1.0, cloud((0, 0, 0)), cloud((1, 0, 0), (2, 0, 0)))
+        with pytest.raises(ValueError):
+            MassProperties().add_point_masses([1.0, 2.0], cloud((0, 0, 0)))
+
+
+class TestAssembly:
+    def random_rods(self, count, seed):
+        generator = random.Random(seed)
+        starts = PointCloud([generator.uniform(-10, 10) for _ in range(3 * count)])
+        ends = PointCloud([generator.uniform(-10, 10) for _ in range(3 * count)])
+        masses = [generator.uniform(0.1, 2) for _ in range(count)]
+        return masses, starts, ends
+
+    def test_parallel_axis_about_other_point(self):
+        parts = MassProperties()
+        parts.add_rods(*self.random_rods(50, 1))
+        centroid = parts.centroid
+        offset = Point(centroid.x + 1, centroid.y - 2, centroid.z + 3)
+        shifted = parts.inertia_tensor(offset)
+        about_centroid = parts.inertia_tensor()
+        d = (1, -2, 3)
+        squared = sum(x * x for x in d)
+        for row in range(3):
+            for column in range(3):
+                steiner = parts.mass * ((squared if row == column else 0) - d[row] * d[column])
+                assert abs(shifted[row][column] - about_centroid[row][column] - steiner) < 1e-8
+
+    def test_remove_matches_rebuild(self):
+        masses, starts, ends = self.random_rods(40, 2)
+        parts = MassProperties()
+        rods = parts.add_rods(masses, starts, ends)
+        cube = parts.add_mesh(CUBE_VERTICES, CUBE_FACES, 3.0)
+        parts.remove(rods[10:])
+        parts.remove(cube)
+        rebuilt = MassProperties()
+        rebuilt.add_rods(masses[:10], PointCloud(starts.data[:30]), PointCloud(ends.data[:30]))
+        assert len(parts) == 10
+        assert are_close_enough(parts.mass, rebuilt.mass)
+        assert parts.centroid == rebuilt.centroid
+        assert_tensor(parts.inertia_tensor(), rebuilt.inertia_tensor(), 1e-8)
+
+    def test_remove_everything_resets(self):
+        parts = MassProperties()
+        ids = parts.add_point_masses(0.1, cloud((0.1, 0.2, 0.3), (0.7, 0.3, 0.1)))
+        parts.remove(ids)
+        assert parts.mass == 0.0
+        with pytest.raises(ValueError):
+            parts.centroid
+
+    def test_remove_unknown_or_twice(self):
+        parts = MassProperties()
+        ids = parts.add_point_masses(1.0, cloud((0, 0, 0), (1, 0, 0)))
+        parts.remove(ids[0])
+        with pytest.raises(KeyError):
+            parts.remove(ids[0])
+        with pytest.raises(KeyError):
+            parts.remove(5)
+        with pytest.raises(KeyError):
+            parts.remove([ids[1], ids[1]])
+        assert len(parts) == 1
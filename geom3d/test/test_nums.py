@@ -1,3 +1,7 @@
+from array import array
+
+import pytest
+
 from geom3d.nums import *
 
 
@@ -32,6 +36,15 @@ class TestAreCloseEnough:
     def test_large_numbers_close_enough(self):
         assert are_close_enough(1e10, 1e10 + 1e-5, tolerance=1e-4)
 
+    def test_relative_tolerance_within(self):
+        assert are_close_enough(1e10, 1e10 + 1, rel_tolerance=1e-9)
+
+    def test_relative_tolerance_outside(self):
+        assert not are_close_enough(1e10, 1e10 + 100, rel_tolerance=1e-9)
+
+    def test_relative_tolerance_keeps_absolute_floor(self):
+        assert are_close_enough(0.0, 1e-11, rel_tolerance=1e-9)
+
 
 class TestIsCloseToZero:
     def test_positive_number_not_close_to_zero(self):
@@ -95,3 +108,59 @@ class TestIsCloseToOne:
 
     def test_nearby_negative_number_not_close_to_one(self):
         assert not is_close_to_one(-0.9999)
+
+
+class TestCloseEnoughMask:
+    def test_element_wise(self):
+        a = array('d', [1.0, 2.0, 3.0])
+        b = [1.0 + 1e-11, 2.1, 3.0]
+        assert close_enough_mask(a, b) == [True, False, True]
+
+    def test_broadcast_scalar(self):
+        assert close_enough_mask([0.3, 0.4], 0.1 + 0.2) == [True, False]
+        assert close_enough_mask(0.3, [0.3, 0.4]) == [True, False]
+
+    def test_scalars(self):
+        assert close_enough_mask(0.3, 0.1 + 0.2) == [True]
+
+    def test_relative_tolerance(self):
+        assert close_enough_mask([1e10, 1.0], [1e10 + 1, 1.1], rel_tolerance=1e-9) == [True, False]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            close_enough_mask([1.0], [1.0, 2.0])
+
+    def test_matches_scalar_version(self):
+        values = [0.0, 1e-11, -1e-9, 1.0, 0.5]
+        assert close_enough_mask(values, 0.0) == [are_close_enough(v, 0.0) for v in values]
+
+
+class TestZeroAndOneMasks:
+    def test_zero_mask(self):
+        assert close_to_zero_mask([0.0, -1e-11, 1e-3]) == [True, True, False]
+
+    def test_zero_mask_custom_tolerance(self):
+        assert close_to_zero_mask([1e-3], tolerance=1e-2) == [True]
+
+    def test_one_mask(self):
+        assert close_to_one_mask([1.0, 0.99999999999, 0.9]) == [True, True, False]
+
+
+class TestAllClose:
+    def test_all_close(self):
+        assert all_close(array('d', [0.1 + 0.2, 1.0]), [0.3, 1.0])
+
+    def test_not_all_close(self):
+        assert not all_close([0.3, 1.0], [0.3, 1.1])
+
+    def test_length_mismatch(self):
+        assert not all_close([1.0], [1.0, 1.0])
+
+    def test_broadcast_scalar(self):
+        assert all_close([0.0, 1e-12], 0.0)
+
+    def test_scalars(self):
+        assert all_close(0.3, 0.1 + 0.2)
+
+    def test_relative_tolerance(self):
+        assert all_close([1e10], [1e10 + 1], rel_tolerance=1e-9)
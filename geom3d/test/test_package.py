@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import geom3d
+from geom3d import vector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(geom3d.__file__)))
+
+# The most the tolerance helpers and the basic types may take to import in a
+# fresh interpreter, in seconds. Several times the measured time, so that only
+# a real regression fails on a loaded machine.
+COLD_START_BUDGET = 0.05
+
+
+def run_fresh(statement, *options):
+    """
+    Runs `statement` in a new interpreter that imports geom3d from this tree
+    and caches its bytecode.
+    """
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable, *options, '-c', statement], capture_output=True, text=True,
+                          check=True, env=environment)
+
+
+def geom3d_import_time(statement, runs=5):
+    """
+    The time in seconds `python -X importtime` charges to geom3d and what it
+    imports, over the fastest of `runs` fresh interpreters after one that
+    compiles the bytecode.
+    """
+    run_fresh(statement)
+    best = None
+    for _ in range(runs):
+        total = 0
+        for line in run_fresh(statement, '-X', 'importtime').stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].startswith(' geom3d'):
+                total += int(fields[1])
+        best = total if best is None else min(best, total)
+    return best / 1e6
+
+
+class TestPackage:
+    def test_import_loads_no_submodules(self):
+        loaded = run_fresh("import sys, geom3d; print(sorted(m for m in sys.modules if m.startswith('geom3d.')))")
+        assert loaded.stdout.strip() == "[]"
+
+    def test_names_load_only_their_submodule(self):
+        loaded = run_fresh("import sys, geom3d; geom3d.are_close_enough; "
+                           "print(sorted(m for m in sys.modules if m.startswith('geom3d.')))")
+        assert loaded.stdout.strip() == "['geom3d.nums']"
+
+    def test_public_names(self):
+        assert geom3d.Vector is vector.Vector
+        for name in geom3d.__all__:
+            value = getattr(geom3d, name)
+            assert value.__name__ == name
+            assert value.__module__.startswith('geom3d.')
+        assert set(geom3d.__all__) <= set(dir(geom3d))
+
+    def test_submodules(self):
+        assert geom3d.truss.Truss is geom3d.Truss
+        assert 'truss' in dir(geom3d)
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError):
+            geom3d.not_a_name
+
+    @pytest.mark.parametrize('statement', ["from geom3d import Vector, Point, are_close_enough",
+                                           "from geom3d import VectorArray, PointCloud"])
+    def test_cold_start_budget(self, statement):
+        elapsed = geom3d_import_time(statement)
+        assert elapsed < COLD_START_BUDGET, f"{statement} took {elapsed * 1e3:.1f} ms"
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+from geom3d.nums import are_close_enough
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def make_cloud():
+    return PointCloud.from_points([Point(0, 0, 0), Point(3, 4, 0), Point(-1, -2, -3)])
+
+
+class TestConstruction:
+    def test_round_trip(self):
+        points = [Point(1, 2, 3), Point(4.5, -6, 0)]
+        assert PointCloud.from_points(points).to_points() == points
+
+    def test_from_coordinates(self):
+        assert PointCloud.from_coordinates([1, 2], [3, 4], [5, 6])[1] == Point(2, 4, 6)
+
+    def test_bytes_per_point(self):
+        cloud = make_cloud()
+        assert len(cloud.data) * cloud.data.itemsize == 24 * len(cloud)
+
+    def test_slice(self):
+        assert make_cloud()[:1].to_points() == [Point(0, 0, 0)]
+
+
+class TestDistanceTo:
+    def test_to_point(self):
+        distances = make_cloud().distance_to(Point(0, 0, 0))
+        assert list(distances)[:2] == [0, 5]
+        assert are_close_enough(distances[2], math.sqrt(14))
+
+    def test_matches_point(self):
+        cloud = make_cloud()
+        other = PointCloud.from_points([Point(1, 1, 1), Point(2, 2, 2), Point(3, 3, 3)])
+        expected = [a.distance_to(b) for a, b in zip(cloud, other)]
+        assert list(cloud.distance_to(other)) == expected
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            make_cloud().distance_to(make_cloud()[:2])
+
+
+class TestPairwise:
+    def test_matrix_matches_point(self):
+        cloud = make_cloud()
+        matrix = cloud.pairwise_distances(block_size=2)
+        for row, a in zip(matrix, cloud):
+            assert list(row) == [a.distance_to(b) for b in cloud]
+
+    def test_blocks_are_bounded(self):
+        cloud = make_cloud()
+        blocks = list(cloud.iter_distance_blocks(cloud[:2], block_size=2))
+        assert [start for start, _ in blocks] == [0, 2]
+        assert [len(rows) for _, rows in blocks] == [2, 1]
+        assert all(len(row) == 2 for _, rows in blocks for row in rows)
+
+    def test_bad_block_size(self):
+        with pytest.raises(ValueError):
+            list(make_cloud().iter_distance_blocks(block_size=0))
+
+
+class TestDisplaced:
+    def test_by_vector(self):
+        cloud = make_cloud().displaced(Vector(1, 1, 1), times=2)
+        assert cloud[1] == Point(5, 6, 2)
+
+    def test_by_vector_array(self):
+        vectors = VectorArray.from_vectors([Vector(1, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)])
+        cloud = make_cloud().displaced(vectors, times=[1, 2, 3])
+        assert cloud.to_points() == [Point(1, 0, 0), Point(3, 6, 0), Point(-1, -2, 0)]
+
+
+class TestMakeVector:
+    def test_to_point(self):
+        vectors = make_cloud().make_vector(Point(1, 1, 1))
+        assert vectors.to_vectors() == [p.make_vector(Point(1, 1, 1)) for p in make_cloud()]
+
+    def test_subtraction(self):
+        assert (make_cloud() - Point(1, 1, 1))[0] == Vector(-1, -1, -1)
+
+
+class TestCloseEnough:
+    def test_against_point(self):
+        assert make_cloud().close_enough(Point(0, 0, 1e-12)) == [True, False, False]
+
+    def test_equality(self):
+        assert make_cloud() == make_cloud().displaced(Vector(1e-12, 0, 0))
+        assert make_cloud() != make_cloud().displaced(Vector(1, 0, 0))
@@ -1,6 +1,10 @@
 import math
+import pickle
+
+import pytest
 
 from geom3d.nums import are_close_enough
+from geom3d.points import FrozenPoint
 from geom3d.points import Point
 from geom3d.vector import Vector
 
@@ -211,3 +215,54 @@ class TestMakeVector:
         result = p1.make_vector(p2)
         expected = Vector(-1, -2, -3)
         assert result == expected
+
+
+class TestSlots:
+    def test_no_instance_dict(self):
+        assert not hasattr(Point(1, 2, 3), '__dict__')
+
+
+class TestFrozenPoint:
+    def test_is_a_point(self):
+        p = FrozenPoint(1, 2, 3)
+        assert isinstance(p, Point)
+        assert p == Point(1, 2, 3)
+        assert Point(1, 2, 3) == p
+
+    def test_immutable(self):
+        p = FrozenPoint(1, 2, 3)
+        with pytest.raises(AttributeError):
+            p.x = 5
+
+    def test_float_noise_hashes_equal(self):
+        a = FrozenPoint(0.1 + 0.2, 1, 1)
+        b = FrozenPoint(0.3, 1, 1)
+        assert a == b
+        assert len({a, b}) == 1
+
+    def test_equality_is_transitive_and_hash_consistent(self):
+        # Coordinates on both sides of the grid edges at +-0.5 tolerances.
+        values = [step * 0.1e-10 for step in range(-12, 13)]
+        values += [edge + offset for edge in (-0.5e-10, 0.5e-10) for offset in (-1e-16, 0.0, 1e-16)]
+        points = [FrozenPoint(0, value, value) for value in values]
+        for a in points:
+            for b in points:
+                if a == b:
+                    assert hash(a) == hash(b)
+                    assert b in {a}
+                    assert all(a == c for c in points if b == c)
+
+    @pytest.mark.parametrize("value", [1e308, float('inf'), float('nan')])
+    def test_extreme_coordinates(self, value):
+        p = FrozenPoint(1, value, 2)
+        q = FrozenPoint(1, value, 2)
+        assert p in {p}
+        assert (p == q) == math.isfinite(value)
+        assert (q in {p}) == math.isfinite(value)
+
+    def test_from_point(self):
+        assert FrozenPoint.from_point(Point(1, 2, 3)) == FrozenPoint(1, 2, 3)
+
+    def test_pickle_round_trip(self):
+        p = FrozenPoint(1, 2, 3)
+        assert pickle.loads(pickle.dumps(p)) == p
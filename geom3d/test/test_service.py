@@ -0,0 +1,216 @@
+import asyncio
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from geom3d.forces import ForceSystem
+from geom3d.nums import are_close_enough
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d import service as service_module
+from geom3d.service import StaticsService
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """
+    A thread pool that records how many calls it ran, optionally holding each
+    call until `gate` is set.
+    """
+    def __init__(self, gate=None):
+        super().__init__(max_workers=2)
+        self.calls = 0
+        self.gate = gate
+
+    def submit(self, function, *args, **kwargs):
+        self.calls += 1
+        if self.gate is None:
+            return super().submit(function, *args, **kwargs)
+
+        def held():
+            self.gate.wait()
+            return function(*args, **kwargs)
+        return super().submit(held)
+
+
+def make_bracket():
+    truss = Truss()
+    top = truss.add_joint(Point(0, 1, 0))
+    bottom = truss.add_joint(Point(0, 0, 0))
+    tip = truss.add_joint(Point(2, 0, 0))
+    truss.add_member(top, tip)
+    truss.add_member(bottom, tip)
+    truss.add_support(top, z=False)
+    truss.add_support(bottom, z=False)
+    return truss, tip
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestStaticsService:
+    def test_resultant(self):
+        forces = VectorArray([1, 0, 0, 0, 2, 0])
+        points = PointCloud([0, 1, 0, 3, 0, 0])
+        about = Point(1, 1, 1)
+
+        async def main():
+            async with StaticsService(executor=CountingExecutor()) as service:
+                return await service.resultant(forces, points, about)
+        force, moment = run(main())
+        system = ForceSystem(forces, points)
+        assert force == system.resultant()
+        assert moment == system.moment_about(about)
+
+    def test_distances(self):
+        async def main():
+            async with StaticsService(executor=CountingExecutor()) as service:
+                return await asyncio.gather(
+                    service.distances(PointCloud([3, 4, 0, 0, 0, 0]), Point(0, 0, 0)),
+                    service.distances(Point(1, 1, 1), Point(1, 1, 2)),
+                )
+        cloud, single = run(main())
+        assert list(cloud) == [5.0, 0.0]
+        assert single == 1.0
+
+    def test_concurrent_requests_share_one_call(self):
+        executor = CountingExecutor()
+
+        async def main():
+            async with StaticsService(executor=executor, max_delay=0.01) as service:
+                return await asyncio.gather(*(
+                    service.distances(PointCloud([n, 0, 0]), Point(0, 0, 0)) for n in range(50)
+                ))
+        results = run(main())
+        assert [list(result) for result in results] == [[float(n)] for n in range(50)]
+        assert executor.calls == 1
+
+    def test_max_batch_splits_batches(self):
+        executor = CountingExecutor()
+
+        async def main():
+            async with StaticsService(executor=executor, max_batch=10, max_delay=0.01) as service:
+                await asyncio.gather(*(
+                    service.distances(PointCloud([n, 0, 0]), Point(0, 0, 0)) for n in range(50)
+                ))
+        run(main())
+        assert executor.calls == 5
+
+    def test_equilibrium_shares_factorization(self):
+        truss, tip = make_bracket()
+        executor = CountingExecutor()
+
+        async def main():
+            async with StaticsService(executor=executor, max_delay=0.01) as service:
+                return await asyncio.gather(*(
+                    service.equilibrium(truss, {tip: Vector(0, -load, 0)}) for load in (1, 2, 3)
+                ))
+        solutions = run(main())
+        assert executor.calls == 1
+        for load, solution in zip((1, 2, 3), solutions):
+            truss.clear_loads()
+            truss.add_load(tip, Vector(0, -load, 0))
+            expected = truss.solve().member_forces
+            assert all(are_close_enough(a, b) for a, b in zip(solution.member_forces, expected))
+
+    def test_factorization_reused_between_batches(self, monkeypatch):
+        truss, tip = make_bracket()
+        factorized = []
+        factorize = Truss.factorize
+
+        def counting_factorize(self):
+            factorized.append(self)
+            return factorize(self)
+        monkeypatch.setattr(Truss, 'factorize', counting_factorize)
+        service_module._factorizations.clear()
+
+        async def main():
+            async with StaticsService(executor=CountingExecutor()) as service:
+                first = await service.equilibrium(truss, {tip: Vector(0, -1, 0)})
+                truss.add_load(tip, Vector(0, -2, 0))
+                second = await service.equilibrium(truss)
+                same, _ = make_bracket()
+                await service.equilibrium(same, {tip: Vector(0, -1, 0)})
+                truss.set_member_stiffness(0, 2.0)
+                await service.equilibrium(truss, {tip: Vector(0, -1, 0)})
+                return first, second
+        first, second = run(main())
+        assert len(factorized) == 2
+        assert all(are_close_enough(2 * a, b) for a, b in zip(first.member_forces, second.member_forces))
+
+    def test_bad_load_case_fails_only_its_request(self):
+        truss, tip = make_bracket()
+
+        async def main():
+            async with StaticsService(executor=CountingExecutor(), max_delay=0.01) as service:
+                return await asyncio.gather(
+                    service.equilibrium(truss, {tip: Vector(0, -1, 0)}),
+                    service.equilibrium(truss, {tip: Vector(0, 0, 1)}),
+                    return_exceptions=True,
+                )
+        good, bad = run(main())
+        assert not isinstance(good, Exception)
+        assert isinstance(bad, ValueError)
+
+    def test_cancelled_request_is_dropped(self):
+        executor = CountingExecutor()
+
+        async def main():
+            async with StaticsService(executor=executor, max_delay=0.05) as service:
+                cancelled = asyncio.ensure_future(service.distances(Point(1, 0, 0), Point(0, 0, 0)))
+                await asyncio.sleep(0)
+                cancelled.cancel()
+                kept = await service.distances(Point(2, 0, 0), Point(0, 0, 0))
+                return cancelled.cancelled(), kept
+        cancelled, kept = run(main())
+        assert cancelled
+        assert kept == 2.0
+
+    def test_backpressure(self):
+        gate = threading.Event()
+        executor = CountingExecutor(gate)
+
+        async def main():
+            async with StaticsService(executor=executor, max_pending=2, max_delay=0) as service:
+                tasks = [asyncio.ensure_future(service.distances(Point(n, 0, 0), Point(0, 0, 0)))
+                         for n in range(5)]
+                await asyncio.sleep(0.05)
+                waiting = service._slots._value, sum(not task.done() for task in tasks)
+                calls = executor.calls
+                gate.set()
+                return waiting, calls, await asyncio.gather(*tasks)
+        (free_slots, pending), calls, results = run(main())
+        assert free_slots == 0
+        assert pending == 5
+        assert calls <= 2
+        assert results == [float(n) for n in range(5)]
+
+    def test_closed_service_rejects_requests(self):
+        async def main():
+            service = StaticsService(executor=CountingExecutor())
+            with pytest.raises(RuntimeError):
+                await service.distances(Point(0, 0, 0), Point(1, 0, 0))
+        run(main())
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            StaticsService(max_batch=0)
+        with pytest.raises(ValueError):
+            StaticsService(max_delay=-1)
+
+        async def main():
+            async with StaticsService(executor=CountingExecutor()) as service:
+                with pytest.raises(ValueError):
+                    await service.resultant(VectorArray([1, 0, 0]), PointCloud([]))
+        run(main())
+
+    def test_process_pool(self):
+        async def main():
+            async with StaticsService(workers=1) as service:
+                return await service.distances(PointCloud([0, 3, 4]), Point(0, 0, 0))
+        assert math.isclose(run(main())[0], 5.0)
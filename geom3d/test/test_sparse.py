@@ -0,0 +1,132 @@
+import pytest
+
+from geom3d.nums import all_close
+from geom3d.sparse import SkylineCholesky
+from geom3d.sparse import SparseCholesky
+from geom3d.sparse import SparseMatrix
+from geom3d.sparse import cholesky
+from geom3d.sparse import conjugate_gradient
+from geom3d.sparse import nested_dissection
+from geom3d.sparse import reverse_cuthill_mckee
+
+
+def laplacian(size):
+    rows, columns, values = [], [], []
+    for index in range(size):
+        rows.append(index)
+        columns.append(index)
+        values.append(2.0 if index else 3.0)
+        if index:
+            rows.extend((index, index - 1))
+            columns.extend((index - 1, index))
+            values.extend((-1.0, -1.0))
+    return SparseMatrix.from_triplets(rows, columns, values, (size, size))
+
+
+def grid_laplacian(width, height):
+    """
+    The graph Laplacian of a `width` x `height` grid, plus the identity, and
+    the position of every node.
+    """
+    rows, columns, values = [], [], []
+    for index in range(width * height):
+        x, y = index % width, index // width
+        neighbours = [other for other, inside in ((index - 1, x), (index + 1, x < width - 1),
+                                                  (index - width, y), (index + width, y < height - 1)) if inside]
+        rows.append(index)
+        columns.append(index)
+        values.append(len(neighbours) + 1.0)
+        for other in neighbours:
+            rows.append(index)
+            columns.append(other)
+            values.append(-1.0)
+    positions = [(float(index % width), float(index // width), 0.0) for index in range(width * height)]
+    return SparseMatrix.from_triplets(rows, columns, values, (width * height, width * height)), positions
+
+
+class TestSparseMatrix:
+    def test_duplicates_are_summed(self):
+        matrix = SparseMatrix.from_triplets([0, 0, 1], [1, 1, 0], [1.0, 2.0, 4.0], (2, 2))
+        assert matrix.to_dense() == [[0.0, 3.0], [4.0, 0.0]]
+        assert matrix.nnz == 2
+
+    def test_matvec_and_rmatvec(self):
+        matrix = SparseMatrix.from_triplets([0, 1, 1], [0, 0, 2], [1.0, 2.0, 3.0], (2, 3))
+        assert list(matrix.matvec([1, 1, 1])) == [1, 5]
+        assert list(matrix.rmatvec([1, 1])) == [3, 0, 3]
+
+    def test_diagonal(self):
+        assert list(laplacian(3).diagonal()) == [3, 2, 2]
+
+
+class TestSolvers:
+    def test_rcm_is_permutation(self):
+        assert sorted(reverse_cuthill_mckee(laplacian(6))) == list(range(6))
+
+    def test_cholesky(self):
+        matrix = laplacian(8)
+        b = [float(i) for i in range(8)]
+        x = SkylineCholesky(matrix).solve(b)
+        assert all_close(matrix.matvec(x), b)
+
+    def test_cholesky_natural_ordering(self):
+        matrix = laplacian(5)
+        factor = SkylineCholesky(matrix, ordering=list(range(5)))
+        assert factor.profile == 9
+        assert all_close(matrix.matvec(factor.solve([1, 0, 0, 0, 1])), [1, 0, 0, 0, 1])
+
+    def test_solve_many(self):
+        matrix = laplacian(4)
+        solutions = SkylineCholesky(matrix).solve_many([[1, 0, 0, 0], [0, 0, 0, 1]])
+        assert all_close(matrix.matvec(solutions[1]), [0, 0, 0, 1])
+
+    def test_cholesky_singular(self):
+        matrix = SparseMatrix.from_triplets([0, 0, 1, 1], [0, 1, 0, 1], [1.0, 1.0, 1.0, 1.0], (2, 2))
+        with pytest.raises(ValueError):
+            SkylineCholesky(matrix)
+
+    def test_conjugate_gradient(self):
+        matrix = laplacian(20)
+        b = [1.0] * 20
+        assert all_close(conjugate_gradient(matrix, b), SkylineCholesky(matrix).solve(b), tolerance=1e-8)
+
+    def test_conjugate_gradient_zero_rhs(self):
+        assert list(conjugate_gradient(laplacian(3), [0, 0, 0])) == [0, 0, 0]
+
+
+class TestSparseCholesky:
+    def test_nested_dissection_is_permutation(self):
+        matrix, positions = grid_laplacian(12, 9)
+        assert sorted(nested_dissection(matrix)) == list(range(108))
+        assert sorted(nested_dissection(matrix, positions, leaf_size=4)) == list(range(108))
+
+    def test_nested_dissection_positions_length(self):
+        matrix, positions = grid_laplacian(3, 3)
+        with pytest.raises(ValueError):
+            nested_dissection(matrix, positions[:-1])
+
+    def test_solve(self):
+        matrix, positions = grid_laplacian(15, 11)
+        b = [float(index % 7) for index in range(165)]
+        expected = SkylineCholesky(matrix).solve(b)
+        for ordering in (None, nested_dissection(matrix, positions, leaf_size=4), list(range(165))):
+            factor = SparseCholesky(matrix, ordering)
+            assert all_close(factor.solve(b), expected, tolerance=1e-9)
+        assert all_close(factor.solve_many([b, b])[1], expected, tolerance=1e-9)
+
+    def test_fills_in_less_than_skyline(self):
+        matrix, positions = grid_laplacian(30, 30)
+        assert SparseCholesky(matrix, nested_dissection(matrix, positions)).nnz < SkylineCholesky(matrix).profile
+
+    def test_singular(self):
+        matrix = SparseMatrix.from_triplets([0, 0, 1, 1], [0, 1, 0, 1], [1.0, 1.0, 1.0, 1.0], (2, 2))
+        with pytest.raises(ValueError):
+            SparseCholesky(matrix)
+
+    def test_cholesky_picks_cheaper_factorization(self):
+        assert isinstance(cholesky(laplacian(50)), SkylineCholesky)
+        matrix, positions = grid_laplacian(40, 40)
+        factor = cholesky(matrix, positions)
+        assert isinstance(factor, SparseCholesky)
+        b = [1.0] * 1600
+        assert all_close(matrix.matvec(factor.solve(b)), b, tolerance=1e-9)
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.spatial import GridIndex
+
+
+def make_cloud(count=200, seed=3):
+    generator = random.Random(seed)
+    return PointCloud.from_points([
+        Point(generator.uniform(-5, 5), generator.uniform(-5, 5), generator.uniform(-5, 5))
+        for _ in range(count)
+    ])
+
+
+def brute_force(cloud, query):
+    return sorted((query.distance_to(point), point_id) for point_id, point in enumerate(cloud))
+
+
+class TestQueries:
+    @pytest.mark.parametrize("cell_size", [None, 0.3, 4.0])
+    def test_nearest_matches_brute_force(self, cell_size):
+        cloud = make_cloud()
+        index = GridIndex.from_points(cloud, cell_size)
+        for query in make_cloud(20, seed=9):
+            distance, point_id = brute_force(cloud, query)[0]
+            assert index.nearest(query) == (point_id, distance)
+
+    def test_k_nearest_matches_brute_force(self):
+        cloud = make_cloud()
+        index = GridIndex.from_points(cloud, 1.0)
+        query = Point(0.5, -0.5, 2)
+        expected = [(point_id, distance) for distance, point_id in brute_force(cloud, query)[:7]]
+        assert index.k_nearest(query, 7) == expected
+
+    @pytest.mark.parametrize("query", [Point(500, 0, 0), Point(-40, 300, 7), Point(6, 0, 0)])
+    def test_far_queries(self, query):
+        # Thousands of empty rings between the query and the points.
+        cloud = make_cloud()
+        index = GridIndex.from_points(cloud, 0.3)
+        expected = [(point_id, distance) for distance, point_id in brute_force(cloud, query)[:4]]
+        assert index.k_nearest(query, 4) == expected
+        assert index.nearest(query) == expected[0]
+
+    def test_k_larger_than_index(self):
+        index = GridIndex.from_points(make_cloud(5), 1.0)
+        assert len(index.k_nearest(Point(100, 100, 100), 10)) == 5
+
+    def test_within_radius_matches_brute_force(self):
+        cloud = make_cloud()
+        index = GridIndex.from_points(cloud, 0.7)
+        query = Point(1, 1, 1)
+        expected = sorted(point_id for distance, point_id in brute_force(cloud, query) if distance <= 2.5)
+        assert index.within_radius(query, 2.5) == expected
+
+    def test_empty_index(self):
+        index = GridIndex(1.0)
+        assert index.nearest(Point(0, 0, 0)) is None
+        assert index.within_radius(Point(0, 0, 0), 10) == []
+
+    def test_bad_cell_size(self):
+        with pytest.raises(ValueError):
+            GridIndex(0)
+
+
+class TestBatchQueries:
+    def test_nearest_many(self):
+        cloud = make_cloud()
+        index = GridIndex.from_points(cloud)
+        queries = make_cloud(10, seed=4)
+        assert index.nearest_many(queries) == [index.nearest(query) for query in queries]
+
+    def test_k_nearest_many(self):
+        index = GridIndex.from_points(make_cloud())
+        queries = make_cloud(3, seed=4)
+        assert [len(found) for found in index.k_nearest_many(queries, 4)] == [4, 4, 4]
+
+    def test_within_radius_many(self):
+        cloud = make_cloud(50)
+        index = GridIndex.from_points(cloud)
+        assert index.within_radius_many(cloud[:2], 0) == [[0], [1]]
+
+
+class TestUpdates:
+    def test_insert_and_remove(self):
+        index = GridIndex(1.0)
+        first = index.insert(Point(0, 0, 0))
+        second = index.insert(Point(3, 0, 0))
+        assert len(index) == 2
+        assert index.nearest(Point(2, 0, 0))[0] == second
+        index.remove(second)
+        assert second not in index
+        assert index.nearest(Point(2, 0, 0)) == (first, 2)
+
+    def test_remove_missing(self):
+        with pytest.raises(KeyError):
+            GridIndex(1.0).remove(3)
+
+    def test_ids_continue_after_insert_many(self):
+        index = GridIndex(1.0)
+        assert index.insert_many(make_cloud(3)) == range(0, 3)
+        assert index.insert(Point(0, 0, 0)) == 3
+        assert index.point(3) == Point(0, 0, 0)
+
+
+class TestFindEqual:
+    def test_agrees_with_point_equality(self):
+        cloud = PointCloud.from_points([Point(1, 1, 1), Point(1 + 5e-11, 1, 1), Point(1 + 5e-10, 1, 1)])
+        index = GridIndex.from_points(cloud, 1e-3)
+        query = Point(1, 1, 1)
+        assert index.find_equal(query) == [point_id for point_id, point in enumerate(cloud) if point == query]
+        assert index.find_equal(query) == [0, 1]
+
+    def test_across_cell_boundary(self):
+        index = GridIndex(1.0)
+        index.insert(Point(1 - 1e-12, 0, 0))
+        assert index.find_equal(Point(1, 0, 0)) == [0]
+
+    def test_custom_tolerance(self):
+        index = GridIndex.from_points(make_cloud(20), 1.0)
+        assert index.find_equal(index.point(4), tolerance=1e-6) == [4]
@@ -0,0 +1,79 @@
+import struct
+from array import array
+
+import pytest
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.streaming import BinaryWriter
+from geom3d.streaming import CsvWriter
+from geom3d.streaming import read_binary
+from geom3d.streaming import read_csv
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def make_cloud(count):
+    return PointCloud.from_coordinates([float(n) for n in range(count)],
+                                       [0.5 * n for n in range(count)],
+                                       [-0.1 * n for n in range(count)])
+
+
+class TestCsv:
+    def test_round_trip_in_chunks(self, tmp_path):
+        path = tmp_path / "points.csv"
+        cloud = make_cloud(10)
+        with CsvWriter(path, header=["x", "y", "z"]) as writer:
+            writer.write(cloud[:4])
+            writer.write(cloud[4:])
+        batches = list(read_csv(path, chunk_size=4, skip_rows=1))
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert PointCloud(array('d', [v for batch in batches for v in batch.data])) == cloud
+
+    def test_columns_and_vectors(self, tmp_path):
+        path = tmp_path / "loads.csv"
+        path.write_text("id;fx;fy;fz\n7;1;2;3\n\n8;4;5;6\n")
+        batches = list(read_csv(path, batch_type=VectorArray, columns=(1, 2, 3), skip_rows=1, delimiter=';'))
+        assert len(batches) == 1
+        assert batches[0].to_vectors() == [Vector(1, 2, 3), Vector(4, 5, 6)]
+
+    def test_scalar_rows(self, tmp_path):
+        path = tmp_path / "distances.csv"
+        with CsvWriter(path, width=1) as writer:
+            writer.write(make_cloud(3).distance_to(Point(0, 0, 0)))
+        assert len(path.read_text().splitlines()) == 3
+
+    def test_bad_width(self, tmp_path):
+        with CsvWriter(tmp_path / "bad.csv", width=2) as writer:
+            with pytest.raises(ValueError):
+                writer.write([1.0, 2.0, 3.0])
+
+
+class TestBinary:
+    def test_round_trip_in_chunks(self, tmp_path):
+        path = tmp_path / "points.bin"
+        cloud = make_cloud(7)
+        with BinaryWriter(path) as writer:
+            writer.write(cloud[:5])
+            writer.write(cloud[5:])
+        batches = list(read_binary(path, chunk_size=3))
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert batches[2][0] == cloud[6]
+
+    def test_little_endian_layout(self, tmp_path):
+        path = tmp_path / "vectors.bin"
+        path.write_bytes(struct.pack('<6d', 1, 2, 3, 4, 5, 6))
+        batches = list(read_binary(path, batch_type=VectorArray))
+        assert batches[0].to_vectors() == [Vector(1, 2, 3), Vector(4, 5, 6)]
+
+    def test_truncated_file(self, tmp_path):
+        path = tmp_path / "bad.bin"
+        path.write_bytes(struct.pack('<4d', 1, 2, 3, 4))
+        with pytest.raises(ValueError):
+            list(read_binary(path))
+
+    def test_write_flat_values(self, tmp_path):
+        path = tmp_path / "values.bin"
+        with BinaryWriter(path, width=1) as writer:
+            writer.write([1.5, 2.5])
+        assert path.read_bytes() == struct.pack('<2d', 1.5, 2.5)
@@ -0,0 +1,155 @@
+import itertools
+
+import pytest
+
+from geom3d.points import Point
+from geom3d.sweep import ResultCache
+from geom3d.sweep import geometry_hash
+from geom3d.sweep import sweep
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+calls = []
+
+
+def cantilever_tip(row):
+    """
+    The chord forces of a two-member bracket of span `row[0]` under a tip
+    load `row[1]`.
+    """
+    calls.append(tuple(row))
+    span, load = row
+    truss = Truss()
+    wall_top = truss.add_joint(Point(0, 1, 0))
+    wall_bottom = truss.add_joint(Point(0, 0, 0))
+    tip = truss.add_joint(Point(span, 0, 0))
+    truss.add_member(wall_top, tip)
+    truss.add_member(wall_bottom, tip)
+    truss.add_support(wall_top, z=False)
+    truss.add_support(wall_bottom, z=False)
+    truss.add_load(tip, Vector(0, -load, 0))
+    return tuple(truss.solve(method="joints").member_forces)
+
+
+def square(row):
+    return (row[0] * row[0],)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+class TestGeometryHash:
+    def test_stable_and_content_based(self):
+        assert geometry_hash(Vector(1, 2, 3), 4.0) == geometry_hash(Vector(1, 2, 3), 4.0)
+        assert geometry_hash({1: 'a', 2: 'b'}) == geometry_hash({2: 'b', 1: 'a'})
+        assert geometry_hash(VectorArray([1.0, 2.0, 3.0])) == geometry_hash(VectorArray([1, 2, 3]))
+
+    def test_types_and_values_distinguished(self):
+        hashes = {
+            geometry_hash(Vector(1, 2, 3)), geometry_hash(Point(1, 2, 3)), geometry_hash(1), geometry_hash(1.0),
+            geometry_hash(True), geometry_hash('1'), geometry_hash((1, 2)), geometry_hash((1,), 2),
+            geometry_hash(0.0), geometry_hash(-0.0),
+        }
+        assert len(hashes) == 10
+
+    def test_truss_loads_change_hash(self):
+        truss = Truss()
+        a = truss.add_joint(Point(0, 0, 0))
+        b = truss.add_joint(Point(1, 0, 0))
+        truss.add_member(a, b)
+        before = geometry_hash(truss)
+        truss.add_load(b, Vector(0, 0, -1))
+        assert geometry_hash(truss) != before
+        loaded = geometry_hash(truss)
+        truss.set_member_stiffness(0, 2.0)
+        assert geometry_hash(truss) != loaded
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            geometry_hash(object())
+
+
+class TestResultCache:
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', [1.0])
+        cache.put('b', [2.0])
+        assert cache.get('a') == (1.0,)
+        cache.put('c', [3.0])
+        assert cache.get('b') is None
+        assert cache.get('a') == (1.0,)
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_disk_tier(self, tmp_path):
+        cache = ResultCache(max_entries=1, directory=tmp_path)
+        cache.put('ab12', [1.5, -2.0])
+        cache.put('cd34', [3.0])
+        assert cache.get('ab12') == (1.5, -2.0)
+        assert ResultCache(directory=tmp_path).get('cd34') == (3.0,)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestSweep:
+    def test_results_in_grid_order(self):
+        grid = list(itertools.product([2.0, 3.0], [10.0, 20.0]))
+        results = sweep(cantilever_tip, grid, 2)
+        assert results == [cantilever_tip(row) for row in grid]
+
+    def test_overlapping_sweep_only_runs_new_points(self):
+        cache = ResultCache()
+        sweep(cantilever_tip, itertools.product([2.0, 3.0], [10.0]), 2, cache=cache)
+        calls.clear()
+        results = sweep(cantilever_tip, itertools.product([2.0, 3.0, 4.0], [10.0]), 2, cache=cache)
+        assert calls == [(4.0, 10.0)]
+        assert len(results) == 3
+
+    def test_duplicate_points_run_once(self):
+        results = sweep(cantilever_tip, [(2.0, 1.0), (2.0, 1.0)], 2)
+        assert len(calls) == 1
+        assert results[0] == results[1]
+
+    def test_context_and_function_are_part_of_the_key(self):
+        cache = ResultCache()
+        sweep(cantilever_tip, [(2.0, 1.0)], 2, context=Point(0, 0, 0), cache=cache)
+        sweep(cantilever_tip, [(2.0, 1.0)], 2, context=Point(0, 0, 1), cache=cache)
+        assert len(calls) == 2
+        assert sweep(square, [(2.0, 1.0)], 1, cache=cache) == [(4.0,)]
+
+    def test_edited_function_is_not_served_from_cache(self):
+        cache = ResultCache()
+        sweep(square, [(2.0,)], 1, cache=cache)
+
+        def edited(row):
+            return (row[0] * row[0] + 1.0,)
+        edited.__module__, edited.__qualname__ = square.__module__, square.__qualname__
+        assert sweep(edited, [(2.0,)], 1, cache=cache) == [(5.0,)]
+
+    def test_version_is_part_of_the_key(self, tmp_path):
+        sweep(cantilever_tip, [(2.0, 1.0)], 2, cache=ResultCache(directory=tmp_path), version=1)
+        cache = ResultCache(directory=tmp_path)
+        sweep(cantilever_tip, [(2.0, 1.0)], 2, cache=cache, version=1)
+        sweep(cantilever_tip, [(2.0, 1.0)], 2, cache=cache, version=2)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_disk_tier_shared_between_runs(self, tmp_path):
+        sweep(square, [(1.0,), (2.0,)], 1, cache=ResultCache(directory=tmp_path))
+        cache = ResultCache(directory=tmp_path)
+        assert sweep(square, [(2.0,), (3.0,)], 1, cache=cache) == [(4.0,), (9.0,)]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_worker_pool(self):
+        grid = [(float(n),) for n in range(50)]
+        assert sweep(square, grid, 1, workers=2, chunk_size=8) == [(float(n * n),) for n in range(50)]
+
+    def test_mixed_widths(self):
+        with pytest.raises(ValueError):
+            sweep(square, [(1.0,), (1.0, 2.0)], 1)
+
+    def test_empty_grid(self):
+        assert sweep(square, [], 1) == []
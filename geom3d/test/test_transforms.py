@@ -0,0 +1,186 @@
+import math
+
+import pytest
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.transforms import FrameTree
+from geom3d.transforms import Quaternion
+from geom3d.transforms import RigidTransform
+from geom3d.transforms import Rotation
+from geom3d.transforms import apply_each
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def quarter_turn_about_z():
+    return Rotation.from_axis_angle(Vector(0, 0, 1), math.pi / 2)
+
+
+class TestRotation:
+    def test_axis_angle_right_hand_rule(self):
+        assert quarter_turn_about_z().apply(Vector(1, 0, 0)) == Vector(0, 1, 0)
+
+    def test_axis_need_not_be_unit(self):
+        assert Rotation.from_axis_angle(Vector(0, 0, 5), 1.0) == Rotation.from_axis_angle(Vector(0, 0, 1), 1.0)
+
+    def test_zero_axis_rejected(self):
+        with pytest.raises(ValueError):
+            Rotation.from_axis_angle(Vector(0, 0, 0), 1.0)
+
+    def test_rejects_non_rotation(self):
+        with pytest.raises(ValueError):
+            Rotation(((2, 0, 0), (0, 1, 0), (0, 0, 1)))
+        with pytest.raises(ValueError):
+            Rotation(((-1, 0, 0), (0, 1, 0), (0, 0, 1)))
+
+    def test_composition_applies_right_first(self):
+        about_z = quarter_turn_about_z()
+        about_x = Rotation.from_axis_angle(Vector(1, 0, 0), math.pi / 2)
+        v = Vector(1, 2, 3)
+        assert (about_x @ about_z).apply(v) == about_x.apply(about_z.apply(v))
+
+    def test_inverse(self):
+        rotation = Rotation.from_axis_angle(Vector(1, 2, 3), 0.7)
+        assert rotation @ rotation.inverse() == Rotation()
+
+    def test_quaternion_round_trip(self):
+        rotation = Rotation.from_axis_angle(Vector(-1, 2, 0.5), 2.9)
+        assert rotation.to_quaternion().to_rotation() == rotation
+
+    def test_axis_angle_round_trip(self):
+        axis, angle = Rotation.from_axis_angle(Vector(0, 3, 4), 1.2).to_axis_angle()
+        assert axis == Vector(0, 0.6, 0.8)
+        assert angle == pytest.approx(1.2)
+
+    def test_rotates_point_clouds_and_vector_arrays(self):
+        rotation = Rotation.from_axis_angle(Vector(1, 1, 0), 0.4)
+        points = [Point(1, 2, 3), Point(-1, 0, 4)]
+        vectors = [Vector(1, 0, 0), Vector(0, 2, -1)]
+        assert rotation.apply(PointCloud.from_points(points)).to_points() == [rotation.apply(p) for p in points]
+        assert rotation.apply(VectorArray.from_vectors(vectors)).to_vectors() == [rotation.apply(v) for v in vectors]
+
+    def test_rejects_unknown_target(self):
+        with pytest.raises(TypeError):
+            Rotation().apply((1, 2, 3))
+
+
+class TestQuaternion:
+    def test_product_composes_rotations(self):
+        a = Quaternion.from_axis_angle(Vector(0, 0, 1), 0.3)
+        b = Quaternion.from_axis_angle(Vector(1, 0, 0), 1.1)
+        assert (a * b).to_rotation() == a.to_rotation() @ b.to_rotation()
+
+    def test_matches_axis_angle_rotation(self):
+        q = Quaternion.from_axis_angle(Vector(0, 0, 1), math.pi / 2)
+        assert q.apply(Point(1, 0, 0)) == Point(0, 1, 0)
+
+    def test_conjugate_is_inverse(self):
+        q = Quaternion.from_axis_angle(Vector(1, 2, 3), 0.8)
+        assert q * q.conjugate() == Quaternion(1, 0, 0, 0)
+
+    def test_identity_axis_angle(self):
+        assert Quaternion(1, 0, 0, 0).to_axis_angle() == (Vector(1, 0, 0), 0.0)
+
+    def test_zero_quaternion_rejected(self):
+        with pytest.raises(ValueError):
+            Quaternion(0, 0, 0, 0).normalized()
+
+
+class TestRigidTransform:
+    def test_points_move_vectors_only_rotate(self):
+        transform = RigidTransform(quarter_turn_about_z(), Vector(10, 0, 0))
+        assert transform.apply(Point(1, 0, 0)) == Point(10, 1, 0)
+        assert transform.apply(Vector(1, 0, 0)) == Vector(0, 1, 0)
+
+    def test_matrix_round_trip(self):
+        transform = RigidTransform(Rotation.from_axis_angle(Vector(1, 1, 1), 0.5), Vector(1, -2, 3))
+        matrix = transform.to_matrix()
+        assert matrix[3] == [0.0, 0.0, 0.0, 1.0]
+        assert RigidTransform.from_matrix(matrix) == transform
+
+    def test_from_matrix_rejects_projective_row(self):
+        with pytest.raises(ValueError):
+            RigidTransform.from_matrix([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 1, 1]])
+
+    def test_composition_and_inverse(self):
+        a = RigidTransform(Rotation.from_axis_angle(Vector(0, 1, 0), 0.3), Vector(1, 2, 3))
+        b = RigidTransform(Rotation.from_axis_angle(Vector(1, 0, 1), -1.3), Vector(-4, 0, 2))
+        p = Point(0.5, -1, 2)
+        assert (a @ b).apply(p) == a.apply(b.apply(p))
+        assert (a @ a.inverse()).apply(p) == p
+
+    def test_rotation_composes_with_transform(self):
+        rotation = quarter_turn_about_z()
+        transform = RigidTransform(translation=Vector(1, 0, 0))
+        p = Point(1, 1, 1)
+        assert (rotation @ transform).apply(p) == rotation.apply(transform.apply(p))
+        assert (transform @ rotation).apply(p) == transform.apply(rotation.apply(p))
+
+    def test_transforms_point_cloud(self):
+        transform = RigidTransform(quarter_turn_about_z(), Vector(0, 0, 1))
+        cloud = PointCloud.from_points([Point(1, 0, 0), Point(0, 1, 0)])
+        assert transform.apply(cloud).to_points() == [Point(0, 1, 1), Point(-1, 0, 1)]
+
+
+class TestApplyEach:
+    def test_one_transform_per_element(self):
+        transforms = [RigidTransform(translation=Vector(1, 0, 0)), quarter_turn_about_z()]
+        cloud = PointCloud.from_points([Point(0, 0, 0), Point(1, 0, 0)])
+        assert apply_each(transforms, cloud).to_points() == [Point(1, 0, 0), Point(0, 1, 0)]
+        vectors = VectorArray.from_vectors([Vector(1, 0, 0), Vector(1, 0, 0)])
+        assert apply_each(transforms, vectors).to_vectors() == [Vector(1, 0, 0), Vector(0, 1, 0)]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            apply_each([Rotation()], PointCloud.from_points([Point(0, 0, 0), Point(1, 1, 1)]))
+
+
+class TestFrameTree:
+    def make_tree(self):
+        frames = FrameTree()
+        frames.add_frame('building', 'world', RigidTransform(translation=Vector(100, 0, 0)))
+        frames.add_frame('floor', 'building', RigidTransform(quarter_turn_about_z(), Vector(0, 0, 10)))
+        return frames
+
+    def test_convert_through_chain(self):
+        frames = self.make_tree()
+        assert frames.convert(Point(1, 0, 0), 'floor', 'world') == Point(100, 1, 10)
+        assert frames.convert(Point(100, 1, 10), 'world', 'floor') == Point(1, 0, 0)
+        assert frames.convert(Vector(1, 0, 0), 'floor', 'world') == Vector(0, 1, 0)
+
+    def test_transforms_are_cached(self):
+        frames = self.make_tree()
+        assert frames.transform('floor', 'world') is frames.transform('floor', 'world')
+
+    def test_moving_a_frame_moves_its_children(self):
+        frames = self.make_tree()
+        frames.convert(Point(0, 0, 0), 'floor', 'world')
+        frames.set_transform('building', RigidTransform(translation=Vector(0, 50, 0)))
+        assert frames.convert(Point(0, 0, 0), 'floor', 'world') == Point(0, 50, 10)
+
+    def test_errors(self):
+        frames = self.make_tree()
+        with pytest.raises(ValueError):
+            frames.add_frame('floor', 'world', Rotation())
+        with pytest.raises(KeyError):
+            frames.add_frame('roof', 'attic', Rotation())
+        with pytest.raises(ValueError):
+            frames.set_transform('world', Rotation())
+
+    def test_invalid_transform_adds_no_frame(self):
+        frames = self.make_tree()
+        with pytest.raises(TypeError):
+            frames.add_frame('roof', 'floor', Vector(0, 0, 3))
+        assert 'roof' not in frames
+        frames.add_frame('roof', 'floor', Rotation())
+        assert frames.convert(Point(0, 0, 0), 'roof', 'world') == Point(100, 0, 10)
+
+    def test_deep_chain(self):
+        frames = FrameTree()
+        parent = 'world'
+        for level in range(5000):
+            frames.add_frame(level, parent, RigidTransform(translation=Vector(1, 0, 0)))
+            parent = level
+        assert frames.convert(Point(0, 0, 0), parent, 'world') == Point(5000, 0, 0)
+        assert frames.convert(Point(0, 0, 0), 2499, 'world') == Point(2500, 0, 0)
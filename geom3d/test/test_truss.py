@@ -0,0 +1,373 @@
+import math
+
+import pytest
+
+from geom3d.nums import all_close
+from geom3d.nums import are_close_enough
+from geom3d.points import Point
+from geom3d.truss import DeterminateTruss
+from geom3d.truss import FactorizedTruss
+from geom3d.truss import Truss
+from geom3d.vector import Vector
+
+
+def make_triangle():
+    truss = Truss()
+    a = truss.add_joint(Point(0, 0, 0))
+    b = truss.add_joint(Point(4, 0, 0))
+    c = truss.add_joint(Point(2, 2, 0))
+    truss.add_member(a, b)
+    truss.add_member(a, c)
+    truss.add_member(b, c)
+    truss.add_support(a, x=True, y=True, z=False)
+    truss.add_support(b, x=False, y=True, z=False)
+    truss.add_load(c, Vector(0, -10, 0))
+    return truss
+
+
+class TestBuilding:
+    def test_counts(self):
+        truss = make_triangle()
+        assert truss.joint_count == 3
+        assert truss.member_count == 3
+        assert truss.members == [(0, 1), (0, 2), (1, 2)]
+
+    def test_stiffnesses(self):
+        truss = make_triangle()
+        truss.set_member_stiffness(1, 2.5)
+        stiffnesses = truss.stiffnesses
+        assert list(stiffnesses) == [1.0, 2.5, 1.0]
+        stiffnesses[0] = 7.0
+        assert truss.stiffnesses[0] == 1.0
+
+    def test_member_vector(self):
+        assert make_triangle().member_vector(1) == Vector(2, 2, 0)
+
+    def test_bad_member(self):
+        truss = make_triangle()
+        with pytest.raises(ValueError):
+            truss.add_member(0, 0)
+        with pytest.raises(IndexError):
+            truss.add_member(0, 5)
+
+    def test_loads_accumulate(self):
+        truss = make_triangle()
+        truss.add_load(2, Vector(1, 0, 0))
+        assert truss.loads[2] == Vector(1, -10, 0)
+        truss.clear_loads()
+        assert truss.loads[2] == Vector(0, 0, 0)
+
+    def test_releasing_support(self):
+        truss = make_triangle()
+        truss.add_support(1, x=False, y=False, z=False)
+        assert 1 not in truss.supports
+
+
+class TestDeterminate:
+    @pytest.mark.parametrize("method", ["direct", "cg", "joints"])
+    def test_triangle(self, method):
+        solution = make_triangle().solve(method=method)
+        diagonal = -10 / (2 * math.sin(math.pi / 4))
+        assert all_close(solution.member_forces, [5, diagonal, diagonal], tolerance=1e-8)
+        assert solution.reactions[0] == Vector(0, 5, 0)
+        assert solution.reactions[1] == Vector(0, 5, 0)
+
+    def test_forces_independent_of_stiffness(self):
+        truss = Truss()
+        for point in (Point(0, 0, 0), Point(4, 0, 0), Point(2, 2, 0)):
+            truss.add_joint(point)
+        truss.add_member(0, 1, stiffness=200)
+        truss.add_member(0, 2, stiffness=3)
+        truss.add_member(1, 2, stiffness=7)
+        truss.add_support(0, x=True, y=True, z=False)
+        truss.add_support(1, x=False, y=True, z=False)
+        truss.add_load(2, Vector(0, -10, 0))
+        assert all_close(truss.solve().member_forces, make_triangle().solve().member_forces)
+
+    def test_equilibrium_matrix(self):
+        truss = make_triangle()
+        solution = truss.solve()
+        internal = truss.equilibrium_matrix().matvec(solution.member_forces)
+        for joint in range(truss.joint_count):
+            reaction = solution.reactions.get(joint, Vector(0, 0, 0))
+            load = truss.loads[joint]
+            total = Vector(*internal[3 * joint:3 * joint + 3]) + reaction + load
+            assert total == Vector(0, 0, 0)
+
+    def test_space_truss(self):
+        truss = Truss()
+        base = [truss.add_joint(Point(math.cos(a), math.sin(a), 0)) for a in (0, 2 * math.pi / 3, 4 * math.pi / 3)]
+        apex = truss.add_joint(Point(0, 0, 1))
+        for joint in base:
+            truss.add_member(joint, apex)
+            truss.add_support(joint)
+        truss.add_load(apex, Vector(0, 0, -30))
+        solution = truss.solve()
+        assert all_close(solution.member_forces, [-10 * math.sqrt(2)] * 3)
+        total = Vector(0, 0, 0)
+        for reaction in solution.reactions.values():
+            total = total + reaction
+        assert total == Vector(0, 0, 30)
+
+
+class TestIndeterminate:
+    def test_members_share_load_by_stiffness(self):
+        truss = Truss()
+        a = truss.add_joint(Point(0, 0, 0))
+        b = truss.add_joint(Point(1, 0, 0))
+        c = truss.add_joint(Point(3, 0, 0))
+        truss.add_member(a, b)
+        truss.add_member(b, c)
+        truss.add_support(a)
+        truss.add_support(c)
+        truss.add_load(b, Vector(3, 0, 0))
+        solution = truss.solve()
+        assert all_close(solution.member_forces, [2, -1])
+        assert solution.reactions[a] == Vector(-2, 0, 0)
+        assert solution.reactions[c] == Vector(-1, 0, 0)
+        assert are_close_enough(solution.displacements[b].i, 2)
+
+
+class TestUnstable:
+    def test_mechanism(self):
+        truss = Truss()
+        for point in (Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0), Point(0, 1, 0)):
+            truss.add_joint(point)
+        for start, end in ((0, 1), (1, 2), (2, 3), (3, 0)):
+            truss.add_member(start, end)
+        truss.add_support(0, z=False)
+        truss.add_support(1, x=False, z=False)
+        truss.add_load(2, Vector(1, 0, 0))
+        with pytest.raises(ValueError):
+            truss.solve()
+
+    def test_load_without_stiffness(self):
+        truss = make_triangle()
+        truss.add_load(2, Vector(0, 0, 1))
+        with pytest.raises(ValueError):
+            truss.solve()
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            make_triangle().solve(method="dense")
+
+
+def make_braced_square():
+    truss = Truss()
+    for point in (Point(0, 0, 0), Point(3, 0, 0), Point(3, 3, 0), Point(0, 3, 0)):
+        truss.add_joint(point)
+    for start, end in ((0, 1), (1, 2), (2, 3), (3, 0), (0, 2), (1, 3)):
+        truss.add_member(start, end)
+    truss.add_support(0, z=False)
+    truss.add_support(1, x=False, z=False)
+    truss.add_load(2, Vector(2, -1, 0))
+    truss.add_load(3, Vector(0, -4, 0))
+    return truss
+
+
+def assert_same_solution(actual, expected):
+    assert all_close(actual.member_forces, expected.member_forces, tolerance=1e-8)
+    assert actual.reactions.keys() == expected.reactions.keys()
+    for joint, reaction in expected.reactions.items():
+        assert all_close([actual.reactions[joint].i, actual.reactions[joint].j, actual.reactions[joint].k],
+                         [reaction.i, reaction.j, reaction.k], tolerance=1e-8)
+
+
+class TestFactorizedTruss:
+    def test_default_loads(self):
+        truss = make_braced_square()
+        assert_same_solution(truss.factorize().solve(), truss.solve())
+
+    def test_solve_many(self):
+        truss = make_braced_square()
+        structure = truss.factorize()
+        cases = [{2: Vector(1, 0, 0)}, {3: Vector(0, -1, 0), 2: Vector(0, -1, 0)}]
+        for solution, case in zip(structure.solve_many(cases), cases):
+            truss.clear_loads()
+            for joint, force in case.items():
+                truss.add_load(joint, force)
+            assert_same_solution(solution, truss.solve())
+
+    def test_vector_array_loads(self):
+        truss = make_braced_square()
+        assert_same_solution(truss.factorize().solve(truss.loads), truss.solve())
+
+    def test_wrong_number_of_loads(self):
+        with pytest.raises(ValueError):
+            make_braced_square().factorize().solve(make_triangle().loads)
+
+    def test_change_stiffness(self):
+        structure = make_braced_square().factorize()
+        structure.set_member_stiffness(4, 5.0)
+        assert structure.pending_updates == 1
+        expected = make_braced_square()
+        expected.set_member_stiffness(4, 5.0)
+        assert_same_solution(structure.solve(), expected.solve())
+
+    def test_remove_member(self):
+        structure = make_braced_square().factorize()
+        structure.remove_member(5)
+        solution = structure.solve()
+        assert solution.member_forces[5] == 0
+        expected = Truss()
+        for point in make_braced_square().joints:
+            expected.add_joint(point)
+        for start, end in ((0, 1), (1, 2), (2, 3), (3, 0), (0, 2)):
+            expected.add_member(start, end)
+        expected.add_support(0, z=False)
+        expected.add_support(1, x=False, z=False)
+        expected.add_load(2, Vector(2, -1, 0))
+        expected.add_load(3, Vector(0, -4, 0))
+        assert all_close(list(solution.member_forces)[:5], expected.solve().member_forces, tolerance=1e-8)
+
+    def test_add_member(self):
+        truss = make_braced_square()
+        structure = truss.factorize()
+        assert structure.add_member(1, 3, stiffness=2.0) == 6
+        truss.add_member(1, 3, stiffness=2.0)
+        assert_same_solution(structure.solve(), truss.solve())
+
+    def test_add_support(self):
+        truss = make_braced_square()
+        structure = truss.factorize()
+        structure.add_support(3, x=True, y=False, z=False)
+        truss.add_support(3, x=True, y=False, z=False)
+        assert structure.pending_updates == 1
+        assert_same_solution(structure.solve(), truss.solve())
+
+    def test_release_support_refactorizes(self):
+        truss = make_braced_square()
+        structure = truss.factorize()
+        structure.add_support(1, x=True, y=True, z=False)
+        structure.solve()
+        structure.set_member_stiffness(0, 3.0)
+        structure.add_support(1, x=False, y=True, z=False)
+        truss.set_member_stiffness(0, 3.0)
+        assert_same_solution(structure.solve(), truss.solve())
+        assert structure.pending_updates == 0
+
+    def test_max_updates(self):
+        truss = make_braced_square()
+        structure = FactorizedTruss(truss, max_updates=2)
+        for stiffness in (2.0, 3.0, 4.0):
+            structure.set_member_stiffness(4, stiffness)
+        truss.set_member_stiffness(4, 4.0)
+        assert_same_solution(structure.solve(), truss.solve())
+        assert structure.pending_updates == 0
+
+    def test_removing_brace_leaves_mechanism(self):
+        structure = make_triangle().factorize()
+        structure.remove_member(0)
+        with pytest.raises(ValueError):
+            structure.solve()
+
+
+def make_howe(panels, width=3.0, depth=2.0):
+    """
+    A planar Howe truss with its bottom chord loaded, pinned at one end and on
+    a roller at the other.
+    """
+    truss = Truss()
+    bottom = [truss.add_joint(Point(width * i, 0, 0)) for i in range(panels + 1)]
+    top = [truss.add_joint(Point(width * i, depth, 0)) for i in range(1, panels)]
+    for a, b in zip(bottom, bottom[1:]):
+        truss.add_member(a, b)
+    for a, b in zip(top, top[1:]):
+        truss.add_member(a, b)
+    truss.add_member(bottom[0], top[0])
+    truss.add_member(top[-1], bottom[-1])
+    for i, joint in enumerate(top, start=1):
+        truss.add_member(bottom[i], joint)
+    for i in range(1, panels - 1):
+        if i < panels / 2:
+            truss.add_member(bottom[i], top[i])
+        else:
+            truss.add_member(top[i - 1], bottom[i + 1])
+    truss.add_support(bottom[0], x=True, y=True, z=False)
+    truss.add_support(bottom[-1], x=False, y=True, z=False)
+    for i, joint in enumerate(bottom[1:-1], start=1):
+        truss.add_load(joint, Vector(0.5 * i, -10 - i, 0))
+    return truss
+
+
+class TestDeterminateTruss:
+    def test_matches_direct_solve(self):
+        truss = make_howe(8)
+        assert_same_solution(truss.determinate().solve(), truss.solve())
+        assert truss.solve(method="joints").displacements is None
+
+    def test_space_truss_reactions_at_joints(self):
+        truss = Truss()
+        base = [truss.add_joint(Point(math.cos(a), math.sin(a), 0)) for a in (0, 2 * math.pi / 3, 4 * math.pi / 3)]
+        apex = truss.add_joint(Point(0, 0, 1))
+        for joint in base:
+            truss.add_member(joint, apex)
+            truss.add_support(joint)
+        truss.add_load(apex, Vector(1, -2, -30))
+        expected = truss.solve()
+        assert_same_solution(truss.solve(method="joints"), expected)
+        structure = truss.determinate()
+        assert all(are_close_enough(structure.member_force(member), force)
+                   for member, force in enumerate(expected.member_forces))
+
+    def test_other_load_cases(self):
+        truss = make_howe(6)
+        structure = truss.determinate()
+        loads = {3: Vector(4, -7, 0), 5: Vector(0, -2, 0)}
+        truss.clear_loads()
+        for joint, force in loads.items():
+            truss.add_load(joint, force)
+        assert_same_solution(structure.solve(loads), truss.solve())
+
+    def test_member_force(self):
+        truss = make_howe(8)
+        structure = truss.determinate()
+        expected = truss.solve().member_forces
+        for member in range(truss.member_count):
+            assert are_close_enough(structure.member_force(member), expected[member])
+            assert are_close_enough(structure.member_force(member), expected[member])
+        with pytest.raises(IndexError):
+            structure.member_force(truss.member_count)
+
+    def test_out_of_plane_load_at_support(self):
+        truss = make_triangle()
+        truss.add_support(2, x=False, y=False, z=True)
+        truss.add_load(2, Vector(0, 0, 3))
+        solution = truss.solve(method="joints")
+        assert solution.reactions[2] == Vector(0, 0, -3)
+        assert solution.reactions[0] == Vector(0, 5, 0)
+
+    def test_load_without_stiffness(self):
+        truss = make_triangle()
+        truss.add_load(2, Vector(0, 0, 1))
+        with pytest.raises(ValueError):
+            truss.solve(method="joints")
+
+    def test_indeterminate(self):
+        with pytest.raises(ValueError):
+            DeterminateTruss(make_braced_square())
+
+    def test_mechanism(self):
+        truss = Truss()
+        for point in (Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0), Point(0, 1, 0)):
+            truss.add_joint(point)
+        for start, end in ((0, 1), (1, 2), (2, 3), (3, 0)):
+            truss.add_member(start, end)
+        truss.add_support(0, z=False)
+        truss.add_support(1, x=False, z=False)
+        with pytest.raises(ValueError):
+            truss.determinate()
+
+    def test_collinear_members(self):
+        # With every member on one line only the axial equations exist, and
+        # three members between three joints are one too many for them.
+        truss = Truss()
+        for point in (Point(0, 0, 0), Point(1, 0, 0), Point(2, 0, 0)):
+            truss.add_joint(point)
+        truss.add_member(0, 1)
+        truss.add_member(1, 2)
+        truss.add_member(0, 2)
+        truss.add_support(0, z=False)
+        truss.add_support(2, x=False, z=False)
+        with pytest.raises(ValueError):
+            truss.determinate()
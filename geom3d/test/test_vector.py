@@ -1,6 +1,7 @@
 import pytest
 
 from geom3d.nums import are_close_enough
+from geom3d.vector import FrozenVector
 from geom3d.vector import Vector
 
 
@@ -240,3 +241,122 @@ class TestMakeLength:
         vector = Vector(1, 1, 1)
         scaled_vector = vector.make_length(2)
         assert scaled_vector.is_parallel(vector)
+
+
+class TestSlots:
+    def test_no_instance_dict(self):
+        assert not hasattr(Vector(1, 2, 3), '__dict__')
+
+    def test_components_still_assignable(self):
+        a = Vector(1, 2, 3)
+        a.i = 5
+        assert a == Vector(5, 2, 3)
+
+
+class TestFrozenVector:
+    def test_is_a_vector(self):
+        a = FrozenVector(1, 2, 3)
+        assert isinstance(a, Vector)
+        assert a == Vector(1, 2, 3)
+        assert Vector(1, 2, 3) == a
+
+    def test_immutable(self):
+        a = FrozenVector(1, 2, 3)
+        with pytest.raises(AttributeError):
+            a.i = 5
+
+    def test_usable_as_dict_key(self):
+        lookup = {FrozenVector(1, 2, 3): "a"}
+        assert lookup[FrozenVector(1, 2, 3)] == "a"
+
+    def test_float_noise_hashes_equal(self):
+        a = FrozenVector(0.1 + 0.2, 1, 1)
+        b = FrozenVector(0.3, 1, 1)
+        assert a == b
+        assert hash(a) == hash(b)
+        assert len({a, b}) == 1
+
+    def test_equal_implies_close(self):
+        a = FrozenVector(1, 2, 3)
+        b = FrozenVector(1 + 2e-10, 2, 3)
+        assert a != b
+        assert not are_close_enough(a.i, b.i)
+
+    def test_equality_is_transitive_and_hash_consistent(self):
+        # Components on both sides of the grid edges at +-0.5 tolerances.
+        values = [step * 0.1e-10 for step in range(-12, 13)]
+        values += [edge + offset for edge in (-0.5e-10, 0.5e-10) for offset in (-1e-16, 0.0, 1e-16)]
+        vectors = [FrozenVector(value, 1, value) for value in values]
+        for a in vectors:
+            for b in vectors:
+                if a == b:
+                    assert hash(a) == hash(b)
+                    assert b in {a}
+                    assert {a: 1}[b] == 1
+                    assert all(a == c for c in vectors if b == c)
+
+    def test_tolerance_attribute(self):
+        class Coarse(FrozenVector):
+            tolerance = 1e-3
+
+        assert Coarse(1, 2, 3) == Coarse(1.0004, 2, 3)
+        assert hash(Coarse(1, 2, 3)) == hash(Coarse(1.0004, 2, 3))
+        assert Coarse(1, 2, 3) != Coarse(1.002, 2, 3)
+
+    def test_huge_components(self):
+        a = FrozenVector(1e300, -1.7e308, 0)
+        assert a == FrozenVector(1e300, -1.7e308, 0)
+        assert hash(a) == hash(FrozenVector(1e300, -1.7e308, 0))
+        assert a != FrozenVector(1e300, 1.7e308, 0)
+
+    @pytest.mark.parametrize("value", [float('inf'), float('-inf'), float('nan')])
+    def test_non_finite_components(self, value):
+        a = FrozenVector(value, 1, 2)
+        assert a == a
+        assert a in {a}
+        assert a != FrozenVector(value, 1, 2)
+
+    def test_from_vector(self):
+        assert FrozenVector.from_vector(Vector(1, 2, 3)) == FrozenVector(1, 2, 3)
+
+    def test_arithmetic_returns_vector(self):
+        result = FrozenVector(1, 2, 3) + FrozenVector(1, 1, 1)
+        assert type(result) is Vector
+        assert result == Vector(2, 3, 4)
+
+
+class TestDerivedProperties:
+    def test_norm_squared(self):
+        assert Vector(1, 2, 2).norm_squared == 9
+
+    def test_frozen_values_match_vector(self):
+        a = FrozenVector(0.3, -1.7, 2.9)
+        b = Vector(0.3, -1.7, 2.9)
+        assert a.norm == b.norm
+        assert a.norm_squared == b.norm_squared
+        assert (a.unit.i, a.unit.j, a.unit.k) == (b.unit.i, b.unit.j, b.unit.k)
+
+    def test_frozen_unit_is_cached_and_frozen(self):
+        a = FrozenVector(3, 4, 0)
+        assert a.unit is a.unit
+        assert isinstance(a.unit, FrozenVector)
+        assert a.unit == Vector(0.6, 0.8, 0)
+
+    def test_frozen_zero_unit(self):
+        zero = FrozenVector(0, 0, 0)
+        assert zero.unit is zero
+        assert zero.make_length(2) == Vector(0, 0, 0)
+
+    def test_cache_cannot_be_overwritten(self):
+        a = FrozenVector(3, 4, 0)
+        assert a.norm == 5
+        with pytest.raises(AttributeError):
+            a._norm = 1
+
+    def test_pickle_drops_cache(self):
+        import pickle
+        a = FrozenVector(3, 4, 0)
+        a.unit
+        copy = pickle.loads(pickle.dumps(a))
+        assert copy == a
+        assert copy.norm == 5
@@ -0,0 +1,123 @@
+import pytest
+
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+
+def make_batch():
+    return VectorArray.from_vectors([Vector(1, 2, 3), Vector(3, 4, 0), Vector(0, 0, 0)])
+
+
+class TestConstruction:
+    def test_from_vectors_round_trip(self):
+        vectors = [Vector(1, 2, 3), Vector(-1.5, 0, 2)]
+        assert VectorArray.from_vectors(vectors).to_vectors() == vectors
+
+    def test_from_components(self):
+        batch = VectorArray.from_components([1, 4], [2, 5], [3, 6])
+        assert batch[1] == Vector(4, 5, 6)
+
+    def test_len(self):
+        assert len(make_batch()) == 3
+        assert len(VectorArray()) == 0
+
+    def test_bad_length(self):
+        with pytest.raises(ValueError):
+            VectorArray([1, 2])
+
+    def test_memoryview_is_not_copied(self):
+        buffer = bytearray(48)
+        view = memoryview(buffer).cast('d')
+        batch = VectorArray(view)
+        view[4] = 7.0
+        assert batch[1] == Vector(0, 7, 0)
+
+    def test_negative_index(self):
+        assert make_batch()[-2] == Vector(3, 4, 0)
+
+    def test_index_out_of_range(self):
+        with pytest.raises(IndexError):
+            make_batch()[3]
+
+    def test_slice(self):
+        assert make_batch()[1:].to_vectors() == [Vector(3, 4, 0), Vector(0, 0, 0)]
+
+
+class TestArithmetic:
+    def test_add(self):
+        a = make_batch()
+        assert (a + a).to_vectors() == [v + v for v in a]
+
+    def test_add_broadcast_vector(self):
+        a = make_batch()
+        assert (a + Vector(1, 1, 1))[2] == Vector(1, 1, 1)
+
+    def test_sub(self):
+        a = make_batch()
+        assert (a - a).to_vectors() == [Vector(0, 0, 0)] * 3
+
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            make_batch() + make_batch()[:2]
+
+    def test_add_int(self):
+        with pytest.raises(TypeError):
+            make_batch() + 1
+
+    def test_scaled_by(self):
+        assert make_batch().scaled_by(2)[0] == Vector(2, 4, 6)
+
+    def test_scaled_by_per_vector(self):
+        assert (make_batch() * [1, -1, 5])[1] == Vector(-3, -4, 0)
+
+
+class TestProducts:
+    def test_dot(self):
+        a = make_batch()
+        assert list(a.dot(Vector(1, 0, 0))) == [1, 3, 0]
+
+    def test_cross_matches_vector(self):
+        a = make_batch()
+        b = VectorArray.from_vectors([Vector(0, 1, 0), Vector(1, 0, 0), Vector(1, 1, 1)])
+        assert a.cross(b).to_vectors() == [x.cross(y) for x, y in zip(a, b)]
+
+    def test_comp(self):
+        assert list(make_batch().comp(Vector(0, 2, 0))) == [2, 4, 0]
+
+    def test_comp_with_zero_vector(self):
+        with pytest.raises(ZeroDivisionError):
+            make_batch().comp(Vector(0, 0, 0))
+
+
+class TestNormAndUnit:
+    def test_norm(self):
+        assert list(make_batch().norm)[1:] == [5, 0]
+
+    def test_unit_matches_vector(self):
+        a = make_batch()
+        assert a.unit.to_vectors() == [v.unit for v in a]
+
+    def test_is_parallel(self):
+        assert make_batch().is_parallel(Vector(2, 4, 6)) == [True, False, True]
+
+    def test_make_length(self):
+        result = make_batch().make_length(10)
+        assert result[1] == Vector(6, 8, 0)
+        assert result[2] == Vector(0, 0, 0)
+
+    def test_make_length_per_vector(self):
+        result = make_batch().make_length([1, 2, 3])
+        assert result[1] == Vector(1.2, 1.6, 0)
+
+
+class TestCloseEnough:
+    def test_rows(self):
+        a = make_batch()
+        b = VectorArray.from_vectors([Vector(1, 2, 3 + 1e-12), Vector(3, 4, 1), Vector(0, 0, 0)])
+        assert a.close_enough(b) == [True, False, True]
+
+    def test_against_vector(self):
+        assert make_batch().close_enough(Vector(0, 0, 0)) == [False, False, True]
+
+    def test_custom_tolerance(self):
+        assert make_batch().close_enough(Vector(3, 4, 0.5), tolerance=1) == [False, True, False]
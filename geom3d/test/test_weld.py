@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.weld import remap_members, weld
+
+
+def brute_force_weld(points, tolerance):
+    kept = []
+    remap = []
+    for point in points:
+        for index, other in enumerate(kept):
+            if all(abs(a - b) < tolerance for a, b in zip((point.x, point.y, point.z), (other.x, other.y, other.z))):
+                remap.append(index)
+                break
+        else:
+            remap.append(len(kept))
+            kept.append(point)
+    return kept, remap
+
+
+class TestWeld:
+    def test_merges_float_noise(self):
+        points = PointCloud.from_points([
+            Point(0, 0, 0), Point(1, 0, 0), Point(1e-12, -1e-12, 0), Point(1 + 5e-11, 0, 0), Point(0, 1, 0)
+        ])
+        kept, remap = weld(points)
+        assert list(remap) == [0, 1, 0, 1, 2]
+        assert kept.to_points() == [Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)]
+
+    def test_keeps_first_occurrence(self):
+        points = PointCloud.from_points([Point(2e-11, 0, 0), Point(0, 0, 0)])
+        kept, remap = weld(points)
+        assert list(remap) == [0, 0]
+        assert kept[0].x == 2e-11
+
+    def test_points_just_outside_tolerance_are_kept(self):
+        points = PointCloud.from_points([Point(0, 0, 0), Point(0, 0, 0.002)])
+        kept, remap = weld(points, tolerance=0.001)
+        assert list(remap) == [0, 1]
+        assert len(kept) == 2
+
+    def test_matches_pairwise_comparison(self):
+        generator = random.Random(5)
+        centres = [Point(generator.randint(-3, 3) * 0.1, generator.randint(-3, 3) * 0.1, 0) for _ in range(60)]
+        points = [Point(p.x + generator.uniform(-1e-4, 1e-4), p.y + generator.uniform(-1e-4, 1e-4), p.z)
+                  for p in centres]
+        kept, remap = weld(PointCloud.from_points(points), tolerance=1e-3)
+        expected_kept, expected_remap = brute_force_weld(points, 1e-3)
+        assert list(remap) == expected_remap
+        assert kept.to_points() == expected_kept
+
+    def test_empty(self):
+        kept, remap = weld(PointCloud.from_points([]))
+        assert len(kept) == 0
+        assert len(remap) == 0
+
+    def test_rejects_non_positive_tolerance(self):
+        with pytest.raises(ValueError):
+            weld(PointCloud.from_points([Point(0, 0, 0)]), tolerance=0)
+
+
+class TestRemapMembers:
+    def test_rewrites_and_drops_collapsed(self):
+        members = [(0, 1), (1, 2), (0, 2), (3, 1)]
+        remap = [0, 1, 0, 1]
+        assert remap_members(members, remap) == [(0, 1), (1, 0)]
+
+    def test_keeps_collapsed_when_asked(self):
+        assert remap_members([(0, 2)], [0, 1, 0], drop_degenerate=False) == [(0, 0)]
@@ -0,0 +1,650 @@
+import math
+
+from geom3d.nums import are_close_enough
+from geom3d.nums import is_close_to_zero
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+from geom3d.vector_array import _interleave
+
+# How far R R^T may drift from the identity before a matrix is rejected as
+# not being a rotation.
+_ORTHONORMAL_TOLERANCE = 1e-9
+
+_IDENTITY = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+
+def _multiply(a, b):
+    """
+    Multiplies two 3x3 matrices stored as tuples of rows.
+    """
+    (a00, a01, a02), (a10, a11, a12), (a20, a21, a22) = a
+    (b00, b01, b02), (b10, b11, b12), (b20, b21, b22) = b
+    return (
+        (a00 * b00 + a01 * b10 + a02 * b20, a00 * b01 + a01 * b11 + a02 * b21, a00 * b02 + a01 * b12 + a02 * b22),
+        (a10 * b00 + a11 * b10 + a12 * b20, a10 * b01 + a11 * b11 + a12 * b21, a10 * b02 + a11 * b12 + a12 * b22),
+        (a20 * b00 + a21 * b10 + a22 * b20, a20 * b01 + a21 * b11 + a22 * b21, a20 * b02 + a21 * b12 + a22 * b22),
+    )
+
+
+def _transform_components(matrix, offset, xs, ys, zs):
+    """
+    Computes ``matrix @ (x, y, z) + offset`` for every row of three component
+    sequences in one pass.
+
+    :return: The three transformed component lists.
+    :rtype: tuple of list
+    """
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+    tx, ty, tz = offset
+    out_x, out_y, out_z = [], [], []
+    for x, y, z in zip(xs, ys, zs):
+        out_x.append(m00 * x + m01 * y + m02 * z + tx)
+        out_y.append(m10 * x + m11 * y + m12 * z + ty)
+        out_z.append(m20 * x + m21 * y + m22 * z + tz)
+    return out_x, out_y, out_z
+
+
+def _apply(matrix, translation, target):
+    """
+    Applies a rotation matrix and a translation to a point, a vector or a
+    batch of either. Vectors are directions, so they are only rotated.
+    """
+    if isinstance(target, Point):
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+        x, y, z = target.x, target.y, target.z
+        tx, ty, tz = translation
+        return Point(
+            m00 * x + m01 * y + m02 * z + tx,
+            m10 * x + m11 * y + m12 * z + ty,
+            m20 * x + m21 * y + m22 * z + tz
+        )
+    if isinstance(target, Vector):
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix
+        i, j, k = target.i, target.j, target.k
+        return Vector(
+            m00 * i + m01 * j + m02 * k,
+            m10 * i + m11 * j + m12 * k,
+            m20 * i + m21 * j + m22 * k
+        )
+    if isinstance(target, PointCloud):
+        return PointCloud(_interleave(*_transform_components(matrix, translation, target.x, target.y, target.z)))
+    if isinstance(target, VectorArray):
+        return VectorArray(_interleave(*_transform_components(matrix, (0.0, 0.0, 0.0), target.i, target.j, target.k)))
+    raise TypeError(f"Cannot transform {type(target).__name__}")
+
+
+class Rotation:
+    __slots__ = ('matrix',)
+
+    def __init__(self, matrix=_IDENTITY):
+        """
+        A rotation about the origin stored as a 3x3 orthonormal matrix.
+
+        Rotations compose with ``@``: ``(a @ b).apply(v)`` equals
+        ``a.apply(b.apply(v))``. `apply` rotates a `Vector`, a `Point`, or a
+        whole `VectorArray` or `PointCloud` in one call.
+
+        :param matrix: The three rows of the matrix. Defaults to the identity.
+        :type matrix: sequence of sequence of float
+        :raises ValueError: If the matrix is not 3x3, not orthonormal, or is a
+            reflection.
+        """
+        rows = tuple(tuple(float(value) for value in row) for row in matrix)
+        if len(rows) != 3 or any(len(row) != 3 for row in rows):
+            raise ValueError("A rotation matrix must be 3x3")
+        for r in range(3):
+            for c in range(3):
+                product = sum(rows[r][n] * rows[c][n] for n in range(3))
+                if not are_close_enough(product, 1.0 if r == c else 0.0, _ORTHONORMAL_TOLERANCE):
+                    raise ValueError("A rotation matrix must be orthonormal")
+        if _determinant(rows) < 0:
+            raise ValueError("A rotation matrix must not be a reflection")
+        self.matrix = rows
+
+    @classmethod
+    def _from_rows(cls, rows):
+        """
+        Wraps a matrix that is already known to be a rotation, skipping the
+        orthonormality check.
+        """
+        rotation = cls.__new__(cls)
+        rotation.matrix = rows
+        return rotation
+
+    @classmethod
+    def from_axis_angle(cls, axis: Vector, angle):
+        """
+        Builds the rotation by `angle` radians about `axis`, counterclockwise
+        when looking down the axis towards the origin (right-hand rule).
+
+        :param axis: The rotation axis. It does not need to be a unit vector.
+        :type axis: Vector
+        :param angle: The rotation angle in radians.
+        :type angle: float
+        :rtype: Rotation
+        :raises ValueError: If `axis` is the zero vector.
+        """
+        if is_close_to_zero(axis.norm):
+            raise ValueError("The rotation axis must not be the zero vector")
+        unit = axis.unit
+        x, y, z = unit.i, unit.j, unit.k
+        c = math.cos(angle)
+        s = math.sin(angle)
+        t = 1 - c
+        return cls._from_rows((
+            (t * x * x + c, t * x * y - s * z, t * x * z + s * y),
+            (t * x * y + s * z, t * y * y + c, t * y * z - s * x),
+            (t * x * z - s * y, t * y * z + s * x, t * z * z + c),
+        ))
+
+    @classmethod
+    def from_quaternion(cls, quaternion):
+        """
+        Builds the rotation represented by a quaternion.
+
+        :param quaternion: The quaternion. It is normalized first.
+        :type quaternion: Quaternion
+        :rtype: Rotation
+        """
+        return quaternion.to_rotation()
+
+    def to_quaternion(self):
+        """
+        The unit quaternion of this rotation, with a non-negative scalar part.
+
+        :rtype: Quaternion
+        """
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = self.matrix
+        trace = m00 + m11 + m22
+        if trace > 0:
+            s = 2 * math.sqrt(trace + 1)
+            w, x, y, z = s / 4, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s
+        elif m00 > m11 and m00 > m22:
+            s = 2 * math.sqrt(1 + m00 - m11 - m22)
+            w, x, y, z = (m21 - m12) / s, s / 4, (m01 + m10) / s, (m02 + m20) / s
+        elif m11 > m22:
+            s = 2 * math.sqrt(1 + m11 - m00 - m22)
+            w, x, y, z = (m02 - m20) / s, (m01 + m10) / s, s / 4, (m12 + m21) / s
+        else:
+            s = 2 * math.sqrt(1 + m22 - m00 - m11)
+            w, x, y, z = (m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, s / 4
+        if w < 0:
+            w, x, y, z = -w, -x, -y, -z
+        return Quaternion(w, x, y, z)
+
+    def to_axis_angle(self):
+        """
+        The axis and angle of this rotation. The angle is in ``[0, pi]``; the
+        identity has angle 0 and axis ``Vector(1, 0, 0)``.
+
+        :return: The unit axis and the angle in radians.
+        :rtype: tuple of (Vector, float)
+        """
+        return self.to_quaternion().to_axis_angle()
+
+    def inverse(self):
+        """
+        The opposite rotation, which is the transpose of the matrix.
+
+        :rtype: Rotation
+        """
+        return Rotation._from_rows(tuple(zip(*self.matrix)))
+
+    def __matmul__(self, other):
+        """
+        Composes two rotations, applying `other` first. A `RigidTransform`
+        on the right gives a `RigidTransform`.
+
+        :param other: The rotation or transform to apply first.
+        :type other: Rotation or RigidTransform
+        :rtype: Rotation or RigidTransform
+        """
+        if isinstance(other, Rotation):
+            return Rotation._from_rows(_multiply(self.matrix, other.matrix))
+        if isinstance(other, RigidTransform):
+            return RigidTransform(self) @ other
+        return NotImplemented
+
+    def apply(self, target):
+        """
+        Rotates a point, a vector, or a whole batch of either about the origin.
+
+        :param target: What to rotate.
+        :type target: Vector or Point or VectorArray or PointCloud
+        :return: The rotated value, of the same type as `target`.
+        :raises TypeError: If `target` is not one of the supported types.
+        """
+        return _apply(self.matrix, (0.0, 0.0, 0.0), target)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Rotation):
+            return False
+        return all(
+            are_close_enough(a, b)
+            for row, other_row in zip(self.matrix, other.matrix)
+            for a, b in zip(row, other_row)
+        )
+
+    def __str__(self):
+        return f"Rotation({self.matrix})"
+
+
+def _determinant(rows):
+    (a, b, c), (d, e, f), (g, h, i) = rows
+    return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+
+class Quaternion:
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w, x, y, z):
+        """
+        A quaternion ``w + x i + y j + z k``. Unit quaternions represent
+        rotations; multiplying two of them composes the rotations, applying
+        the right-hand one first.
+
+        :param w: The scalar part.
+        :type w: float
+        :param x: The first imaginary component.
+        :type x: float
+        :param y: The second imaginary component.
+        :type y: float
+        :param z: The third imaginary component.
+        :type z: float
+        """
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def from_axis_angle(cls, axis: Vector, angle):
+        """
+        Builds the unit quaternion of the rotation by `angle` radians about `axis`.
+
+        :param axis: The rotation axis. It does not need to be a unit vector.
+        :type axis: Vector
+        :param angle: The rotation angle in radians.
+        :type angle: float
+        :rtype: Quaternion
+        :raises ValueError: If `axis` is the zero vector.
+        """
+        if is_close_to_zero(axis.norm):
+            raise ValueError("The rotation axis must not be the zero vector")
+        unit = axis.unit
+        s = math.sin(angle / 2)
+        return cls(math.cos(angle / 2), unit.i * s, unit.j * s, unit.k * s)
+
+    @property
+    def norm(self):
+        """
+        The Euclidean norm of the four components.
+
+        :rtype: float
+        """
+        return math.sqrt(self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalized(self):
+        """
+        The quaternion scaled to unit norm.
+
+        :rtype: Quaternion
+        :raises ValueError: If the quaternion is zero.
+        """
+        norm = self.norm
+        if is_close_to_zero(norm):
+            raise ValueError("Cannot normalize the zero quaternion")
+        return Quaternion(self.w / norm, self.x / norm, self.y / norm, self.z / norm)
+
+    def conjugate(self):
+        """
+        The conjugate ``w - x i - y j - z k``, which is the inverse rotation
+        for a unit quaternion.
+
+        :rtype: Quaternion
+        """
+        return Quaternion(self.w, -self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        """
+        The Hamilton product of two quaternions.
+
+        :param other: The right-hand quaternion.
+        :type other: Quaternion
+        :rtype: Quaternion
+        """
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        return Quaternion(
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        )
+
+    def to_rotation(self):
+        """
+        The rotation matrix of this quaternion, after normalizing it.
+
+        :rtype: Rotation
+        :raises ValueError: If the quaternion is zero.
+        """
+        q = self.normalized()
+        w, x, y, z = q.w, q.x, q.y, q.z
+        return Rotation._from_rows((
+            (1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)),
+            (2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)),
+            (2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)),
+        ))
+
+    def to_axis_angle(self):
+        """
+        The axis and angle of the rotation this quaternion represents. The
+        angle is in ``[0, pi]``; the identity has angle 0 and axis
+        ``Vector(1, 0, 0)``.
+
+        :return: The unit axis and the angle in radians.
+        :rtype: tuple of (Vector, float)
+        """
+        q = self.normalized()
+        if q.w < 0:
+            q = Quaternion(-q.w, -q.x, -q.y, -q.z)
+        s = math.sqrt(q.x * q.x + q.y * q.y + q.z * q.z)
+        if is_close_to_zero(s):
+            return Vector(1, 0, 0), 0.0
+        return Vector(q.x / s, q.y / s, q.z / s), 2 * math.atan2(s, q.w)
+
+    def apply(self, target):
+        """
+        Rotates a point, a vector, or a whole batch of either about the origin.
+
+        :param target: What to rotate.
+        :type target: Vector or Point or VectorArray or PointCloud
+        :return: The rotated value, of the same type as `target`.
+        """
+        return self.to_rotation().apply(target)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Quaternion):
+            return False
+        return (are_close_enough(self.w, other.w) and are_close_enough(self.x, other.x)
+                and are_close_enough(self.y, other.y) and are_close_enough(self.z, other.z))
+
+    def __str__(self):
+        return f"({self.w}, {self.x}, {self.y}, {self.z})"
+
+
+class RigidTransform:
+    __slots__ = ('rotation', 'translation')
+
+    def __init__(self, rotation=None, translation=None):
+        """
+        A rigid motion: a rotation about the origin followed by a translation,
+        the 4x4 homogeneous matrix ``[[R, t], [0, 1]]``.
+
+        Transforms compose with ``@``, applying the right-hand one first.
+        `apply` moves points and rotates vectors (a vector has homogeneous
+        coordinate 0, so the translation does not affect it), one at a time or
+        as a whole `PointCloud` or `VectorArray`.
+
+        :param rotation: The rotation. Defaults to the identity.
+        :type rotation: Rotation or None
+        :param translation: The translation. Defaults to zero.
+        :type translation: Vector or None
+        """
+        self.rotation = rotation if rotation is not None else Rotation._from_rows(_IDENTITY)
+        self.translation = translation if translation is not None else Vector(0, 0, 0)
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Builds a transform from a 4x4 homogeneous matrix.
+
+        :param matrix: The four rows of the matrix.
+        :type matrix: sequence of sequence of float
+        :rtype: RigidTransform
+        :raises ValueError: If the matrix is not 4x4, its last row is not
+            ``0, 0, 0, 1``, or its upper-left block is not a rotation.
+        """
+        rows = [list(row) for row in matrix]
+        if len(rows) != 4 or any(len(row) != 4 for row in rows):
+            raise ValueError("A homogeneous transform must be 4x4")
+        if not all(are_close_enough(a, b) for a, b in zip(rows[3], (0, 0, 0, 1))):
+            raise ValueError("The last row of a rigid transform must be 0, 0, 0, 1")
+        rotation = Rotation([row[:3] for row in rows[:3]])
+        return cls(rotation, Vector(rows[0][3], rows[1][3], rows[2][3]))
+
+    def to_matrix(self):
+        """
+        The 4x4 homogeneous matrix of this transform.
+
+        :rtype: list of list of float
+        """
+        t = (self.translation.i, self.translation.j, self.translation.k)
+        rows = [list(row) + [offset] for row, offset in zip(self.rotation.matrix, t)]
+        rows.append([0.0, 0.0, 0.0, 1.0])
+        return rows
+
+    def inverse(self):
+        """
+        The transform that undoes this one.
+
+        :rtype: RigidTransform
+        """
+        inverse = self.rotation.inverse()
+        return RigidTransform(inverse, inverse.apply(self.translation).scaled_by(-1))
+
+    def __matmul__(self, other):
+        """
+        Composes two transforms, applying `other` first.
+
+        :param other: The transform or rotation to apply first.
+        :type other: RigidTransform or Rotation
+        :rtype: RigidTransform
+        """
+        if isinstance(other, Rotation):
+            other = RigidTransform(other)
+        if not isinstance(other, RigidTransform):
+            return NotImplemented
+        return RigidTransform(
+            self.rotation @ other.rotation,
+            self.rotation.apply(other.translation) + self.translation
+        )
+
+    def apply(self, target):
+        """
+        Transforms a point, a vector, or a whole batch of either. Points are
+        rotated and translated; vectors are only rotated.
+
+        :param target: What to transform.
+        :type target: Vector or Point or VectorArray or PointCloud
+        :return: The transformed value, of the same type as `target`.
+        :raises TypeError: If `target` is not one of the supported types.
+        """
+        t = self.translation
+        return _apply(self.rotation.matrix, (t.i, t.j, t.k), target)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, RigidTransform):
+            return False
+        return self.rotation == other.rotation and self.translation == other.translation
+
+    def __str__(self):
+        return f"RigidTransform({self.rotation}, {self.translation})"
+
+
+def apply_each(transforms, target):
+    """
+    Applies a different transform to every element of a batch, such as the
+    local-to-global transform of every member of a structure.
+
+    :param transforms: One transform per element of `target`.
+    :type transforms: sequence of Rotation or Quaternion or RigidTransform
+    :param target: The batch to transform. Points are rotated and translated;
+        vectors are only rotated.
+    :type target: PointCloud or VectorArray
+    :return: The transformed batch, of the same type as `target`.
+    :rtype: PointCloud or VectorArray
+    :raises ValueError: If the number of transforms does not match the batch.
+    """
+    if len(transforms) != len(target):
+        raise ValueError(f"Expected {len(target)} transforms, got {len(transforms)}")
+    if isinstance(target, PointCloud):
+        is_points, components = True, (target.x, target.y, target.z)
+    elif isinstance(target, VectorArray):
+        is_points, components = False, (target.i, target.j, target.k)
+    else:
+        raise TypeError(f"Cannot transform {type(target).__name__}")
+    out_x, out_y, out_z = [], [], []
+    tx = ty = tz = 0.0
+    for transform, x, y, z in zip(transforms, *components):
+        transform = _as_rigid(transform)
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = transform.rotation.matrix
+        if is_points:
+            t = transform.translation
+            tx, ty, tz = t.i, t.j, t.k
+        out_x.append(m00 * x + m01 * y + m02 * z + tx)
+        out_y.append(m10 * x + m11 * y + m12 * z + ty)
+        out_z.append(m20 * x + m21 * y + m22 * z + tz)
+    return type(target)(_interleave(out_x, out_y, out_z))
+
+
+class FrameTree:
+    def __init__(self, root='world'):
+        """
+        A tree of named coordinate frames, each placed in its parent by a
+        `RigidTransform`.
+
+        The transform between any two frames is the product of the transforms
+        along the path between them. Every frame's transform to the root and
+        every frame-to-frame transform are cached once computed, so repeated
+        conversions between the same frames cost one lookup. Changing a
+        frame's placement clears the caches.
+
+        :param root: The name of the root frame. Defaults to ``'world'``.
+        :type root: str
+        """
+        self.root = root
+        self._parents = {root: None}
+        self._placements = {root: RigidTransform()}
+        self._to_root = {root: self._placements[root]}
+        self._between = {}
+
+    def __contains__(self, name):
+        return name in self._parents
+
+    def add_frame(self, name, parent, transform):
+        """
+        Adds a frame.
+
+        :param name: The name of the new frame.
+        :type name: str
+        :param parent: The name of the frame it is placed in.
+        :type parent: str
+        :param transform: Maps coordinates in the new frame to coordinates in
+            the parent frame.
+        :type transform: RigidTransform or Rotation
+        :raises ValueError: If `name` already exists.
+        :raises KeyError: If `parent` does not exist.
+        """
+        if name in self._parents:
+            raise ValueError(f"Frame {name!r} already exists")
+        if parent not in self._parents:
+            raise KeyError(parent)
+        placement = _as_rigid(transform)
+        self._parents[name] = parent
+        self._placements[name] = placement
+
+    def set_transform(self, name, transform):
+        """
+        Moves a frame within its parent. Frames placed in it move with it.
+
+        :param name: The name of the frame.
+        :type name: str
+        :param transform: The new placement in the parent frame.
+        :type transform: RigidTransform or Rotation
+        :raises ValueError: If `name` is the root frame.
+        """
+        if name == self.root:
+            raise ValueError("The root frame cannot be moved")
+        if name not in self._parents:
+            raise KeyError(name)
+        self._placements[name] = _as_rigid(transform)
+        self._to_root = {self.root: self._placements[self.root]}
+        self._between.clear()
+
+    def to_root(self, name):
+        """
+        The transform from a frame's coordinates to root coordinates.
+
+        :param name: The name of the frame.
+        :type name: str
+        :rtype: RigidTransform
+        """
+        cached = self._to_root.get(name)
+        if cached is not None:
+            return cached
+        # Walk up to the nearest frame with a cached transform, then cache
+        # every frame on the way back down.
+        path = [name]
+        parent = self._parents[name]
+        while parent not in self._to_root:
+            path.append(parent)
+            parent = self._parents[parent]
+        cached = self._to_root[parent]
+        for frame in reversed(path):
+            cached = cached @ self._placements[frame]
+            self._to_root[frame] = cached
+        return cached
+
+    def transform(self, source, target):
+        """
+        The transform from `source` coordinates to `target` coordinates.
+
+        :param source: The frame the coordinates are given in.
+        :type source: str
+        :param target: The frame to express them in.
+        :type target: str
+        :rtype: RigidTransform
+        """
+        key = (source, target)
+        cached = self._between.get(key)
+        if cached is None:
+            cached = self.to_root(target).inverse() @ self.to_root(source)
+            self._between[key] = cached
+        return cached
+
+    def convert(self, value, source, target):
+        """
+        Re-expresses a point, a vector, or a batch of either given in one
+        frame in another frame.
+
+        :param value: The value to convert.
+        :type value: Vector or Point or VectorArray or PointCloud
+        :param source: The frame `value` is given in.
+        :type source: str
+        :param target: The frame to express it in.
+        :type target: str
+        :return: The converted value, of the same type as `value`.
+        """
+        return self.transform(source, target).apply(value)
+
+
+def _as_rigid(transform):
+    if isinstance(transform, Quaternion):
+        transform = transform.to_rotation()
+    if isinstance(transform, Rotation):
+        return RigidTransform(transform)
+    if isinstance(transform, RigidTransform):
+        return transform
+    raise TypeError(f"Expected a Rotation, Quaternion or RigidTransform, got {type(transform).__name__}")
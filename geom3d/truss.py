@@ -0,0 +1,1099 @@
+import math
+from array import array
+from collections import deque
+from operator import mul
+
+from geom3d.point_cloud import PointCloud
+from geom3d.points import Point
+from geom3d.sparse import SparseMatrix
+from geom3d.sparse import cholesky
+from geom3d.sparse import conjugate_gradient
+from geom3d.vector import Vector
+from geom3d.vector_array import VectorArray
+
+# Free degrees of freedom whose stiffness falls below this fraction of the
+# largest diagonal entry carry no member stiffness at all, such as the
+# out-of-plane direction of a planar truss.
+_UNCONNECTED_DOF = 1e-12
+
+
+class TrussSolution:
+    __slots__ = ('member_forces', 'reactions', 'displacements')
+
+    def __init__(self, member_forces, reactions, displacements):
+        """
+        The result of solving a truss.
+
+        :param member_forces: The axial force in every member, positive in
+            tension and negative in compression.
+        :type member_forces: array
+        :param reactions: The reaction force at every supported joint, keyed by
+            joint index. Unrestrained directions of a support are zero.
+        :type reactions: dict of int to Vector
+        :param displacements: The displacement of every joint. Only meaningful
+            in absolute terms when real member stiffnesses were given, and None
+            when the truss was solved by statics alone.
+        :type displacements: VectorArray or None
+        """
+        self.member_forces = member_forces
+        self.reactions = reactions
+        self.displacements = displacements
+
+
+class Truss:
+    def __init__(self):
+        """
+        A pin-jointed truss: joints at `Point`s, two-force members between
+        pairs of joints, supports that restrain joint directions and loads
+        applied at joints.
+
+        Solving uses the stiffness form of the equilibrium equations,
+        ``A diag(EA / L) A^T u = f`` with `A` the sparse equilibrium matrix,
+        which gives the member forces and reactions for statically determinate
+        and indeterminate trusses alike. For a determinate truss the member
+        forces do not depend on the member stiffnesses.
+        """
+        self._joints = array('d')
+        self._loads = array('d')
+        self._starts = array('q')
+        self._ends = array('q')
+        self._stiffness = array('d')
+        self._supports = {}
+
+    @property
+    def joint_count(self):
+        return len(self._joints) // 3
+
+    @property
+    def member_count(self):
+        return len(self._starts)
+
+    @property
+    def joints(self):
+        """
+        The position of every joint.
+
+        :rtype: PointCloud
+        """
+        return PointCloud(self._joints)
+
+    @property
+    def members(self):
+        """
+        The ``(start, end)`` joint indices of every member.
+
+        :rtype: list of tuple of (int, int)
+        """
+        return list(zip(self._starts, self._ends))
+
+    @property
+    def stiffnesses(self):
+        """
+        The axial rigidity EA of every member.
+
+        :rtype: array
+        """
+        return array('d', self._stiffness)
+
+    @property
+    def supports(self):
+        """
+        The restrained directions of every supported joint, keyed by joint index.
+
+        :rtype: dict of int to tuple of bool
+        """
+        return dict(self._supports)
+
+    @property
+    def loads(self):
+        """
+        The external load applied at every joint.
+
+        :rtype: VectorArray
+        """
+        return VectorArray(array('d', self._loads))
+
+    def joint(self, index):
+        """
+        The position of one joint.
+
+        :param index: The joint index.
+        :type index: int
+        :rtype: Point
+        """
+        return self.joints[index]
+
+    def add_joint(self, point: Point):
+        """
+        Adds a joint at a point.
+
+        :param point: The joint position.
+        :type point: Point
+        :return: The index of the new joint.
+        :rtype: int
+        """
+        self._joints.extend((point.x, point.y, point.z))
+        self._loads.extend((0.0, 0.0, 0.0))
+        return self.joint_count - 1
+
+    def add_joints(self, points: PointCloud):
+        """
+        Adds one joint per point of a cloud.
+
+        :param points: The joint positions.
+        :type points: PointCloud
+        :return: The indices of the new joints.
+        :rtype: range
+        """
+        first = self.joint_count
+        self._joints.extend(points.data)
+        self._loads.extend(array('d', bytes(24 * len(points))))
+        return range(first, self.joint_count)
+
+    def _check_joint(self, index):
+        if not 0 <= index < self.joint_count:
+            raise IndexError(f"Joint {index} does not exist")
+
+    def add_member(self, start, end, stiffness=1.0):
+        """
+        Adds a two-force member between two joints.
+
+        :param start: The index of the first joint.
+        :type start: int
+        :param end: The index of the second joint.
+        :type end: int
+        :param stiffness: The axial rigidity EA of the member. Defaults to 1.0,
+            which is enough for the forces of a statically determinate truss.
+        :type stiffness: float
+        :return: The index of the new member.
+        :rtype: int
+        """
+        self._check_joint(start)
+        self._check_joint(end)
+        if start == end:
+            raise ValueError("A member must connect two different joints")
+        if stiffness <= 0:
+            raise ValueError("Member stiffness must be positive")
+        self._starts.append(start)
+        self._ends.append(end)
+        self._stiffness.append(stiffness)
+        return self.member_count - 1
+
+    def set_member_stiffness(self, member, stiffness):
+        """
+        Changes the axial rigidity EA of a member.
+
+        :param member: The member index.
+        :type member: int
+        :param stiffness: The new axial rigidity.
+        :type stiffness: float
+        """
+        if stiffness <= 0:
+            raise ValueError("Member stiffness must be positive")
+        self._stiffness[member] = stiffness
+
+    def add_support(self, joint, x=True, y=True, z=True):
+        """
+        Restrains a joint in some or all of the global directions. Calling it
+        again for the same joint replaces the previous restraint.
+
+        :param joint: The joint index.
+        :type joint: int
+        :param x: Whether the `x` direction is restrained.
+        :type x: bool
+        :param y: Whether the `y` direction is restrained.
+        :type y: bool
+        :param z: Whether the `z` direction is restrained.
+        :type z: bool
+        """
+        self._check_joint(joint)
+        if x or y or z:
+            self._supports[joint] = (bool(x), bool(y), bool(z))
+        else:
+            self._supports.pop(joint, None)
+
+    def add_load(self, joint, force: Vector):
+        """
+        Adds an external force at a joint, on top of any load already there.
+
+        :param joint: The joint index.
+        :type joint: int
+        :param force: The applied force.
+        :type force: Vector
+        """
+        self._check_joint(joint)
+        offset = 3 * joint
+        self._loads[offset] += force.i
+        self._loads[offset + 1] += force.j
+        self._loads[offset + 2] += force.k
+
+    def clear_loads(self):
+        """
+        Removes every external load.
+        """
+        self._loads = array('d', bytes(8 * len(self._loads)))
+
+    def member_vector(self, member):
+        """
+        The vector along a member, from its start joint to its end joint.
+
+        :param member: The member index.
+        :type member: int
+        :rtype: Vector
+        """
+        return self.joint(self._starts[member]).make_vector(self.joint(self._ends[member]))
+
+    def _member_directions(self):
+        """
+        Returns the unit direction and length of every member, computed over
+        all members at once.
+        """
+        joints = self._joints
+        starts = PointCloud(array('d', [c for s in self._starts for c in joints[3 * s:3 * s + 3]]))
+        ends = PointCloud(array('d', [c for e in self._ends for c in joints[3 * e:3 * e + 3]]))
+        vectors = starts.make_vector(ends)
+        lengths = vectors.norm
+        if any(length == 0 for length in lengths):
+            raise ValueError("Members must have a non-zero length")
+        return vectors.unit, lengths
+
+    def equilibrium_matrix(self):
+        """
+        Assembles the sparse equilibrium matrix `A` of the truss, with one row
+        per joint direction and one column per member. Column `m` holds the
+        force that a unit tension in member `m` exerts on its joints, so
+        ``A t + r + f = 0`` for member forces `t`, reactions `r` and loads `f`.
+
+        :rtype: SparseMatrix
+        """
+        directions, _ = self._member_directions()
+        rows, columns, values = [], [], []
+        for member, (start, end, e) in enumerate(zip(self._starts, self._ends, directions)):
+            for axis, component in enumerate((e.i, e.j, e.k)):
+                if component:
+                    rows.extend((3 * start + axis, 3 * end + axis))
+                    columns.extend((member, member))
+                    values.extend((component, -component))
+        return SparseMatrix.from_triplets(rows, columns, values, (3 * self.joint_count, self.member_count))
+
+    def _restrained_dofs(self):
+        return _restrained_dofs(self._supports)
+
+    def _member_blocks(self):
+        """
+        Returns every member's joints, unit direction components and axial
+        stiffness EA / L.
+        """
+        directions, lengths = self._member_directions()
+        return [
+            (start, end, (e.i, e.j, e.k), rigidity / length)
+            for start, end, e, length, rigidity in zip(self._starts, self._ends, directions,
+                                                       lengths, self._stiffness)
+        ]
+
+    def solve(self, method="direct", tolerance=1e-10):
+        """
+        Solves the truss for its member forces, reactions and displacements.
+
+        :param method: ``"direct"`` for a sparse Cholesky factorization,
+            ``"cg"`` for the Jacobi-preconditioned conjugate gradient method,
+            which needs less memory on very large trusses, or ``"joints"`` for
+            the method of joints on a statically determinate truss, which
+            needs no matrix at all but gives no displacements, see
+            `DeterminateTruss`.
+        :type method: str
+        :param tolerance: The relative residual tolerance of the ``"cg"`` method.
+        :type tolerance: float
+        :return: The member forces, reactions and displacements.
+        :rtype: TrussSolution
+        :raises ValueError: If the truss is unstable (a mechanism) or the
+            method is unknown.
+        """
+        if method == "joints":
+            return DeterminateTruss(self).solve()
+        if method not in ("direct", "cg"):
+            raise ValueError(f"Unknown method {method!r}, expected 'direct', 'cg' or 'joints'")
+        blocks = self._member_blocks()
+        restrained = self._restrained_dofs()
+        stiffness, free = _assemble(self.joint_count, blocks, restrained)
+        _check_loads(self._loads, free, restrained)
+        rhs = array('d', [self._loads[dof] for dof in free])
+        if method == "direct":
+            solution = _factorize(stiffness, free, self.joints).solve(rhs)
+        else:
+            solution = conjugate_gradient(stiffness, rhs, tolerance=tolerance)
+        return _recover(blocks, self._supports, free, solution, self._loads)
+
+    def factorize(self):
+        """
+        Factorizes the stiffness matrix once so that many load cases can be
+        solved cheaply, see `FactorizedTruss`.
+
+        :rtype: FactorizedTruss
+        """
+        return FactorizedTruss(self)
+
+    def determinate(self):
+        """
+        Prepares the truss for solving by statics alone, joint by joint or one
+        member at a time, see `DeterminateTruss`.
+
+        :rtype: DeterminateTruss
+        :raises ValueError: If the truss is not statically determinate or
+            cannot be solved one joint at a time.
+        """
+        return DeterminateTruss(self)
+
+
+def _restrained_dofs(supports):
+    restrained = set()
+    for joint, directions in supports.items():
+        for axis, fixed in enumerate(directions):
+            if fixed:
+                restrained.add(3 * joint + axis)
+    return restrained
+
+
+def _member_dofs(start, end):
+    return 3 * start, 3 * start + 1, 3 * start + 2, 3 * end, 3 * end + 1, 3 * end + 2
+
+
+def _assemble(joint_count, blocks, restrained):
+    """
+    Assembles the stiffness matrix ``A diag(EA / L) A^T`` over the free joint
+    directions. Directions that no member stiffens, such as the out-of-plane
+    direction of a planar truss, are left out along with the restrained ones.
+
+    :return: The reduced stiffness matrix and the free directions in order.
+    """
+    diagonal = array('d', bytes(24 * joint_count))
+    for start, end, e, k in blocks:
+        for axis in range(3):
+            contribution = k * e[axis] * e[axis]
+            diagonal[3 * start + axis] += contribution
+            diagonal[3 * end + axis] += contribution
+    threshold = _UNCONNECTED_DOF * max(diagonal, default=0.0)
+    free = [dof for dof in range(3 * joint_count) if dof not in restrained and diagonal[dof] > threshold]
+    position = {dof: index for index, dof in enumerate(free)}
+    rows, columns, values = [], [], []
+    for start, end, e, k in blocks:
+        if not k:
+            continue
+        reduced = [position.get(dof) for dof in _member_dofs(start, end)]
+        signed = (e[0], e[1], e[2], -e[0], -e[1], -e[2])
+        for a in range(6):
+            if reduced[a] is None or not signed[a]:
+                continue
+            for b in range(6):
+                if reduced[b] is not None and signed[b]:
+                    rows.append(reduced[a])
+                    columns.append(reduced[b])
+                    values.append(k * signed[a] * signed[b])
+    return SparseMatrix.from_triplets(rows, columns, values, (len(free), len(free))), free
+
+
+def _factorize(stiffness, free, joints):
+    """
+    Factorizes a reduced stiffness matrix, ordered by the position of the
+    joint of every free direction.
+    """
+    data = joints.data
+    positions = [tuple(data[3 * (dof // 3):3 * (dof // 3) + 3]) for dof in free]
+    try:
+        return cholesky(stiffness, positions)
+    except ValueError:
+        raise ValueError("The truss is unstable: its stiffness matrix is singular") from None
+
+
+def _check_loads(loads, free, restrained):
+    """
+    Rejects loads on directions that are neither free nor restrained, which no
+    member or support can resist.
+    """
+    free = set(free)
+    for dof, load in enumerate(loads):
+        if load and dof not in free and dof not in restrained:
+            raise ValueError(f"Joint {dof // 3} is loaded in a direction no member can resist")
+
+
+def _recover(blocks, supports, free, free_displacements, loads):
+    """
+    Turns the displacements of the free directions into member forces,
+    reactions and joint displacements. The reaction at a restrained direction
+    balances the member forces and the load acting there.
+    """
+    displacements = array('d', bytes(8 * len(loads)))
+    for dof, value in zip(free, free_displacements):
+        displacements[dof] = value
+    forces = array('d')
+    internal = array('d', bytes(8 * len(loads)))
+    for start, end, e, k in blocks:
+        elongation = sum(
+            e[axis] * (displacements[3 * end + axis] - displacements[3 * start + axis])
+            for axis in range(3)
+        )
+        force = k * elongation
+        forces.append(force)
+        if force:
+            for axis in range(3):
+                internal[3 * start + axis] -= force * e[axis]
+                internal[3 * end + axis] += force * e[axis]
+    reactions = {}
+    for joint, directions in sorted(supports.items()):
+        components = [
+            internal[3 * joint + axis] - loads[3 * joint + axis] if fixed else 0.0
+            for axis, fixed in enumerate(directions)
+        ]
+        reactions[joint] = Vector(*components)
+    return TrussSolution(forces, reactions, VectorArray(displacements))
+
+
+def _load_vector(loads, joint_count):
+    """
+    Flattens one load per joint, or a mapping from joint index to load, into
+    a load vector over every joint direction.
+    """
+    if isinstance(loads, VectorArray):
+        if len(loads) != joint_count:
+            raise ValueError(f"Expected {joint_count} joint loads, got {len(loads)}")
+        return array('d', loads.data)
+    vector = array('d', bytes(24 * joint_count))
+    for joint, force in loads.items():
+        vector[3 * joint] += force.i
+        vector[3 * joint + 1] += force.j
+        vector[3 * joint + 2] += force.k
+    return vector
+
+
+class _DenseLU:
+    def __init__(self, matrix):
+        """
+        LU factorization with partial pivoting of a small dense matrix, used for
+        the capacitance system of the low-rank updates in `FactorizedTruss`.
+        """
+        size = len(matrix)
+        lu = [list(row) for row in matrix]
+        pivots = list(range(size))
+        scale = max((abs(v) for row in lu for v in row), default=0.0)
+        for column in range(size):
+            pivot = max(range(column, size), key=lambda r: abs(lu[r][column]))
+            if abs(lu[pivot][column]) <= _UNCONNECTED_DOF * scale:
+                raise ValueError("The truss is unstable: its stiffness matrix is singular")
+            if pivot != column:
+                lu[pivot], lu[column] = lu[column], lu[pivot]
+                pivots[pivot], pivots[column] = pivots[column], pivots[pivot]
+            for row in range(column + 1, size):
+                factor = lu[row][column] / lu[column][column]
+                lu[row][column] = factor
+                if factor:
+                    for k in range(column + 1, size):
+                        lu[row][k] -= factor * lu[column][k]
+        self.lu = lu
+        self.pivots = pivots
+
+    def solve(self, b):
+        lu = self.lu
+        size = len(lu)
+        y = [b[p] for p in self.pivots]
+        for row in range(size):
+            y[row] -= sum(lu[row][k] * y[k] for k in range(row))
+        for row in range(size - 1, -1, -1):
+            y[row] = (y[row] - sum(lu[row][k] * y[k] for k in range(row + 1, size))) / lu[row][row]
+        return y
+
+
+class FactorizedTruss:
+    def __init__(self, truss: Truss, max_updates=32):
+        """
+        A truss whose stiffness matrix is factorized once and reused for any
+        number of load cases.
+
+        The geometry, members and supports are copied from `truss` when this
+        object is created. Changing a member's stiffness, removing or adding a
+        member, or adding a support afterwards does not refactorize: each change
+        is a low-rank correction that is folded into every later solve through
+        a small dense capacitance system. After `max_updates` corrections, or
+        for a change that cannot be expressed as a correction (releasing a
+        restraint, or stiffening a direction that had no stiffness), the matrix
+        is refactorized on the next solve.
+
+        :param truss: The truss to factorize.
+        :type truss: Truss
+        :param max_updates: The number of low-rank corrections to accumulate
+            before refactorizing. Defaults to 32.
+        :type max_updates: int
+        :raises ValueError: If the truss is unstable.
+        """
+        self._joints = PointCloud(array('d', truss.joints.data))
+        self._supports = truss.supports
+        directions, lengths = truss._member_directions()
+        self._members = truss.members
+        self._lengths = list(lengths)
+        self._rigidity = list(truss._stiffness)
+        self._directions = [(e.i, e.j, e.k) for e in directions]
+        self._default_loads = truss.loads
+        self.max_updates = max_updates
+        self._factorize()
+
+    @property
+    def member_count(self):
+        return len(self._members)
+
+    @property
+    def pending_updates(self):
+        """
+        The number of low-rank corrections applied since the last factorization.
+
+        :rtype: int
+        """
+        return len(self._columns)
+
+    def _blocks(self):
+        return [
+            (start, end, e, rigidity / length)
+            for (start, end), e, rigidity, length in zip(self._members, self._directions,
+                                                         self._rigidity, self._lengths)
+        ]
+
+    def _factorize(self):
+        self._restrained = _restrained_dofs(self._supports)
+        stiffness, self._free = _assemble(len(self._joints), self._blocks(), self._restrained)
+        self._position = {dof: index for index, dof in enumerate(self._free)}
+        self._factor = _factorize(stiffness, self._free, self._joints)
+        self._stale = False
+        self._columns = []
+        self._inverse_diagonal = []
+        self._corrections = []
+        self._capacitance = None
+
+    def _push_update(self, column, inverse_diagonal):
+        if len(self._columns) >= self.max_updates:
+            self._stale = True
+        if self._stale:
+            return
+        self._columns.append(column)
+        self._inverse_diagonal.append(inverse_diagonal)
+        self._corrections.append(None)
+        self._capacitance = None
+
+    def _stiffness_update(self, member, delta):
+        """
+        Records the change ``delta * b b^T`` of the stiffness matrix caused by
+        changing the axial stiffness of one member by `delta`.
+        """
+        start, end = self._members[member]
+        e = self._directions[member]
+        column = array('d', bytes(8 * len(self._free)))
+        for dof, component in zip(_member_dofs(start, end), (-e[0], -e[1], -e[2], e[0], e[1], e[2])):
+            if not component:
+                continue
+            index = self._position.get(dof)
+            if index is not None:
+                column[index] = component
+            elif dof not in self._restrained:
+                self._stale = True
+                return
+        self._push_update(column, 1 / delta)
+
+    def set_member_stiffness(self, member, stiffness):
+        """
+        Changes the axial rigidity EA of a member.
+
+        :param member: The member index.
+        :type member: int
+        :param stiffness: The new axial rigidity. Zero removes the member.
+        :type stiffness: float
+        """
+        if stiffness < 0:
+            raise ValueError("Member stiffness must not be negative")
+        delta = (stiffness - self._rigidity[member]) / self._lengths[member]
+        self._rigidity[member] = stiffness
+        if delta:
+            self._stiffness_update(member, delta)
+
+    def remove_member(self, member):
+        """
+        Removes a member. Its index stays valid and its force is reported as zero.
+
+        :param member: The member index.
+        :type member: int
+        """
+        self.set_member_stiffness(member, 0.0)
+
+    def add_member(self, start, end, stiffness=1.0):
+        """
+        Adds a member between two existing joints.
+
+        :param start: The index of the first joint.
+        :type start: int
+        :param end: The index of the second joint.
+        :type end: int
+        :param stiffness: The axial rigidity EA of the member.
+        :type stiffness: float
+        :return: The index of the new member.
+        :rtype: int
+        """
+        if start == end:
+            raise ValueError("A member must connect two different joints")
+        if stiffness <= 0:
+            raise ValueError("Member stiffness must be positive")
+        vector = self._joints[start].make_vector(self._joints[end])
+        if vector.norm == 0:
+            raise ValueError("Members must have a non-zero length")
+        e = vector.unit
+        self._members.append((start, end))
+        self._directions.append((e.i, e.j, e.k))
+        self._lengths.append(vector.norm)
+        self._rigidity.append(0.0)
+        self.set_member_stiffness(len(self._members) - 1, stiffness)
+        return len(self._members) - 1
+
+    def add_support(self, joint, x=True, y=True, z=True):
+        """
+        Restrains a joint in some or all of the global directions, replacing
+        any previous restraint of that joint.
+
+        :param joint: The joint index.
+        :type joint: int
+        :param x: Whether the `x` direction is restrained.
+        :type x: bool
+        :param y: Whether the `y` direction is restrained.
+        :type y: bool
+        :param z: Whether the `z` direction is restrained.
+        :type z: bool
+        """
+        before = self._supports.get(joint, (False, False, False))
+        after = (bool(x), bool(y), bool(z))
+        if after == (False, False, False):
+            self._supports.pop(joint, None)
+        else:
+            self._supports[joint] = after
+        for axis in range(3):
+            dof = 3 * joint + axis
+            if before[axis] and not after[axis]:
+                self._stale = True
+            elif after[axis] and not before[axis]:
+                index = self._position.get(dof)
+                if index is not None:
+                    column = array('d', bytes(8 * len(self._free)))
+                    column[index] = 1.0
+                    self._push_update(column, 0.0)
+        self._restrained = _restrained_dofs(self._supports)
+
+    def _prepare(self):
+        """
+        Refactorizes if needed and builds the capacitance matrix
+        ``V^T K^-1 V + D`` of the pending corrections.
+        """
+        if self._stale:
+            self._factorize()
+        if self._capacitance is not None or not self._columns:
+            return
+        for index, column in enumerate(self._columns):
+            if self._corrections[index] is None:
+                self._corrections[index] = self._factor.solve(column)
+        size = len(self._columns)
+        matrix = [[0.0] * size for _ in range(size)]
+        for row, column in enumerate(self._columns):
+            for other, correction in enumerate(self._corrections):
+                matrix[row][other] = sum(map(mul, column, correction))
+            matrix[row][row] += self._inverse_diagonal[row]
+        try:
+            self._capacitance = _DenseLU(matrix)
+        except ValueError:
+            # A correction may leave a direction with no stiffness at all, which
+            # a fresh assembly drops instead of treating as singular.
+            self._stale = True
+            self._prepare()
+
+    def solve(self, loads=None):
+        """
+        Solves one load case with the stored factorization.
+
+        :param loads: One load per joint, or a mapping from joint index to load.
+            Defaults to the loads of the truss this object was built from.
+        :type loads: VectorArray or dict of int to Vector or None
+        :return: The member forces, reactions and displacements.
+        :rtype: TrussSolution
+        :raises ValueError: If the modified truss is unstable.
+        """
+        return self.solve_many([loads])[0]
+
+    def solve_many(self, load_cases):
+        """
+        Solves many load cases against the same factorization in one call.
+
+        :param load_cases: The load cases, each one load per joint or a mapping
+            from joint index to load.
+        :type load_cases: iterable of VectorArray or dict of int to Vector
+        :return: One solution per load case, in order.
+        :rtype: list of TrussSolution
+        :raises ValueError: If the modified truss is unstable.
+        """
+        self._prepare()
+        blocks = self._blocks()
+        solutions = []
+        for loads in load_cases:
+            loads = _load_vector(self._default_loads if loads is None else loads, len(self._joints))
+            _check_loads(loads, self._free, self._restrained)
+            displacements = self._factor.solve(array('d', [loads[dof] for dof in self._free]))
+            if self._columns:
+                weights = self._capacitance.solve([sum(map(mul, column, displacements))
+                                                   for column in self._columns])
+                for weight, correction in zip(weights, self._corrections):
+                    if weight:
+                        for index, value in enumerate(correction):
+                            displacements[index] -= weight * value
+            for dof in self._restrained:
+                index = self._position.get(dof)
+                if index is not None:
+                    displacements[index] = 0.0
+            solutions.append(_recover(blocks, self._supports, self._free, displacements, loads))
+        return solutions
+
+
+def _pseudo_inverse(columns):
+    """
+    The left pseudo-inverse ``(A^T A)^-1 A^T`` of the matrix with the given
+    columns, row by row, so that ``x = P b`` solves ``A x = b`` exactly when
+    `A` is square and in the least squares sense when it is tall.
+
+    :raises ValueError: If the columns are linearly dependent.
+    """
+    lu = _DenseLU([[sum(map(mul, a, b)) for b in columns] for a in columns])
+    solved = [lu.solve([column[row] for column in columns]) for row in range(len(columns[0]))]
+    return [array('d', (values[index] for values in solved)) for index in range(len(columns))]
+
+
+class DeterminateTruss:
+    def __init__(self, truss: Truss):
+        """
+        A statically determinate truss solved by statics alone, joint by joint
+        with the method of joints, or one member at a time with the method of
+        sections.
+
+        The order in which joints are solved depends only on the geometry and
+        is worked out once, together with the small local system of every
+        joint, so each load case costs a few multiply-adds per member. When
+        the supports provide exactly as many reactions as the rigid body
+        equilibrium equations, the reactions are found first from the
+        equilibrium of the whole truss; otherwise they are solved at their
+        joints like member forces.
+
+        Directions no member acts in, such as the out-of-plane direction of a
+        planar truss, are left out as in `Truss.solve`. The geometry, members
+        and supports are copied from `truss` when this object is created.
+
+        :param truss: The truss to solve.
+        :type truss: Truss
+        :raises ValueError: If the truss is statically indeterminate, unstable,
+            or cannot be solved one joint at a time, in which case
+            `Truss.solve` still applies.
+        """
+        directions, _ = truss._member_directions()
+        self._joints = PointCloud(array('d', truss.joints.data))
+        self._members = truss.members
+        self._directions = [(e.i, e.j, e.k) for e in directions]
+        self._supports = truss.supports
+        self._default_loads = truss.loads
+        self._axes = [
+            axis for axis in range(3)
+            if any(abs(e[axis]) > _UNCONNECTED_DOF for e in self._directions)
+        ]
+        # Rigid body moments only exist about axes normal to two active axes.
+        self._moment_axes = [
+            axis for axis in range(3)
+            if all(other in self._axes for other in range(3) if other != axis)
+        ]
+        self._incident = [[] for _ in range(len(self._joints))]
+        for member, (start, end) in enumerate(self._members):
+            self._incident[start].append((member, 1.0))
+            self._incident[end].append((member, -1.0))
+        self._reaction_dofs = [
+            (joint, axis) for joint, restrained in sorted(self._supports.items())
+            for axis in self._axes if restrained[axis]
+        ]
+        unknowns = len(self._members) + len(self._reaction_dofs)
+        equations = len(self._axes) * len(self._joints)
+        if unknowns > equations:
+            raise ValueError("The truss is statically indeterminate; use Truss.solve")
+        if unknowns < equations:
+            raise ValueError("The truss is unstable: it has fewer members and reactions than equations")
+        self._global = self._plan_reactions()
+        self._plan_joints()
+        self._sections = {}
+        self._cones = {}
+
+    def _rigid_rows(self, force, point, reference):
+        """
+        The rigid body equilibrium rows of a force acting at a point: its
+        active components and its moment about `reference`.
+        """
+        d = (point[0] - reference[0], point[1] - reference[1], point[2] - reference[2])
+        moment = (
+            d[1] * force[2] - d[2] * force[1],
+            d[2] * force[0] - d[0] * force[2],
+            d[0] * force[1] - d[1] * force[0],
+        )
+        return [force[axis] for axis in self._axes] + [moment[axis] for axis in self._moment_axes]
+
+    def _point(self, joint):
+        data = self._joints.data
+        return data[3 * joint], data[3 * joint + 1], data[3 * joint + 2]
+
+    def _plan_reactions(self):
+        """
+        The pseudo-inverse giving every reaction from the loads when the whole
+        truss is a free body with as many reactions as equations, else None.
+        """
+        if len(self._reaction_dofs) != len(self._axes) + len(self._moment_axes):
+            return None
+        reference = self._point(self._reaction_dofs[0][0])
+        columns = []
+        for joint, axis in self._reaction_dofs:
+            unit = [0.0, 0.0, 0.0]
+            unit[axis] = 1.0
+            columns.append(self._rigid_rows(unit, self._point(joint), reference))
+        try:
+            return reference, _pseudo_inverse(columns)
+        except ValueError:
+            return None
+
+    def _plan_joints(self):
+        """
+        Orders the joints so that each one has at most as many unknowns as
+        equilibrium equations when its turn comes, peeling the truss from its
+        free ends, and factors every joint's local system.
+        """
+        dimension = len(self._axes)
+        reactions_at = {}
+        if self._global is None:
+            for joint, axis in self._reaction_dofs:
+                reactions_at.setdefault(joint, []).append(axis)
+        remaining = [len(members) + len(reactions_at.get(joint, ())) for joint, members in enumerate(self._incident)]
+        solved = [False] * len(self._members)
+        self._steps = []
+        self._step_of = [None] * len(self._members)
+        queue = deque(joint for joint, count in enumerate(remaining) if 0 < count <= dimension)
+        while queue:
+            joint = queue.popleft()
+            if not 0 < remaining[joint] <= dimension:
+                continue
+            unknown = [(member, sign) for member, sign in self._incident[joint] if not solved[member]]
+            known = [(member, sign) for member, sign in self._incident[joint] if solved[member]]
+            axes = reactions_at.pop(joint, [])
+            columns = [[sign * self._directions[member][axis] for axis in self._axes] for member, sign in unknown]
+            columns.extend([1.0 if axis == other else 0.0 for other in self._axes] for axis in axes)
+            try:
+                inverse = _pseudo_inverse(columns)
+            except ValueError:
+                # Blocked for now; fewer unknowns later may make it solvable.
+                if axes:
+                    reactions_at[joint] = axes
+                continue
+            index = len(self._steps)
+            self._steps.append((joint, unknown, axes, known, inverse))
+            remaining[joint] = 0
+            for member, _ in unknown:
+                solved[member] = True
+                self._step_of[member] = index
+                start, end = self._members[member]
+                other = end if start == joint else start
+                remaining[other] -= 1
+                if 0 < remaining[other] <= dimension:
+                    queue.append(other)
+        if not all(solved) or reactions_at:
+            raise ValueError("The truss cannot be solved one joint at a time; use Truss.solve")
+
+    def _loads(self, loads):
+        loads = _load_vector(self._default_loads if loads is None else loads, len(self._joints))
+        for dof, load in enumerate(loads):
+            if load and dof % 3 not in self._axes and not self._supports.get(dof // 3, (False,) * 3)[dof % 3]:
+                raise ValueError(f"Joint {dof // 3} is loaded in a direction no member can resist")
+        return loads
+
+    def _global_reactions(self, loads):
+        """
+        Every reaction from the equilibrium of the whole truss, keyed by
+        ``(joint, axis)``.
+        """
+        reference, inverse = self._global
+        totals = [0.0] * len(inverse[0])
+        for joint in range(len(self._joints)):
+            force = loads[3 * joint:3 * joint + 3]
+            if any(force):
+                for row, value in enumerate(self._rigid_rows(force, self._point(joint), reference)):
+                    totals[row] -= value
+        return {dof: sum(map(mul, row, totals)) for dof, row in zip(self._reaction_dofs, inverse)}
+
+    def _run(self, steps, loads, forces, reactions):
+        """
+        Solves the given joint steps in order, filling in member forces and
+        reaction components.
+        """
+        axes = self._axes
+        directions = self._directions
+        for joint, unknown, reaction_axes, known, inverse in steps:
+            base = 3 * joint
+            rhs = []
+            for axis in axes:
+                value = loads[base + axis] + reactions.get((joint, axis), 0.0)
+                for member, sign in known:
+                    value += forces[member] * sign * directions[member][axis]
+                rhs.append(-value)
+            values = [sum(map(mul, row, rhs)) for row in inverse]
+            for (member, _), value in zip(unknown, values):
+                forces[member] = value
+            for axis, value in zip(reaction_axes, values[len(unknown):]):
+                reactions[(joint, axis)] = value
+
+    def solve(self, loads=None):
+        """
+        Solves every member force and reaction with the method of joints.
+
+        :param loads: One load per joint, or a mapping from joint index to load.
+            Defaults to the loads of the truss this object was built from.
+        :type loads: VectorArray or dict of int to Vector or None
+        :return: The member forces and reactions. Statics alone gives no
+            displacements, so `displacements` is None.
+        :rtype: TrussSolution
+        """
+        loads = self._loads(loads)
+        reactions = self._global_reactions(loads) if self._global is not None else {}
+        forces = array('d', bytes(8 * len(self._members)))
+        self._run(self._steps, loads, forces, reactions)
+        solution = {}
+        for joint, restrained in sorted(self._supports.items()):
+            solution[joint] = Vector(*(
+                (reactions.get((joint, axis), 0.0) if axis in self._axes else -loads[3 * joint + axis])
+                if fixed else 0.0
+                for axis, fixed in enumerate(restrained)
+            ))
+        return TrussSolution(forces, solution, None)
+
+    def _section_normals(self, member):
+        """
+        Candidate normals of cutting planes through a member, from square
+        across it to nearly along it.
+        """
+        e = self._directions[member]
+        if len(self._axes) == 2:
+            a, b = self._axes
+            for degrees in (0, 20, -20, 40, -40, 60, -60, 75, -75):
+                angle = math.radians(degrees)
+                normal = [0.0, 0.0, 0.0]
+                normal[a] = math.cos(angle) * e[a] - math.sin(angle) * e[b]
+                normal[b] = math.sin(angle) * e[a] + math.cos(angle) * e[b]
+                yield normal
+            return
+        yield e
+        if len(self._axes) == 3:
+            vector = Vector(*e)
+            first = vector.cross(Vector(1, 0, 0) if abs(e[0]) < 0.9 else Vector(0, 1, 0)).unit
+            second = vector.cross(first)
+            for tilt in (math.radians(30), math.radians(60)):
+                for turn in range(4):
+                    angle = turn * math.pi / 2
+                    side = first.scaled_by(math.cos(angle)) + second.scaled_by(math.sin(angle))
+                    yield tuple(math.cos(tilt) * c + math.sin(tilt) * s for c, s in zip(e, (side.i, side.j, side.k)))
+
+    def _find_section(self, member):
+        """
+        Looks for a cut through `member` by a plane through its midpoint that
+        crosses no more members than there are rigid body equations and whose
+        free body can be solved. Returns the joints on one side, the cut
+        members with the direction their force pulls that side, the reference
+        point and the row of the pseudo-inverse that gives `member`, or None.
+        """
+        start, end = self._members[member]
+        a, b = self._point(start), self._point(end)
+        middle = tuple((p + q) / 2 for p, q in zip(a, b))
+        data = self._joints.data
+        limit = len(self._axes) + len(self._moment_axes)
+        supported = set(self._supports)
+        for normal in self._section_normals(member):
+            inside = [
+                (data[3 * joint] - middle[0]) * normal[0] + (data[3 * joint + 1] - middle[1]) * normal[1]
+                + (data[3 * joint + 2] - middle[2]) * normal[2] < 0
+                for joint in range(len(self._joints))
+            ]
+            cut = [index for index, (s, e) in enumerate(self._members) if inside[s] != inside[e]]
+            if len(cut) > limit:
+                continue
+            sides = [joint for joint, flag in enumerate(inside) if flag]
+            others = [joint for joint, flag in enumerate(inside) if not flag]
+            if len(others) < len(sides):
+                sides, others, inside = others, sides, [not flag for flag in inside]
+            if self._global is None and supported.intersection(sides):
+                if supported.intersection(others):
+                    continue
+                sides, inside = others, [not flag for flag in inside]
+            columns = []
+            pulls = []
+            for index in cut:
+                s, e = self._members[index]
+                sign = 1.0 if inside[s] else -1.0
+                direction = tuple(sign * c for c in self._directions[index])
+                columns.append(self._rigid_rows(direction, self._point(s if inside[s] else e), middle))
+                pulls.append(index)
+            try:
+                inverse = _pseudo_inverse(columns)
+            except ValueError:
+                continue
+            return sides, middle, inverse[pulls.index(member)]
+        return None
+
+    def _cone(self, member):
+        """
+        The joint steps `member` depends on, in solving order.
+        """
+        needed = set()
+        pending = [self._step_of[member]]
+        while pending:
+            index = pending.pop()
+            if index in needed:
+                continue
+            needed.add(index)
+            pending.extend(self._step_of[known] for known, _ in self._steps[index][3])
+        return [self._steps[index] for index in sorted(needed)]
+
+    def member_force(self, member, loads=None):
+        """
+        The force in a single member, without solving the whole truss.
+
+        The method of sections is tried first: a plane through the member
+        that cuts few enough members splits off a free body whose equilibrium
+        gives the force directly from the loads on that side. When no such
+        cut exists, only the joints the member depends on are solved. The
+        cut or joints chosen for each member are remembered for later calls.
+
+        :param member: The member index.
+        :type member: int
+        :param loads: One load per joint, or a mapping from joint index to load.
+            Defaults to the loads of the truss this object was built from.
+        :type loads: VectorArray or dict of int to Vector or None
+        :return: The axial force, positive in tension.
+        :rtype: float
+        """
+        if not 0 <= member < len(self._members):
+            raise IndexError(f"Member {member} does not exist")
+        loads = self._loads(loads)
+        if member not in self._sections:
+            self._sections[member] = self._find_section(member)
+        section = self._sections[member]
+        reactions = self._global_reactions(loads) if self._global is not None else {}
+        if section is not None:
+            sides, middle, row = section
+            totals = [0.0] * len(row)
+            for joint in sides:
+                base = 3 * joint
+                force = [loads[base + axis] + reactions.get((joint, axis), 0.0) for axis in range(3)]
+                if any(force):
+                    for index, value in enumerate(self._rigid_rows(force, self._point(joint), middle)):
+                        totals[index] -= value
+            return sum(map(mul, row, totals))
+        if member not in self._cones:
+            self._cones[member] = self._cone(member)
+        forces = array('d', bytes(8 * len(self._members)))
+        self._run(self._cones[member], loads, forces, reactions)
+        return forces[member]
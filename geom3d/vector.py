@@ -1,10 +1,13 @@
 import math
 
+from geom3d.nums import _snap
 from geom3d.nums import are_close_enough
 from geom3d.nums import is_close_to_zero
 
 
 class Vector:
+    __slots__ = ('i', 'j', 'k')
+
     def __init__(self, i, j, k):
         """
         Initialize the example class with given parameters `i`, `j`, and `k`.
@@ -74,7 +77,17 @@ class Vector:
         :return: The Euclidean norm of the vector.
         :rtype: float
         """
-        return math.sqrt(self.i ** 2 + self.j ** 2 + self.k ** 2)
+        return math.sqrt(self.i * self.i + self.j * self.j + self.k * self.k)
+
+    @property
+    def norm_squared(self):
+        """
+        The squared Euclidean norm, which avoids the square root when only
+        lengths are compared.
+
+        :rtype: float
+        """
+        return self.i * self.i + self.j * self.j + self.k * self.k
 
     def __str__(self):
         """
@@ -172,11 +185,12 @@ class Vector:
         :rtype: Vector
         :return: The unit vector if the norm is not zero, or the vector itself if the norm is zero.
         """
-        if are_close_enough(self.norm, 0):
+        norm = self.norm
+        if are_close_enough(norm, 0):
             # This allows for the special case were we try to find the unit vector of the
             # zero vector. This would involve dividing by zero so we need another bit of logic to handle that
             return self
-        return self.scaled_by(1 / self.norm)
+        return self.scaled_by(1 / norm)
 
     def comp(self, other):
         """
@@ -218,6 +232,123 @@ class Vector:
         :rtype: Vector
 
         """
-        if self == Vector(0, 0, 0):
+        if is_close_to_zero(self.i) and is_close_to_zero(self.j) and is_close_to_zero(self.k):
             return Vector(0, 0, 0)
         return self.unit.scaled_by(length)
+
+
+class FrozenVector(Vector):
+    __slots__ = ('_key', '_norm_squared', '_norm', '_unit')
+
+    tolerance = 1e-10
+
+    def __init__(self, i, j, k):
+        """
+        An immutable, hashable Vector that can be used as a dict key or set member.
+
+        Components cannot be reassigned after construction. Every component
+        is snapped once to the nearest multiple of the `tolerance` class
+        attribute (the default tolerance of `are_close_enough`), and two frozen
+        vectors of the same tolerance are equal when their snapped components
+        are, so equality is transitive, equal vectors always hash equally and
+        their components agree to within the tolerance. Comparisons with a
+        plain `Vector` use `Vector.__eq__`. Arithmetic returns plain `Vector`
+        instances.
+
+        A vector with a NaN or infinite component is equal only to itself, as
+        `are_close_enough` never finds such components close.
+
+        Because the components never change, `norm`, `norm_squared` and `unit`
+        are computed on first access and cached on the instance, so code that
+        reads them repeatedly pays for the square root and the unit vector once.
+
+        :param i: The first component.
+        :type i: float or int
+        :param j: The second component.
+        :type j: float or int
+        :param k: The third component.
+        :type k: float or int
+        """
+        object.__setattr__(self, 'i', i)
+        object.__setattr__(self, 'j', j)
+        object.__setattr__(self, 'k', k)
+        object.__setattr__(self, '_key', _snap((i, j, k), self.tolerance))
+
+    @classmethod
+    def from_vector(cls, vector):
+        """
+        Creates a frozen copy of an existing vector.
+
+        :param vector: The vector to copy.
+        :type vector: Vector
+        :return: A FrozenVector with the same components.
+        :rtype: FrozenVector
+        """
+        return cls(vector.i, vector.j, vector.k)
+
+    @property
+    def norm_squared(self):
+        try:
+            return self._norm_squared
+        except AttributeError:
+            norm_squared = self.i * self.i + self.j * self.j + self.k * self.k
+            object.__setattr__(self, '_norm_squared', norm_squared)
+            return norm_squared
+
+    @property
+    def norm(self):
+        try:
+            return self._norm
+        except AttributeError:
+            norm = math.sqrt(self.norm_squared)
+            object.__setattr__(self, '_norm', norm)
+            return norm
+
+    @property
+    def unit(self):
+        """
+        The unit vector, as a FrozenVector cached after the first access. The
+        zero vector is its own unit vector, as with `Vector.unit`.
+
+        :rtype: FrozenVector
+        """
+        try:
+            return self._unit
+        except AttributeError:
+            norm = self.norm
+            if are_close_enough(norm, 0):
+                return self
+            inverse = 1 / norm
+            unit = FrozenVector(self.i * inverse, self.j * inverse, self.k * inverse)
+            object.__setattr__(self, '_unit', unit)
+            return unit
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.i, self.j, self.k)
+
+    def __eq__(self, other):
+        """
+        Compares two frozen vectors by their snapped components, or falls back
+        to `Vector.__eq__` for any other object.
+
+        :param other: The object to compare with.
+        :type other: Any
+        :return: True if the vectors are equal, False otherwise.
+        :rtype: bool
+        """
+        if self is other:
+            return True
+        if isinstance(other, FrozenVector):
+            return self._key is not None and self._key == other._key and self.tolerance == other.tolerance
+        return Vector.__eq__(self, other)
+
+    def __hash__(self):
+        if self._key is None:
+            return object.__hash__(self)
+        return hash(self._key)
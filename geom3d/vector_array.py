@@ -0,0 +1,357 @@
+from array import array
+from itertools import repeat
+
+from geom3d.backends import _interleave
+from geom3d.backends import get_backend
+from geom3d.nums import all_close
+from geom3d.nums import close_enough_mask
+from geom3d.nums import close_to_zero_mask
+from geom3d.vector import Vector
+
+# The norm, or component, below which `unit` and `make_length` treat a row as
+# zero, matching `are_close_enough` and `Vector`.
+_ZERO_TOLERANCE = 1e-10
+
+
+def _as_buffer(data):
+    """
+    Returns a flat float64 buffer for `data` without copying when possible.
+
+    An `array('d')` or a memoryview with format ``'d'`` is used as-is so that
+    callers can hand over an existing buffer (for example a memory-mapped file)
+    without paying for a copy. Anything else is copied into a new `array('d')`.
+
+    :param data: A flat sequence of floats.
+    :return: A flat float64 buffer.
+    :rtype: array or memoryview
+    """
+    if isinstance(data, array) and data.typecode == 'd':
+        return data
+    if isinstance(data, memoryview) and data.format == 'd' and data.ndim == 1:
+        return data
+    return array('d', data)
+
+
+def _scalars(value, count):
+    """
+    Broadcasts a scalar to `count` repetitions, or passes a per-element
+    sequence of scalars through after checking its length.
+    """
+    if isinstance(value, (int, float)):
+        return repeat(value, count)
+    if len(value) != count:
+        raise ValueError(f"Expected {count} values, got {len(value)}")
+    return value
+
+
+class VectorArray:
+    def __init__(self, data=()):
+        """
+        Stores N vectors as one contiguous float64 buffer laid out as
+        ``i0, j0, k0, i1, j1, k1, ...`` (an (N, 3) row-major block).
+
+        Every operation available on `Vector` is available here as a single
+        call over the whole batch, so large sets of force or position vectors
+        can be processed without creating one Python object per vector.
+
+        :param data: A flat sequence of floats whose length is a multiple of 3.
+            An `array('d')` or a float64 memoryview is used without copying.
+        :type data: array or memoryview or iterable of float
+        """
+        data = _as_buffer(data)
+        if len(data) % 3 != 0:
+            raise ValueError("VectorArray data length must be a multiple of 3")
+        self._data = data
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """
+        Builds a VectorArray from an iterable of `Vector` instances.
+
+        :param vectors: The vectors to pack.
+        :type vectors: iterable of Vector
+        :return: A new VectorArray holding the same components.
+        :rtype: VectorArray
+        """
+        data = array('d')
+        for vector in vectors:
+            data.append(vector.i)
+            data.append(vector.j)
+            data.append(vector.k)
+        return cls(data)
+
+    @classmethod
+    def from_components(cls, i, j, k):
+        """
+        Builds a VectorArray from three equally long component sequences.
+
+        :param i: The `i` components.
+        :param j: The `j` components.
+        :param k: The `k` components.
+        :return: A new VectorArray.
+        :rtype: VectorArray
+        """
+        if not len(i) == len(j) == len(k):
+            raise ValueError("Component sequences must have the same length")
+        return cls(_interleave(i, j, k))
+
+    def to_vectors(self):
+        """
+        Unpacks the batch into a list of `Vector` instances.
+
+        :return: One `Vector` per row.
+        :rtype: list of Vector
+        """
+        return [Vector(i, j, k) for i, j, k in zip(self.i, self.j, self.k)]
+
+    @property
+    def data(self):
+        """
+        The underlying flat float64 buffer.
+
+        :rtype: array or memoryview
+        """
+        return self._data
+
+    @property
+    def i(self):
+        """
+        The `i` components of every vector.
+
+        :rtype: array or memoryview
+        """
+        return self._data[0::3]
+
+    @property
+    def j(self):
+        """
+        The `j` components of every vector.
+
+        :rtype: array or memoryview
+        """
+        return self._data[1::3]
+
+    @property
+    def k(self):
+        """
+        The `k` components of every vector.
+
+        :rtype: array or memoryview
+        """
+        return self._data[2::3]
+
+    def __len__(self):
+        return len(self._data) // 3
+
+    def __getitem__(self, index):
+        """
+        Returns a single row as a `Vector`, or a contiguous range of rows as a
+        new VectorArray when given a slice with step 1.
+
+        :param index: The row index or slice.
+        :type index: int or slice
+        :rtype: Vector or VectorArray
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("VectorArray slices must have a step of 1")
+            return VectorArray(self._data[3 * start:3 * max(start, stop)])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("VectorArray index out of range")
+        offset = 3 * index
+        return Vector(self._data[offset], self._data[offset + 1], self._data[offset + 2])
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    def __eq__(self, other):
+        """
+        Two VectorArrays are equal when they hold the same number of vectors
+        and every component is within `are_close_enough` of its counterpart,
+        which matches `Vector.__eq__` applied row by row.
+
+        :param other: The object to compare with.
+        :return: True if both batches hold the same vectors, False otherwise.
+        :rtype: bool
+        """
+        if self is other:
+            return True
+        if not isinstance(other, VectorArray):
+            return False
+        if len(self) != len(other):
+            return False
+        return all_close(self._data, other._data)
+
+    def close_enough(self, other, tolerance=1e-10, rel_tolerance=0.0):
+        """
+        Compares every row with the matching row of `other`, or with a single
+        `Vector`, and reports which rows are close enough on all three components.
+
+        :param other: The vectors to compare with.
+        :type other: VectorArray or Vector
+        :param tolerance: The absolute tolerance. Defaults to 1e-10.
+        :type tolerance: float
+        :param rel_tolerance: The tolerance relative to the larger magnitude of
+            each component pair. Defaults to 0.0 (absolute only).
+        :type rel_tolerance: float
+        :return: One boolean per row.
+        :rtype: list of bool
+        """
+        self._other_data(other)
+        i_mask = close_enough_mask(self.i, other.i, tolerance, rel_tolerance)
+        j_mask = close_enough_mask(self.j, other.j, tolerance, rel_tolerance)
+        k_mask = close_enough_mask(self.k, other.k, tolerance, rel_tolerance)
+        return [a and b and c for a, b, c in zip(i_mask, j_mask, k_mask)]
+
+    def __str__(self):
+        return "[" + ", ".join(f"({i}, {j}, {k})" for i, j, k in zip(self.i, self.j, self.k)) + "]"
+
+    def _other_data(self, other):
+        """
+        Returns the buffer of `other` as the backends take it, a single
+        `Vector` becoming one ``(i, j, k)`` row applied to every row.
+        """
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(f"Expected {len(self)} vectors, got {len(other)}")
+            return other._data
+        if isinstance(other, Vector):
+            return other.i, other.j, other.k
+        raise TypeError(f"Expected a Vector or VectorArray, got {type(other).__name__}")
+
+    def __add__(self, other):
+        """
+        Adds a VectorArray row by row, or a single `Vector` to every row.
+
+        :param other: The vectors to add.
+        :type other: VectorArray or Vector
+        :return: A new VectorArray holding the sums.
+        :rtype: VectorArray
+        """
+        if not isinstance(other, (Vector, VectorArray)):
+            return NotImplemented
+        return VectorArray(get_backend().add(self._data, self._other_data(other)))
+
+    def __sub__(self, other):
+        """
+        Subtracts a VectorArray row by row, or a single `Vector` from every row.
+
+        :param other: The vectors to subtract.
+        :type other: VectorArray or Vector
+        :return: A new VectorArray holding the differences.
+        :rtype: VectorArray
+        """
+        if not isinstance(other, (Vector, VectorArray)):
+            return NotImplemented
+        return VectorArray(get_backend().subtract(self._data, self._other_data(other)))
+
+    def scaled_by(self, factor):
+        """
+        Scales every vector by `factor`.
+
+        :param factor: A single scale factor, or one factor per vector.
+        :type factor: float or int or sequence of float
+        :return: A new VectorArray with scaled components.
+        :rtype: VectorArray
+        """
+        if not isinstance(factor, (int, float)):
+            factor = _scalars(factor, len(self))
+        return VectorArray(get_backend().scale(self._data, factor))
+
+    def __mul__(self, other):
+        """
+        Scales the batch, see `scaled_by`.
+
+        :param other: A single scale factor, or one factor per vector.
+        :type other: float or int or sequence of float
+        :return: A new VectorArray with scaled components.
+        :rtype: VectorArray
+        """
+        return self.scaled_by(other)
+
+    def dot(self, other):
+        """
+        Computes the dot product of every row with the matching row of
+        `other`, or with a single `Vector`.
+
+        :param other: The vectors to dot with.
+        :type other: VectorArray or Vector
+        :return: One dot product per vector.
+        :rtype: array
+        """
+        return get_backend().dot(self._data, self._other_data(other))
+
+    def cross(self, other):
+        """
+        Computes the cross product of every row with the matching row of
+        `other`, or with a single `Vector`.
+
+        :param other: The vectors to cross with.
+        :type other: VectorArray or Vector
+        :return: A new VectorArray holding the cross products.
+        :rtype: VectorArray
+        """
+        return VectorArray(get_backend().cross(self._data, self._other_data(other)))
+
+    @property
+    def norm(self):
+        """
+        The Euclidean norm of every vector.
+
+        :rtype: array
+        """
+        return get_backend().norm(self._data)
+
+    @property
+    def unit(self):
+        """
+        The unit vector of every row. Rows whose norm is close to zero are
+        returned unchanged, matching `Vector.unit`.
+
+        :rtype: VectorArray
+        """
+        return VectorArray(get_backend().unit(self._data, _ZERO_TOLERANCE))
+
+    def comp(self, other):
+        """
+        Computes the scalar projection of every row onto the matching row of
+        `other`, or onto a single `Vector`.
+
+        :param other: The vectors to project onto.
+        :type other: VectorArray or Vector
+        :return: One scalar projection per vector.
+        :rtype: array
+        :raises ZeroDivisionError: If any vector of `other` has zero norm.
+        """
+        if isinstance(other, Vector):
+            return array('d', [d / other.norm for d in self.dot(other)])
+        return array('d', [d / n for d, n in zip(self.dot(other), other.norm)])
+
+    def is_parallel(self, other):
+        """
+        Checks every row for parallelism with the matching row of `other`, or
+        with a single `Vector`. A zero vector is parallel to any vector.
+
+        :param other: The vectors to compare against.
+        :type other: VectorArray or Vector
+        :return: One boolean per vector.
+        :rtype: list of bool
+        """
+        return close_to_zero_mask(self.cross(other).norm)
+
+    def make_length(self, length):
+        """
+        Rescales every vector to the given length while preserving its
+        direction. Zero vectors stay zero, matching `Vector.make_length`.
+
+        :param length: A single target length, or one length per vector.
+        :type length: float or int or sequence of float
+        :return: A new VectorArray with the requested lengths.
+        :rtype: VectorArray
+        """
+        if not isinstance(length, (int, float)):
+            length = _scalars(length, len(self))
+        return VectorArray(get_backend().make_length(self._data, length, _ZERO_TOLERANCE))
@@ -0,0 +1,63 @@
+from array import array
+
+from geom3d.point_cloud import PointCloud
+from geom3d.spatial import GridIndex
+
+
+def weld(points: PointCloud, tolerance=1e-10):
+    """
+    Merges points that coincide within a tolerance, such as the duplicate
+    joints of an imported model that differ only by float noise.
+
+    Points are welded with the same test as `Point.__eq__`: two points match
+    when every coordinate differs by less than `tolerance`. Points are visited
+    in order and each one is merged into the first kept point it matches, or
+    kept if it matches none. Kept points are looked up through a `GridIndex`
+    whose cells are `tolerance` wide, so every point is compared only with
+    the kept points in its neighbouring cells and the pass runs in near-linear
+    time instead of comparing every pair.
+
+    :param points: The points to weld.
+    :type points: PointCloud
+    :param tolerance: The per-coordinate tolerance. Defaults to 1e-10.
+    :type tolerance: float
+    :return: The kept points, in order of first appearance, and the remap
+        table: ``remap[old]`` is the index of point `old` among the kept points.
+    :rtype: tuple of (PointCloud, array)
+    :raises ValueError: If `tolerance` is not positive.
+    """
+    if not tolerance > 0:
+        raise ValueError("tolerance must be positive")
+    index = GridIndex(tolerance)
+    remap = array('q')
+    kept = array('d')
+    for point in points:
+        found = index.find_equal(point, tolerance)
+        if found:
+            remap.append(found[0])
+        else:
+            remap.append(index.insert(point))
+            kept.extend((point.x, point.y, point.z))
+    return PointCloud(kept), remap
+
+
+def remap_members(members, remap, drop_degenerate=True):
+    """
+    Rewrites member connectivity after `weld`.
+
+    :param members: The ``(start, end)`` point indices of every member.
+    :type members: iterable of tuple of (int, int)
+    :param remap: The remap table returned by `weld`.
+    :type remap: sequence of int
+    :param drop_degenerate: Drop members whose two ends were welded into one
+        point. Defaults to True.
+    :type drop_degenerate: bool
+    :return: The rewritten members, in their original order.
+    :rtype: list of tuple of (int, int)
+    """
+    rewritten = []
+    for start, end in members:
+        start, end = remap[start], remap[end]
+        if start != end or not drop_degenerate:
+            rewritten.append((start, end))
+    return rewritten